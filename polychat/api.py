@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -6,21 +8,38 @@ from starlette.responses import RedirectResponse
 from polychat.container.default_container import DefaultContainer
 from polychat.controller.deepseek_controller import DeepseekController
 from polychat.controller.gemini_controller import GeminiController
+from polychat.controller.job_controller import JobController
 from polychat.controller.kimi_controller import KimiController
+from polychat.controller.metrics_controller import MetricsController
+from polychat.controller.multi_controller import MultiController
 from polychat.controller.perplexity_controller import PerplexityController
 from polychat.controller.chat_gpt_controller import ChatGptController
 from polychat.controller.qwen_controller import QwenController
+from polychat.controller.status_controller import StatusController
+from polychat.controller.system_controller import SystemController
+
+
+default_container: DefaultContainer = DefaultContainer.getInstance()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Avvia le risorse condivise (pool browser) e le rilascia allo shutdown
+    await default_container.startup()
+    try:
+        yield
+    finally:
+        await default_container.shutdown()
 
 
 # Creazione dell'istanza dell'applicazione FastAPI
 app = FastAPI(
     title="API",
     description="API per la gestione",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
-default_container: DefaultContainer = DefaultContainer.getInstance()
-
 # Istanziamo i controller tramite il container di dipendenze
 perplexity_chat_controller: PerplexityController = default_container.get(PerplexityController)
 kimi_chat_controller: KimiController = default_container.get(KimiController)
@@ -28,6 +47,11 @@ deepseek_chat_controller: DeepseekController = default_container.get(DeepseekCon
 chatgpt_chat_controller: ChatGptController = default_container.get(ChatGptController)
 qwen_chat_controller: QwenController = default_container.get(QwenController)
 gemini_chat_controller: GeminiController = default_container.get(GeminiController)
+system_controller: SystemController = default_container.get(SystemController)
+job_controller: JobController = default_container.get(JobController)
+status_controller: StatusController = default_container.get(StatusController)
+multi_controller: MultiController = default_container.get(MultiController)
+metrics_controller: MetricsController = default_container.get(MetricsController)
 
 # Includiamo i router dei controller nell'app
 app.include_router(perplexity_chat_controller.router)
@@ -36,6 +60,11 @@ app.include_router(deepseek_chat_controller.router)
 app.include_router(chatgpt_chat_controller.router)
 app.include_router(qwen_chat_controller.router)
 app.include_router(gemini_chat_controller.router)
+app.include_router(system_controller.router)
+app.include_router(job_controller.router)
+app.include_router(status_controller.router)
+app.include_router(multi_controller.router)
+app.include_router(metrics_controller.router)
 
 # Configurazione CORS per consentire richieste da altre origini
 app.add_middleware(
@@ -54,7 +83,8 @@ async def root():
 
 @app.get("/health", tags=["Health"])
 async def health_check():
-    return {"status": "ok"}
+    # Include lo stato dei circuit breaker dei provider
+    return system_controller.get_health()
 
 # Per eseguire il server direttamente quando si esegue questo file
 if __name__ == "__main__":
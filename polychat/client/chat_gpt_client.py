@@ -3,24 +3,35 @@ from datetime import datetime
 import json
 import logging
 import os
-import time
 from typing import Any, Literal, Optional
 
-import requests
-from browserforge.fingerprints import Screen
-from camoufox.async_api import AsyncCamoufox
 from injector import inject
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.chatgpt_ask_result import ChatGptAskResult
 from polychat.model.client.chatgpt_conversation_detail import ConversationDetail
 from polychat.model.client.chatgpt_conversation_list import ConversationList
+from polychat.model.client.download_stream import DownloadStream
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
 logger = logging.getLogger(__name__)
 
 
 class ChatGptClient(AbstractClient):
+    PROVIDER_NAME = "chatgpt"
+    WARM_PAGE_URL = "https://chatgpt.com/"
+    STREAM_URL_MARKERS = ("/backend-api/f/conversation", "/backend-api/conversation")
+    ALLOWED_URL_PATTERNS = ("/backend-api/",)
+    STREAM_TEXT_PATH = "/message/content/parts/0"
     CHATGPT_NAVIGATION_TIMEOUT_MS = 12_000
     CHATGPT_NAVIGATION_RETRY_ATTEMPTS = 3
     CHAT_LIST_URL = (
@@ -28,21 +39,35 @@ class ChatGptClient(AbstractClient):
         "offset={offset}&limit={limit}&order=updated&is_archived=false&"
         "is_starred=false&request_p_scope=false"
     )
+    SESSION_API_URL = "https://chatgpt.com/api/auth/session"
+    CONVERSATION_API_URL = "https://chatgpt.com/backend-api/conversation/{chat_id}"
     PROMPT_SELECTOR = "#prompt-textarea"
     PROMPT_WAIT_TIMEOUT_MS = 3_500
     PROMPT_MAX_ATTEMPTS = 3
-    POST_NAVIGATION_WAIT_MS = 400
     POST_RECOVERY_WAIT_MS = 250
     PROMPT_SHORTCUT_WAIT_MS = 1_000
     WAIT_FOR_URL_TIMEOUT_MS = 8_000
     POST_SUBMIT_WAIT_MS = 5_000
+    STATUS_MARKER_WAIT_MS = 1_500
+    AUTH_STATUS_MARKER = '"authStatus":"logged_in"'
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
     COMPLETE_WAIT_CHECK_INTERVAL_SECONDS = 2.0
     CONVERSATION_FETCH_TIMEOUT_MS = 90_000
     CONVERSATION_PAGE_LOAD_TIMEOUT_MS = 10_000
     IMAGE_DOWNLOAD_GRACE_PERIOD_MS = 5_000
+    IMAGE_DOWNLOAD_SETTLE_MS = 2_000
     ASYNC_STATUS_POLL_INTERVAL_MS = 10_000
     ASYNC_STATUS_POLL_TIMEOUT_MS = 60_000
+    DOWNLOAD_FORWARDED_REQUEST_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+    DOWNLOAD_FORWARDED_RESPONSE_HEADERS = (
+        "content-length",
+        "content-range",
+        "accept-ranges",
+        "etag",
+        "last-modified",
+        "cache-control",
+        "content-disposition",
+    )
 
     @inject
     def __init__(
@@ -52,12 +77,31 @@ class ChatGptClient(AbstractClient):
         session_cookie: str = "",
         session_cookie_chunks: Optional[list[str]] = None,
         workspace_name: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "chatgpt")
         self.storage_state_path = os.path.join(self.session_dir, "chatgpt_state.json")
         self.cookie_path = os.path.join(self.session_dir, "chatgpt_cookie.txt")
-        self.headless = headless
         self.session_cookie = session_cookie
         self.session_cookie_chunks = session_cookie_chunks or []
         self.workspace_name = (workspace_name or "").strip()
@@ -67,93 +111,85 @@ class ChatGptClient(AbstractClient):
         session_auth = self._resolve_session_auth_from_login_content(content)
         self._persist_session_auth(session_auth)
 
-        constraints = Screen(max_width=1920, max_height=1080)
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
-            await context.add_cookies(session_auth["browser_cookies"])
+        async with self._open_context(cookies=session_auth["browser_cookies"]) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
             await self._goto(page, "https://chatgpt.com/", wait_until="domcontentloaded", timeout=20_000)
             await page.wait_for_timeout(1_500)
             await context.storage_state(path=self.storage_state_path)
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     def logout(self) -> None:
         """Rimuove la cartella sessione ChatGPT."""
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        constraints = Screen(max_width=1920, max_height=1080)
-        content = ""
-        try:
-            session_auth = self._load_session_auth(optional=True)
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints,
-            ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-                context = await browser.new_context(**context_options)
-                if session_auth:
-                    await context.add_cookies(session_auth["browser_cookies"])
-
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._goto(page, "https://chatgpt.com/", wait_until="domcontentloaded", timeout=20_000)
-                await page.wait_for_timeout(1_500)
-                content = await page.content()
+        async with self._timed_operation("status"):
+            content = ""
+            try:
+                session_auth = self._load_session_auth(optional=True)
+                async with self._open_page(
+                    self.storage_state_path,
+                    session_auth["browser_cookies"] if session_auth else None,
+                ) as (context, page):
+                    await self._goto(page, "https://chatgpt.com/", wait_until="domcontentloaded", timeout=20_000)
+                    await self._wait_for_page_condition(
+                        page,
+                        "marker => document.documentElement.innerHTML.includes(marker)",
+                        self.AUTH_STATUS_MARKER,
+                        self.STATUS_MARKER_WAIT_MS,
+                    )
+                    content = await page.content()
 
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
-                await page.close()
-                await context.close()
-        except Exception as exc:
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "chatgpt",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"Status check failed: {exc}",
+                }
+
+            is_logged_in = self.AUTH_STATUS_MARKER in content
             return {
                 "provider": "chatgpt",
-                "is_available": False,
-                "is_logged_in": False,
-                "detail": f"Status check failed: {exc}",
+                "is_available": True,
+                "is_logged_in": is_logged_in,
+                "detail": None if is_logged_in else "Marker auth non trovato nella homepage",
             }
 
-        marker = '"authStatus":"logged_in"'
-        is_logged_in = marker in content
-        return {
-            "provider": "chatgpt",
-            "is_available": True,
-            "is_logged_in": is_logged_in,
-            "detail": None if is_logged_in else "Marker auth non trovato nella homepage",
-        }
-
-    def get_conversations(self, offset: int = 0, limit: int = 28) -> ConversationList:
+    async def get_conversations(self, offset: int = 0, limit: int = 28) -> ConversationList:
         """Recupera la lista delle conversazioni esistenti."""
         session_auth = self._load_session_auth()
 
         url = self.CHAT_LIST_URL.format(offset=offset, limit=limit)
 
-        with requests.Session() as session:
-            response = self._requests_request(
-                session,
-                "GET",
-                url,
-                headers=self._auth_headers(session_auth["joined_value"], session_auth["cookie_header"], ""),
-                timeout=30,
-            )
-            response.raise_for_status()
-            return ConversationList.model_validate_json(response.text)
+        response = await self._http_request(
+            "GET",
+            url,
+            headers=self._auth_headers(session_auth["joined_value"], session_auth["cookie_header"], ""),
+            timeout=30,
+        )
+        response.raise_for_status()
+        return ConversationList.model_validate_json(response.text)
 
     async def get_conversation(self, chat_id: str) -> ConversationDetail:
-        """Recupera i dettagli di una conversazione tramite il browser."""
-        if not chat_id:
-            raise ValueError("chat_id mancante")
+        """Recupera i dettagli di una conversazione via HTTP, ripiegando sul browser se necessario."""
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
 
-        session_auth = self._load_session_auth()
-        payload = await self._fetch_conversation_via_browser(chat_id, session_auth)
-        return ConversationDetail.model_validate(payload)
+            session_auth = self._load_session_auth()
+            payload = await self._fetch_conversation_direct(chat_id, session_auth)
+            if payload is None:
+                payload = await self._fetch_conversation_via_browser(chat_id, session_auth)
+            return ConversationDetail.model_validate(payload)
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> ChatGptAskResult:
         """
@@ -164,28 +200,19 @@ class ChatGptClient(AbstractClient):
         session_auth = self._load_session_auth()
 
         async def _attempt() -> ChatGptAskResult:
-            constraints = Screen(max_width=1920, max_height=1080)
             logger.info("ChatGPT ask started (chat_id=%s, workspace=%s)", chat_id, self.workspace_name or "<none>")
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-            ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-                context = await browser.new_context(**context_options)
-                await context.add_cookies(session_auth["browser_cookies"])
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-
-                resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
-
-                try:
-                    await page.close()
-                    await context.close()
-                except Exception as exc:
-                    logger.warning("Error while closing ChatGPT page/context: %s", exc)
+            async with self._timed_operation("ask"):
+                async with self._open_page(
+                    self.storage_state_path,
+                    session_auth["browser_cookies"],
+                    chat_id=chat_id,
+                ) as (context, page):
+                    resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
+
+                    try:
+                        await self._release_page(page, resolved_chat_id)
+                    except Exception as exc:
+                        logger.warning("Error while closing ChatGPT page: %s", exc)
 
             logger.info("ChatGPT ask completed (chat_id=%s)", resolved_chat_id)
             return ChatGptAskResult(chat_id=resolved_chat_id, message="")
@@ -199,38 +226,32 @@ class ChatGptClient(AbstractClient):
         type_input: bool = True,
     ) -> ConversationDetail:
         session_auth = self._load_session_auth()
-        constraints = Screen(max_width=1920, max_height=1080)
 
         logger.info("ChatGPT ask_and_wait started (chat_id=%s, workspace=%s)", chat_id, self.workspace_name or "<none>")
-        async with AsyncCamoufox(
-            headless=self.headless,
-            humanize=True,
-            screen=constraints
-        ) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-            context = await browser.new_context(**context_options)
-            await context.add_cookies(session_auth["browser_cookies"])
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-
-            try:
-                resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
-                await self._wait_for_network_to_settle(
-                    page,
-                    timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
-                    check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
-                )
-                payload = await self._fetch_conversation_via_page(page, resolved_chat_id)
-                return ConversationDetail.model_validate(payload)
-            finally:
+        async with self._timed_operation("ask_and_wait"):
+            async with self._open_page(
+                self.storage_state_path,
+                session_auth["browser_cookies"],
+                chat_id=chat_id,
+            ) as (context, page):
+                resolved_chat_id = None
                 try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception as exc:
-                    logger.warning("Unable to persist ChatGPT storage state: %s", exc)
-                await page.close()
-                await context.close()
+                    resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
+                    async with self._timed_step("generation"):
+                        await self._wait_for_network_to_settle(
+                            page,
+                            timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                            check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                        )
+                    async with self._timed_step("fetch_conversation"):
+                        payload = await self._fetch_conversation_via_page(page, resolved_chat_id)
+                    return ConversationDetail.model_validate(payload)
+                finally:
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception as exc:
+                        logger.warning("Unable to persist ChatGPT storage state: %s", exc)
+                    await self._release_page(page, resolved_chat_id)
 
     def _load_session_cookie(self) -> str:
         cookie_value = (self.session_cookie or "").strip()
@@ -275,6 +296,12 @@ class ChatGptClient(AbstractClient):
             return None
         raise ValueError("CHATGPT_SESSION_COOKIE mancante o vuoto")
 
+    def _warm_page_session(self) -> dict[str, Any]:
+        return {
+            "storage_state_path": self.storage_state_path,
+            "cookies": self._load_session_auth()["browser_cookies"],
+        }
+
     def _read_persisted_session_auth(self) -> Optional[dict[str, Any]]:
         raw_content = self._read_text_file(self.cookie_path)
         if not raw_content:
@@ -416,7 +443,7 @@ class ChatGptClient(AbstractClient):
         if self.workspace_name:
             try:
                 await self._select_workspace_by_name(page, self.workspace_name)
-                await page.wait_for_timeout(self.POST_RECOVERY_WAIT_MS)
+                await self._wait_for_selector_ready(page, self.PROMPT_SELECTOR, self.PROMPT_WAIT_TIMEOUT_MS)
                 return
             except Exception as exc:
                 logger.warning("Configured workspace selection failed: %s", exc)
@@ -431,7 +458,7 @@ class ChatGptClient(AbstractClient):
             if "deactivated" in text:
                 continue
             await option.click()
-            await page.wait_for_timeout(self.POST_RECOVERY_WAIT_MS)
+            await self._wait_for_selector_ready(page, self.PROMPT_SELECTOR, self.PROMPT_WAIT_TIMEOUT_MS)
             return
 
         raise Exception(
@@ -441,15 +468,14 @@ class ChatGptClient(AbstractClient):
     async def _focus_prompt_input(self, page) -> None:
         logger.info("Focusing prompt input via shortcut ControlOrMeta+Shift+O")
         await page.keyboard.press("ControlOrMeta+Shift+O")
-        await page.wait_for_timeout(self.PROMPT_SHORTCUT_WAIT_MS)
+        if not await self._wait_for_focus(page, self.PROMPT_SELECTOR, self.PROMPT_SHORTCUT_WAIT_MS):
+            logger.info("Prompt input focus not confirmed within %sms; continuing", self.PROMPT_SHORTCUT_WAIT_MS)
 
     async def _type_into_focused_input(self, page, content: str) -> None:
-        safe_content = self._sanitize_message(content)
-        await page.keyboard.type(safe_content)
+        await self._type_lines(page, content, page.keyboard.type)
 
     async def _paste_into_focused_input(self, page, content: str) -> None:
-        safe_content = self._sanitize_message(content)
-        await page.keyboard.insert_text(safe_content)
+        await self._insert_message(page, self.PROMPT_SELECTOR, content, focus=False)
 
     async def _raise_input_timeout(self, page, original_exception: Exception) -> None:
         screenshot_path = await self._capture_debug_screenshot(page, "input-timeout")
@@ -522,17 +548,38 @@ class ChatGptClient(AbstractClient):
         logger.info("Clicked 'Skip' in apps-at-work onboarding")
         return True
 
+    async def _fetch_conversation_direct(self, chat_id: str, session_auth: dict[str, Any]) -> Optional[dict]:
+        """
+        Legge /backend-api/conversation/{id} senza browser: l'access token arriva da
+        /api/auth/session con i cookie di sessione. Le conversazioni ancora in generazione
+        o con immagini restano al browser, che ne attende completamento e download.
+        """
+        cookies = {
+            name: value
+            for name, value in self._read_storage_state_cookies(self.storage_state_path, "chatgpt.com").items()
+            if not name.startswith("__Secure-next-auth.session-token")
+        }
+        cookies.update({cookie["name"]: cookie["value"] for cookie in session_auth["browser_cookies"]})
+        cookie_header = self._format_cookie_header(cookies)
+
+        session_payload = await self._fetch_json_direct("GET", self.SESSION_API_URL, headers={"Cookie": cookie_header})
+        access_token = session_payload.get("accessToken") if isinstance(session_payload, dict) else None
+        if not access_token:
+            return None
+
+        payload = await self._fetch_json_direct(
+            "GET",
+            self.CONVERSATION_API_URL.format(chat_id=chat_id),
+            headers=self._auth_headers(access_token, cookie_header),
+        )
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("async_status") is not None or self._conversation_has_image_parts(payload):
+            return None
+        return payload
+
     async def _fetch_conversation_via_browser(self, chat_id: str, session_auth: dict[str, Any]) -> dict:
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-            context = await browser.new_context(**context_options)
-            await context.add_cookies(session_auth["browser_cookies"])
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
+        async with self._open_page(self.storage_state_path, session_auth["browser_cookies"]) as (context, page):
             conversation_payload = await self._fetch_conversation_via_page(page, chat_id)
 
             try:
@@ -540,7 +587,6 @@ class ChatGptClient(AbstractClient):
             except Exception as exc:
                 logger.warning("Unable to persist ChatGPT storage state: %s", exc)
             await page.close()
-            await context.close()
 
         return conversation_payload
 
@@ -552,21 +598,45 @@ class ChatGptClient(AbstractClient):
         type_input: bool,
     ) -> str:
         url = f"https://chatgpt.com/c/{chat_id}" if chat_id else "https://chatgpt.com/"
-        await self._open_chatgpt_page(page, url)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=4_000)
-        except Exception:
-            logger.info("Network idle not reached quickly; continuing anyway")
-        await page.wait_for_timeout(self.POST_NAVIGATION_WAIT_MS)
-        await self._ensure_workspace_active(page)
+        async with self._timed_step("navigate"):
+            await self._open_chatgpt_page(page, url, reuse_current=True)
 
-        if self.workspace_name:
-            logger.info("Workspace configured; selecting workspace by name: %s", self.workspace_name)
-            await self._select_workspace_by_name(page, self.workspace_name)
-            await page.wait_for_timeout(self.POST_RECOVERY_WAIT_MS)
+        async with self._timed_step("prompt_ready"):
+            if not await self._wait_for_selector_ready(page, self.PROMPT_SELECTOR, self.PROMPT_WAIT_TIMEOUT_MS):
+                logger.info("Prompt input not visible quickly; checking workspace state")
+            await self._ensure_workspace_active(page)
 
-        await self._focus_prompt_input(page)
+            if self.workspace_name:
+                logger.info("Workspace configured; selecting workspace by name: %s", self.workspace_name)
+                await self._select_workspace_by_name(page, self.workspace_name)
+                await self._wait_for_selector_ready(page, self.PROMPT_SELECTOR, self.PROMPT_WAIT_TIMEOUT_MS)
 
+            await self._focus_prompt_input(page)
+
+        async with self._timed_step("input"):
+            await self._fill_prompt_input(page, message, type_input)
+
+        stream_started = self._watch_page_event(page, "response", self._is_conversation_stream_response)
+        self._mark_prompt_submitted()
+        await page.keyboard.press("Enter")
+        logger.info("Prompt submitted; waiting for conversation URL")
+
+        async with self._timed_step("conversation_url"):
+            if not await self._wait_for_url_match(page, "**/c/**", self.WAIT_FOR_URL_TIMEOUT_MS):
+                logger.info("Conversation URL not detected within timeout; continuing")
+
+        async with self._timed_step("submit_ack"):
+            if await self._wait_for_signal(stream_started, self.POST_SUBMIT_WAIT_MS) is None:
+                logger.info("Conversation stream not observed within %sms; continuing", self.POST_SUBMIT_WAIT_MS)
+
+        current_url = page.url or ""
+        logger.info("Current page URL after submit: %s", current_url)
+
+        slug = self._extract_slug_from_url(current_url if current_url else url)
+        logger.info("ChatGPT submit completed (chat_id=%s)", slug)
+        return slug
+
+    async def _fill_prompt_input(self, page, message: str, type_input: bool) -> None:  # noqa: ANN001
         if type_input:
             logger.info("Typing prompt content in textarea")
             try:
@@ -598,26 +668,80 @@ class ChatGptClient(AbstractClient):
                         f"Screenshot creato: {screenshot_path}."
                     ) from retry_exc
 
-        await page.keyboard.press("Enter")
-        logger.info("Prompt submitted; waiting for conversation URL")
-
+    def _extract_stream_deltas(self, state: dict[str, Any], event_name: str, data: str) -> list[str]:
+        """
+        Gestisce sia il formato delta (`{"p", "o", "v"}`, con `{"v"}` che prosegue l'ultima
+        operazione e `o=patch` che ne raggruppa piu' d'una) sia il formato legacy con il
+        messaggio completo a ogni evento.
+        """
+        if data == "[DONE]":
+            return []
         try:
-            await page.wait_for_url("**/c/**", timeout=self.WAIT_FOR_URL_TIMEOUT_MS)
-        except Exception:
-            logger.info("Conversation URL not detected within timeout; continuing")
-
-        logger.info("Waiting %sms before continuing after submit", self.POST_SUBMIT_WAIT_MS)
-        await page.wait_for_timeout(self.POST_SUBMIT_WAIT_MS)
+            payload = json.loads(data)
+        except ValueError:
+            return []
+        if not isinstance(payload, dict):
+            return []
+
+        if isinstance(payload.get("message"), dict) and "v" not in payload:
+            message = payload["message"]
+            if not self._is_assistant_text_message(message):
+                return []
+            parts = message.get("content", {}).get("parts") or []
+            return self._diff_stream_text(state, parts[0] if parts and isinstance(parts[0], str) else "")
+
+        if "p" not in payload and "o" not in payload:
+            operations = [{"p": state.get("path"), "o": state.get("operation"), "v": payload.get("v")}]
+        elif payload.get("o") == "patch" and isinstance(payload.get("v"), list):
+            operations = [operation for operation in payload["v"] if isinstance(operation, dict)]
+        else:
+            operations = [payload]
+            state["path"] = payload.get("p")
+            state["operation"] = payload.get("o")
+
+        deltas = []
+        for operation in operations:
+            path = operation.get("p")
+            value = operation.get("v")
+            if path == "" and operation.get("o") == "add" and isinstance(value, dict):
+                message = value.get("message")
+                state["assistant"] = isinstance(message, dict) and self._is_assistant_text_message(message)
+                continue
+            if (
+                state.get("assistant")
+                and path == self.STREAM_TEXT_PATH
+                and operation.get("o") == "append"
+                and isinstance(value, str)
+            ):
+                deltas.append(value)
+        return deltas
 
-        current_url = page.url or ""
-        logger.info("Current page URL after submit: %s", current_url)
+    @staticmethod
+    def _is_assistant_text_message(message: dict[str, Any]) -> bool:
+        author = message.get("author") if isinstance(message.get("author"), dict) else {}
+        content = message.get("content") if isinstance(message.get("content"), dict) else {}
+        return author.get("role") == "assistant" and content.get("content_type") == "text"
 
-        slug = self._extract_slug_from_url(current_url if current_url else url)
-        logger.info("ChatGPT submit completed (chat_id=%s)", slug)
-        return slug
+    @staticmethod
+    def _is_conversation_stream_response(response) -> bool:  # noqa: ANN001
+        """True per la risposta (streaming) della POST che invia il prompt."""
+        request = getattr(response, "request", None)
+        if getattr(request, "method", "POST") != "POST":
+            return False
+        path = str(getattr(response, "url", "")).split("?", 1)[0].rstrip("/")
+        return path.endswith(("/backend-api/f/conversation", "/backend-api/conversation"))
 
-    async def _open_chatgpt_page(self, page, url: str, timeout: Optional[int] = None) -> None:  # noqa: ANN001
+    async def _open_chatgpt_page(
+        self,
+        page,
+        url: str,
+        timeout: Optional[int] = None,
+        reuse_current: bool = False,
+    ) -> None:  # noqa: ANN001
         navigation_timeout = timeout or self.CHATGPT_NAVIGATION_TIMEOUT_MS
+        if reuse_current and self._is_page_at_url(page, url):
+            logger.info("ChatGPT page already open on %s; skipping navigation", url)
+            return
 
         async def _navigate() -> None:
             logger.info("Opening ChatGPT page: %s", url)
@@ -647,70 +771,61 @@ class ChatGptClient(AbstractClient):
         await _navigate_with_logging()
 
     async def _fetch_conversation_via_page(self, page, chat_id: str) -> dict:  # noqa: ANN001
-        conversation_url = f"https://chatgpt.com/backend-api/conversation/{chat_id}"
+        conversation_url = self.CONVERSATION_API_URL.format(chat_id=chat_id)
         url = f"https://chatgpt.com/c/{chat_id}"
         image_download_url = ""
-        last_image_seen_at = 0.0
+        image_seen = asyncio.Event()
 
         async def handle_response(response):
-            nonlocal image_download_url, last_image_seen_at
+            nonlocal image_download_url
             try:
                 if "/backend-api/files/download/" in response.url and f"conversation_id={chat_id}" in response.url:
                     payload = await response.json()
                     if isinstance(payload, dict) and payload.get("download_url"):
                         image_download_url = payload["download_url"]
-                        last_image_seen_at = time.monotonic()
+                        image_seen.set()
             except Exception as exc:
                 logger.warning("Error parsing ChatGPT response payload: %s", exc)
 
-        page.on("response", handle_response)
-
-        conversation_payload = await self._await_conversation_payload(page, conversation_url, url, use_reload=False)
-        async_status_waited_ms = 0
-
-        while conversation_payload.get("async_status") is not None:
-            if async_status_waited_ms >= self.ASYNC_STATUS_POLL_TIMEOUT_MS:
-                raise TimeoutError("Risposta conversazione ChatGPT ancora in caricamento dopo 60 secondi")
+        with self._page_listeners(page, response=handle_response):
+            conversation_payload = await self._await_conversation_payload(page, conversation_url, url, use_reload=False)
+            async_status_waited_ms = 0
 
-            logger.info(
-                "Conversation async_status still set (%s); waiting %sms before retry",
-                conversation_payload.get("async_status"),
-                self.ASYNC_STATUS_POLL_INTERVAL_MS,
-            )
-            await page.wait_for_timeout(self.ASYNC_STATUS_POLL_INTERVAL_MS)
-            async_status_waited_ms += self.ASYNC_STATUS_POLL_INTERVAL_MS
-            conversation_payload = await self._await_conversation_payload(page, conversation_url, url, use_reload=True)
+            while conversation_payload.get("async_status") is not None:
+                if async_status_waited_ms >= self.ASYNC_STATUS_POLL_TIMEOUT_MS:
+                    raise TimeoutError("Risposta conversazione ChatGPT ancora in caricamento dopo 60 secondi")
 
-        await page.wait_for_timeout(self.IMAGE_DOWNLOAD_GRACE_PERIOD_MS)
+                logger.info(
+                    "Conversation async_status still set (%s); waiting %sms before retry",
+                    conversation_payload.get("async_status"),
+                    self.ASYNC_STATUS_POLL_INTERVAL_MS,
+                )
+                await page.wait_for_timeout(self.ASYNC_STATUS_POLL_INTERVAL_MS)
+                async_status_waited_ms += self.ASYNC_STATUS_POLL_INTERVAL_MS
+                conversation_payload = await self._await_conversation_payload(
+                    page,
+                    conversation_url,
+                    url,
+                    use_reload=True,
+                )
 
-        if last_image_seen_at > 0:
-            while True:
-                elapsed = time.monotonic() - last_image_seen_at
-                if elapsed >= 2.0:
-                    break
-                await page.wait_for_timeout(200)
+            # Si attende il download dell'immagine solo se la conversazione ne contiene una
+            if image_seen.is_set() or self._conversation_has_image_parts(conversation_payload):
+                await self._await_image_downloads(image_seen)
 
-        if image_download_url:
-            initial_image_download_url = image_download_url
-            image_download_url = ""
-            last_image_seen_at = 0.0
-            await page.wait_for_timeout(self.IMAGE_DOWNLOAD_GRACE_PERIOD_MS)
-            try:
-                await page.reload(wait_until="domcontentloaded", timeout=self.CONVERSATION_PAGE_LOAD_TIMEOUT_MS)
-                await page.wait_for_load_state("domcontentloaded", timeout=self.CONVERSATION_PAGE_LOAD_TIMEOUT_MS)
-            except Exception:
-                logger.info("Conversation page reload did not reach domcontentloaded quickly; continuing")
-            await page.wait_for_timeout(self.IMAGE_DOWNLOAD_GRACE_PERIOD_MS)
-
-            if last_image_seen_at > 0:
-                while True:
-                    elapsed = time.monotonic() - last_image_seen_at
-                    if elapsed >= 2.0:
-                        break
-                    await page.wait_for_timeout(200)
+            if image_download_url:
+                initial_image_download_url = image_download_url
+                image_download_url = ""
+                image_seen.clear()
+                try:
+                    await page.reload(wait_until="domcontentloaded", timeout=self.CONVERSATION_PAGE_LOAD_TIMEOUT_MS)
+                    await page.wait_for_load_state("domcontentloaded", timeout=self.CONVERSATION_PAGE_LOAD_TIMEOUT_MS)
+                except Exception:
+                    logger.info("Conversation page reload did not reach domcontentloaded quickly; continuing")
+                await self._await_image_downloads(image_seen)
 
-            if not image_download_url:
-                image_download_url = initial_image_download_url
+                if not image_download_url:
+                    image_download_url = initial_image_download_url
 
         if not conversation_payload:
             raise Exception("Risposta conversazione non intercettata")
@@ -718,6 +833,35 @@ class ChatGptClient(AbstractClient):
             conversation_payload["image_download_url"] = image_download_url
         return conversation_payload
 
+    async def _await_image_downloads(self, image_seen: asyncio.Event) -> bool:
+        """
+        Attende il primo download immagine (al massimo IMAGE_DOWNLOAD_GRACE_PERIOD_MS), poi
+        finche' non ne arrivano altri per IMAGE_DOWNLOAD_SETTLE_MS.
+        """
+        if not await self._wait_for_signal(image_seen.wait(), self.IMAGE_DOWNLOAD_GRACE_PERIOD_MS):
+            logger.info("No image download observed within %sms", self.IMAGE_DOWNLOAD_GRACE_PERIOD_MS)
+            return False
+
+        while True:
+            image_seen.clear()
+            if not await self._wait_for_signal(image_seen.wait(), self.IMAGE_DOWNLOAD_SETTLE_MS):
+                return True
+
+    @staticmethod
+    def _conversation_has_image_parts(payload: dict) -> bool:
+        mapping = payload.get("mapping") if isinstance(payload, dict) else None
+        if not isinstance(mapping, dict):
+            return False
+
+        for node in mapping.values():
+            message = node.get("message") if isinstance(node, dict) else None
+            content = message.get("content") if isinstance(message, dict) else None
+            parts = content.get("parts") if isinstance(content, dict) else None
+            for part in parts or []:
+                if isinstance(part, dict) and part.get("content_type") == "image_asset_pointer":
+                    return True
+        return False
+
     @staticmethod
     def _is_matching_conversation_response(response_url: str, conversation_url: str) -> bool:
         normalized_response_url = response_url.split("?", 1)[0].rstrip("/")
@@ -745,8 +889,12 @@ class ChatGptClient(AbstractClient):
         conversation_response = await conversation_response_info.value
         return await conversation_response.json()
 
-    def proxy_download(self, download_url: str) -> tuple[bytes, int, str, str]:
-        """Proxy download usando il cookie ChatGPT in header Cookie."""
+    async def proxy_download(self, download_url: str, request_headers: Optional[dict[str, str]] = None) -> DownloadStream:
+        """
+        Proxy download usando il cookie ChatGPT in header Cookie. Il body non viene letto:
+        la response resta aperta e va consumata (e chiusa) tramite il DownloadStream.
+        Range e header condizionali del chiamante vengono inoltrati a monte.
+        """
         if not download_url:
             raise ValueError("download_url mancante")
         if not download_url.startswith("https://chatgpt.com/"):
@@ -754,6 +902,7 @@ class ChatGptClient(AbstractClient):
 
         session_auth = self._load_session_auth()
         headers = {
+            "Accept-Encoding": "identity",
             "Cookie": session_auth["cookie_header"],
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -762,14 +911,26 @@ class ChatGptClient(AbstractClient):
             ),
         }
 
-        with requests.Session() as session:
-            response = self._requests_request(session, "GET", download_url, headers=headers, timeout=60)
+        for name, value in (request_headers or {}).items():
+            if value and name.lower() in self.DOWNLOAD_FORWARDED_REQUEST_HEADERS:
+                headers[name] = value
+
+        response = await self._http_stream("GET", download_url, headers=headers, timeout=60)
+        # 416 (Range non soddisfacibile) e' una risposta valida da restituire al chiamante
+        if response.status_code >= 400 and response.status_code != 416:
+            await response.aclose()
             response.raise_for_status()
-            content = response.content
-            status_code = response.status_code
-            content_type = response.headers.get("content-type", "application/octet-stream")
-            content_disposition = response.headers.get("content-disposition", "")
-            return content, status_code, content_type, content_disposition
+
+        return DownloadStream(
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/octet-stream"),
+            headers={
+                name: response.headers[name]
+                for name in self.DOWNLOAD_FORWARDED_RESPONSE_HEADERS
+                if name in response.headers
+            },
+            response=response,
+        )
 
     @staticmethod
     def _auth_headers(session_cookie: str, cookie_header: str = "", account_id: str = "") -> dict:
@@ -4,11 +4,18 @@ import os
 from typing import Any, Literal, Optional
 from urllib.parse import urlparse
 
-from browserforge.fingerprints import Screen
-from camoufox.async_api import AsyncCamoufox
 from injector import inject
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.deepseek_response import DeepseekResponse
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
@@ -16,10 +23,16 @@ from polychat.parser.auth_payload_parser import AuthPayloadParser
 class DeepseekClient(AbstractClient):
     """Client per interagire con Deepseek tramite browser + polling history API."""
 
+    PROVIDER_NAME = "deepseek"
+    WARM_PAGE_URL = "https://chat.deepseek.com/"
+    STREAM_URL_MARKERS = ("/api/v0/chat/completion",)
+    ALLOWED_URL_PATTERNS = ("/api/v0/",)
     BASE_URL = "https://chat.deepseek.com/"
     CHAT_URL_TEMPLATE = "https://chat.deepseek.com/a/chat/s/{chat_id}"
     HISTORY_API_URL = "https://chat.deepseek.com/api/v0/chat/history_messages?chat_session_id={chat_id}"
     INPUT_SELECTOR = "textarea"
+    WAIT_FOR_URL_TIMEOUT_MS = 20_000
+    STATUS_READY_WAIT_MS = 1_000
     POLL_INTERVAL_SECONDS = 2
     MAX_WAIT_SECONDS = 120
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
@@ -31,12 +44,31 @@ class DeepseekClient(AbstractClient):
         session_dir: str,
         headless: bool | Literal["virtual"] = False,
         user_token_json: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "deepseek")
         self.storage_state_path = os.path.join(self.session_dir, "deepseek_state.json")
         self.user_token_path = os.path.join(self.session_dir, "deepseek_user_token.json")
-        self.headless = headless
         self.user_token_json = user_token_json
         os.makedirs(self.session_dir, exist_ok=True)
 
@@ -44,164 +76,181 @@ class DeepseekClient(AbstractClient):
         token_json = self._resolve_user_token_json_from_login_content(content)
         self._write_text_file(self.user_token_path, token_json)
 
-        constraints = Screen(max_width=1920, max_height=1080)
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
+        async with self._open_context(init_script=self._build_user_token_init_script(token_json)) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
             await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
-            await self._set_user_token(page, token_json)
-            await page.reload(wait_until="domcontentloaded", timeout=20_000)
             await page.wait_for_timeout(1_500)
             await context.storage_state(path=self.storage_state_path)
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> DeepseekResponse:
         token_json = self._load_user_token_json()
 
         async def _attempt() -> DeepseekResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-            async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-
-                url = self.CHAT_URL_TEMPLATE.format(chat_id=chat_id) if chat_id else self.BASE_URL
-                await self._goto(page, url, wait_until="domcontentloaded", timeout=20_000)
-                await self._set_user_token(page, token_json)
-                await page.reload(wait_until="domcontentloaded", timeout=20_000)
-
-                if self._is_sign_in_url(page.url or ""):
-                    raise PermissionError("Deepseek login required: redirected to /sign_in")
-
-                await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-                await page.click(self.INPUT_SELECTOR)
-
-                if type_input:
-                    await self._type_message(page, self.INPUT_SELECTOR, message)
-                else:
-                    await self._paste_message(page, self.INPUT_SELECTOR, message)
-
-                await page.keyboard.press("Enter")
-
-                try:
-                    await page.wait_for_url("**/a/chat/s/**", timeout=20_000)
-                except Exception:
-                    pass
-
-                await page.wait_for_timeout(1_500)
-                extracted_chat_id = self._extract_chat_id_from_url(page.url or "")
-                if not extracted_chat_id:
-                    raise ValueError("Chat ID Deepseek non trovato nella URL dopo l'invio del messaggio")
+            async with self._timed_operation("ask"), self._open_page(
+                self.storage_state_path,
+                init_script=self._build_user_token_init_script(token_json),
+                chat_id=chat_id,
+            ) as (context, page):
+                extracted_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
 
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
 
-                await page.close()
-                await context.close()
+                await self._release_page(page, extracted_chat_id)
                 return DeepseekResponse(chat_id=extracted_chat_id, message="")
 
         return await _attempt()
 
     async def get_conversation(self, chat_id: str) -> DeepseekResponse:
-        if not chat_id:
-            raise ValueError("chat_id mancante")
-
-        token_json = self._load_user_token_json()
-        constraints = Screen(max_width=1920, max_height=1080)
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
 
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
+            token_json = self._load_user_token_json()
+            response = await self._poll_conversation_direct(chat_id, token_json)
+            if response is not None:
+                return response
+
+            async with self._open_page(
+                self.storage_state_path,
+                init_script=self._build_user_token_init_script(token_json),
+            ) as (context, page):
+                await self._goto(
+                    page,
+                    self.CHAT_URL_TEMPLATE.format(chat_id=chat_id),
+                    wait_until="domcontentloaded",
+                    timeout=20_000,
+                )
+                response = await self._poll_conversation_from_page(page, chat_id)
 
-            context = await browser.new_context(**context_options)
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
+                try:
+                    await context.storage_state(path=self.storage_state_path)
+                except Exception:
+                    pass
 
-            await self._goto(page, self.CHAT_URL_TEMPLATE.format(chat_id=chat_id), wait_until="domcontentloaded", timeout=20_000)
-            await self._set_user_token(page, token_json)
-            await page.reload(wait_until="domcontentloaded", timeout=20_000)
+                await page.close()
 
-            last_message = ""
-            elapsed = 0
+                return response
 
-            while elapsed < self.MAX_WAIT_SECONDS:
-                payload = await page.evaluate(
-                    """async (url) => {
-                        const response = await fetch(url, { credentials: 'include' });
-                        return await response.json();
-                    }""",
-                    self.HISTORY_API_URL.format(chat_id=chat_id),
-                )
+    async def _poll_conversation_direct(self, chat_id: str, token_json: str) -> Optional[DeepseekResponse]:
+        """Polling della history API via HTTP; None se la sessione va ripristinata nel browser."""
+        cookies = self._read_storage_state_cookies(self.storage_state_path, "deepseek.com")
+        headers = {"Authorization": f"Bearer {self._extract_user_token(token_json)}"}
+        if cookies:
+            headers["Cookie"] = self._format_cookie_header(cookies)
 
-                message, done = self._extract_assistant_message(payload)
-                if message:
-                    last_message = message
-                if message and done:
-                    break
+        last_message = ""
+        elapsed = 0
 
-                await asyncio.sleep(self.POLL_INTERVAL_SECONDS)
-                elapsed += self.POLL_INTERVAL_SECONDS
+        while elapsed < self.MAX_WAIT_SECONDS:
+            payload = await self._fetch_json_direct("GET", self.HISTORY_API_URL.format(chat_id=chat_id), headers)
+            # Con token scaduto l'API risponde 200 con un `code` di errore applicativo
+            if not isinstance(payload, dict) or payload.get("code") not in (None, 0):
+                return None
 
-            if not last_message:
-                raise TimeoutError(f"Timeout waiting for Deepseek chat response (chat_id={chat_id})")
+            message, done = self._extract_assistant_message(payload)
+            if message:
+                last_message = message
+            if message and done:
+                return DeepseekResponse(chat_id=chat_id, message=message)
 
-            try:
-                await context.storage_state(path=self.storage_state_path)
-            except Exception:
-                pass
+            await asyncio.sleep(self.POLL_INTERVAL_SECONDS)
+            elapsed += self.POLL_INTERVAL_SECONDS
 
-            await page.close()
-            await context.close()
+        if not last_message:
+            raise TimeoutError(f"Timeout waiting for Deepseek chat response (chat_id={chat_id})")
 
-            return DeepseekResponse(chat_id=chat_id, message=last_message)
+        return DeepseekResponse(chat_id=chat_id, message=last_message)
 
     async def _submit_prompt(
         self,
         page,
-        token_json: str,
         message: str,
         chat_id: Optional[str],
         type_input: bool,
     ) -> str:
         url = self.CHAT_URL_TEMPLATE.format(chat_id=chat_id) if chat_id else self.BASE_URL
-        await self._goto(page, url, wait_until="domcontentloaded", timeout=20_000)
-        await self._set_user_token(page, token_json)
-        await page.reload(wait_until="domcontentloaded", timeout=20_000)
+        async with self._timed_step("navigate"):
+            await self._goto(page, url, reuse_current=True, wait_until="domcontentloaded", timeout=20_000)
 
         if self._is_sign_in_url(page.url or ""):
             raise PermissionError("Deepseek login required: redirected to /sign_in")
 
-        await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-        await page.click(self.INPUT_SELECTOR)
+        async with self._timed_step("prompt_ready"):
+            await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
+            await page.click(self.INPUT_SELECTOR)
 
-        if type_input:
-            await self._type_message(page, self.INPUT_SELECTOR, message)
-        else:
-            await self._paste_message(page, self.INPUT_SELECTOR, message)
+        async with self._timed_step("input"):
+            if type_input:
+                await self._type_message(page, self.INPUT_SELECTOR, message)
+            else:
+                await self._insert_message(page, self.INPUT_SELECTOR, message)
 
+        self._mark_prompt_submitted()
         await page.keyboard.press("Enter")
 
-        try:
-            await page.wait_for_url("**/a/chat/s/**", timeout=20_000)
-        except Exception:
-            pass
-
-        await page.wait_for_timeout(1_500)
+        async with self._timed_step("conversation_url"):
+            await self._wait_for_url_match(page, "**/a/chat/s/**", self.WAIT_FOR_URL_TIMEOUT_MS)
         extracted_chat_id = self._extract_chat_id_from_url(page.url or "")
         if not extracted_chat_id:
             raise ValueError("Chat ID Deepseek non trovato nella URL dopo l'invio del messaggio")
 
         return extracted_chat_id
 
+    def _extract_stream_deltas(self, state: dict[str, Any], event_name: str, data: str) -> list[str]:
+        """
+        Lo stream Deepseek invia uno snapshot iniziale (`{"v": {"response": ...}}`) e poi operazioni
+        `{"p", "o", "v"}`; un `{"v": "..."}` senza path prosegue l'ultimo path. Solo i fragment
+        di tipo RESPONSE sono testo della risposta (THINK e' il ragionamento).
+        """
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return []
+        if not isinstance(payload, dict):
+            return []
+
+        value = payload.get("v")
+        fragment_types = state.setdefault("fragment_types", [])
+        if "p" not in payload and isinstance(value, dict):
+            response = value.get("response") if isinstance(value.get("response"), dict) else {}
+            return self._collect_response_fragments(fragment_types, response.get("fragments"))
+        if "p" in payload:
+            state["path"] = payload["p"]
+
+        path = str(state.get("path") or "")
+        if path == "response/fragments":
+            return self._collect_response_fragments(fragment_types, value)
+        if not isinstance(value, str):
+            return []
+        if path == "response/content":
+            return [value]
+        parts = path.split("/")
+        if len(parts) == 4 and parts[:2] == ["response", "fragments"] and parts[3] == "content":
+            try:
+                fragment_type = fragment_types[int(parts[2])]
+            except (ValueError, IndexError):
+                return []
+            return [value] if fragment_type == "RESPONSE" else []
+        return []
+
+    @staticmethod
+    def _collect_response_fragments(fragment_types: list[Optional[str]], fragments: Any) -> list[str]:
+        deltas = []
+        for fragment in fragments if isinstance(fragments, list) else []:
+            if not isinstance(fragment, dict):
+                continue
+            fragment_types.append(fragment.get("type"))
+            content = fragment.get("content")
+            if fragment.get("type") == "RESPONSE" and isinstance(content, str):
+                deltas.append(content)
+        return deltas
+
     async def _poll_conversation_from_page(self, page, chat_id: str) -> DeepseekResponse:  # noqa: ANN001
         last_message = ""
         elapsed = 0
@@ -236,82 +285,78 @@ class DeepseekClient(AbstractClient):
         type_input: bool = True,
     ) -> DeepseekResponse:
         token_json = self._load_user_token_json()
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-
+        async with self._timed_operation("ask_and_wait"), self._open_page(
+            self.storage_state_path,
+            init_script=self._build_user_token_init_script(token_json),
+            chat_id=chat_id,
+        ) as (context, page):
+            resolved_chat_id = None
             try:
-                resolved_chat_id = await self._submit_prompt(page, token_json, message, chat_id, type_input)
-                await self._wait_for_network_to_settle(
-                    page,
-                    timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
-                    check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
-                )
-                response = await self._poll_conversation_from_page(page, resolved_chat_id)
+                resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
+                async with self._timed_step("generation"):
+                    await self._wait_for_network_to_settle(
+                        page,
+                        timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                        check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                    )
+                async with self._timed_step("fetch_conversation"):
+                    response = await self._poll_conversation_from_page(page, resolved_chat_id)
             finally:
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
-                await page.close()
-                await context.close()
+                await self._release_page(page, resolved_chat_id)
 
         return response
 
     def logout(self) -> None:
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        try:
-            token_json = self._load_user_token_json()
-            constraints = Screen(max_width=1920, max_height=1080)
-            async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
-                await self._set_user_token(page, token_json)
-                await page.reload(wait_until="domcontentloaded", timeout=20_000)
-                await page.wait_for_timeout(1_000)
-
-                if self._is_sign_in_url(page.url or ""):
-                    is_logged_in = False
-                else:
-                    is_logged_in = True
-
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
+        async with self._timed_operation("status"):
+            try:
+                token_json = self._load_user_token_json()
+                async with self._open_page(
+                    self.storage_state_path,
+                    init_script=self._build_user_token_init_script(token_json),
+                ) as (context, page):
+                    await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
+                    # Ready quando compare l'input (loggato) o la SPA redirige su /sign_in
+                    await self._wait_for_page_condition(
+                        page,
+                        "selector => location.pathname.startsWith('/sign_in') || !!document.querySelector(selector)",
+                        self.INPUT_SELECTOR,
+                        self.STATUS_READY_WAIT_MS,
+                    )
+
+                    if self._is_sign_in_url(page.url or ""):
+                        is_logged_in = False
+                    else:
+                        is_logged_in = True
+
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "deepseek",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"Status check failed: {exc}",
+                }
 
-                await page.close()
-                await context.close()
-        except Exception as exc:
             return {
                 "provider": "deepseek",
-                "is_available": False,
-                "is_logged_in": False,
-                "detail": f"Status check failed: {exc}",
+                "is_available": True,
+                "is_logged_in": is_logged_in,
+                "detail": None if is_logged_in else "Redirected to /sign_in",
             }
 
-        return {
-            "provider": "deepseek",
-            "is_available": True,
-            "is_logged_in": is_logged_in,
-            "detail": None if is_logged_in else "Redirected to /sign_in",
-        }
-
     @staticmethod
     def _extract_chat_id_from_url(url: str) -> str:
         if not url:
@@ -378,6 +423,14 @@ class DeepseekClient(AbstractClient):
             raise ValueError("DEEPSEEK_USER_TOKEN_JSON non è un JSON valido") from exc
         return json.dumps(parsed, ensure_ascii=False)
 
+    @staticmethod
+    def _extract_user_token(token_json: str) -> str:
+        """Il localStorage `userToken` e' `{"value": "<token>", ...}`; il token serve come Bearer."""
+        parsed = json.loads(token_json)
+        if isinstance(parsed, dict):
+            return str(parsed.get("value", ""))
+        return str(parsed)
+
     def _load_user_token_json(self) -> str:
         token_json = (self.user_token_json or "").strip()
         if token_json:
@@ -399,10 +452,18 @@ class DeepseekClient(AbstractClient):
 
         return self._validate_user_token_json(parsed.raw_text.strip())
 
-    async def _set_user_token(self, page, token_json: str) -> None:
-        await page.evaluate(
-            """(tokenValue) => {
-                window.localStorage.setItem('userToken', tokenValue);
-            }""",
-            token_json,
+    def _warm_page_session(self) -> dict[str, Any]:
+        return {
+            "storage_state_path": self.storage_state_path,
+            "init_script": self._build_user_token_init_script(self._load_user_token_json()),
+        }
+
+    @classmethod
+    def _build_user_token_init_script(cls, token_json: str) -> str:
+        """Script di init del context: il token e' in localStorage gia' alla prima navigazione."""
+        origin = cls.BASE_URL.rstrip("/")
+        return (
+            f"if (window.location.origin === {json.dumps(origin)}) {{\n"
+            f"    window.localStorage.setItem('userToken', {json.dumps(token_json)});\n"
+            "}"
         )
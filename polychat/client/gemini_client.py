@@ -4,11 +4,18 @@ import re
 from typing import Literal, Optional
 from urllib.parse import urlparse
 
-from browserforge.fingerprints import Screen
-from camoufox.async_api import AsyncCamoufox
 from injector import inject
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.gemini_response import GeminiResponse
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
@@ -16,9 +23,16 @@ from polychat.parser.auth_payload_parser import AuthPayloadParser
 class GeminiClient(AbstractClient):
     """Client per interagire con Gemini tramite automazione browser."""
 
+    PROVIDER_NAME = "gemini"
+    WARM_PAGE_URL = "https://gemini.google.com/app"
+    ALLOWED_URL_PATTERNS = ("/_/BardChatUi/data/",)
     BASE_URL = "https://gemini.google.com/app"
     BATCH_EXECUTE_PATH = "/_/BardChatUi/data/batchexecute"
     INPUT_SELECTOR = ".text-input-field"
+    INPUT_FOCUS_WAIT_MS = 1_000
+    WAIT_FOR_URL_TIMEOUT_MS = 15_000
+    STATUS_MARKER_WAIT_MS = 1_500
+    STATUS_MARKER = "Account Google:"
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
     COMPLETE_WAIT_CHECK_INTERVAL_SECONDS = 2.0
 
@@ -29,12 +43,31 @@ class GeminiClient(AbstractClient):
         headless: bool | Literal["virtual"] = False,
         cookie_1psid: str = "",
         cookie_1psidts: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "gemini")
         self.storage_state_path = os.path.join(self.session_dir, "gemini_state.json")
         self.cookies_path = os.path.join(self.session_dir, "gemini_cookies.json")
-        self.headless = headless
         self.cookie_1psid = cookie_1psid
         self.cookie_1psidts = cookie_1psidts
         os.makedirs(self.session_dir, exist_ok=True)
@@ -49,125 +82,85 @@ class GeminiClient(AbstractClient):
             },
         )
 
-        constraints = Screen(max_width=1920, max_height=1080)
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
-            await context.add_cookies(self._build_session_cookies(cookie_1psid, cookie_1psidts))
+        async with self._open_context(cookies=self._build_session_cookies(cookie_1psid, cookie_1psidts)) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
             await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
             await page.wait_for_timeout(1_500)
             await context.storage_state(path=self.storage_state_path)
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> GeminiResponse:
         cookie_1psid, cookie_1psidts = self._load_session_cookies()
 
         async def _attempt() -> GeminiResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-            async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                await context.add_cookies(self._build_session_cookies(cookie_1psid, cookie_1psidts))
-
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                url = f"{self.BASE_URL}/{chat_id}" if chat_id else self.BASE_URL
-                await self._goto(page, url, wait_until="domcontentloaded", timeout=20_000)
-
-                await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-                await page.click(self.INPUT_SELECTOR)
-                await page.wait_for_timeout(1_000)
-
-                if type_input:
-                    await page.keyboard.type(self._sanitize_message(message))
-                else:
-                    await page.keyboard.insert_text(self._sanitize_message(message))
-
-                await page.keyboard.press("Enter")
-                await page.wait_for_timeout(2_000)
-
-                try:
-                    await page.wait_for_url("**/app/**", timeout=15_000)
-                except Exception:
-                    pass
-
-                extracted_chat_id = self._extract_chat_id_from_url(page.url or "")
-                if not extracted_chat_id:
-                    raise ValueError("Chat ID Gemini non trovato nella URL dopo l'invio del messaggio")
+            async with self._timed_operation("ask"), self._open_page(
+                self.storage_state_path,
+                self._build_session_cookies(cookie_1psid, cookie_1psidts),
+                chat_id=chat_id,
+            ) as (context, page):
+                extracted_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
 
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
 
-                await page.close()
-                await context.close()
+                await self._release_page(page, extracted_chat_id)
 
                 return GeminiResponse(chat_id=extracted_chat_id, message="")
 
         return await _attempt()
 
     async def get_conversation(self, chat_id: str) -> GeminiResponse:
-        if not chat_id:
-            raise ValueError("chat_id mancante")
-
-        cookie_1psid, cookie_1psidts = self._load_session_cookies()
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            await context.add_cookies(self._build_session_cookies(cookie_1psid, cookie_1psidts))
-
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-            response_container_id = ""
-            response_received = asyncio.Event()
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
 
-            async def handle_response(response):
-                nonlocal response_container_id
-                if self.BATCH_EXECUTE_PATH not in (response.url or ""):
-                    return
+            cookie_1psid, cookie_1psidts = self._load_session_cookies()
+            async with self._open_page(
+                self.storage_state_path,
+                self._build_session_cookies(cookie_1psid, cookie_1psidts),
+            ) as (context, page):
+                response_container_id = ""
+                response_received = asyncio.Event()
+
+                async def handle_response(response):
+                    nonlocal response_container_id
+                    if self.BATCH_EXECUTE_PATH not in (response.url or ""):
+                        return
+
+                    try:
+                        content = await response.text()
+                    except Exception:
+                        return
+
+                    extracted = self._extract_response_container_id(content, chat_id)
+                    if extracted:
+                        response_container_id = extracted
+                        response_received.set()
+
+                with self._page_listeners(page, response=handle_response):
+                    await self._goto(page, f"{self.BASE_URL}/{chat_id}", wait_until="domcontentloaded", timeout=20_000)
+
+                    try:
+                        await asyncio.wait_for(response_received.wait(), timeout=45)
+                    except asyncio.TimeoutError as exc:
+                        raise TimeoutError("Timeout waiting for Gemini batchexecute response") from exc
+
+                    selector = f"#model-response-message-content{response_container_id}"
+                    await page.wait_for_selector(selector, state="visible", timeout=45_000)
+                    content = await page.inner_text(selector)
 
                 try:
-                    content = await response.text()
+                    await context.storage_state(path=self.storage_state_path)
                 except Exception:
-                    return
-
-                extracted = self._extract_response_container_id(content, chat_id)
-                if extracted:
-                    response_container_id = extracted
-                    response_received.set()
-
-            page.on("response", handle_response)
-            await self._goto(page, f"{self.BASE_URL}/{chat_id}", wait_until="domcontentloaded", timeout=20_000)
-
-            try:
-                await asyncio.wait_for(response_received.wait(), timeout=45)
-            except asyncio.TimeoutError as exc:
-                raise TimeoutError("Timeout waiting for Gemini batchexecute response") from exc
-
-            selector = f"#model-response-message-content{response_container_id}"
-            await page.wait_for_selector(selector, state="visible", timeout=45_000)
-            content = await page.inner_text(selector)
-
-            try:
-                await context.storage_state(path=self.storage_state_path)
-            except Exception:
-                pass
+                    pass
 
-            await page.close()
-            await context.close()
+                await page.close()
 
-        return GeminiResponse(chat_id=chat_id, message=(content or "").strip())
+            return GeminiResponse(chat_id=chat_id, message=(content or "").strip())
 
     async def _submit_prompt(
         self,
@@ -177,24 +170,25 @@ class GeminiClient(AbstractClient):
         type_input: bool,
     ) -> str:
         url = f"{self.BASE_URL}/{chat_id}" if chat_id else self.BASE_URL
-        await self._goto(page, url, wait_until="domcontentloaded", timeout=20_000)
+        async with self._timed_step("navigate"):
+            await self._goto(page, url, reuse_current=True, wait_until="domcontentloaded", timeout=20_000)
 
-        await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-        await page.click(self.INPUT_SELECTOR)
-        await page.wait_for_timeout(1_000)
+        async with self._timed_step("prompt_ready"):
+            await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
+            await page.click(self.INPUT_SELECTOR)
+            await self._wait_for_focus(page, self.INPUT_SELECTOR, self.INPUT_FOCUS_WAIT_MS)
 
-        if type_input:
-            await page.keyboard.type(self._sanitize_message(message))
-        else:
-            await page.keyboard.insert_text(self._sanitize_message(message))
+        async with self._timed_step("input"):
+            if type_input:
+                await self._type_lines(page, message, page.keyboard.type)
+            else:
+                await self._insert_message(page, self.INPUT_SELECTOR, message, focus=False)
 
+        self._mark_prompt_submitted()
         await page.keyboard.press("Enter")
-        await page.wait_for_timeout(2_000)
 
-        try:
-            await page.wait_for_url("**/app/**", timeout=15_000)
-        except Exception:
-            pass
+        async with self._timed_step("conversation_url"):
+            await self._wait_for_url_match(page, "**/app/**", self.WAIT_FOR_URL_TIMEOUT_MS)
 
         extracted_chat_id = self._extract_chat_id_from_url(page.url or "")
         if not extracted_chat_id:
@@ -221,17 +215,17 @@ class GeminiClient(AbstractClient):
                 response_container_id = extracted
                 response_received.set()
 
-        page.on("response", handle_response)
-        await self._goto(page, f"{self.BASE_URL}/{chat_id}", wait_until="domcontentloaded", timeout=20_000)
+        with self._page_listeners(page, response=handle_response):
+            await self._goto(page, f"{self.BASE_URL}/{chat_id}", wait_until="domcontentloaded", timeout=20_000)
 
-        try:
-            await asyncio.wait_for(response_received.wait(), timeout=45)
-        except asyncio.TimeoutError as exc:
-            raise TimeoutError("Timeout waiting for Gemini batchexecute response") from exc
+            try:
+                await asyncio.wait_for(response_received.wait(), timeout=45)
+            except asyncio.TimeoutError as exc:
+                raise TimeoutError("Timeout waiting for Gemini batchexecute response") from exc
 
-        selector = f"#model-response-message-content{response_container_id}"
-        await page.wait_for_selector(selector, state="visible", timeout=45_000)
-        return await page.inner_text(selector)
+            selector = f"#model-response-message-content{response_container_id}"
+            await page.wait_for_selector(selector, state="visible", timeout=45_000)
+            return await page.inner_text(selector)
 
     async def ask_and_wait(
         self,
@@ -240,79 +234,72 @@ class GeminiClient(AbstractClient):
         type_input: bool = True,
     ) -> GeminiResponse:
         cookie_1psid, cookie_1psidts = self._load_session_cookies()
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            await context.add_cookies(self._build_session_cookies(cookie_1psid, cookie_1psidts))
-
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-
+        async with self._timed_operation("ask_and_wait"), self._open_page(
+            self.storage_state_path,
+            self._build_session_cookies(cookie_1psid, cookie_1psidts),
+            chat_id=chat_id,
+        ) as (context, page):
+            resolved_chat_id = None
             try:
                 resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
-                await self._wait_for_network_to_settle(
-                    page,
-                    timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
-                    check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
-                )
-                content = await self._read_conversation_from_page(page, resolved_chat_id)
+                async with self._timed_step("generation"):
+                    await self._wait_for_network_to_settle(
+                        page,
+                        timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                        check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                    )
+                async with self._timed_step("fetch_conversation"):
+                    content = await self._read_conversation_from_page(page, resolved_chat_id)
             finally:
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
-                await page.close()
-                await context.close()
+                await self._release_page(page, resolved_chat_id)
 
         return GeminiResponse(chat_id=resolved_chat_id, message=(content or "").strip())
 
     def logout(self) -> None:
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        marker = "Account Google:"
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        try:
-            cookie_1psid, cookie_1psidts = self._load_session_cookies()
-            async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-                context = await browser.new_context(**context_options)
-                await context.add_cookies(self._build_session_cookies(cookie_1psid, cookie_1psidts))
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
-                await page.wait_for_timeout(1_500)
-                content = await page.content()
+        async with self._timed_operation("status"):
+            try:
+                cookie_1psid, cookie_1psidts = self._load_session_cookies()
+                async with self._open_page(
+                    self.storage_state_path,
+                    self._build_session_cookies(cookie_1psid, cookie_1psidts),
+                ) as (context, page):
+                    await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
+                    await self._wait_for_page_condition(
+                        page,
+                        "marker => document.documentElement.innerHTML.includes(marker)",
+                        self.STATUS_MARKER,
+                        self.STATUS_MARKER_WAIT_MS,
+                    )
+                    content = await page.content()
+
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "gemini",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"Status check failed: {exc}",
+                }
 
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
-                await page.close()
-                await context.close()
-        except Exception as exc:
             return {
                 "provider": "gemini",
-                "is_available": False,
-                "is_logged_in": False,
-                "detail": f"Status check failed: {exc}",
+                "is_available": True,
+                "is_logged_in": self.STATUS_MARKER in content,
+                "detail": None if self.STATUS_MARKER in content else "Marker 'Account Google:' non trovato",
             }
 
-        return {
-            "provider": "gemini",
-            "is_available": True,
-            "is_logged_in": marker in content,
-            "detail": None if marker in content else "Marker 'Account Google:' non trovato",
-        }
-
     def _load_session_cookies(self) -> tuple[str, str]:
         cookie_1psid = (self.cookie_1psid or "").strip()
         cookie_1psidts = (self.cookie_1psidts or "").strip()
@@ -328,6 +315,13 @@ class GeminiClient(AbstractClient):
 
         raise ValueError("GEMINI_COOKIE_1PSID e GEMINI_COOKIE_1PSIDTS sono obbligatori")
 
+    def _warm_page_session(self) -> dict:
+        cookie_1psid, cookie_1psidts = self._load_session_cookies()
+        return {
+            "storage_state_path": self.storage_state_path,
+            "cookies": self._build_session_cookies(cookie_1psid, cookie_1psidts),
+        }
+
     def _resolve_session_cookies_from_login_content(self, content: str) -> tuple[str, str]:
         parsed = AuthPayloadParser.parse(content)
         values = {
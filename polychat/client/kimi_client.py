@@ -1,13 +1,21 @@
+import json
 import os
 from typing import Any, Literal, Optional
 from urllib.parse import urlparse
 
-from browserforge.fingerprints import Screen
-from camoufox.async_api import AsyncCamoufox
 from injector import inject
 from strip_tags import strip_tags
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.kimi_response import KimiResponse
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
@@ -15,9 +23,16 @@ from polychat.parser.auth_payload_parser import AuthPayloadParser
 class KimiClient(AbstractClient):
     """Client per interagire con Kimi tramite automazione browser."""
 
+    PROVIDER_NAME = "kimi"
+    WARM_PAGE_URL = "https://www.kimi.com/"
+    ALLOWED_URL_PATTERNS = ("/apiv2/",)
     BASE_URL = "https://www.kimi.com/"
     GET_CHAT_URL = "https://www.kimi.com/apiv2/kimi.gateway.chat.v1.ChatService/GetChat"
-    POST_SUBMIT_WAIT_MS = 5_000
+    INPUT_SELECTOR = ".chat-input"
+    INPUT_READY_TIMEOUT_MS = 10_000
+    WAIT_FOR_URL_TIMEOUT_MS = 12_000
+    USER_NAME_WAIT_MS = 1_500
+    DIALOG_CLOSE_WAIT_MS = 500
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
     COMPLETE_WAIT_CHECK_INTERVAL_SECONDS = 2.0
     GET_CHAT_WAIT_TIMEOUT_MS = 10_000
@@ -30,12 +45,31 @@ class KimiClient(AbstractClient):
         headless: bool | Literal["virtual"] = False,
         access_token: str = "",
         refresh_token: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "kimi")
         self.storage_state_path = os.path.join(self.session_dir, "kimi_state.json")
         self.tokens_path = os.path.join(self.session_dir, "kimi_tokens.json")
-        self.headless = headless
         self.access_token = access_token
         self.refresh_token = refresh_token
         os.makedirs(self.session_dir, exist_ok=True)
@@ -43,7 +77,6 @@ class KimiClient(AbstractClient):
     async def login(self, content: str) -> None:
         """Imposta i token Kimi in localStorage e salva lo stato della sessione."""
         os.makedirs(self.session_dir, exist_ok=True)
-        constraints = Screen(max_width=1920, max_height=1080)
         access_token, refresh_token = self._resolve_auth_tokens_from_login_content(content)
         self._write_json_file(
             self.tokens_path,
@@ -52,89 +85,58 @@ class KimiClient(AbstractClient):
                 "refresh_token": refresh_token,
             },
         )
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
+        init_script = self._build_auth_tokens_init_script(access_token, refresh_token)
+        async with self._open_context(init_script=init_script) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
 
-            await self._bootstrap_authenticated_page(page, self.BASE_URL, access_token, refresh_token)
+            await self._goto(page, self.BASE_URL, wait_until="load", timeout=30_000)
             await page.wait_for_timeout(2_000)
 
             await context.storage_state(path=self.storage_state_path)
 
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> KimiResponse:
         """Invia un prompt a Kimi e restituisce il solo chat_id."""
 
         async def _attempt() -> KimiResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-            ) as browser:
-                access_token, refresh_token = self._load_auth_tokens()
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-
-                chat_id = await self._submit_prompt(
-                    page,
-                    message,
-                    chat_id,
-                    type_input,
-                    access_token,
-                    refresh_token,
-                )
-
-                await page.close()
-                await context.close()
-
-            return KimiResponse(chat_id=chat_id, message="")
-
-        return await self._retry_async(_attempt, attempts=3)
+            async with self._timed_operation("ask"), self._open_page(
+                self.storage_state_path,
+                init_script=self._build_auth_tokens_init_script(*self._load_auth_tokens()),
+                chat_id=chat_id,
+            ) as (context, page):
+                resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
+
+                await self._release_page(page, resolved_chat_id)
+
+            return KimiResponse(chat_id=resolved_chat_id, message="")
+
+        return await self._retry_async(_attempt, "ask")
 
     async def get_conversation(self, chat_id: str) -> KimiResponse:
-        if not chat_id:
-            raise ValueError("chat_id mancante")
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
+
+            content = await self._fetch_conversation_direct(chat_id)
+            if content is not None:
+                return KimiResponse(chat_id=chat_id, message=content)
+
+            async def _attempt() -> KimiResponse:
+                async with self._open_page(
+                    self.storage_state_path,
+                    init_script=self._build_auth_tokens_init_script(*self._load_auth_tokens()),
+                ) as (context, page):
+                    await self._goto(page, f"{self.BASE_URL}chat/{chat_id}", wait_until="load", timeout=30_000)
+                    content = await self._fetch_conversation_via_page(page, chat_id)
 
-        async def _attempt() -> KimiResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-            ) as browser:
-                access_token, refresh_token = self._load_auth_tokens()
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._bootstrap_authenticated_page(
-                    page,
-                    f"{self.BASE_URL}chat/{chat_id}",
-                    access_token,
-                    refresh_token,
-                )
-                content = await self._fetch_conversation_via_page(page, chat_id)
-
-                await page.close()
-                await context.close()
-
-            return KimiResponse(chat_id=chat_id, message=content)
-
-        return await self._retry_async(_attempt, attempts=3)
+                    await page.close()
+
+                return KimiResponse(chat_id=chat_id, message=content)
+
+            return await self._retry_async(_attempt, "get_conversation")
 
     async def ask_and_wait(
         self,
@@ -143,105 +145,78 @@ class KimiClient(AbstractClient):
         type_input: bool = True,
     ) -> KimiResponse:
         async def _attempt() -> KimiResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-            ) as browser:
-                access_token, refresh_token = self._load_auth_tokens()
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-
+            async with self._timed_operation("ask_and_wait"), self._open_page(
+                self.storage_state_path,
+                init_script=self._build_auth_tokens_init_script(*self._load_auth_tokens()),
+                chat_id=chat_id,
+            ) as (context, page):
+                resolved_chat_id = None
                 try:
-                    resolved_chat_id = await self._submit_prompt(
-                        page,
-                        message,
-                        chat_id,
-                        type_input,
-                        access_token,
-                        refresh_token,
-                    )
-                    await page.wait_for_timeout(self.POST_SUBMIT_WAIT_MS)
-                    await self._open_chat_page(page, resolved_chat_id)
-                    content = await self._fetch_conversation_via_page(
-                        page,
-                        resolved_chat_id,
-                    )
+                    resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
+                    async with self._timed_step("generation"):
+                        await self._wait_for_network_to_settle(
+                            page,
+                            timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                            check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                        )
+                    async with self._timed_step("fetch_conversation"):
+                        await self._open_chat_page(page, resolved_chat_id)
+                        content = await self._fetch_conversation_via_page(
+                            page,
+                            resolved_chat_id,
+                        )
                 finally:
-                    await page.close()
-                    await context.close()
+                    await self._release_page(page, resolved_chat_id)
 
                 return KimiResponse(chat_id=resolved_chat_id, message=content)
 
-        return await self._retry_async(_attempt, attempts=3)
+        return await self._retry_async(_attempt, "ask_and_wait")
 
     def logout(self) -> None:
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        constraints = Screen(max_width=1920, max_height=1080)
-        user_name_text = ""
-        try:
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-            ) as browser:
-                access_token, refresh_token = self._load_auth_tokens()
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-                context = await browser.new_context(**context_options)
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._bootstrap_authenticated_page(
-                    page,
-                    self.BASE_URL,
-                    access_token,
-                    refresh_token,
-                    wait_until="domcontentloaded",
-                    timeout=20_000,
-                )
-                await page.wait_for_timeout(1_500)
-                user_name = await page.query_selector(".user-name")
-                if user_name is not None:
-                    user_name_text = (await user_name.inner_text() or "").strip()
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
-                await page.close()
-                await context.close()
-        except Exception as exc:
+        async with self._timed_operation("status"):
+            user_name_text = ""
+            try:
+                async with self._open_page(
+                    self.storage_state_path,
+                    init_script=self._build_auth_tokens_init_script(*self._load_auth_tokens()),
+                ) as (context, page):
+                    await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
+                    await self._wait_for_selector_ready(page, ".user-name", self.USER_NAME_WAIT_MS)
+                    user_name = await page.query_selector(".user-name")
+                    if user_name is not None:
+                        user_name_text = (await user_name.inner_text() or "").strip()
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "kimi",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"Kimi status check failed: {exc}",
+                }
+
+            is_logged_in = self._is_logged_in_from_user_name_text(user_name_text)
+            if not user_name_text:
+                detail = "Kimi user-name element not found"
+            elif not is_logged_in:
+                detail = "Kimi login prompt detected"
+            else:
+                detail = None
+
             return {
                 "provider": "kimi",
-                "is_available": False,
-                "is_logged_in": False,
-                "detail": f"Kimi status check failed: {exc}",
+                "is_available": True,
+                "is_logged_in": is_logged_in,
+                "detail": detail,
             }
 
-        is_logged_in = self._is_logged_in_from_user_name_text(user_name_text)
-        if not user_name_text:
-            detail = "Kimi user-name element not found"
-        elif not is_logged_in:
-            detail = "Kimi login prompt detected"
-        else:
-            detail = None
-
-        return {
-            "provider": "kimi",
-            "is_available": True,
-            "is_logged_in": is_logged_in,
-            "detail": detail,
-        }
-
     @staticmethod
     def _is_logged_in_from_user_name_text(user_name_text: str) -> bool:
         normalized_text = (user_name_text or "").strip()
@@ -277,26 +252,21 @@ class KimiClient(AbstractClient):
             raise ValueError("KIMI_ACCESS_TOKEN e KIMI_REFRESH_TOKEN devono essere entrambi valorizzati")
         return access_token, refresh_token
 
-    async def _bootstrap_authenticated_page(
-        self,
-        page,
-        url: str,
-        access_token: str,
-        refresh_token: str,
-        wait_until: str = "load",
-        timeout: int = 30_000,
-    ) -> None:  # noqa: ANN001
-        await self._goto(page, url, wait_until=wait_until, timeout=timeout)
-        await self._set_auth_tokens(page, access_token, refresh_token)
-        await self._goto(page, url, wait_until=wait_until, timeout=timeout)
-
-    async def _set_auth_tokens(self, page, access_token: str, refresh_token: str) -> None:  # noqa: ANN001
-        await page.evaluate(
-            """([accessToken, refreshToken]) => {
-                window.localStorage.setItem('access_token', accessToken);
-                window.localStorage.setItem('refresh_token', refreshToken);
-            }""",
-            [access_token, refresh_token],
+    def _warm_page_session(self) -> dict[str, Any]:
+        return {
+            "storage_state_path": self.storage_state_path,
+            "init_script": self._build_auth_tokens_init_script(*self._load_auth_tokens()),
+        }
+
+    @classmethod
+    def _build_auth_tokens_init_script(cls, access_token: str, refresh_token: str) -> str:
+        """Script di init del context: i token sono in localStorage gia' alla prima navigazione."""
+        origin = cls.BASE_URL.rstrip("/")
+        return (
+            f"if (window.location.origin === {json.dumps(origin)}) {{\n"
+            f"    window.localStorage.setItem('access_token', {json.dumps(access_token)});\n"
+            f"    window.localStorage.setItem('refresh_token', {json.dumps(refresh_token)});\n"
+            "}"
         )
 
     @staticmethod
@@ -320,25 +290,24 @@ class KimiClient(AbstractClient):
         message: str,
         chat_id: Optional[str],
         type_input: bool,
-        access_token: str,
-        refresh_token: str,
     ) -> str:
         url = f"{self.BASE_URL}chat/{chat_id}" if chat_id else self.BASE_URL
-        await self._bootstrap_authenticated_page(page, url, access_token, refresh_token)
-        await page.wait_for_timeout(5_000)
-        await self._dismiss_later_dialog_if_present(page)
-        if type_input:
-            await self._type_message(page, ".chat-input", message)
-        else:
-            await self._paste_message(page, ".chat-input", message)
-
+        async with self._timed_step("navigate"):
+            await self._goto(page, url, reuse_current=True, wait_until="load", timeout=30_000)
+        async with self._timed_step("prompt_ready"):
+            await self._wait_for_selector_ready(page, self.INPUT_SELECTOR, self.INPUT_READY_TIMEOUT_MS)
+            await self._dismiss_later_dialog_if_present(page)
+        async with self._timed_step("input"):
+            if type_input:
+                await self._type_message(page, self.INPUT_SELECTOR, message)
+            else:
+                await self._insert_message(page, self.INPUT_SELECTOR, message)
+
+        self._mark_prompt_submitted()
         await page.keyboard.press("Enter")
 
-        try:
-            await page.wait_for_url("**/chat/**", timeout=12_000)
-        except Exception:
-            pass
-        await page.wait_for_timeout(1_000)
+        async with self._timed_step("conversation_url"):
+            await self._wait_for_url_match(page, "**/chat/**", self.WAIT_FOR_URL_TIMEOUT_MS)
         resolved_chat_id = self._extract_chat_id_from_url(page.url or "")
         if not resolved_chat_id:
             raise ValueError("Chat ID Kimi non trovato nella URL dopo l'invio del messaggio")
@@ -352,7 +321,12 @@ class KimiClient(AbstractClient):
                 continue
 
             await button.click()
-            await page.wait_for_timeout(500)
+            await self._wait_for_selector_ready(
+                page,
+                ".common-dialog-button",
+                self.DIALOG_CLOSE_WAIT_MS,
+                state="hidden",
+            )
             return
 
     async def _open_chat_page(self, page, chat_id: str) -> None:  # noqa: ANN001
@@ -362,6 +336,23 @@ class KimiClient(AbstractClient):
         except Exception:
             pass
 
+    async def _fetch_conversation_direct(self, chat_id: str) -> Optional[str]:
+        """Chiama GetChat via HTTP con l'access token; None se serve il browser (token o challenge)."""
+        access_token, _ = self._load_auth_tokens()
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "Referer": f"{self.BASE_URL}chat/{chat_id}",
+        }
+        cookies = self._read_storage_state_cookies(self.storage_state_path, "kimi.com")
+        if cookies:
+            headers["Cookie"] = self._format_cookie_header(cookies)
+
+        payload = await self._fetch_json_direct("POST", self.GET_CHAT_URL, headers, json_body={"chat_id": chat_id})
+        if not isinstance(payload, dict):
+            return None
+        return self._extract_message_from_get_chat_payload(payload, chat_id)
+
     async def _fetch_conversation_via_page(
         self,
         page,
@@ -378,7 +369,7 @@ class KimiClient(AbstractClient):
                     lambda response: self._is_matching_get_chat_response(response.url),
                     timeout=self.GET_CHAT_WAIT_TIMEOUT_MS,
                 ) as response_info:
-                    await page.wait_for_timeout(self.GET_CHAT_WAIT_TIMEOUT_MS)
+                    pass
                 response = await response_info.value
             except Exception:
                 waited_ms += self.GET_CHAT_WAIT_TIMEOUT_MS
@@ -1,22 +1,39 @@
 import os
 import asyncio
-from camoufox.async_api import AsyncCamoufox
+import json
 from typing import Any, Literal, Optional
 from injector import inject
-from browserforge.fingerprints import Screen
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.perplexity_response import PerplexityResponse
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
 
 class PerplexityClient(AbstractClient):
+    PROVIDER_NAME = "perplexity"
+    WARM_PAGE_URL = "https://www.perplexity.ai/"
+    STREAM_URL_MARKERS = ("/rest/sse/perplexity_ask",)
+    ALLOWED_URL_PATTERNS = ("/rest/", "/api/auth/session")
     SESSION_URL_MARKER = "api/auth/session"
     SESSION_RESPONSE_TIMEOUT_MS = 5_000
+    INPUT_SELECTOR = "#ask-input"
+    SUBMIT_BUTTON_SELECTOR = "button.interactable.rounded-full.bg-button-bg"
+    SUBMIT_READY_TIMEOUT_MS = 1_000
+    WAIT_FOR_URL_TIMEOUT_MS = 10_000
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
     COMPLETE_WAIT_CHECK_INTERVAL_SECONDS = 2.0
     THREAD_COMPLETION_TIMEOUT_SECONDS = 90.0
     THREAD_COMPLETION_POLL_INTERVAL_MS = 5_000
+    THREAD_API_URL = "https://www.perplexity.ai/rest/thread/{slug}"
 
     @inject
     def __init__(
@@ -24,12 +41,31 @@ class PerplexityClient(AbstractClient):
         session_dir: str,
         headless: bool | Literal["virtual"] = False,
         session_cookie: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "perplexity")
         self.storage_state_path = os.path.join(self.session_dir, "perplexity_state.json")
         self.cookie_path = os.path.join(self.session_dir, "perplexity_cookie.txt")
-        self.headless = headless
         self.session_cookie = session_cookie
         self.base_url = "https://www.perplexity.ai/"
         os.makedirs(self.session_dir, exist_ok=True)
@@ -38,17 +74,14 @@ class PerplexityClient(AbstractClient):
         cookie_value = self._resolve_session_cookie_from_login_content(content)
         self._write_text_file(self.cookie_path, cookie_value)
 
-        constraints = Screen(max_width=1920, max_height=1080)
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
-            await context.add_cookies([self._build_session_cookie(cookie_value)])
+        async with self._open_context(cookies=[self._build_session_cookie(cookie_value)]) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
             await self._goto(page, self.base_url, wait_until="domcontentloaded", timeout=20_000)
             await page.wait_for_timeout(1_500)
             await context.storage_state(path=self.storage_state_path)
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> PerplexityResponse:
         """
@@ -61,43 +94,15 @@ class PerplexityClient(AbstractClient):
         Returns:
             The complete response content from Perplexity
         """
-        constraints = Screen(max_width=1920, max_height=1080)
         session_cookie = self._load_session_cookie()
 
         async def _attempt() -> PerplexityResponse:
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints
-                ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                await context.add_cookies([self._build_session_cookie(session_cookie)])
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-
-                if chat_id:
-                    url = f"https://www.perplexity.ai/search/{chat_id}"
-                else:
-                    url = "https://www.perplexity.ai/"
-
-                await self._goto(page, url)
-
-                if type_input:
-                    await self._type_message(page, "#ask-input", message)
-                else:
-                    await self._paste_message(page, "#ask-input", message)
-
-                await page.wait_for_timeout(1000)
-                await page.click("button.interactable.rounded-full.bg-button-bg")
-                await page.wait_for_timeout(3_000)
-                current_slug = self._extract_slug_from_url(page.url or "")
-
-                if not current_slug:
-                    raise Exception("Slug Perplexity non trovato dopo invio messaggio")
+            async with self._timed_operation("ask"), self._open_page(
+                self.storage_state_path,
+                [self._build_session_cookie(session_cookie)],
+                chat_id=chat_id,
+            ) as (context, page):
+                current_slug = await self._submit_prompt(page, message, chat_id, type_input)
 
                 response_content = PerplexityResponse(thread_url_slug=current_slug)
 
@@ -106,8 +111,7 @@ class PerplexityClient(AbstractClient):
                 except Exception:
                     pass
 
-                await page.close()
-                await context.close()
+                await self._release_page(page, current_slug)
 
                 return response_content
 
@@ -119,133 +123,106 @@ class PerplexityClient(AbstractClient):
         chat_id: Optional[str] = None,
         type_input: bool = True,
     ) -> PerplexityResponse:
-        constraints = Screen(max_width=1920, max_height=1080)
         session_cookie = self._load_session_cookie()
 
-        async with AsyncCamoufox(
-            headless=self.headless,
-            humanize=True,
-            screen=constraints,
-        ) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            await context.add_cookies([self._build_session_cookie(session_cookie)])
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-
+        async with self._timed_operation("ask_and_wait"), self._open_page(
+            self.storage_state_path,
+            [self._build_session_cookie(session_cookie)],
+            chat_id=chat_id,
+        ) as (context, page):
+            slug = None
             try:
                 slug = await self._submit_prompt(page, message, chat_id, type_input)
-                await self._wait_for_network_to_settle(
-                    page,
-                    timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
-                    check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
-                )
-                response_content = await self._wait_for_thread_response(page, slug)
+                async with self._timed_step("generation"):
+                    await self._wait_for_network_to_settle(
+                        page,
+                        timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                        check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                    )
+                async with self._timed_step("fetch_conversation"):
+                    response_content = await self._wait_for_thread_response(page, slug)
             finally:
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
-                await page.close()
-                await context.close()
+                await self._release_page(page, slug)
 
         return response_content
 
     def logout(self) -> None:
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        constraints = Screen(max_width=1920, max_height=1080)
-        session_cookie = self._load_session_cookie()
-        session_payload = None
-        session_response_seen = False
-        try:
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints,
-            ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-                context = await browser.new_context(**context_options)
-                await context.add_cookies([self._build_session_cookie(session_cookie)])
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                session_detection_task = asyncio.create_task(
-                    self._detect_login_state_from_session_response(page)
-                )
-                await self._goto(page, self.base_url, wait_until="domcontentloaded", timeout=20_000)
-                try:
-                    await page.wait_for_timeout(1_500)
-                except Exception:
-                    pass
-                session_response_seen, session_payload = await session_detection_task
+        async with self._timed_operation("status"):
+            session_cookie = self._load_session_cookie()
+            session_payload = None
+            session_response_seen = False
+            try:
+                async with self._open_page(
+                    self.storage_state_path,
+                    [self._build_session_cookie(session_cookie)],
+                ) as (context, page):
+                    session_detection_task = asyncio.create_task(
+                        self._detect_login_state_from_session_response(page)
+                    )
+                    await self._goto(page, self.base_url, wait_until="domcontentloaded", timeout=20_000)
+                    session_response_seen, session_payload = await session_detection_task
+
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "perplexity",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"Status check failed: {exc}",
+                }
+
+            is_logged_in = self._is_non_empty_session_payload(session_payload)
+            if is_logged_in:
+                detail = None
+            elif not session_response_seen:
+                detail = "Session response api/auth/session not detected within 5 seconds"
+            else:
+                detail = "Session response api/auth/session was empty or missing data"
 
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
-                await page.close()
-                await context.close()
-        except Exception as exc:
             return {
                 "provider": "perplexity",
-                "is_available": False,
-                "is_logged_in": False,
-                "detail": f"Status check failed: {exc}",
+                "is_available": True,
+                "is_logged_in": is_logged_in,
+                "detail": detail,
             }
 
-        is_logged_in = self._is_non_empty_session_payload(session_payload)
-        if is_logged_in:
-            detail = None
-        elif not session_response_seen:
-            detail = "Session response api/auth/session not detected within 5 seconds"
-        else:
-            detail = "Session response api/auth/session was empty or missing data"
-
-        return {
-            "provider": "perplexity",
-            "is_available": True,
-            "is_logged_in": is_logged_in,
-            "detail": detail,
-        }
-
     async def get_conversation(self, chat_id: str) -> PerplexityResponse:
         """Recupera il dettaglio del thread Perplexity a partire dallo slug."""
-        if not chat_id:
-            raise ValueError("chat_id mancante")
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
 
-        session_cookie = self._load_session_cookie()
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(
-            headless=self.headless,
-            humanize=True,
-            screen=constraints,
-        ) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            await context.add_cookies([self._build_session_cookie(session_cookie)])
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
-            response_content = await self._wait_for_thread_response(page, chat_id, post_navigation_wait_ms=10_000)
+            session_cookie = self._load_session_cookie()
+            response_content = await self._wait_for_thread_response_direct(chat_id, session_cookie)
+            if response_content is not None:
+                return response_content
 
-            try:
-                await context.storage_state(path=self.storage_state_path)
-            except Exception:
-                pass
+            async with self._open_page(
+                self.storage_state_path,
+                [self._build_session_cookie(session_cookie)],
+            ) as (context, page):
+                response_content = await self._wait_for_thread_response(page, chat_id)
 
-            await page.close()
-            await context.close()
+                try:
+                    await context.storage_state(path=self.storage_state_path)
+                except Exception:
+                    pass
 
-        return response_content
+                await page.close()
+
+            return response_content
 
     async def _submit_prompt(
         self,
@@ -259,16 +236,25 @@ class PerplexityClient(AbstractClient):
         else:
             url = "https://www.perplexity.ai/"
 
-        await self._goto(page, url)
+        async with self._timed_step("navigate"):
+            await self._goto(page, url, reuse_current=True)
 
-        if type_input:
-            await self._type_message(page, "#ask-input", message)
-        else:
-            await self._paste_message(page, "#ask-input", message)
+        async with self._timed_step("input"):
+            if type_input:
+                await self._type_message(page, self.INPUT_SELECTOR, message)
+            else:
+                await self._insert_message(page, self.INPUT_SELECTOR, message)
 
-        await page.wait_for_timeout(1000)
-        await page.click("button.interactable.rounded-full.bg-button-bg")
-        await page.wait_for_timeout(3_000)
+        async with self._timed_step("submit_ready"):
+            await self._wait_for_selector_ready(
+                page,
+                f"{self.SUBMIT_BUTTON_SELECTOR}:not([disabled])",
+                self.SUBMIT_READY_TIMEOUT_MS,
+            )
+        self._mark_prompt_submitted()
+        await page.click(self.SUBMIT_BUTTON_SELECTOR)
+        async with self._timed_step("conversation_url"):
+            await self._wait_for_url_match(page, "**/search/**", self.WAIT_FOR_URL_TIMEOUT_MS)
         current_slug = self._extract_slug_from_url(page.url or "")
 
         if not current_slug:
@@ -276,7 +262,7 @@ class PerplexityClient(AbstractClient):
 
         return current_slug
 
-    async def _wait_for_thread_response(self, page, slug: str, post_navigation_wait_ms: int = 0) -> PerplexityResponse:
+    async def _wait_for_thread_response(self, page, slug: str) -> PerplexityResponse:
         """
         Attende la response AJAX /rest/thread/{slug} finche' l'ultima entry non e' COMPLETED.
         """
@@ -294,33 +280,55 @@ class PerplexityClient(AbstractClient):
                 thread_url,
                 thread_path,
                 timeout_seconds=remaining_seconds,
-                post_navigation_wait_ms=post_navigation_wait_ms,
             )
-            post_navigation_wait_ms = 0
 
             if response_content.get("status") == "COMPLETED":
                 return PerplexityResponse.model_validate(response_content)
 
             await page.wait_for_timeout(self.THREAD_COMPLETION_POLL_INTERVAL_MS)
 
+    async def _wait_for_thread_response_direct(self, slug: str, session_cookie: str) -> Optional[PerplexityResponse]:
+        """Come `_wait_for_thread_response` ma via HTTP; None se serve il browser."""
+        cookies = self._read_storage_state_cookies(self.storage_state_path, "perplexity.ai")
+        cookies["__Secure-next-auth.session-token"] = session_cookie
+        headers = {
+            "Cookie": self._format_cookie_header(cookies),
+            "Referer": f"https://www.perplexity.ai/search/{slug}",
+        }
+        deadline = asyncio.get_running_loop().time() + self.THREAD_COMPLETION_TIMEOUT_SECONDS
+
+        while True:
+            if asyncio.get_running_loop().time() >= deadline:
+                raise Exception("Timeout waiting for Perplexity thread completion")
+
+            payload = await self._fetch_json_direct("GET", self.THREAD_API_URL.format(slug=slug), headers)
+            if payload is None:
+                return None
+
+            response_content = self._extract_last_thread_entry(payload)
+            if response_content.get("status") == "COMPLETED":
+                return PerplexityResponse.model_validate(response_content)
+
+            await asyncio.sleep(self.THREAD_COMPLETION_POLL_INTERVAL_MS / 1000)
+
     async def _fetch_thread_entry(
         self,
         page,
         thread_url: str,
         thread_path: str,
         timeout_seconds: float,
-        post_navigation_wait_ms: int = 0,
     ) -> dict[str, Any]:
         async with page.expect_response(
             lambda response: thread_path in response.url,
             timeout=max(1, int(timeout_seconds * 1000)),
         ) as thread_response_info:
             await self._goto(page, thread_url)
-            if post_navigation_wait_ms > 0:
-                await page.wait_for_timeout(post_navigation_wait_ms)
 
         response = await thread_response_info.value
-        payload = await response.json()
+        return self._extract_last_thread_entry(await response.json())
+
+    @staticmethod
+    def _extract_last_thread_entry(payload: Any) -> dict[str, Any]:
         entries = payload.get("entries") if isinstance(payload, dict) else None
         if not entries:
             raise Exception("Perplexity thread response missing entries")
@@ -331,6 +339,32 @@ class PerplexityClient(AbstractClient):
 
         return last_entry
 
+    def _extract_stream_deltas(self, state: dict[str, Any], event_name: str, data: str) -> list[str]:
+        """Ricostruisce il markdown del blocco `ask_text` (testo completo o chunk con offset) e ne restituisce la parte nuova."""
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return []
+        blocks = payload.get("blocks") if isinstance(payload, dict) else None
+
+        for block in blocks or []:
+            if not isinstance(block, dict) or block.get("intended_usage") != "ask_text":
+                continue
+            markdown_block = block.get("markdown_block")
+            if not isinstance(markdown_block, dict):
+                continue
+
+            if isinstance(markdown_block.get("answer"), str):
+                full_text = markdown_block["answer"]
+            else:
+                chunks = state.setdefault("chunks", [])
+                offset = int(markdown_block.get("chunk_starting_offset") or 0)
+                new_chunks = [chunk for chunk in markdown_block.get("chunks") or [] if isinstance(chunk, str)]
+                chunks[offset:offset + len(new_chunks)] = new_chunks
+                full_text = "".join(chunks)
+            return self._diff_stream_text(state, full_text)
+        return []
+
     def _load_session_cookie(self) -> str:
         cookie_value = (self.session_cookie or "").strip()
         if cookie_value:
@@ -343,6 +377,12 @@ class PerplexityClient(AbstractClient):
 
         raise ValueError("PERPLEXITY_SESSION_COOKIE mancante o vuoto")
 
+    def _warm_page_session(self) -> dict[str, Any]:
+        return {
+            "storage_state_path": self.storage_state_path,
+            "cookies": [self._build_session_cookie(self._load_session_cookie())],
+        }
+
     def _resolve_session_cookie_from_login_content(self, content: str) -> str:
         parsed = AuthPayloadParser.parse(content)
         cookie = self._find_cookie(parsed.cookies, "__Secure-next-auth.session-token")
@@ -413,15 +453,14 @@ class PerplexityClient(AbstractClient):
             finally:
                 response_received.set()
 
-        page.on("response", handle_response)
-
-        try:
-            await asyncio.wait_for(
-                response_received.wait(),
-                timeout=self.SESSION_RESPONSE_TIMEOUT_MS / 1000,
-            )
-        except asyncio.TimeoutError:
-            return False, None
+        with self._page_listeners(page, response=handle_response):
+            try:
+                await asyncio.wait_for(
+                    response_received.wait(),
+                    timeout=self.SESSION_RESPONSE_TIMEOUT_MS / 1000,
+                )
+            except asyncio.TimeoutError:
+                return False, None
 
         return session_response_seen, session_payload
 
@@ -1,14 +1,21 @@
 import asyncio
+import json
 import os
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 from urllib.parse import urlparse
 
-import requests
-from browserforge.fingerprints import Screen
-from camoufox.async_api import AsyncCamoufox
 from injector import inject
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.model.client.qwen_response import QwenResponse
 from polychat.parser.auth_payload_parser import AuthPayloadParser
 
@@ -16,10 +23,15 @@ from polychat.parser.auth_payload_parser import AuthPayloadParser
 class QwenClient(AbstractClient):
     """Client per interagire con Qwen via browser + polling API chat."""
 
+    PROVIDER_NAME = "qwen"
+    WARM_PAGE_URL = "https://chat.qwen.ai/"
+    STREAM_URL_MARKERS = ("/api/v2/chat/completions",)
+    ALLOWED_URL_PATTERNS = ("/api/",)
     BASE_URL = "https://chat.qwen.ai/"
     CHAT_API_URL = "https://chat.qwen.ai/api/v2/chats/{chat_id}"
     WAIT_FOR_URL_TIMEOUT_MS = 20_000
     INPUT_SELECTOR = ".message-input-textarea"
+    INPUT_FOCUS_WAIT_MS = 500
     POLL_INTERVAL_SECONDS = 2
     MAX_WAIT_SECONDS = 120
     COMPLETE_WAIT_TIMEOUT_SECONDS = 60.0
@@ -31,12 +43,31 @@ class QwenClient(AbstractClient):
         session_dir: str,
         headless: bool | Literal["virtual"] = False,
         session_cookie: str = "",
+        browser_pool: Optional[BrowserPoolManager] = None,
+        warm_page_pool: Optional[WarmPagePoolManager] = None,
+        http_client_manager: Optional[HttpClientManager] = None,
+        retry_manager: Optional[RetryManager] = None,
+        latency_manager: Optional[LatencyManager] = None,
+        sticky_page_manager: Optional[StickyPageManager] = None,
+        resource_blocking_manager: Optional[ResourceBlockingManager] = None,
+        asset_cache_manager: Optional[AssetCacheManager] = None,
+        metrics_manager: Optional[MetricsManager] = None,
     ):
-        super().__init__()
+        super().__init__(
+            headless,
+            browser_pool,
+            warm_page_pool,
+            http_client_manager,
+            retry_manager,
+            latency_manager,
+            sticky_page_manager,
+            resource_blocking_manager,
+            asset_cache_manager,
+            metrics_manager,
+        )
         self.session_dir = os.path.join(session_dir, "qwen")
         self.storage_state_path = os.path.join(self.session_dir, "qwen_state.json")
         self.cookie_path = os.path.join(self.session_dir, "qwen_cookie.txt")
-        self.headless = headless
         self.session_cookie = session_cookie
         os.makedirs(self.session_dir, exist_ok=True)
 
@@ -44,57 +75,26 @@ class QwenClient(AbstractClient):
         session_cookie = self._resolve_session_cookie_from_login_content(content)
         self._write_text_file(self.cookie_path, session_cookie)
 
-        constraints = Screen(max_width=1920, max_height=1080)
-        async with AsyncCamoufox(headless=self.headless, humanize=True, screen=constraints) as browser:
-            context = await browser.new_context()
-            await context.add_cookies([self._build_session_cookie(session_cookie)])
+        async with self._open_context(cookies=[self._build_session_cookie(session_cookie)]) as context:
             page = await context.new_page()
             self._attach_page_request_logger(page)
             await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
             await page.wait_for_timeout(1_500)
             await context.storage_state(path=self.storage_state_path)
             await page.close()
-            await context.close()
+        self._invalidate_warm_pages()
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> QwenResponse:
         session_cookie = self._load_session_cookie()
         requested_chat_id = chat_id
 
         async def _attempt() -> QwenResponse:
-            constraints = Screen(max_width=1920, max_height=1080)
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints,
-            ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                await context.add_cookies([self._build_session_cookie(session_cookie)])
-
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                url = f"{self.BASE_URL}c/{requested_chat_id}" if requested_chat_id else self.BASE_URL
-                await self._goto(page, url, wait_until="domcontentloaded", timeout=15_000)
-                await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-                await page.wait_for_timeout(500)
-
-                if type_input:
-                    await self._type_into_focused_input(page, message)
-                else:
-                    await self._paste_into_focused_input(page, message)
-
-                await page.keyboard.press("Enter")
-
-                await page.wait_for_timeout(1_000)
-
-                url = page.url or ""
-
-                extracted_chat_id = self._extract_chat_id_from_url(url)
-                if not extracted_chat_id:
-                    raise ValueError("Chat ID Qwen non trovato nella URL dopo l'invio del messaggio")
+            async with self._timed_operation("ask"), self._open_page(
+                self.storage_state_path,
+                [self._build_session_cookie(session_cookie)],
+                chat_id=requested_chat_id,
+            ) as (context, page):
+                extracted_chat_id = await self._submit_prompt(page, message, requested_chat_id, type_input)
 
                 response = QwenResponse(
                     data={
@@ -107,68 +107,75 @@ class QwenClient(AbstractClient):
                 except Exception:
                     pass
 
-                await page.close()
-                await context.close()
+                await self._release_page(page, extracted_chat_id)
 
                 return response
 
-        # Non ritentare l'intero flow di ask: un retry qui rispedirebbe il messaggio.
-        return await _attempt()
+        # Si ritenta solo se il prompt non e' ancora stato inviato (vedi _mark_prompt_submitted)
+        return await self._retry_async(_attempt, "ask")
 
     def logout(self) -> None:
         self._clear_session_dir(self.session_dir)
+        self._invalidate_warm_pages()
 
     async def status(self) -> dict:
-        constraints = Screen(max_width=1920, max_height=1080)
-        session_cookie = self._load_session_cookie()
-        try:
-            async with AsyncCamoufox(
-                headless=self.headless,
-                humanize=True,
-                screen=constraints,
-            ) as browser:
-                context_options = {}
-                if os.path.exists(self.storage_state_path):
-                    context_options["storage_state"] = self.storage_state_path
-
-                context = await browser.new_context(**context_options)
-                await context.add_cookies([self._build_session_cookie(session_cookie)])
-
-                page = await context.new_page()
-                self._attach_page_request_logger(page)
-                await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
-                await page.wait_for_timeout(1_500)
-                try:
-                    await context.storage_state(path=self.storage_state_path)
-                except Exception:
-                    pass
-                await page.close()
-                await context.close()
-        except Exception as exc:
+        async with self._timed_operation("status"):
+            session_cookie = self._load_session_cookie()
+            try:
+                async with self._open_page(
+                    self.storage_state_path,
+                    [self._build_session_cookie(session_cookie)],
+                ) as (context, page):
+                    await self._goto(page, self.BASE_URL, wait_until="domcontentloaded", timeout=20_000)
+                    await page.wait_for_timeout(1_500)
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+                    await page.close()
+            except Exception as exc:
+                return {
+                    "provider": "qwen",
+                    "is_available": False,
+                    "is_logged_in": False,
+                    "detail": f"TODO: implement Qwen login detection (status check failed: {exc})",
+                }
+
             return {
                 "provider": "qwen",
-                "is_available": False,
+                "is_available": True,
                 "is_logged_in": False,
-                "detail": f"TODO: implement Qwen login detection (status check failed: {exc})",
+                "detail": "TODO: implement Qwen login detection",
             }
 
-        return {
-            "provider": "qwen",
-            "is_available": True,
-            "is_logged_in": False,
-            "detail": "TODO: implement Qwen login detection",
-        }
-
     async def get_conversation(self, chat_id: str) -> QwenResponse:
-        if not chat_id:
-            raise ValueError("chat_id mancante")
+        async with self._timed_operation("get_conversation"):
+            if not chat_id:
+                raise ValueError("chat_id mancante")
 
-        session_cookie = self._load_session_cookie()
+            session_cookie = self._load_session_cookie()
 
-        async def _attempt() -> QwenResponse:
-            return await self._poll_chat_response(chat_id, session_cookie)
+            async def _attempt() -> QwenResponse:
+                response = await self._poll_chat_response(chat_id, session_cookie)
+                if response is not None:
+                    return response
+
+                async with self._open_page(
+                    self.storage_state_path,
+                    [self._build_session_cookie(session_cookie)],
+                ) as (context, page):
+                    await self._goto(page, f"{self.BASE_URL}c/{chat_id}", wait_until="domcontentloaded", timeout=20_000)
+                    response = await self._poll_chat_response_from_page(page, chat_id)
+
+                    try:
+                        await context.storage_state(path=self.storage_state_path)
+                    except Exception:
+                        pass
+
+                    await page.close()
+                return response
 
-        return await self._retry_async(_attempt, attempts=3)
+            return await self._retry_async(_attempt, "get_conversation")
 
     async def ask_and_wait(
         self,
@@ -177,50 +184,44 @@ class QwenClient(AbstractClient):
         type_input: bool = True,
     ) -> QwenResponse:
         session_cookie = self._load_session_cookie()
-        constraints = Screen(max_width=1920, max_height=1080)
-
-        async with AsyncCamoufox(
-            headless=self.headless,
-            humanize=True,
-            screen=constraints,
-        ) as browser:
-            context_options = {}
-            if os.path.exists(self.storage_state_path):
-                context_options["storage_state"] = self.storage_state_path
-
-            context = await browser.new_context(**context_options)
-            await context.add_cookies([self._build_session_cookie(session_cookie)])
-
-            page = await context.new_page()
-            self._attach_page_request_logger(page)
 
+        async with self._timed_operation("ask_and_wait"), self._open_page(
+            self.storage_state_path,
+            [self._build_session_cookie(session_cookie)],
+            chat_id=chat_id,
+        ) as (context, page):
+            resolved_chat_id = None
             try:
                 resolved_chat_id = await self._submit_prompt(page, message, chat_id, type_input)
-                await self._wait_for_network_to_settle(
-                    page,
-                    timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
-                    check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
-                )
-                response = await self._poll_chat_response_from_page(page, resolved_chat_id)
+                async with self._timed_step("generation"):
+                    await self._wait_for_network_to_settle(
+                        page,
+                        timeout_seconds=self.COMPLETE_WAIT_TIMEOUT_SECONDS,
+                        check_interval_seconds=self.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS,
+                    )
+                async with self._timed_step("fetch_conversation"):
+                    response = await self._poll_chat_response_from_page(page, resolved_chat_id)
             finally:
                 try:
                     await context.storage_state(path=self.storage_state_path)
                 except Exception:
                     pass
 
-                await page.close()
-                await context.close()
+                await self._release_page(page, resolved_chat_id)
 
         return response
 
-    async def _poll_chat_response(self, chat_id: str, session_cookie: str) -> QwenResponse:
+    async def _poll_chat_response(self, chat_id: str, session_cookie: str) -> Optional[QwenResponse]:
+        """Polling via HTTP della chat API; None se la sessione va ripristinata nel browser."""
         elapsed = 0
         last_response: Optional[QwenResponse] = None
         last_error: Optional[Exception] = None
 
         while elapsed < self.MAX_WAIT_SECONDS:
             try:
-                payload = await asyncio.to_thread(self._fetch_chat_payload, chat_id, session_cookie)
+                payload = await self._fetch_chat_payload(chat_id, session_cookie)
+                if payload is None:
+                    return None
                 response = QwenResponse.model_validate(payload)
                 last_response = response
 
@@ -275,25 +276,14 @@ class QwenClient(AbstractClient):
             )
         raise TimeoutError(f"Timeout waiting for Qwen chat response (chat_id={chat_id})")
 
-    def _fetch_chat_payload(self, chat_id: str, session_cookie: str) -> dict:
-        url = self.CHAT_API_URL.format(chat_id=chat_id)
+    async def _fetch_chat_payload(self, chat_id: str, session_cookie: str) -> Optional[dict]:
+        cookies = self._read_storage_state_cookies(self.storage_state_path, "qwen.ai")
+        cookies["token"] = session_cookie
         headers = {
-            "Accept": "application/json",
-            "Cookie": f"token={session_cookie}",
+            "Cookie": self._format_cookie_header(cookies),
             "Referer": f"{self.BASE_URL}c/{chat_id}",
         }
-        self._log_http_request("GET", url)
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
-        try:
-            return response.json()
-        except ValueError as exc:
-            content_type = response.headers.get("Content-Type", "")
-            body_preview = (response.text or "")[:200].replace("\n", " ")
-            raise ValueError(
-                f"Qwen chat API returned non-JSON response. "
-                f"status={response.status_code} content_type={content_type} body={body_preview}"
-            ) from exc
+        return await self._fetch_json_direct("GET", self.CHAT_API_URL.format(chat_id=chat_id), headers)
 
     def _load_session_cookie(self) -> str:
         cookie_value = (self.session_cookie or "").strip()
@@ -305,6 +295,12 @@ class QwenClient(AbstractClient):
                 return cookie_value
         raise ValueError("QWEN_SESSION_COOKIE mancante o vuoto")
 
+    def _warm_page_session(self) -> dict:
+        return {
+            "storage_state_path": self.storage_state_path,
+            "cookies": [self._build_session_cookie(self._load_session_cookie())],
+        }
+
     def _resolve_session_cookie_from_login_content(self, content: str) -> str:
         parsed = AuthPayloadParser.parse(content)
         for cookie in parsed.cookies:
@@ -335,18 +331,24 @@ class QwenClient(AbstractClient):
     ) -> str:
         requested_chat_id = chat_id
         url = f"{self.BASE_URL}c/{requested_chat_id}" if requested_chat_id else self.BASE_URL
-        await self._goto(page, url, wait_until="domcontentloaded", timeout=15_000)
-        await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
-        await page.wait_for_timeout(500)
+        async with self._timed_step("navigate"):
+            await self._goto(page, url, reuse_current=True, wait_until="domcontentloaded", timeout=15_000)
+
+        async with self._timed_step("prompt_ready"):
+            await page.wait_for_selector(self.INPUT_SELECTOR, state="visible", timeout=20_000)
+            await self._wait_for_focus(page, self.INPUT_SELECTOR, self.INPUT_FOCUS_WAIT_MS)
 
-        if type_input:
-            await self._type_into_focused_input(page, message)
-        else:
-            await self._paste_into_focused_input(page, message)
+        async with self._timed_step("input"):
+            if type_input:
+                await self._type_into_focused_input(page, message)
+            else:
+                await self._paste_into_focused_input(page, message)
 
+        self._mark_prompt_submitted()
         await page.keyboard.press("Enter")
 
-        await page.wait_for_timeout(1_000)
+        async with self._timed_step("conversation_url"):
+            await self._wait_for_url_match(page, "**/c/**", self.WAIT_FOR_URL_TIMEOUT_MS)
 
         current_url = page.url or ""
         extracted_chat_id = self._extract_chat_id_from_url(current_url)
@@ -355,13 +357,27 @@ class QwenClient(AbstractClient):
 
         return extracted_chat_id
 
+    def _extract_stream_deltas(self, state: dict[str, Any], event_name: str, data: str) -> list[str]:
+        """Chunk in formato OpenAI (`choices[0].delta.content`); si ignorano le fasi diverse da `answer`."""
+        try:
+            payload = json.loads(data)
+        except ValueError:
+            return []
+        choices = payload.get("choices") if isinstance(payload, dict) else None
+        if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+            return []
+
+        delta = choices[0].get("delta")
+        if not isinstance(delta, dict) or delta.get("phase") not in (None, "answer"):
+            return []
+        content = delta.get("content")
+        return [content] if isinstance(content, str) else []
+
     async def _type_into_focused_input(self, page, content: str) -> None:
-        safe_content = self._sanitize_message(content)
-        await page.keyboard.type(safe_content)
+        await self._type_lines(page, content, page.keyboard.type)
 
     async def _paste_into_focused_input(self, page, content: str) -> None:
-        safe_content = self._sanitize_message(content)
-        await page.keyboard.insert_text(safe_content)
+        await self._insert_message(page, self.INPUT_SELECTOR, content, focus=False)
 
     @staticmethod
     def _extract_chat_id_from_url(url: str) -> str:
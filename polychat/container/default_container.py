@@ -11,18 +11,49 @@ from polychat.client.gemini_client import GeminiClient
 from polychat.client.kimi_client import KimiClient
 from polychat.client.perplexity_client import PerplexityClient
 from polychat.client.qwen_client import QwenClient
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.admission_manager import AdmissionManager
+from polychat.manager.batch_manager import BatchManager
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.job_manager import JobManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.single_flight_manager import SingleFlightManager
+from polychat.manager.resource_blocking_manager import (
+    DEFAULT_BLOCKED_RESOURCE_TYPES,
+    DEFAULT_BLOCKED_URL_PATTERNS,
+    ResourceBlockingManager,
+)
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.status_monitor_manager import StatusMonitorManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
 from polychat.service.chat_gpt_service import ChatGptService
 from polychat.service.deepseek_service import DeepseekService
 from polychat.service.gemini_service import GeminiService
+from polychat.service.job_service import JobService
 from polychat.service.kimi_service import KimiService
+from polychat.service.metrics_service import MetricsService
+from polychat.service.multi_service import MultiService
 from polychat.service.perplexity_service import PerplexityService
 from polychat.service.qwen_service import QwenService
+from polychat.service.status_service import StatusService
+from polychat.service.system_service import SystemService
 from polychat.controller.gemini_controller import GeminiController
+from polychat.controller.job_controller import JobController
 from polychat.controller.kimi_controller import KimiController
+from polychat.controller.metrics_controller import MetricsController
+from polychat.controller.multi_controller import MultiController
 from polychat.controller.chat_gpt_controller import ChatGptController
 from polychat.controller.perplexity_controller import PerplexityController
 from polychat.controller.deepseek_controller import DeepseekController
 from polychat.controller.qwen_controller import QwenController
+from polychat.controller.status_controller import StatusController
+from polychat.controller.system_controller import SystemController
 from polychat.mapper.client.chatgpt_chat_mapper import ChatGptChatMapper
 from polychat.mapper.client.deepseek_chat_mapper import DeepseekChatMapper
 from polychat.mapper.client.gemini_chat_mapper import GeminiChatMapper
@@ -30,6 +61,8 @@ from polychat.mapper.client.kimi_chat_mapper import KimiChatMapper
 from polychat.mapper.client.perplexity_chat_mapper import PerplexityChatMapper
 from polychat.mapper.client.qwen_chat_mapper import QwenChatMapper
 from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.mapper.service.job_to_api_mapper import JobToApiMapper
+from polychat.mapper.service.multi_to_api_mapper import MultiToApiMapper
 
 
 class DefaultContainer:
@@ -58,6 +91,24 @@ class DefaultContainer:
     def get_var(self, key):
         return self.__dict__[key]
 
+    async def startup(self):
+        await self.asset_cache_manager.start()
+        await self.browser_pool_manager.start()
+        await self.warm_page_pool_manager.start()
+        await self.sticky_page_manager.start()
+        await self.job_manager.start()
+        await self.status_monitor_manager.start()
+
+    async def shutdown(self):
+        await self.status_monitor_manager.stop()
+        await self.job_manager.stop()
+        await self.job_service.stop()
+        await self.sticky_page_manager.stop()
+        await self.warm_page_pool_manager.stop()
+        await self.browser_pool_manager.stop()
+        await self.http_client_manager.stop()
+        await self.asset_cache_manager.stop()
+
     def _init_directories(self):
         self.root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         self.var_dir = os.path.join(self.root_dir, 'var')
@@ -67,6 +118,9 @@ class DefaultContainer:
         self.app_log_path = os.path.join(self.log_dir, 'app.log')
         self.session_dir = os.path.join(self.var_dir, 'session')
         os.makedirs(self.session_dir, exist_ok=True)
+        # Account aggiuntivi: var/session/accounts/<account>/<provider>
+        self.accounts_session_dir = os.path.join(self.session_dir, 'accounts')
+        self.asset_cache_dir = os.path.join(self.var_dir, 'asset_cache')
 
     def _init_environment_variables(self):
         self.pandoc_executable = os.environ.get('PANDOC_EXECUTABLE', 'pandoc')
@@ -74,6 +128,67 @@ class DefaultContainer:
         self.api_port = int(os.environ.get('API_PORT', '8459'))
         self.session_dir_env = os.environ.get('SESSION_DIR', 'var/session')
         self.headless = self._parse_headless_mode(os.environ.get('HEADLESS', 'true'))
+        self.browser_pool_size = int(os.environ.get('BROWSER_POOL_SIZE', '1'))
+        self.browser_pool_max_uses = int(os.environ.get('BROWSER_POOL_MAX_USES', '50'))
+        self.browser_pool_health_check_interval_seconds = float(
+            os.environ.get('BROWSER_POOL_HEALTH_CHECK_INTERVAL_SECONDS', '30')
+        )
+        self.warm_page_pool_size = int(os.environ.get('WARM_PAGE_POOL_SIZE', '1'))
+        self.warm_page_max_idle_seconds = float(os.environ.get('WARM_PAGE_MAX_IDLE_SECONDS', '300'))
+        self.sticky_page_idle_ttl_seconds = float(os.environ.get('STICKY_PAGE_IDLE_TTL_SECONDS', '0'))
+        self.sticky_page_max_pages = int(os.environ.get('STICKY_PAGE_MAX_PAGES', '4'))
+        self.resource_blocking_enabled = os.environ.get('RESOURCE_BLOCKING_ENABLED', 'true').strip().lower() in {
+            '1', 'true', 'yes', 'on'
+        }
+        self.resource_blocked_types = self._read_list_environment_value(
+            'RESOURCE_BLOCKED_TYPES',
+            DEFAULT_BLOCKED_RESOURCE_TYPES,
+        )
+        self.resource_blocked_url_patterns = DEFAULT_BLOCKED_URL_PATTERNS + self._read_list_environment_value(
+            'RESOURCE_BLOCKED_URL_PATTERNS',
+            (),
+        )
+        self.asset_cache_enabled = os.environ.get('ASSET_CACHE_ENABLED', 'true').strip().lower() in {
+            '1', 'true', 'yes', 'on'
+        }
+        self.asset_cache_max_mb = int(os.environ.get('ASSET_CACHE_MAX_MB', '256'))
+        self.http_max_connections = int(os.environ.get('HTTP_MAX_CONNECTIONS', '20'))
+        self.http_max_keepalive_connections = int(os.environ.get('HTTP_MAX_KEEPALIVE_CONNECTIONS', '10'))
+        self.http_keepalive_expiry_seconds = float(os.environ.get('HTTP_KEEPALIVE_EXPIRY_SECONDS', '30'))
+        self.http_timeout_seconds = float(os.environ.get('HTTP_TIMEOUT_SECONDS', '20'))
+        self.retry_budget_ratio = float(os.environ.get('RETRY_BUDGET_RATIO', '0.2'))
+        self.retry_min_retries_per_window = int(os.environ.get('RETRY_MIN_RETRIES_PER_WINDOW', '3'))
+        self.retry_budget_window_seconds = float(os.environ.get('RETRY_BUDGET_WINDOW_SECONDS', '60'))
+        self.latency_window_size = int(os.environ.get('LATENCY_WINDOW_SIZE', '200'))
+        self.latency_min_samples = int(os.environ.get('LATENCY_MIN_SAMPLES', '20'))
+        self.admission_max_in_flight = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', '2'))
+        self.admission_max_queue_size = int(os.environ.get('ADMISSION_MAX_QUEUE_SIZE', '10'))
+        self.admission_queue_timeout_seconds = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', '30'))
+        self.admission_max_in_flight_by_provider = self._read_provider_environment_values('ADMISSION_MAX_IN_FLIGHT_')
+        self.circuit_breaker_failure_threshold = int(os.environ.get('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+        self.circuit_breaker_open_seconds = float(os.environ.get('CIRCUIT_BREAKER_OPEN_SECONDS', '30'))
+        self.circuit_breaker_probe_timeout_seconds = float(
+            os.environ.get('CIRCUIT_BREAKER_PROBE_TIMEOUT_SECONDS', '30')
+        )
+        self.status_refresh_interval_seconds = float(os.environ.get('STATUS_REFRESH_INTERVAL_SECONDS', '300'))
+        self.status_check_timeout_seconds = float(os.environ.get('STATUS_CHECK_TIMEOUT_SECONDS', '60'))
+        self.status_aggregate_timeout_seconds = float(os.environ.get('STATUS_AGGREGATE_TIMEOUT_SECONDS', '30'))
+        self.multi_timeout_seconds = float(os.environ.get('MULTI_TIMEOUT_SECONDS', '180'))
+        self.hedge_percentile = float(os.environ.get('HEDGE_PERCENTILE', '0.95'))
+        self.hedge_default_delay_seconds = float(os.environ.get('HEDGE_DEFAULT_DELAY_SECONDS', '30'))
+        self.batch_default_parallelism = int(os.environ.get('BATCH_DEFAULT_PARALLELISM', '2'))
+        self.batch_max_parallelism = int(os.environ.get('BATCH_MAX_PARALLELISM', '8'))
+        self.conversation_cache_max_entries = int(os.environ.get('CONVERSATION_CACHE_MAX_ENTRIES', '1000'))
+        self.conversation_cache_in_progress_ttl_seconds = float(
+            os.environ.get('CONVERSATION_CACHE_IN_PROGRESS_TTL_SECONDS', '5')
+        )
+        self.conversation_cache_completed_ttl_seconds = float(
+            os.environ.get('CONVERSATION_CACHE_COMPLETED_TTL_SECONDS', '0')
+        )
+        self.account_scheduling_strategy = os.environ.get('ACCOUNT_SCHEDULING_STRATEGY', 'least_loaded').strip()
+        self.job_max_workers = int(os.environ.get('JOB_MAX_WORKERS', '4'))
+        self.job_max_retained = int(os.environ.get('JOB_MAX_RETAINED', '1000'))
+        self.job_retention_seconds = float(os.environ.get('JOB_RETENTION_SECONDS', '3600'))
         self.perplexity_session_cookie = os.environ.get('PERPLEXITY_SESSION_COOKIE', '')
         self.chatgpt_session_cookie = os.environ.get('CHATGPT_SESSION_COOKIE', '')
         self.chatgpt_session_cookie_chunks = self._read_numbered_environment_values('CHATGPT_SESSION_COOKIE_')
@@ -84,6 +199,15 @@ class DefaultContainer:
         self.gemini_cookie_1psid = os.environ.get('GEMINI_COOKIE_1PSID', '')
         self.gemini_cookie_1psidts = os.environ.get('GEMINI_COOKIE_1PSIDTS', '')
         self.deepseek_user_token_json = os.environ.get('DEEPSEEK_USER_TOKEN_JSON', '')
+        # Credenziali degli account aggiuntivi, es. CHATGPT_SESSION_COOKIE__acct2
+        self.chatgpt_session_cookie_by_account = self._read_account_environment_values('CHATGPT_SESSION_COOKIE')
+        self.perplexity_session_cookie_by_account = self._read_account_environment_values('PERPLEXITY_SESSION_COOKIE')
+        self.kimi_access_token_by_account = self._read_account_environment_values('KIMI_ACCESS_TOKEN')
+        self.kimi_refresh_token_by_account = self._read_account_environment_values('KIMI_REFRESH_TOKEN')
+        self.qwen_session_cookie_by_account = self._read_account_environment_values('QWEN_SESSION_COOKIE')
+        self.gemini_cookie_1psid_by_account = self._read_account_environment_values('GEMINI_COOKIE_1PSID')
+        self.gemini_cookie_1psidts_by_account = self._read_account_environment_values('GEMINI_COOKIE_1PSIDTS')
+        self.deepseek_user_token_json_by_account = self._read_account_environment_values('DEEPSEEK_USER_TOKEN_JSON')
 
     @staticmethod
     def _read_numbered_environment_values(prefix: str) -> list[str]:
@@ -101,6 +225,48 @@ class DefaultContainer:
         max_index = max(indexed_keys)
         return [os.environ.get(f'{prefix}{index}', '') for index in range(max_index + 1)]
 
+    @staticmethod
+    def _read_provider_environment_values(prefix: str) -> dict[str, int]:
+        """Override per provider, es. ADMISSION_MAX_IN_FLIGHT_CHATGPT=1 -> {"chatgpt": 1}."""
+        values = {}
+        for key, value in os.environ.items():
+            if key.startswith(prefix) and key[len(prefix):] and value.strip():
+                values[key[len(prefix):].lower()] = int(value)
+        return values
+
+    @staticmethod
+    def _read_list_environment_value(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
+        """Lista separata da virgole, es. RESOURCE_BLOCKED_TYPES=image,font; se non impostata usa `default`."""
+        value = os.environ.get(name)
+        if value is None:
+            return tuple(default)
+        return tuple(item.strip() for item in value.split(',') if item.strip())
+
+    @staticmethod
+    def _read_account_environment_values(name: str) -> dict[str, str]:
+        """Valori per account, es. KIMI_ACCESS_TOKEN__acct2=... -> {"acct2": "..."}."""
+        prefix = f'{name}__'
+        return {
+            key[len(prefix):]: value
+            for key, value in os.environ.items()
+            if key.startswith(prefix) and key[len(prefix):] and value.strip()
+        }
+
+    def _provider_accounts(self, provider: str, *account_values: dict[str, str]) -> list[str]:
+        """Account aggiuntivi di un provider: da variabili d'ambiente o da sessioni gia' salvate."""
+        accounts = set()
+        for values in account_values:
+            accounts.update(values)
+        if os.path.isdir(self.accounts_session_dir):
+            for account in os.listdir(self.accounts_session_dir):
+                if os.path.isdir(os.path.join(self.accounts_session_dir, account, provider)):
+                    accounts.add(account)
+        accounts.discard(AccountPoolManager.DEFAULT_ACCOUNT)
+        return sorted(accounts)
+
+    def _account_session_dir(self, account: str) -> str:
+        return os.path.join(self.accounts_session_dir, account)
+
     @staticmethod
     def _parse_headless_mode(value: str | None) -> bool | Literal["virtual"]:
         normalized = (value or "true").strip().lower()
@@ -117,18 +283,175 @@ class DefaultContainer:
         chat_to_api_mapper = ChatToApiMapper()
         self.injector.binder.bind(ChatToApiMapper, to=chat_to_api_mapper)
 
+        # Bind BrowserPoolManager, condiviso da tutti i client
+        self.browser_pool_manager = BrowserPoolManager(
+            self.headless,
+            self.browser_pool_size,
+            self.browser_pool_max_uses,
+            self.browser_pool_health_check_interval_seconds,
+        )
+        self.injector.binder.bind(BrowserPoolManager, to=self.browser_pool_manager)
+
+        # Bind WarmPagePoolManager, i client vi registrano le proprie pagine pre-autenticate
+        self.warm_page_pool_manager = WarmPagePoolManager(
+            self.warm_page_pool_size,
+            self.warm_page_max_idle_seconds,
+        )
+        self.injector.binder.bind(WarmPagePoolManager, to=self.warm_page_pool_manager)
+
+        # Bind HttpClientManager, un client HTTP keep-alive per host condiviso dai client
+        self.http_client_manager = HttpClientManager(
+            self.http_max_connections,
+            self.http_max_keepalive_connections,
+            self.http_keepalive_expiry_seconds,
+            self.http_timeout_seconds,
+        )
+        self.injector.binder.bind(HttpClientManager, to=self.http_client_manager)
+
+        # Bind RetryManager, retry con backoff esponenziale e budget per provider condiviso dai client
+        self.retry_manager = RetryManager(
+            self.retry_budget_ratio,
+            self.retry_min_retries_per_window,
+            self.retry_budget_window_seconds,
+        )
+        self.injector.binder.bind(RetryManager, to=self.retry_manager)
+
+        # Bind LatencyManager, latenze recenti delle operazioni dei client (percentili per l'hedging)
+        self.latency_manager = LatencyManager(self.latency_window_size, self.latency_min_samples)
+        self.injector.binder.bind(LatencyManager, to=self.latency_manager)
+
+        # Bind MetricsManager, durate ed esiti delle operazioni dei client esposti su /metrics
+        self.metrics_manager = MetricsManager()
+        self.injector.binder.bind(MetricsManager, to=self.metrics_manager)
+
+        # Bind StickyPageManager, tiene aperta la pagina di una conversazione tra un turno e l'altro
+        self.sticky_page_manager = StickyPageManager(self.sticky_page_idle_ttl_seconds, self.sticky_page_max_pages)
+        self.injector.binder.bind(StickyPageManager, to=self.sticky_page_manager)
+
+        # Bind ResourceBlockingManager, scarta immagini, font e tracker dalle pagine dei provider
+        self.resource_blocking_manager = ResourceBlockingManager(
+            self.resource_blocking_enabled,
+            self.resource_blocked_types,
+            self.resource_blocked_url_patterns,
+        )
+        self.injector.binder.bind(ResourceBlockingManager, to=self.resource_blocking_manager)
+
+        # Bind AssetCacheManager, cache su disco dei bundle statici condivisa tra i context
+        self.asset_cache_manager = AssetCacheManager(
+            self.asset_cache_dir,
+            self.asset_cache_max_mb * 1024 * 1024,
+            self.asset_cache_enabled,
+        )
+        self.injector.binder.bind(AssetCacheManager, to=self.asset_cache_manager)
+
+        # Bind AdmissionManager, limita le richieste concorrenti per provider
+        self.admission_manager = AdmissionManager(
+            self.admission_max_in_flight,
+            self.admission_max_queue_size,
+            self.admission_queue_timeout_seconds,
+        )
+        for provider, max_in_flight in self.admission_max_in_flight_by_provider.items():
+            self.admission_manager.configure(provider, max_in_flight=max_in_flight)
+        self.injector.binder.bind(AdmissionManager, to=self.admission_manager)
+
+        # Bind AccountPoolManager, distribuisce le richieste tra gli account di ogni provider
+        self.account_pool_manager = AccountPoolManager(self.account_scheduling_strategy)
+        self.injector.binder.bind(AccountPoolManager, to=self.account_pool_manager)
+
+        # Bind ConversationCacheManager, letture delle conversazioni condivise dai service
+        self.conversation_cache_manager = ConversationCacheManager(
+            self.conversation_cache_max_entries,
+            self.conversation_cache_in_progress_ttl_seconds,
+            self.conversation_cache_completed_ttl_seconds,
+        )
+        self.injector.binder.bind(ConversationCacheManager, to=self.conversation_cache_manager)
+
+        # Bind SingleFlightManager, accorpa le letture concorrenti della stessa conversazione
+        self.single_flight_manager = SingleFlightManager()
+        self.injector.binder.bind(SingleFlightManager, to=self.single_flight_manager)
+
+        # Bind CircuitBreakerManager, i service vi registrano la propria sonda di status
+        self.circuit_breaker_manager = CircuitBreakerManager(
+            self.circuit_breaker_failure_threshold,
+            self.circuit_breaker_open_seconds,
+            self.circuit_breaker_probe_timeout_seconds,
+        )
+        self.injector.binder.bind(CircuitBreakerManager, to=self.circuit_breaker_manager)
+
+        # Bind StatusMonitorManager, aggiorna in background lo stato dei provider
+        self.status_monitor_manager = StatusMonitorManager(
+            self.status_refresh_interval_seconds,
+            self.status_check_timeout_seconds,
+        )
+        self.injector.binder.bind(StatusMonitorManager, to=self.status_monitor_manager)
+
+        # Bind BatchManager, esegue i batch di messaggi con parallelismo limitato
+        self.batch_manager = BatchManager(self.batch_default_parallelism, self.batch_max_parallelism)
+        self.injector.binder.bind(BatchManager, to=self.batch_manager)
+
+        # Bind SystemService e SystemController
+        system_service = SystemService(
+            self.admission_manager,
+            self.account_pool_manager,
+            self.conversation_cache_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.latency_manager,
+            self.resource_blocking_manager,
+            self.asset_cache_manager,
+        )
+        self.injector.binder.bind(SystemService, to=system_service)
+        system_controller = SystemController(system_service)
+        self.injector.binder.bind(SystemController, to=system_controller)
+
         # Bind PerplexityClient with session_dir and headless
         perplexity_client = PerplexityClient(
             self.session_dir,
             self.headless,
             self.perplexity_session_cookie,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(PerplexityClient, to=perplexity_client)
 
         # Bind PerplexityService
         perplexity_chat_mapper = PerplexityChatMapper()
         self.injector.binder.bind(PerplexityChatMapper, to=perplexity_chat_mapper)
-        perplexity_service = PerplexityService(perplexity_client, perplexity_chat_mapper)
+        perplexity_account_clients = {
+            account: PerplexityClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.perplexity_session_cookie_by_account.get(account, ''),
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('perplexity', self.perplexity_session_cookie_by_account)
+        }
+        perplexity_service = PerplexityService(
+            perplexity_client,
+            perplexity_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            perplexity_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(PerplexityService, to=perplexity_service)
 
         # Bind PerplexityController
@@ -142,13 +465,51 @@ class DefaultContainer:
             self.chatgpt_session_cookie,
             self.chatgpt_session_cookie_chunks,
             self.chatgpt_workspace_name,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(ChatGptClient, to=chatgpt_client)
 
         # Bind ChatGptService
         chatgpt_chat_mapper = ChatGptChatMapper()
         self.injector.binder.bind(ChatGptChatMapper, to=chatgpt_chat_mapper)
-        chatgpt_service = ChatGptService(chatgpt_client, chatgpt_chat_mapper)
+        chatgpt_account_clients = {
+            account: ChatGptClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.chatgpt_session_cookie_by_account.get(account, ''),
+                [],
+                self.chatgpt_workspace_name,
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('chatgpt', self.chatgpt_session_cookie_by_account)
+        }
+        chatgpt_service = ChatGptService(
+            chatgpt_client,
+            chatgpt_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            chatgpt_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(ChatGptService, to=chatgpt_service)
 
         # Bind ChatGptController
@@ -161,13 +522,50 @@ class DefaultContainer:
             self.headless,
             self.kimi_access_token,
             self.kimi_refresh_token,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(KimiClient, to=kimi_client)
 
         # Bind KimiService
         kimi_chat_mapper = KimiChatMapper()
         self.injector.binder.bind(KimiChatMapper, to=kimi_chat_mapper)
-        kimi_service = KimiService(kimi_client, kimi_chat_mapper)
+        kimi_account_clients = {
+            account: KimiClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.kimi_access_token_by_account.get(account, ''),
+                self.kimi_refresh_token_by_account.get(account, ''),
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('kimi', self.kimi_access_token_by_account, self.kimi_refresh_token_by_account)
+        }
+        kimi_service = KimiService(
+            kimi_client,
+            kimi_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            kimi_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(KimiService, to=kimi_service)
 
         # Bind KimiController
@@ -179,13 +577,49 @@ class DefaultContainer:
             self.session_dir,
             self.headless,
             self.qwen_session_cookie,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(QwenClient, to=qwen_client)
 
         # Bind QwenService
         qwen_chat_mapper = QwenChatMapper()
         self.injector.binder.bind(QwenChatMapper, to=qwen_chat_mapper)
-        qwen_service = QwenService(qwen_client, qwen_chat_mapper)
+        qwen_account_clients = {
+            account: QwenClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.qwen_session_cookie_by_account.get(account, ''),
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('qwen', self.qwen_session_cookie_by_account)
+        }
+        qwen_service = QwenService(
+            qwen_client,
+            qwen_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            qwen_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(QwenService, to=qwen_service)
 
         # Bind QwenController
@@ -197,13 +631,49 @@ class DefaultContainer:
             self.session_dir,
             self.headless,
             self.deepseek_user_token_json,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(DeepseekClient, to=deepseek_client)
 
         # Bind DeepseekService
         deepseek_chat_mapper = DeepseekChatMapper()
         self.injector.binder.bind(DeepseekChatMapper, to=deepseek_chat_mapper)
-        deepseek_service = DeepseekService(deepseek_client, deepseek_chat_mapper)
+        deepseek_account_clients = {
+            account: DeepseekClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.deepseek_user_token_json_by_account.get(account, ''),
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('deepseek', self.deepseek_user_token_json_by_account)
+        }
+        deepseek_service = DeepseekService(
+            deepseek_client,
+            deepseek_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            deepseek_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(DeepseekService, to=deepseek_service)
 
         # Bind DeepseekController
@@ -216,15 +686,139 @@ class DefaultContainer:
             self.headless,
             self.gemini_cookie_1psid,
             self.gemini_cookie_1psidts,
+            browser_pool=self.browser_pool_manager,
+            warm_page_pool=self.warm_page_pool_manager,
+            http_client_manager=self.http_client_manager,
+            retry_manager=self.retry_manager,
+            latency_manager=self.latency_manager,
+            sticky_page_manager=self.sticky_page_manager,
+            resource_blocking_manager=self.resource_blocking_manager,
+            asset_cache_manager=self.asset_cache_manager,
+            metrics_manager=self.metrics_manager,
         )
         self.injector.binder.bind(GeminiClient, to=gemini_client)
 
         # Bind GeminiService
         gemini_chat_mapper = GeminiChatMapper()
         self.injector.binder.bind(GeminiChatMapper, to=gemini_chat_mapper)
-        gemini_service = GeminiService(gemini_client, gemini_chat_mapper)
+        gemini_account_clients = {
+            account: GeminiClient(
+                self._account_session_dir(account),
+                self.headless,
+                self.gemini_cookie_1psid_by_account.get(account, ''),
+                self.gemini_cookie_1psidts_by_account.get(account, ''),
+                browser_pool=self.browser_pool_manager,
+                http_client_manager=self.http_client_manager,
+                retry_manager=self.retry_manager,
+                latency_manager=self.latency_manager,
+                sticky_page_manager=self.sticky_page_manager,
+                resource_blocking_manager=self.resource_blocking_manager,
+                asset_cache_manager=self.asset_cache_manager,
+                metrics_manager=self.metrics_manager,
+            )
+            for account in self._provider_accounts('gemini', self.gemini_cookie_1psid_by_account, self.gemini_cookie_1psidts_by_account)
+        }
+        gemini_service = GeminiService(
+            gemini_client,
+            gemini_chat_mapper,
+            self.admission_manager,
+            self.account_pool_manager,
+            gemini_account_clients,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.circuit_breaker_manager,
+            self.status_monitor_manager,
+            self.batch_manager,
+        )
         self.injector.binder.bind(GeminiService, to=gemini_service)
 
         # Bind GeminiController
         gemini_controller = GeminiController(gemini_service, chat_to_api_mapper)
         self.injector.binder.bind(GeminiController, to=gemini_controller)
+
+        # Con piu' account il limite di richieste concorrenti del provider cresce di conseguenza
+        for provider in ('chatgpt', 'deepseek', 'gemini', 'kimi', 'perplexity', 'qwen'):
+            account_count = len(self.account_pool_manager.accounts(provider))
+            if account_count > 1 and provider not in self.admission_max_in_flight_by_provider:
+                self.admission_manager.configure(provider, max_in_flight=self.admission_max_in_flight * account_count)
+
+        # Bind JobManager, JobService e JobController (richieste eseguite in background)
+        self.job_manager = JobManager(
+            self.job_max_workers,
+            self.job_max_retained,
+            self.job_retention_seconds,
+        )
+        self.injector.binder.bind(JobManager, to=self.job_manager)
+        job_to_api_mapper = JobToApiMapper(chat_to_api_mapper)
+        self.injector.binder.bind(JobToApiMapper, to=job_to_api_mapper)
+        self.job_service = JobService(
+            self.job_manager,
+            self.http_client_manager,
+            job_to_api_mapper,
+            chatgpt_service,
+            deepseek_service,
+            gemini_service,
+            kimi_service,
+            perplexity_service,
+            qwen_service,
+        )
+        self.injector.binder.bind(JobService, to=self.job_service)
+        job_controller = JobController(self.job_service, job_to_api_mapper)
+        self.injector.binder.bind(JobController, to=job_controller)
+
+        # Bind StatusService e StatusController (GET /status con tutti i provider)
+        status_service = StatusService(
+            chatgpt_service,
+            deepseek_service,
+            gemini_service,
+            kimi_service,
+            perplexity_service,
+            qwen_service,
+            self.status_aggregate_timeout_seconds,
+        )
+        self.injector.binder.bind(StatusService, to=status_service)
+        status_controller = StatusController(status_service)
+        self.injector.binder.bind(StatusController, to=status_controller)
+
+        # Bind MultiService e MultiController (stesso messaggio a piu' provider in parallelo)
+        multi_to_api_mapper = MultiToApiMapper(chat_to_api_mapper)
+        self.injector.binder.bind(MultiToApiMapper, to=multi_to_api_mapper)
+        multi_service = MultiService(
+            chatgpt_service,
+            deepseek_service,
+            gemini_service,
+            kimi_service,
+            perplexity_service,
+            qwen_service,
+            self.multi_timeout_seconds,
+            self.latency_manager,
+            self.hedge_percentile,
+            self.hedge_default_delay_seconds,
+        )
+        self.injector.binder.bind(MultiService, to=multi_service)
+        multi_controller = MultiController(multi_service, multi_to_api_mapper)
+        self.injector.binder.bind(MultiController, to=multi_controller)
+
+        # Bind MetricsService e MetricsController (GET /metrics in formato Prometheus)
+        metrics_service = MetricsService(
+            self.metrics_manager,
+            self.browser_pool_manager,
+            self.warm_page_pool_manager,
+            self.sticky_page_manager,
+            self.admission_manager,
+            self.account_pool_manager,
+            self.conversation_cache_manager,
+            self.single_flight_manager,
+            self.retry_manager,
+            self.circuit_breaker_manager,
+            self.job_manager,
+            self.batch_manager,
+            self.http_client_manager,
+            self.status_monitor_manager,
+            self.latency_manager,
+            self.resource_blocking_manager,
+            self.asset_cache_manager,
+        )
+        self.injector.binder.bind(MetricsService, to=metrics_service)
+        metrics_controller = MetricsController(metrics_service)
+        self.injector.binder.bind(MetricsController, to=metrics_controller)
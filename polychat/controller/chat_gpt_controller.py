@@ -1,10 +1,14 @@
-from io import BytesIO
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from injector import inject
+from starlette.background import BackgroundTask
 
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.circuit_breaker_manager import CircuitOpenError
 from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.model.chat_batch_request import ChatBatchRequest
 from polychat.model.chat_request import ChatRequest
 from polychat.model.api.login_request import LoginRequest
 from polychat.model.api.chat_response import (
@@ -41,6 +45,20 @@ class ChatGptController:
             summary="Invia un messaggio a ChatGPT e attende la risposta finale",
             response_model=ChatCompleteResponse,
         )
+        self.router.add_api_route(
+            "/stream",
+            self.create_chat_stream,
+            methods=["POST"],
+            summary="Invia un messaggio a ChatGPT e restituisce la risposta in streaming (SSE)",
+            response_class=StreamingResponse,
+        )
+        self.router.add_api_route(
+            "/batch",
+            self.create_chat_batch,
+            methods=["POST"],
+            summary="Invia piu' messaggi a ChatGPT e restituisce i risultati in NDJSON man mano che terminano",
+            response_class=StreamingResponse,
+        )
         self.router.add_api_route(
             "/login",
             self.login,
@@ -83,17 +101,28 @@ class ChatGptController:
                 type_input=request.type,
             )
             return self.chat_to_api_mapper.create_start_from(chat)
+        except AdmissionRejectedError as exc:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(exc)
+        except CircuitOpenError as exc:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(exc)
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error processing ChatGPT request: {exc}",
             )
 
-    async def get_chat_response(self, chat_id: str) -> ChatMessageResponse:
+    async def get_chat_response(
+        self,
+        chat_id: str,
+        response: Response = None,
+        if_none_match: Annotated[Optional[str], Header(alias="If-None-Match")] = None,
+    ) -> ChatMessageResponse:
         """Recupera la risposta di ChatGPT a partire dall'ID conversazione."""
         try:
             chat = await self.chatgpt_service.get_conversation(chat_id)
-            return self.chat_to_api_mapper.create_message_from(chat)
+            return self.chat_to_api_mapper.create_conditional_message_from(chat, response, if_none_match)
+        except CircuitOpenError as exc:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(exc)
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -109,12 +138,41 @@ class ChatGptController:
                 type_input=request.type,
             )
             return self.chat_to_api_mapper.create_complete_from(chat)
+        except AdmissionRejectedError as exc:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(exc)
+        except CircuitOpenError as exc:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(exc)
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error processing blocking ChatGPT request: {exc}",
             )
 
+    async def create_chat_stream(self, request: ChatRequest) -> StreamingResponse:
+        """Invia un messaggio e inoltra la risposta come text/event-stream man mano che viene generata."""
+        events = self.chatgpt_service.ask_stream(request.message, request.chat_id, type_input=request.type)
+        try:
+            # Admission e circuit breaker vengono verificati prima del primo evento
+            first_event = await anext(events, None)
+        except AdmissionRejectedError as exc:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(exc)
+        except CircuitOpenError as exc:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(exc)
+        return StreamingResponse(
+            self.chat_to_api_mapper.create_sse_stream_from(events, first_event),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def create_chat_batch(self, request: ChatBatchRequest) -> StreamingResponse:
+        """Una riga JSON per messaggio, nell'ordine di completamento; gli errori non interrompono il batch."""
+        items = self.chatgpt_service.ask_batch(request.requests, request.parallelism)
+        return StreamingResponse(
+            self.chat_to_api_mapper.create_ndjson_stream_from(items),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     def logout(self) -> dict:
         """Logout ChatGPT (rimuove cookie e storage state)."""
         try:
@@ -126,9 +184,12 @@ class ChatGptController:
                 detail=f"Error processing ChatGPT logout: {exc}",
             )
 
-    async def get_status(self) -> ChannelStatusResponse:
+    async def get_status(
+        self,
+        refresh: Annotated[bool, Query(description="Esegue un controllo live invece di usare lo stato in memoria")] = False,
+    ) -> ChannelStatusResponse:
         try:
-            return ChannelStatusResponse.model_validate(await self.chatgpt_service.status())
+            return ChannelStatusResponse.model_validate(await self.chatgpt_service.status(refresh=refresh))
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -145,21 +206,42 @@ class ChatGptController:
                 detail=f"Error processing ChatGPT login: {exc}",
             )
 
-    def proxy_download(self, download_url: str = Query(...)) -> StreamingResponse:
-        """Proxy di download_url ChatGPT aggiungendo cookie di sessione in header Cookie."""
+    async def proxy_download(
+        self,
+        download_url: str = Query(...),
+        chat_id: Optional[str] = Query(None, description="Conversazione del file, per usare la sessione del suo account"),
+        range_header: Optional[str] = Header(None, alias="Range"),
+        if_range: Optional[str] = Header(None, alias="If-Range"),
+        if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+        if_modified_since: Optional[str] = Header(None, alias="If-Modified-Since"),
+    ) -> StreamingResponse:
+        """
+        Proxy di download_url ChatGPT aggiungendo cookie di sessione in header Cookie.
+        Il file viene inoltrato a chunk man mano che arriva (memoria costante), con
+        supporto a Range/ETag e agli header di lunghezza originali.
+        """
+        request_headers = {
+            "Range": range_header,
+            "If-Range": if_range,
+            "If-None-Match": if_none_match,
+            "If-Modified-Since": if_modified_since,
+        }
         try:
-            content, status_code, content_type, content_disposition = self.chatgpt_service.proxy_download(download_url)
-            headers = {}
-            if content_disposition:
-                headers["Content-Disposition"] = content_disposition
-            return StreamingResponse(
-                BytesIO(content),
-                media_type=content_type,
-                status_code=status_code,
-                headers=headers,
+            download = await self.chatgpt_service.proxy_download(
+                download_url,
+                {name: value for name, value in request_headers.items() if value},
+                chat_id,
             )
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error proxying ChatGPT download: {exc}",
             )
+
+        return StreamingResponse(
+            download.iter_bytes(),
+            media_type=download.media_type,
+            status_code=download.status_code,
+            headers=download.headers,
+            background=BackgroundTask(download.aclose),
+        )
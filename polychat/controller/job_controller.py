@@ -0,0 +1,63 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from injector import inject
+
+from polychat.manager.job_manager import JobCapacityError
+from polychat.mapper.service.job_to_api_mapper import JobToApiMapper
+from polychat.model.api.job_request import JobRequest
+from polychat.model.api.job_response import JobResponse
+from polychat.service.job_service import JobService
+
+
+class JobController:
+    """Controller per i job asincroni: la richiesta ritorna subito, il risultato si legge dopo."""
+
+    MAX_WAIT_SECONDS = 60.0
+
+    @inject
+    def __init__(self, job_service: JobService, job_to_api_mapper: JobToApiMapper):
+        self.job_service = job_service
+        self.job_to_api_mapper = job_to_api_mapper
+        self.router = APIRouter(prefix="/jobs", tags=["Jobs"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "",
+            self.create_job,
+            methods=["POST"],
+            summary="Accoda un messaggio per un provider e restituisce subito l'id del job",
+            response_model=JobResponse,
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+        self.router.add_api_route(
+            "/{job_id}",
+            self.get_job,
+            methods=["GET"],
+            summary="Stato e risultato di un job (con `wait` attende fino alla fine)",
+            response_model=JobResponse,
+        )
+
+    def create_job(self, request: JobRequest) -> JobResponse:
+        try:
+            job = self.job_service.submit(
+                request.provider,
+                request.message,
+                request.chat_id,
+                type_input=request.type,
+                webhook_url=request.webhook_url,
+            )
+            return self.job_to_api_mapper.create_from(job)
+        except JobCapacityError as exc:
+            raise self.job_to_api_mapper.create_capacity_error_from(exc)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    async def get_job(
+        self,
+        job_id: str,
+        wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS, description="Secondi di long-poll"),
+    ) -> JobResponse:
+        job = await self.job_service.wait(job_id, wait)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} non trovato")
+        return self.job_to_api_mapper.create_from(job)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from injector import inject
+
+from polychat.service.metrics_service import MetricsService
+
+
+class MetricsController:
+    """Controller per le metriche in formato Prometheus."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    @inject
+    def __init__(self, metrics_service: MetricsService):
+        self.metrics_service = metrics_service
+        self.router = APIRouter(tags=["Metrics"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "/metrics",
+            self.get_metrics,
+            methods=["GET"],
+            summary="Metriche per provider e operazione in formato testo Prometheus",
+            response_class=PlainTextResponse,
+        )
+
+    async def get_metrics(self) -> PlainTextResponse:
+        return PlainTextResponse(self.metrics_service.render(), media_type=self.CONTENT_TYPE)
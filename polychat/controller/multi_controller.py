@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, status
+from injector import inject
+
+from polychat.mapper.service.multi_to_api_mapper import MultiToApiMapper
+from polychat.model.api.multi_complete_request import MultiCompleteRequest
+from polychat.model.api.multi_complete_response import MultiCompleteResponse
+from polychat.service.multi_service import MultiService
+
+
+class MultiController:
+    """Controller per le richieste inviate a piu' provider contemporaneamente."""
+
+    @inject
+    def __init__(self, multi_service: MultiService, multi_to_api_mapper: MultiToApiMapper):
+        self.multi_service = multi_service
+        self.multi_to_api_mapper = multi_to_api_mapper
+        self.router = APIRouter(prefix="/multi", tags=["Multi"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "/complete",
+            self.create_complete,
+            methods=["POST"],
+            summary="Invia un messaggio a piu' provider in parallelo (modalita' first, all, quorum o hedged)",
+            response_model=MultiCompleteResponse,
+        )
+
+    async def create_complete(self, request: MultiCompleteRequest) -> MultiCompleteResponse:
+        try:
+            completion = await self.multi_service.complete(
+                request.providers,
+                request.message,
+                mode=request.mode,
+                quorum=request.quorum,
+                timeout_seconds=request.timeout_seconds,
+                type_input=request.type,
+                hedge_after_seconds=request.hedge_after_seconds,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        return self.multi_to_api_mapper.create_from(completion)
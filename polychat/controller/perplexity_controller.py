@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from injector import inject
 
+from polychat.model.chat_batch_request import ChatBatchRequest
 from polychat.model.chat_request import ChatRequest
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.circuit_breaker_manager import CircuitOpenError
 from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
 from polychat.model.api.login_request import LoginRequest
 from polychat.model.api.chat_response import (
@@ -39,6 +45,20 @@ class PerplexityController:
             summary="Send a message to Perplexity and wait for the completed response",
             response_model=ChatCompleteResponse,
         )
+        self.router.add_api_route(
+            "/stream",
+            self.create_chat_stream,
+            methods=["POST"],
+            summary="Invia un messaggio a Perplexity e restituisce la risposta in streaming (SSE)",
+            response_class=StreamingResponse,
+        )
+        self.router.add_api_route(
+            "/batch",
+            self.create_chat_batch,
+            methods=["POST"],
+            summary="Invia piu' messaggi a Perplexity e restituisce i risultati in NDJSON man mano che terminano",
+            response_class=StreamingResponse,
+        )
         self.router.add_api_route(
             "/login",
             self.login,
@@ -75,17 +95,28 @@ class PerplexityController:
                 type_input=request.type,
             )
             return self.chat_to_api_mapper.create_start_from(chat)
+        except AdmissionRejectedError as e:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(e)
+        except CircuitOpenError as e:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error processing request: {str(e)}",
             )
 
-    async def get_chat_response(self, chat_id: str) -> ChatMessageResponse:
+    async def get_chat_response(
+        self,
+        chat_id: str,
+        response: Response = None,
+        if_none_match: Annotated[Optional[str], Header(alias="If-None-Match")] = None,
+    ) -> ChatMessageResponse:
         """Get Perplexity response by conversation id (slug)."""
         try:
             chat = await self.perplexity_service.get_conversation(chat_id)
-            return self.chat_to_api_mapper.create_message_from(chat)
+            return self.chat_to_api_mapper.create_conditional_message_from(chat, response, if_none_match)
+        except CircuitOpenError as e:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -101,12 +132,41 @@ class PerplexityController:
                 type_input=request.type,
             )
             return self.chat_to_api_mapper.create_complete_from(chat)
+        except AdmissionRejectedError as e:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(e)
+        except CircuitOpenError as e:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error processing blocking request: {str(e)}",
             )
 
+    async def create_chat_stream(self, request: ChatRequest) -> StreamingResponse:
+        """Invia un messaggio e inoltra la risposta come text/event-stream man mano che viene generata."""
+        events = self.perplexity_service.ask_stream(request.message, request.chat_id, type_input=request.type)
+        try:
+            # Admission e circuit breaker vengono verificati prima del primo evento
+            first_event = await anext(events, None)
+        except AdmissionRejectedError as exc:
+            raise self.chat_to_api_mapper.create_too_many_requests_from(exc)
+        except CircuitOpenError as exc:
+            raise self.chat_to_api_mapper.create_service_unavailable_from(exc)
+        return StreamingResponse(
+            self.chat_to_api_mapper.create_sse_stream_from(events, first_event),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def create_chat_batch(self, request: ChatBatchRequest) -> StreamingResponse:
+        """Una riga JSON per messaggio, nell'ordine di completamento; gli errori non interrompono il batch."""
+        items = self.perplexity_service.ask_batch(request.requests, request.parallelism)
+        return StreamingResponse(
+            self.chat_to_api_mapper.create_ndjson_stream_from(items),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     def logout(self) -> dict:
         try:
             self.perplexity_service.logout()
@@ -117,9 +177,12 @@ class PerplexityController:
                 detail=f"Error processing Perplexity logout: {exc}",
             )
 
-    async def get_status(self) -> ChannelStatusResponse:
+    async def get_status(
+        self,
+        refresh: Annotated[bool, Query(description="Esegue un controllo live invece di usare lo stato in memoria")] = False,
+    ) -> ChannelStatusResponse:
         try:
-            return ChannelStatusResponse.model_validate(await self.perplexity_service.status())
+            return ChannelStatusResponse.model_validate(await self.perplexity_service.status(refresh=refresh))
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
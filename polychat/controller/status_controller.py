@@ -0,0 +1,38 @@
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Query
+from injector import inject
+
+from polychat.model.api.status_response import StatusResponse
+from polychat.service.status_service import StatusService
+
+
+class StatusController:
+    """Controller per lo stato aggregato di tutti i provider."""
+
+    MAX_TIMEOUT_SECONDS = 120.0
+
+    @inject
+    def __init__(self, status_service: StatusService):
+        self.status_service = status_service
+        self.router = APIRouter(tags=["Status"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "/status",
+            self.get_status,
+            methods=["GET"],
+            summary="Status di tutti i provider, controllati in parallelo",
+            response_model=StatusResponse,
+        )
+
+    async def get_status(
+        self,
+        refresh: Annotated[bool, Query(description="Esegue un controllo live invece di usare lo stato in memoria")] = False,
+        timeout: Annotated[
+            Optional[float],
+            Query(gt=0, le=MAX_TIMEOUT_SECONDS, description="Scadenza complessiva in secondi"),
+        ] = None,
+    ) -> StatusResponse:
+        return StatusResponse.model_validate(await self.status_service.status(refresh=refresh, timeout_seconds=timeout))
@@ -0,0 +1,82 @@
+from fastapi import APIRouter
+from injector import inject
+
+from polychat.service.system_service import SystemService
+
+
+class SystemController:
+    """Controller per lo stato interno del server."""
+
+    @inject
+    def __init__(self, system_service: SystemService):
+        self.system_service = system_service
+        self.router = APIRouter(prefix="/system", tags=["System"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "/admission",
+            self.get_admission_stats,
+            methods=["GET"],
+            summary="Richieste in corso e in coda per provider",
+        )
+        self.router.add_api_route(
+            "/accounts",
+            self.get_account_stats,
+            methods=["GET"],
+            summary="Carico degli account per provider",
+        )
+        self.router.add_api_route(
+            "/conversation-cache",
+            self.get_conversation_cache_stats,
+            methods=["GET"],
+            summary="Voci e hit della cache delle conversazioni",
+        )
+        self.router.add_api_route(
+            "/status-monitor",
+            self.get_status_monitor_stats,
+            methods=["GET"],
+            summary="Ultimo controllo di stato in background per provider",
+        )
+        self.router.add_api_route(
+            "/latency",
+            self.get_latency_stats,
+            methods=["GET"],
+            summary="Percentili di latenza per provider e operazione",
+        )
+        self.router.add_api_route(
+            "/resource-blocking",
+            self.get_resource_blocking_stats,
+            methods=["GET"],
+            summary="Richieste bloccate e byte scaricati dalle pagine dei provider",
+        )
+        self.router.add_api_route(
+            "/asset-cache",
+            self.get_asset_cache_stats,
+            methods=["GET"],
+            summary="Cache su disco degli asset statici dei provider",
+        )
+
+    def get_health(self) -> dict:
+        return self.system_service.health()
+
+    def get_admission_stats(self) -> dict:
+        return self.system_service.admission_stats()
+
+    def get_account_stats(self) -> dict:
+        return self.system_service.account_stats()
+
+    def get_conversation_cache_stats(self) -> dict:
+        return self.system_service.conversation_cache_stats()
+
+    def get_status_monitor_stats(self) -> dict:
+        return self.system_service.status_monitor_stats()
+
+    def get_latency_stats(self) -> dict:
+        return self.system_service.latency_stats()
+
+    def get_resource_blocking_stats(self) -> dict:
+        return self.system_service.resource_blocking_stats()
+
+    def get_asset_cache_stats(self) -> dict:
+        return self.system_service.asset_cache_stats()
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import itertools
+import logging
+from typing import AsyncIterator, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+SchedulingStrategy = Literal["least_loaded", "round_robin"]
+
+
+class _ProviderAccounts:
+    def __init__(self, accounts: list[str]) -> None:
+        self.accounts = accounts
+        self.in_flight = {account: 0 for account in accounts}
+        self.leases = {account: 0 for account in accounts}
+        self.cursor = itertools.count()
+
+
+class AccountPoolManager:
+    """
+    Distribuisce le richieste di un provider tra piu' account (identita' di sessione).
+
+    Le nuove conversazioni vanno all'account con meno richieste in corso (`least_loaded`,
+    a parita' si ruota) oppure a turno (`round_robin`). Una conversazione esistente resta
+    sull'account che l'ha creata: le associazioni chat_id -> account vengono ricordate
+    (al massimo `max_conversations`, le meno recenti vengono dimenticate). Una conversazione
+    non piu' nota (riavvio, eviction) va all'account di default, come le letture.
+    """
+
+    DEFAULT_ACCOUNT = "default"
+
+    def __init__(self, strategy: SchedulingStrategy = "least_loaded", max_conversations: int = 10000):
+        if strategy not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Strategia di scheduling non valida: {strategy}")
+        self.strategy = strategy
+        self.max_conversations = max(1, max_conversations)
+        self._providers: dict[str, _ProviderAccounts] = {}
+        self._conversations: OrderedDict[tuple[str, str], str] = OrderedDict()
+
+    def register(self, provider: str, accounts: list[str]) -> None:
+        if not accounts:
+            raise ValueError(f"Nessun account configurato per {provider}")
+        self._providers[provider] = _ProviderAccounts(list(dict.fromkeys(accounts)))
+
+    def accounts(self, provider: str) -> list[str]:
+        pool = self._providers.get(provider)
+        return list(pool.accounts) if pool is not None else [self.DEFAULT_ACCOUNT]
+
+    @asynccontextmanager
+    async def lease(self, provider: str, chat_id: Optional[str] = None) -> AsyncIterator[str]:
+        """Sceglie l'account per la richiesta e lo conta come occupato fino all'uscita."""
+        pool = self._providers.get(provider)
+        if pool is None:
+            yield self.DEFAULT_ACCOUNT
+            return
+
+        if chat_id:
+            account = self._known_account(provider, chat_id) or self._default_account(pool)
+        else:
+            account = self._select(pool)
+        pool.in_flight[account] += 1
+        pool.leases[account] += 1
+        try:
+            yield account
+        finally:
+            pool.in_flight[account] -= 1
+
+    def account_for(self, provider: str, chat_id: Optional[str]) -> str:
+        """Account che gestisce `chat_id`; quello di default se la conversazione non e' nota."""
+        return self._known_account(provider, chat_id) or self.DEFAULT_ACCOUNT
+
+    def remember_conversation(self, provider: str, chat_id: Optional[str], account: str) -> None:
+        if not chat_id or provider not in self._providers:
+            return
+
+        key = (provider, chat_id)
+        self._conversations[key] = account
+        self._conversations.move_to_end(key)
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "conversations": len(self._conversations),
+            "providers": {
+                provider: {
+                    account: {"in_flight": pool.in_flight[account], "leases": pool.leases[account]}
+                    for account in pool.accounts
+                }
+                for provider, pool in self._providers.items()
+            },
+        }
+
+    def _known_account(self, provider: str, chat_id: Optional[str]) -> Optional[str]:
+        if not chat_id:
+            return None
+
+        key = (provider, chat_id)
+        account = self._conversations.get(key)
+        pool = self._providers.get(provider)
+        if account is None or pool is None or account not in pool.in_flight:
+            return None
+        self._conversations.move_to_end(key)
+        return account
+
+    def _default_account(self, pool: _ProviderAccounts) -> str:
+        return self.DEFAULT_ACCOUNT if self.DEFAULT_ACCOUNT in pool.in_flight else pool.accounts[0]
+
+    def _select(self, pool: _ProviderAccounts) -> str:
+        offset = next(pool.cursor) % len(pool.accounts)
+        rotated = pool.accounts[offset:] + pool.accounts[:offset]
+        if self.strategy == "round_robin":
+            return rotated[0]
+        # min() restituisce il primo a parita' di carico: la rotazione distribuisce i pareggi
+        return min(rotated, key=lambda account: pool.in_flight[account])
@@ -0,0 +1,190 @@
+import asyncio
+from contextlib import asynccontextmanager
+import heapq
+import itertools
+import logging
+import math
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AdmissionRejectedError(Exception):
+    """Richiesta rifiutata per sovraccarico: coda piena o attesa oltre il timeout."""
+
+    def __init__(self, provider: str, reason: str, retry_after_seconds: int):
+        super().__init__(f"{provider} sovraccarico ({reason}), riprovare tra {retry_after_seconds}s")
+        self.provider = provider
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class _ProviderGate:
+    def __init__(self, max_in_flight: int, max_queue_size: int, queue_timeout_seconds: float) -> None:
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue_size = max(0, max_queue_size)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.in_flight = 0
+        # Heap di (priorita', sequenza, future): a parita' di priorita' vince l'ordine di arrivo
+        self.waiters: list[tuple[int, int, asyncio.Future]] = []
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.avg_hold_seconds: Optional[float] = None
+
+
+class AdmissionManager:
+    """
+    Limita le richieste in corso per provider, con una coda d'attesa limitata.
+
+    Ogni provider ha al massimo `max_in_flight` operazioni attive; le altre attendono in
+    coda (FIFO, oppure per `priority` crescente) fino a `queue_timeout_seconds`. Se la coda
+    e' piena o l'attesa scade la richiesta viene rifiutata subito con AdmissionRejectedError,
+    che riporta un Retry-After stimato dalla durata media delle operazioni.
+
+    Il lavoro in background (job, batch) non deve fallire per sovraccarico: con
+    `retry_until_admitted` attende il Retry-After e si rimette in coda.
+    """
+
+    HOLD_TIME_SMOOTHING = 0.2
+
+    def __init__(self, max_in_flight: int = 2, max_queue_size: int = 10, queue_timeout_seconds: float = 30.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._gates: dict[str, _ProviderGate] = {}
+        self._sequence = itertools.count()
+
+    def configure(
+        self,
+        provider: str,
+        max_in_flight: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        queue_timeout_seconds: Optional[float] = None,
+    ) -> None:
+        """Imposta limiti specifici per un provider (i valori None usano quelli di default)."""
+        self._gates[provider] = _ProviderGate(
+            self.max_in_flight if max_in_flight is None else max_in_flight,
+            self.max_queue_size if max_queue_size is None else max_queue_size,
+            self.queue_timeout_seconds if queue_timeout_seconds is None else queue_timeout_seconds,
+        )
+
+    @asynccontextmanager
+    async def admit(self, provider: str, priority: int = 0) -> AsyncIterator[None]:
+        """Attende uno slot libero per il provider; priorita' piu' bassa = servita prima."""
+        gate = self._get_gate(provider)
+        await self._acquire(provider, gate, priority)
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record_hold_time(gate, time.monotonic() - started_at)
+            self._release(gate)
+
+    @staticmethod
+    async def retry_until_admitted(operation: Callable[[], Awaitable[T]]) -> T:
+        """Esegue `operation`; se l'ammissione viene rifiutata riprova dopo il Retry-After suggerito."""
+        while True:
+            try:
+                return await operation()
+            except AdmissionRejectedError as exc:
+                logger.info(
+                    "Background request for %s not admitted (%s); retrying in %ss",
+                    exc.provider,
+                    exc.reason,
+                    exc.retry_after_seconds,
+                )
+                await asyncio.sleep(exc.retry_after_seconds)
+
+    def stats(self) -> dict:
+        return {
+            provider: {
+                "in_flight": gate.in_flight,
+                "queued": len(gate.waiters),
+                "max_in_flight": gate.max_in_flight,
+                "max_queue_size": gate.max_queue_size,
+                "admitted": gate.admitted,
+                "rejected": gate.rejected,
+                "timed_out": gate.timed_out,
+                "avg_wait_seconds": gate.total_wait_seconds / gate.admitted if gate.admitted else 0.0,
+                "max_wait_seconds": gate.max_wait_seconds,
+            }
+            for provider, gate in self._gates.items()
+        }
+
+    def _get_gate(self, provider: str) -> _ProviderGate:
+        if provider not in self._gates:
+            self.configure(provider)
+        return self._gates[provider]
+
+    async def _acquire(self, provider: str, gate: _ProviderGate, priority: int) -> None:
+        if gate.in_flight < gate.max_in_flight and not gate.waiters:
+            gate.in_flight += 1
+            self._record_admission(gate, 0.0)
+            return
+
+        if len(gate.waiters) >= gate.max_queue_size:
+            gate.rejected += 1
+            logger.info("Admission rejected for %s: queue full (%s waiting)", provider, len(gate.waiters))
+            raise AdmissionRejectedError(provider, "coda piena", self._retry_after_seconds(gate))
+
+        queued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(gate.waiters, entry)
+        try:
+            # Lo slot viene passato direttamente da chi rilascia: in_flight resta invariato
+            await asyncio.wait_for(future, timeout=gate.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._remove_waiter(gate, entry)
+            gate.timed_out += 1
+            gate.rejected += 1
+            logger.info("Admission rejected for %s: queued longer than %ss", provider, gate.queue_timeout_seconds)
+            raise AdmissionRejectedError(provider, "attesa in coda scaduta", self._retry_after_seconds(gate))
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(gate)
+            else:
+                self._remove_waiter(gate, entry)
+            raise
+
+        self._record_admission(gate, time.monotonic() - queued_at)
+
+    def _release(self, gate: _ProviderGate) -> None:
+        while gate.waiters:
+            _, _, future = heapq.heappop(gate.waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        gate.in_flight = max(0, gate.in_flight - 1)
+
+    @staticmethod
+    def _remove_waiter(gate: _ProviderGate, entry: tuple[int, int, asyncio.Future]) -> None:
+        if entry in gate.waiters:
+            gate.waiters.remove(entry)
+            heapq.heapify(gate.waiters)
+
+    @staticmethod
+    def _record_admission(gate: _ProviderGate, wait_seconds: float) -> None:
+        gate.admitted += 1
+        gate.total_wait_seconds += wait_seconds
+        gate.max_wait_seconds = max(gate.max_wait_seconds, wait_seconds)
+
+    def _record_hold_time(self, gate: _ProviderGate, hold_seconds: float) -> None:
+        if gate.avg_hold_seconds is None:
+            gate.avg_hold_seconds = hold_seconds
+        else:
+            gate.avg_hold_seconds += self.HOLD_TIME_SMOOTHING * (hold_seconds - gate.avg_hold_seconds)
+
+    @staticmethod
+    def _retry_after_seconds(gate: _ProviderGate) -> int:
+        """Stima del tempo necessario a smaltire la coda attuale, almeno 1 secondo."""
+        if gate.avg_hold_seconds is None:
+            return 1
+        estimate = gate.avg_hold_seconds * (len(gate.waiters) + 1) / gate.max_in_flight
+        return max(1, math.ceil(estimate))
@@ -0,0 +1,253 @@
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Path degli asset con hash nel nome (webpack/vite/Next.js): il contenuto di un URL non cambia mai
+DEFAULT_ASSET_PATTERNS = (
+    r"/_next/static/",
+    r"[./\-_~](?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{8,}\.(?:m?js|css|woff2?|ttf|otf)$",
+)
+CACHEABLE_RESOURCE_TYPES = frozenset({"script", "stylesheet", "font"})
+# Header della response originale riproposti quando l'asset viene servito dalla cache
+STORED_HEADERS = (
+    "content-type",
+    "cache-control",
+    "access-control-allow-origin",
+    "access-control-allow-credentials",
+    "cross-origin-resource-policy",
+    "timing-allow-origin",
+)
+
+
+class _AssetEntry:
+    def __init__(self, digest: str, size: int, headers: dict[str, str]) -> None:
+        self.digest = digest
+        self.size = size
+        self.headers = headers
+
+
+class AssetCacheManager:
+    """
+    Cache su disco degli asset statici dei provider, condivisa tra tutti i BrowserContext.
+
+    Ogni context nasce con la cache del browser vuota e riscarica i bundle JS/CSS del provider.
+    Il manager installa sul context una route per gli asset immutabili (nome con hash, es.
+    `/_next/static/...`): la prima richiesta va in rete e il corpo viene salvato in
+    `cache_dir/objects` con il suo sha256 come nome, le successive sono servite dal disco.
+    Oltre `max_bytes` si eliminano gli URL usati meno di recente; l'indice URL -> digest e'
+    salvato in `cache_dir/index.json` e ricaricato all'avvio.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        enabled: bool = True,
+        asset_patterns: tuple[str, ...] = DEFAULT_ASSET_PATTERNS,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, max_bytes)
+        self.enabled = enabled and self.max_bytes > 0
+        self._asset_patterns = [re.compile(pattern) for pattern in asset_patterns]
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._index_path = os.path.join(cache_dir, "index.json")
+        self._entries: OrderedDict[str, _AssetEntry] = OrderedDict()
+        self._loaded = False
+        self._start_lock = asyncio.Lock()
+        # Le scritture dell'indice sono serializzate: ognuna salva lo stato piu' recente
+        self._write_lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evictions = 0
+
+    async def start(self) -> None:
+        """Carica l'indice salvato; le route vengono installate solo a caricamento concluso."""
+        async with self._start_lock:
+            if not self.enabled or self._loaded:
+                return
+            for item in await asyncio.to_thread(self._read_index):
+                self._entries[item["url"]] = _AssetEntry(item["digest"], item["size"], item.get("headers", {}))
+            self._evict()
+            known = {entry.digest for entry in self._entries.values()}
+            await asyncio.to_thread(self._remove_orphans, known)
+            self._loaded = True
+
+    async def stop(self) -> None:
+        if self.enabled and self._loaded:
+            async with self._write_lock:
+                await asyncio.to_thread(self._write_index, self._index_payload())
+
+    def is_cacheable(self, url: str) -> bool:
+        path = urlsplit(url).path
+        return any(pattern.search(path) for pattern in self._asset_patterns)
+
+    async def install(self, context) -> None:  # noqa: ANN001
+        if not self.enabled or not hasattr(context, "route"):
+            return
+
+        await self.start()
+        await context.route(self.is_cacheable, self._handle_route)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes(),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stored": self.stored,
+            "evictions": self.evictions,
+        }
+
+    async def _handle_route(self, route) -> None:  # noqa: ANN001
+        request = route.request
+        if request.method != "GET" or request.resource_type not in CACHEABLE_RESOURCE_TYPES:
+            await route.fallback()
+            return
+
+        url = request.url
+        entry = self._entries.get(url)
+        if entry is not None:
+            body = await asyncio.to_thread(self._read_object, entry.digest)
+            if body is not None:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                await route.fulfill(status=200, headers=entry.headers, body=body)
+                return
+            self._entries.pop(url, None)
+
+        self.misses += 1
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception as exc:
+            # La richiesta prosegue senza cache: una route non risolta bloccherebbe la pagina
+            logger.warning("Unable to fetch asset %s for the cache: %s", url, exc)
+            await route.fallback()
+            return
+        if response.status == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            await self._store(url, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    async def _store(self, url: str, headers: dict[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+
+        digest = hashlib.sha256(body).hexdigest()
+        stored_headers = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        try:
+            await asyncio.to_thread(self._write_object, digest, body)
+        except OSError as exc:
+            logger.warning("Unable to store cached asset %s: %s", url, exc)
+            return
+
+        self._entries[url] = _AssetEntry(digest, len(body), stored_headers)
+        self._entries.move_to_end(url)
+        self.stored += 1
+        removed = self._evict()
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(self._persist, removed, self._index_payload())
+        except OSError as exc:
+            logger.warning("Unable to save asset cache index: %s", exc)
+
+    def _evict(self) -> list[str]:
+        """Rimuove gli URL meno recenti oltre `max_bytes`; restituisce i digest non piu' usati."""
+        removed = []
+        while self._entries and self._total_bytes() > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.evictions += 1
+            if not any(entry.digest == evicted.digest for entry in self._entries.values()):
+                removed.append(evicted.digest)
+        return removed
+
+    def _total_bytes(self) -> int:
+        # Gli oggetti sono content-addressed: URL diversi con lo stesso contenuto occupano un solo file
+        return sum({entry.digest: entry.size for entry in self._entries.values()}.values())
+
+    def _persist(self, removed_digests: list[str], index_payload: list[dict]) -> None:
+        for digest in removed_digests:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+        self._write_index(index_payload)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects_dir, digest[:2], digest)
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._object_path(digest), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write_object(self, digest: str, body: bytes) -> None:
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        self._atomic_write(path, body)
+
+    def _index_payload(self) -> list[dict]:
+        # Costruito nel loop: i thread di scrittura non devono iterare `_entries` mentre cambia
+        return [
+            {"url": url, "digest": entry.digest, "size": entry.size, "headers": entry.headers}
+            for url, entry in self._entries.items()
+        ]
+
+    def _write_index(self, payload: list[dict]) -> None:
+        self._atomic_write(self._index_path, json.dumps(payload).encode())
+
+    @staticmethod
+    def _atomic_write(path: str, content: bytes) -> None:
+        # File temporaneo univoco: context diversi possono salvare lo stesso asset nello stesso momento
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(content)
+            os.replace(temporary_path, path)
+        except BaseException:
+            try:
+                os.remove(temporary_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _read_index(self) -> list[dict]:
+        """Voci dell'indice salvato il cui oggetto e' ancora presente su disco."""
+        try:
+            with open(self._index_path) as file:
+                payload = json.load(file)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable asset cache index: %s", exc)
+            return []
+        return [item for item in payload if os.path.exists(self._object_path(item["digest"]))]
+
+    def _remove_orphans(self, known_digests: set[str]) -> None:
+        """Elimina i file senza voce nell'indice (evicted all'avvio o scritti prima di un arresto non pulito)."""
+        if not os.path.isdir(self._objects_dir):
+            return
+        removed = 0
+        for directory in os.listdir(self._objects_dir):
+            for name in os.listdir(os.path.join(self._objects_dir, directory)):
+                if name not in known_digests:
+                    os.remove(os.path.join(self._objects_dir, directory, name))
+                    removed += 1
+        if removed:
+            logger.info("Asset cache cleanup removed %s orphaned objects", removed)
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from polychat.manager.admission_manager import AdmissionManager
+from polychat.model.service.batch_item import BatchItem
+from polychat.model.service.chat import Chat
+
+logger = logging.getLogger(__name__)
+
+BatchRunner = Callable[[int], Awaitable[Chat]]
+
+
+class BatchManager:
+    """
+    Esegue gli elementi di un batch con parallelismo limitato e li restituisce man mano che terminano.
+
+    Ogni batch usa al massimo `parallelism` worker (di default `default_parallelism`, mai oltre
+    `max_parallelism`). L'errore di un elemento viene riportato nel suo BatchItem senza fermare
+    gli altri; se chi consuma smette di leggere, gli elementi ancora in corso vengono cancellati.
+    I worker possono superare il limite dell'admission control: un elemento rifiutato per
+    sovraccarico viene ripetuto dopo il Retry-After invece di risultare fallito.
+    """
+
+    def __init__(self, default_parallelism: int = 2, max_parallelism: int = 8):
+        self.max_parallelism = max(1, max_parallelism)
+        self.default_parallelism = min(max(1, default_parallelism), self.max_parallelism)
+        self.running_batches = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    async def run(self, total: int, runner: BatchRunner, parallelism: Optional[int] = None) -> AsyncIterator[BatchItem]:
+        """`runner(index)` produce il risultato dell'elemento `index` (0 <= index < total)."""
+        if total <= 0:
+            return
+
+        worker_count = min(parallelism or self.default_parallelism, self.max_parallelism, total)
+        indexes = iter(range(total))
+        finished: asyncio.Queue[BatchItem] = asyncio.Queue()
+        sequence = 0
+
+        async def work() -> None:
+            nonlocal sequence
+            for index in indexes:
+                started_at = time.monotonic()
+                chat = None
+                error = None
+                try:
+                    chat = await AdmissionManager.retry_until_admitted(lambda: runner(index))
+                except Exception as exc:
+                    logger.info("Batch item %s failed: %s", index, exc)
+                    error = str(exc) or type(exc).__name__
+                sequence += 1
+                finished.put_nowait(
+                    BatchItem(
+                        index=index,
+                        sequence=sequence,
+                        total=total,
+                        latency_seconds=round(time.monotonic() - started_at, 3),
+                        chat=chat,
+                        error=error,
+                    )
+                )
+
+        self.running_batches += 1
+        workers = [asyncio.create_task(work()) for _ in range(worker_count)]
+        try:
+            for _ in range(total):
+                item = await finished.get()
+                if item.succeeded:
+                    self.succeeded += 1
+                else:
+                    self.failed += 1
+                yield item
+        finally:
+            self.running_batches -= 1
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "running_batches": self.running_batches,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
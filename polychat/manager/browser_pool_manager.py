@@ -0,0 +1,257 @@
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import time
+from typing import Any, AsyncIterator, Literal, Optional
+
+from browserforge.fingerprints import Screen
+from camoufox.async_api import AsyncCamoufox
+
+logger = logging.getLogger(__name__)
+
+
+class _BrowserSlot:
+    """Browser Camoufox avviato e condiviso tra piu' lease."""
+
+    def __init__(self, launcher, browser) -> None:  # noqa: ANN001
+        self.launcher = launcher
+        self.browser = browser
+        self.uses = 0
+        self.active_leases = 0
+        self.retiring = False
+        # Sostituzione in corso (avvio del nuovo browser fuori dal lock del pool)
+        self.replacement: Optional[asyncio.Task] = None
+
+
+class BrowserPoolManager:
+    """
+    Pool di processi browser Camoufox condivisi a livello di processo.
+
+    Una volta avviato (`start`) mantiene `size` browser aperti e consegna ai client
+    BrowserContext nuovi e isolati. Ogni browser viene riciclato dopo `max_uses` lease
+    o quando non risulta piu' connesso. Se il pool non e' avviato (es. comandi CLI)
+    ogni lease lancia un browser dedicato e lo chiude al termine.
+
+    Il riciclo avviene in background: il lock del pool non viene mai tenuto durante l'avvio
+    di un browser, e il vecchio continua a servire lease finche' il nuovo non e' pronto.
+    Solo se non resta alcun browser sano la lease attende la sostituzione.
+    """
+
+    def __init__(
+        self,
+        headless: bool | Literal["virtual"] = False,
+        size: int = 1,
+        max_uses: int = 50,
+        health_check_interval_seconds: float = 30.0,
+    ):
+        self.headless = headless
+        self.size = max(1, size)
+        self.max_uses = max(1, max_uses)
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self._slots: list[_BrowserSlot] = []
+        self._lock = asyncio.Lock()
+        self._health_check_task: Optional[asyncio.Task] = None
+        self._replacements: set[asyncio.Task] = set()
+        self._started = False
+        self.open_browsers = 0
+        self.launches = 0
+        self.launch_seconds_total = 0.0
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        if self._started:
+            return
+
+        async with self._lock:
+            while len(self._slots) < self.size:
+                self._slots.append(await self._launch_slot())
+            self._started = True
+
+        if self.health_check_interval_seconds > 0:
+            self._health_check_task = asyncio.create_task(self._run_health_checks())
+        logger.info("Browser pool started (size=%s, max_uses=%s)", self.size, self.max_uses)
+
+    async def stop(self) -> None:
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            try:
+                await self._health_check_task
+            except asyncio.CancelledError:
+                pass
+            self._health_check_task = None
+
+        replacements = list(self._replacements)
+        for task in replacements:
+            task.cancel()
+        await asyncio.gather(*replacements, return_exceptions=True)
+
+        async with self._lock:
+            slots = list(self._slots)
+            self._slots.clear()
+            self._started = False
+
+        for slot in slots:
+            await self._close_slot(slot)
+        logger.info("Browser pool stopped")
+
+    @asynccontextmanager
+    async def lease_context(self, **context_options: Any) -> AsyncIterator[Any]:
+        """Restituisce un BrowserContext nuovo, chiuso automaticamente a fine utilizzo."""
+        if not self._started:
+            slot = await self._launch_slot()
+            try:
+                context = await slot.browser.new_context(**context_options)
+                try:
+                    yield context
+                finally:
+                    await self._close_context(context)
+            finally:
+                await self._close_slot(slot)
+            return
+
+        slot = await self._acquire_slot()
+        try:
+            context = await slot.browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                await self._close_context(context)
+        finally:
+            await self._release_slot(slot)
+
+    def stats(self) -> dict:
+        return {
+            "started": self._started,
+            "size": self.size,
+            "max_uses": self.max_uses,
+            "open_browsers": self.open_browsers,
+            "launches": self.launches,
+            "launch_seconds_total": round(self.launch_seconds_total, 3),
+            "browsers": [
+                {
+                    "uses": slot.uses,
+                    "active_leases": slot.active_leases,
+                    "retiring": slot.retiring,
+                    "healthy": self._is_healthy(slot),
+                }
+                for slot in self._slots
+            ],
+        }
+
+    def _launch_options(self) -> dict:
+        return {
+            "headless": self.headless,
+            "humanize": True,
+            "screen": Screen(max_width=1920, max_height=1080),
+        }
+
+    async def _launch_slot(self) -> _BrowserSlot:
+        started_at = time.perf_counter()
+        launcher = AsyncCamoufox(**self._launch_options())
+        browser = await launcher.__aenter__()
+        self.launches += 1
+        self.launch_seconds_total += time.perf_counter() - started_at
+        self.open_browsers += 1
+        return _BrowserSlot(launcher, browser)
+
+    async def _acquire_slot(self) -> _BrowserSlot:
+        async with self._lock:
+            pending = self._schedule_replacements()
+            healthy = [slot for slot in self._slots if self._is_healthy(slot)]
+            if healthy:
+                return self._lease_slot(healthy)
+
+        # Nessun browser sano: si attende la sostituzione, senza bloccare le altre lease
+        if pending:
+            await asyncio.wait(pending)
+        async with self._lock:
+            return self._lease_slot(self._slots)
+
+    @staticmethod
+    def _lease_slot(slots: list[_BrowserSlot]) -> _BrowserSlot:
+        slot = min(slots, key=lambda candidate: candidate.active_leases)
+        slot.uses += 1
+        slot.active_leases += 1
+        return slot
+
+    def _schedule_replacements(self) -> list[asyncio.Task]:
+        """Avvia la sostituzione degli slot esausti o non sani. Va chiamato con il lock acquisito."""
+        for slot in self._slots:
+            if slot.replacement is None and (slot.uses >= self.max_uses or not self._is_healthy(slot)):
+                slot.replacement = asyncio.create_task(self._replace_slot(slot))
+                self._replacements.add(slot.replacement)
+                slot.replacement.add_done_callback(self._replacements.discard)
+        return [slot.replacement for slot in self._slots if slot.replacement is not None]
+
+    async def _release_slot(self, slot: _BrowserSlot) -> None:
+        slot.active_leases = max(0, slot.active_leases - 1)
+        if slot.retiring and slot.active_leases == 0:
+            await self._close_slot(slot)
+
+    async def _replace_slot(self, slot: _BrowserSlot) -> None:
+        """
+        Sostituisce uno slot esausto o non sano. Il nuovo browser viene avviato fuori dal lock e
+        prima di togliere il vecchio: se l'avvio fallisce lo slot resta nel pool (verra' ritentato
+        alla prossima richiesta) e il pool non si svuota.
+        """
+        logger.info(
+            "Recycling pooled browser (uses=%s, healthy=%s)",
+            slot.uses,
+            self._is_healthy(slot),
+        )
+        try:
+            replacement = await self._launch_slot()
+        except asyncio.CancelledError:
+            slot.replacement = None
+            raise
+        except Exception as exc:
+            slot.replacement = None
+            logger.warning("Unable to launch replacement browser, keeping the current one: %s", exc)
+            return
+
+        async with self._lock:
+            swapped = slot in self._slots
+            if swapped:
+                self._slots[self._slots.index(slot)] = replacement
+                slot.retiring = True
+        if not swapped:
+            # Pool fermato durante l'avvio
+            await self._close_slot(replacement)
+        elif slot.active_leases == 0:
+            await self._close_slot(slot)
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval_seconds)
+            try:
+                async with self._lock:
+                    self._schedule_replacements()
+            except Exception as exc:
+                logger.warning("Browser pool health check failed: %s", exc)
+
+    @staticmethod
+    def _is_healthy(slot: _BrowserSlot) -> bool:
+        is_connected = getattr(slot.browser, "is_connected", None)
+        if callable(is_connected):
+            try:
+                return bool(is_connected())
+            except Exception:
+                return False
+        return True
+
+    @staticmethod
+    async def _close_context(context) -> None:  # noqa: ANN001
+        try:
+            await context.close()
+        except Exception as exc:
+            logger.warning("Error while closing pooled browser context: %s", exc)
+
+    async def _close_slot(self, slot: _BrowserSlot) -> None:
+        self.open_browsers = max(0, self.open_browsers - 1)
+        try:
+            await slot.launcher.__aexit__(None, None, None)
+        except Exception as exc:
+            logger.warning("Error while closing pooled browser: %s", exc)
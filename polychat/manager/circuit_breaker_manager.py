@@ -0,0 +1,171 @@
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+import math
+import time
+from typing import AsyncIterator, Awaitable, Callable, Literal, Optional
+
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.retry_manager import RetryManager
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+CircuitProbe = Callable[[], Awaitable[bool]]
+
+
+class CircuitOpenError(Exception):
+    """Provider considerato non disponibile: la richiesta viene rifiutata senza aprire il browser."""
+
+    def __init__(self, provider: str, retry_after_seconds: int):
+        super().__init__(f"{provider} temporaneamente non disponibile, riprovare tra {retry_after_seconds}s")
+        self.provider = provider
+        self.retry_after_seconds = retry_after_seconds
+
+
+class _ProviderCircuit:
+    def __init__(self) -> None:
+        self.state: CircuitState = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe: Optional[CircuitProbe] = None
+        self.last_error: Optional[str] = None
+        self.rejected = 0
+        self.trips = 0
+
+
+class CircuitBreakerManager:
+    """
+    Circuit breaker per provider.
+
+    Dopo `failure_threshold` errori consecutivi il circuito si apre e le richieste vengono
+    rifiutate subito con CircuitOpenError per `open_seconds`. Trascorso questo tempo la prima
+    richiesta esegue una sola sonda (`status()` del client, registrata con `register_probe`):
+    se va a buon fine il circuito si richiude, altrimenti resta aperto per un altro periodo.
+    I rifiuti dell'admission control non contano come errori del provider, e nemmeno gli
+    errori del chiamante o di configurazione (validazione, credenziali, 4xx): contano solo
+    quelli che `RetryManager.is_retryable` considera transitori, cosi' richieste non valide
+    non possono aprire il circuito per tutti.
+    """
+
+    IGNORED_EXCEPTIONS: tuple[type[BaseException], ...] = (AdmissionRejectedError,)
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 30.0, probe_timeout_seconds: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self._circuits: dict[str, _ProviderCircuit] = {}
+
+    def register_probe(self, provider: str, probe: CircuitProbe) -> None:
+        self._get_circuit(provider).probe = probe
+
+    @asynccontextmanager
+    async def guard(self, provider: str) -> AsyncIterator[None]:
+        """Rifiuta la richiesta se il circuito e' aperto, altrimenti ne registra l'esito."""
+        circuit = self._get_circuit(provider)
+        await self._before_request(provider, circuit)
+        try:
+            yield
+        except self.IGNORED_EXCEPTIONS:
+            self._abort_trial(circuit)
+            raise
+        except Exception as exc:
+            if RetryManager.is_retryable(exc):
+                self._record_failure(provider, circuit, exc)
+            else:
+                self._abort_trial(circuit)
+            raise
+        except BaseException:
+            # Cancellazione (client disconnesso, perdenti di /multi): non e' un errore del provider
+            self._abort_trial(circuit)
+            raise
+        self._record_success(circuit)
+
+    def stats(self) -> dict:
+        return {
+            provider: {
+                "state": circuit.state,
+                "consecutive_failures": circuit.consecutive_failures,
+                "trips": circuit.trips,
+                "rejected": circuit.rejected,
+                "last_error": circuit.last_error,
+            }
+            for provider, circuit in self._circuits.items()
+        }
+
+    def _get_circuit(self, provider: str) -> _ProviderCircuit:
+        if provider not in self._circuits:
+            self._circuits[provider] = _ProviderCircuit()
+        return self._circuits[provider]
+
+    async def _before_request(self, provider: str, circuit: _ProviderCircuit) -> None:
+        if circuit.state == "closed":
+            return
+
+        remaining = self._remaining_open_seconds(circuit)
+        if circuit.state == "half_open" or remaining > 0:
+            circuit.rejected += 1
+            raise CircuitOpenError(provider, max(1, math.ceil(remaining)))
+
+        if circuit.probe is None:
+            # Senza sonda la richiesta stessa fa da tentativo di prova
+            circuit.state = "half_open"
+            return
+
+        circuit.state = "half_open"
+        try:
+            healthy = await self._run_probe(provider, circuit)
+        except BaseException:
+            self._abort_trial(circuit)
+            raise
+        if healthy:
+            logger.info("Circuit for %s closed after successful probe", provider)
+            self._record_success(circuit)
+            return
+
+        self._open(circuit)
+        circuit.rejected += 1
+        raise CircuitOpenError(provider, max(1, math.ceil(self.open_seconds)))
+
+    async def _run_probe(self, provider: str, circuit: _ProviderCircuit) -> bool:
+        try:
+            return bool(await asyncio.wait_for(circuit.probe(), timeout=self.probe_timeout_seconds))
+        except Exception as exc:
+            circuit.last_error = f"probe: {exc}"
+            logger.info("Circuit probe for %s failed: %s", provider, exc)
+            return False
+
+    def _record_success(self, circuit: _ProviderCircuit) -> None:
+        circuit.state = "closed"
+        circuit.consecutive_failures = 0
+        circuit.opened_at = None
+
+    def _record_failure(self, provider: str, circuit: _ProviderCircuit, exc: Exception) -> None:
+        circuit.consecutive_failures += 1
+        circuit.last_error = str(exc)
+        if circuit.state == "half_open" or circuit.consecutive_failures >= self.failure_threshold:
+            if circuit.state != "open":
+                logger.warning(
+                    "Circuit for %s opened after %s consecutive failures: %s",
+                    provider,
+                    circuit.consecutive_failures,
+                    exc,
+                )
+            self._open(circuit)
+
+    def _abort_trial(self, circuit: _ProviderCircuit) -> None:
+        """Tentativo di prova interrotto senza esito: il circuito torna aperto per un altro periodo."""
+        if circuit.state == "half_open":
+            circuit.state = "open"
+            circuit.opened_at = time.monotonic()
+
+    def _open(self, circuit: _ProviderCircuit) -> None:
+        if circuit.state != "open":
+            circuit.trips += 1
+        circuit.state = "open"
+        circuit.opened_at = time.monotonic()
+
+    def _remaining_open_seconds(self, circuit: _ProviderCircuit) -> float:
+        if circuit.opened_at is None:
+            return 0.0
+        return self.open_seconds - (time.monotonic() - circuit.opened_at)
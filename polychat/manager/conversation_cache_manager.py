@@ -0,0 +1,126 @@
+from collections import OrderedDict
+import time
+from typing import Optional
+
+from polychat.model.service.chat import Chat
+
+
+class _CacheEntry:
+    def __init__(self, chat: Chat, completed: bool, stable_reads: int, expires_at: Optional[float]) -> None:
+        self.chat = chat
+        self.completed = completed
+        self.stable_reads = stable_reads
+        self.expires_at = expires_at
+
+
+class ConversationCacheManager:
+    """
+    Cache LRU in memoria delle conversazioni lette dai provider, per (provider, chat_id).
+
+    Una conversazione ancora in corso resta valida solo `in_progress_ttl_seconds`. Solo il
+    chiamante sa se la risposta e' davvero conclusa (`completed=True`): in quel caso la voce
+    vale `completed_ttl_seconds` (0 = senza scadenza, solo LRU). Letture consecutive identiche
+    raddoppiano soltanto la validita' della voce fino a `MAX_INFERRED_TTL_SECONDS`, cosi' una
+    risposta in pausa non resta bloccata in cache.
+
+    Le letture vanno marcate con `generation()` prima di interrogare il provider: una `put`
+    con una generazione precedente all'ultimo `invalidate` della conversazione viene scartata.
+    """
+
+    MAX_INFERRED_TTL_SECONDS = 60.0
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        in_progress_ttl_seconds: float = 5.0,
+        completed_ttl_seconds: float = 0.0,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.in_progress_ttl_seconds = in_progress_ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], _CacheEntry] = OrderedDict()
+        # Orologio logico delle invalidazioni; per le chiavi dimenticate vale `_invalidated_floor`
+        self._clock = 0
+        self._invalidated: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._invalidated_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_puts = 0
+
+    def get(self, provider: str, chat_id: str) -> Optional[Chat]:
+        key = (provider, chat_id)
+        entry = self._entries.get(key)
+        # Le voci scadute restano finche' non vengono sostituite: servono a riconoscere
+        # una risposta ormai stabile alla lettura successiva
+        if entry is None or (entry.expires_at is not None and entry.expires_at <= time.monotonic()):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.chat
+
+    def generation(self) -> int:
+        """Da leggere prima di interrogare il provider e passare poi a `put`."""
+        return self._clock
+
+    def put(
+        self,
+        provider: str,
+        chat_id: str,
+        chat: Chat,
+        completed: bool = False,
+        generation: Optional[int] = None,
+    ) -> None:
+        if self.max_entries == 0:
+            return
+
+        key = (provider, chat_id)
+        if generation is not None and generation < self._invalidated.get(key, self._invalidated_floor):
+            # Lettura partita prima di un nuovo messaggio: il risultato e' gia' vecchio
+            self.stale_puts += 1
+            return
+
+        previous = self._entries.get(key)
+        stable_reads = 0
+        if previous is not None and chat.message and previous.chat == chat:
+            stable_reads = previous.stable_reads + 1
+
+        if completed:
+            ttl_seconds = self.completed_ttl_seconds
+        else:
+            ttl_seconds = min(self.in_progress_ttl_seconds * 2 ** stable_reads, self._max_inferred_ttl())
+        expires_at = None if completed and ttl_seconds <= 0 else time.monotonic() + ttl_seconds
+        self._entries[key] = _CacheEntry(chat, completed, stable_reads, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, provider: str, chat_id: Optional[str]) -> None:
+        """Da chiamare quando la conversazione riceve un nuovo messaggio."""
+        if not chat_id or self.max_entries == 0:
+            return
+
+        key = (provider, chat_id)
+        self._entries.pop(key, None)
+        self._clock += 1
+        self._invalidated[key] = self._clock
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.max_entries:
+            # Scelta conservativa: le chiavi dimenticate valgono come invalidate a quel momento
+            _, self._invalidated_floor = self._invalidated.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "completed": sum(1 for entry in self._entries.values() if entry.completed),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_puts": self.stale_puts,
+        }
+
+    def _max_inferred_ttl(self) -> float:
+        ceiling = max(self.in_progress_ttl_seconds, self.MAX_INFERRED_TTL_SECONDS)
+        if self.completed_ttl_seconds > 0:
+            ceiling = min(ceiling, max(self.in_progress_ttl_seconds, self.completed_ttl_seconds))
+        return ceiling
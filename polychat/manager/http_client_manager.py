@@ -0,0 +1,99 @@
+from http.cookiejar import DefaultCookiePolicy
+import importlib.util
+import logging
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _RejectAllCookiesPolicy(DefaultCookiePolicy):
+    """Il cookie jar del client non memorizza mai i Set-Cookie delle risposte."""
+
+    def set_ok(self, cookie, request) -> bool:  # noqa: ANN001
+        return False
+
+
+class HttpClientManager:
+    """
+    Client HTTP asincroni condivisi, uno per host dei provider.
+
+    Ogni host ottiene un `httpx.AsyncClient` con keep-alive e limiti di connessione, cosi'
+    le chiamate dirette alle API non ripagano handshake TCP+TLS a ogni richiesta. I redirect
+    vengono seguiti come faceva `requests` (l'header Cookie non viene inoltrato al nuovo URL);
+    HTTP/2 viene abilitato solo se il pacchetto `h2` e' installato. I client vengono creati alla
+    prima richiesta e chiusi con `stop()`.
+
+    Lo stesso client serve account diversi: il suo cookie jar rifiuta ogni Set-Cookie, cosi'
+    la sessione di un account non finisce mai nelle richieste (o nei redirect) di un altro.
+    I cookie vanno passati a ogni chiamata.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_seconds: float = 30.0,
+        timeout_seconds: float = 20.0,
+        http2: Optional[bool] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self.timeout = httpx.Timeout(timeout_seconds)
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._requests: dict[str, int] = {}
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Restituisce il client condiviso dell'host di `url`, creandolo se necessario."""
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            raise ValueError(f"URL non valida: {url}")
+
+        host = f"{parsed.scheme}://{parsed.netloc}"
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                follow_redirects=True,
+            )
+            # httpx copia il jar passato al costruttore: la policy va impostata su quello del client
+            client.cookies.jar.set_policy(_RejectAllCookiesPolicy())
+            self._clients[host] = client
+        self._requests[host] = self._requests.get(host, 0) + 1
+        return client
+
+    def create_client(self, timeout_seconds: float, follow_redirects: bool = False) -> httpx.AsyncClient:
+        """Client dedicato, non condiviso e non chiuso da `stop()`: lo chiude chi lo crea."""
+        client = httpx.AsyncClient(
+            limits=self.limits,
+            timeout=httpx.Timeout(timeout_seconds),
+            follow_redirects=follow_redirects,
+        )
+        client.cookies.jar.set_policy(_RejectAllCookiesPolicy())
+        return client
+
+    async def stop(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as exc:
+                logger.warning("Error while closing HTTP client: %s", exc)
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "hosts": {
+                host: {"requests": self._requests.get(host, 0), "is_closed": client.is_closed}
+                for host, client in self._clients.items()
+            },
+        }
@@ -0,0 +1,174 @@
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from polychat.model.service.chat import Chat
+from polychat.model.service.job import Job
+
+logger = logging.getLogger(__name__)
+
+JobRunner = Callable[[Job], Awaitable[Chat]]
+JobCallback = Callable[[Job], Awaitable[None]]
+
+
+class JobCapacityError(Exception):
+    """Troppi job ancora in corso: impossibile accettarne di nuovi."""
+
+
+class _JobEntry:
+    def __init__(self, job: Job, runner: JobRunner, on_finished: Optional[JobCallback]) -> None:
+        self.job = job
+        self.runner = runner
+        self.on_finished = on_finished
+        self.done = asyncio.Event()
+
+
+class JobManager:
+    """
+    Coda in memoria di job eseguiti da un numero fisso di worker in background.
+
+    I job vengono conservati per `retention_seconds` dopo la fine e al massimo `max_jobs`
+    alla volta: oltre il limite si scartano prima i job terminati piu' vecchi, e se sono
+    tutti ancora in corso `submit` rifiuta il nuovo job con JobCapacityError.
+    Un job interrotto allo shutdown risulta fallito e `on_finished` viene comunque chiamato,
+    al massimo per INTERRUPTED_CALLBACK_TIMEOUT_SECONDS.
+    """
+
+    INTERRUPTED_CALLBACK_TIMEOUT_SECONDS = 5.0
+
+    def __init__(self, max_workers: int = 4, max_jobs: int = 1000, retention_seconds: float = 3600.0):
+        self.max_workers = max(1, max_workers)
+        self.max_jobs = max(1, max_jobs)
+        self.retention_seconds = retention_seconds
+        self._jobs: OrderedDict[str, _JobEntry] = OrderedDict()
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._started = False
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        if self._started:
+            return
+
+        self._started = True
+        self._workers = [asyncio.create_task(self._run_worker()) for _ in range(self.max_workers)]
+        logger.info("Job manager started (workers=%s)", self.max_workers)
+
+    async def stop(self) -> None:
+        self._started = False
+        workers = list(self._workers)
+        self._workers.clear()
+        for worker in workers:
+            worker.cancel()
+        for worker in workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+    def submit(self, job: Job, runner: JobRunner, on_finished: Optional[JobCallback] = None) -> Job:
+        """Accoda il job; `runner` ne produce il risultato, `on_finished` viene chiamato alla fine."""
+        self._prune()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobCapacityError(f"Troppi job in corso (massimo {self.max_jobs})")
+
+        self._jobs[job.id] = _JobEntry(job, runner, on_finished)
+        self._queue.put_nowait(job.id)
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        entry = self._jobs.get(job_id)
+        return entry.job if entry is not None else None
+
+    async def wait(self, job_id: str, timeout_seconds: float) -> Optional[Job]:
+        """Attende la fine del job per al massimo `timeout_seconds` e ne restituisce lo stato."""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+
+        if timeout_seconds > 0 and not entry.done.is_set():
+            try:
+                await asyncio.wait_for(entry.done.wait(), timeout=timeout_seconds)
+            except asyncio.TimeoutError:
+                pass
+        return entry.job
+
+    def stats(self) -> dict:
+        statuses = [entry.job.status for entry in self._jobs.values()]
+        return {
+            "started": self._started,
+            "workers": self.max_workers,
+            "retained": len(statuses),
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    async def _run_worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                entry = self._jobs.get(job_id)
+                if entry is not None:
+                    await self._execute(entry)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, entry: _JobEntry) -> None:
+        job = entry.job
+        job.status = "running"
+        job.started_at = time.time()
+        interrupted: Optional[asyncio.CancelledError] = None
+        try:
+            job.chat = await entry.runner(job)
+            job.status = "succeeded"
+            self.succeeded += 1
+        except asyncio.CancelledError as exc:
+            job.status = "failed"
+            job.error = "Job interrotto"
+            self.failed += 1
+            interrupted = exc
+        except Exception as exc:
+            job.status = "failed"
+            job.error = str(exc)
+            self.failed += 1
+            logger.info("Job %s (%s) failed: %s", job.id, job.provider, exc)
+        finally:
+            job.finished_at = time.time()
+            entry.done.set()
+
+        if entry.on_finished is not None:
+            try:
+                if interrupted is None:
+                    await entry.on_finished(job)
+                else:
+                    await asyncio.wait_for(entry.on_finished(job), timeout=self.INTERRUPTED_CALLBACK_TIMEOUT_SECONDS)
+            except Exception as exc:
+                logger.warning("Job %s completion callback failed: %s", job.id, exc)
+
+        if interrupted is not None:
+            raise interrupted
+
+    def _prune(self) -> None:
+        now = time.time()
+        for job_id, entry in list(self._jobs.items()):
+            job = entry.job
+            if job.is_finished and now - (job.finished_at or now) >= self.retention_seconds:
+                del self._jobs[job_id]
+
+        if len(self._jobs) < self.max_jobs:
+            return
+
+        # Oltre il limite si liberano i job terminati piu' vecchi (ordine di inserimento)
+        for job_id, entry in list(self._jobs.items()):
+            if len(self._jobs) < self.max_jobs:
+                break
+            if entry.job.is_finished:
+                del self._jobs[job_id]
@@ -0,0 +1,67 @@
+from collections import deque
+import math
+from typing import Optional
+
+
+class _LatencyWindow:
+    def __init__(self, window_size: int) -> None:
+        self.samples: deque[float] = deque(maxlen=window_size)
+        self.count = 0
+        self.failures = 0
+
+
+class LatencyManager:
+    """
+    Latenze recenti delle operazioni dei client, per (provider, operazione).
+
+    Conserva le ultime `window_size` durate delle operazioni riuscite e ne calcola i
+    percentili; sotto `min_samples` campioni il percentile non e' considerato affidabile
+    e `percentile` restituisce None.
+    """
+
+    def __init__(self, window_size: int = 200, min_samples: int = 20):
+        self.window_size = max(1, window_size)
+        self.min_samples = max(1, min_samples)
+        self._windows: dict[tuple[str, str], _LatencyWindow] = {}
+
+    def record(self, provider: str, operation: str, seconds: float, succeeded: bool = True) -> None:
+        key = (provider, operation)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _LatencyWindow(self.window_size)
+        window.count += 1
+        if succeeded:
+            window.samples.append(seconds)
+        else:
+            window.failures += 1
+
+    def percentile(self, provider: str, operation: str, quantile: float) -> Optional[float]:
+        window = self._windows.get((provider, operation))
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        return self._quantile(sorted(window.samples), quantile)
+
+    def stats(self) -> dict:
+        stats: dict[str, dict] = {}
+        for (provider, operation), window in self._windows.items():
+            samples = sorted(window.samples)
+            stats.setdefault(provider, {})[operation] = {
+                "count": window.count,
+                "failures": window.failures,
+                "p50_seconds": self._round(self._quantile(samples, 0.5)),
+                "p95_seconds": self._round(self._quantile(samples, 0.95)),
+                "p99_seconds": self._round(self._quantile(samples, 0.99)),
+            }
+        return stats
+
+    @staticmethod
+    def _quantile(samples: list[float], quantile: float) -> Optional[float]:
+        if not samples:
+            return None
+        # Nearest-rank: il valore sotto cui cade almeno la frazione `quantile` dei campioni
+        rank = max(1, math.ceil(quantile * len(samples)))
+        return samples[min(rank, len(samples)) - 1]
+
+    @staticmethod
+    def _round(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
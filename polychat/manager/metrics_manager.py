@@ -0,0 +1,181 @@
+import math
+from typing import Callable, Iterable, Optional
+
+# Latenze di operazioni browser: da decine di millisecondi (step) a qualche minuto (generazione)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = tuple[tuple[str, str], ...]
+# (nome, tipo, help, label, valore) di una metrica calcolata al momento della lettura
+Sample = tuple[str, str, str, dict[str, str], float]
+Collector = Callable[[], Iterable[Sample]]
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+
+class MetricsManager:
+    """
+    Registro delle metriche del processo, esposte in formato testo Prometheus (`render`).
+
+    I client registrano durata ed esito di ogni operazione, gli step che la compongono e le
+    richieste HTTP; le metriche degli altri manager (code, pool, cache, circuiti) vengono
+    lette dai loro `stats()` tramite i collector registrati, solo quando si chiede `/metrics`.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._metadata: dict[str, tuple[str, str]] = {}
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, _Histogram]] = {}
+        self._collectors: list[Collector] = []
+
+    def operation_started(self, provider: str, operation: str) -> None:
+        self.add_gauge(
+            "polychat_operations_in_flight",
+            "Operazioni del client in corso",
+            1,
+            provider=provider,
+            operation=operation,
+        )
+
+    def operation_finished(
+        self,
+        provider: str,
+        operation: str,
+        seconds: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.add_gauge(
+            "polychat_operations_in_flight",
+            "Operazioni del client in corso",
+            -1,
+            provider=provider,
+            operation=operation,
+        )
+        self.observe(
+            "polychat_operation_duration_seconds",
+            "Durata delle operazioni del client",
+            seconds,
+            provider=provider,
+            operation=operation,
+        )
+        self.inc(
+            "polychat_operations_total",
+            "Operazioni del client concluse per esito",
+            provider=provider,
+            operation=operation,
+            outcome="failed" if error is not None else "succeeded",
+        )
+        if error is not None:
+            self.inc(
+                "polychat_operation_errors_total",
+                "Errori delle operazioni del client per classe di eccezione",
+                provider=provider,
+                operation=operation,
+                exception=type(error).__name__,
+            )
+
+    def observe_phase(self, provider: str, operation: str, phase: str, seconds: float) -> None:
+        self.observe(
+            "polychat_phase_duration_seconds",
+            "Durata degli step di un'operazione (browser_context, navigate, input, generation, ...)",
+            seconds,
+            provider=provider,
+            operation=operation,
+            phase=phase,
+        )
+
+    def inc(self, name: str, help_text: str, amount: float = 1.0, **labels: str) -> None:
+        self._metadata.setdefault(name, ("counter", help_text))
+        series = self._counters.setdefault(name, {})
+        key = self._labels(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def add_gauge(self, name: str, help_text: str, amount: float, **labels: str) -> None:
+        self._metadata.setdefault(name, ("gauge", help_text))
+        series = self._gauges.setdefault(name, {})
+        key = self._labels(labels)
+        series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, help_text: str, value: float, **labels: str) -> None:
+        self._metadata.setdefault(name, ("histogram", help_text))
+        series = self._histograms.setdefault(name, {})
+        key = self._labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = _Histogram(self.buckets)
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                histogram.bucket_counts[index] += 1
+        histogram.count += 1
+        histogram.sum += value
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Tutte le metriche in formato testo Prometheus (text/plain; version=0.0.4)."""
+        families: dict[str, list[str]] = {}
+        metadata = dict(self._metadata)
+
+        for name, series in self._counters.items():
+            families[name] = [self._line(name, labels, value) for labels, value in series.items()]
+        for name, series in self._gauges.items():
+            families[name] = [self._line(name, labels, value) for labels, value in series.items()]
+        for name, series in self._histograms.items():
+            families[name] = [
+                line
+                for labels, histogram in series.items()
+                for line in self._histogram_lines(name, labels, histogram)
+            ]
+
+        for collector in self._collectors:
+            for name, metric_type, help_text, labels, value in collector():
+                metadata.setdefault(name, (metric_type, help_text))
+                families.setdefault(name, []).append(self._line(name, self._labels(labels), value))
+
+        output = []
+        for name in sorted(families):
+            metric_type, help_text = metadata[name]
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(families[name])
+        return "\n".join(output) + "\n"
+
+    def _histogram_lines(self, name: str, labels: Labels, histogram: _Histogram) -> list[str]:
+        lines = [
+            self._line(f"{name}_bucket", labels + (("le", self._format_value(upper_bound)),), count)
+            for upper_bound, count in zip(self.buckets, histogram.bucket_counts)
+        ]
+        lines.append(self._line(f"{name}_bucket", labels + (("le", "+Inf"),), histogram.count))
+        lines.append(self._line(f"{name}_sum", labels, histogram.sum))
+        lines.append(self._line(f"{name}_count", labels, histogram.count))
+        return lines
+
+    @staticmethod
+    def _labels(labels: dict[str, str]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    @classmethod
+    def _line(cls, name: str, labels: Labels, value: float) -> str:
+        if not labels:
+            return f"{name} {cls._format_value(value)}"
+        rendered = ",".join(f'{label}="{cls._escape(label_value)}"' for label, label_value in labels)
+        return f"{name}{{{rendered}}} {cls._format_value(value)}"
+
+    @staticmethod
+    def _escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    @staticmethod
+    def _format_value(value: float) -> str:
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
@@ -0,0 +1,139 @@
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+# Analytics, advertising e session replay: nessun flusso dell'automazione ne dipende
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+    "browser-intake-datadoghq.com",
+    "sentry.io",
+)
+
+
+class PageTraffic:
+    """Contatori delle richieste di un BrowserContext (bloccate, lasciate passare, byte scaricati)."""
+
+    def __init__(self) -> None:
+        self.blocked = 0
+        self.allowed = 0
+        self.downloaded_bytes = 0
+        self.blocked_by_type: dict[str, int] = {}
+
+    def record_blocked(self, resource_type: str) -> None:
+        self.blocked += 1
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def snapshot(self) -> dict[str, int]:
+        return {"blocked": self.blocked, "allowed": self.allowed, "downloaded_bytes": self.downloaded_bytes}
+
+    def since(self, snapshot: dict[str, int]) -> dict[str, int]:
+        return {name: value - snapshot.get(name, 0) for name, value in self.snapshot().items()}
+
+
+class ResourceBlockingManager:
+    """
+    Installa su ogni BrowserContext una route che scarta le risorse inutili all'automazione.
+
+    Vengono bloccate le richieste con tipo in `blocked_resource_types` (immagini, media, font)
+    e quelle verso URL che contengono uno dei `blocked_url_patterns` (tracker e analytics),
+    a meno che l'URL contenga uno dei pattern consentiti dal provider (le XHR intercettate).
+    I byte scaricati sono stimati dal Content-Length delle response: quelli delle richieste
+    bloccate non sono noti, perche' la richiesta viene interrotta prima di partire.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        blocked_resource_types: tuple[str, ...] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_url_patterns: tuple[str, ...] = DEFAULT_BLOCKED_URL_PATTERNS,
+    ):
+        self.enabled = enabled
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        self.blocked_url_patterns = tuple(blocked_url_patterns)
+        self._contexts: dict[int, PageTraffic] = {}
+        self._totals: dict[str, PageTraffic] = {}
+
+    async def install(
+        self,
+        context,  # noqa: ANN001
+        provider: str,
+        allowed_url_patterns: tuple[str, ...] = (),
+        blocked_url_patterns: tuple[str, ...] = (),
+    ) -> Optional[PageTraffic]:
+        if not self.enabled or not hasattr(context, "route"):
+            return None
+
+        traffic = PageTraffic()
+        totals = self._totals.setdefault(provider, PageTraffic())
+        blocked_url_patterns = self.blocked_url_patterns + tuple(blocked_url_patterns)
+
+        async def _handle_route(route):  # noqa: ANN001
+            request = route.request
+            resource_type = request.resource_type
+            if self._should_block(request.url, resource_type, allowed_url_patterns, blocked_url_patterns):
+                traffic.record_blocked(resource_type)
+                totals.record_blocked(resource_type)
+                await route.abort("blockedbyclient")
+                return
+            traffic.allowed += 1
+            totals.allowed += 1
+            # fallback: la richiesta passa alle route registrate prima (es. cache degli asset)
+            await route.fallback()
+
+        def _handle_response(response):  # noqa: ANN001
+            size = self._content_length(response)
+            traffic.downloaded_bytes += size
+            totals.downloaded_bytes += size
+
+        await context.route("**/*", _handle_route)
+        if hasattr(context, "on"):
+            context.on("response", _handle_response)
+        self._contexts[id(context)] = traffic
+        return traffic
+
+    def traffic(self, context) -> Optional[PageTraffic]:  # noqa: ANN001
+        return self._contexts.get(id(context))
+
+    def forget(self, context) -> None:  # noqa: ANN001
+        self._contexts.pop(id(context), None)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "blocked_resource_types": sorted(self.blocked_resource_types),
+            "providers": {
+                provider: {**traffic.snapshot(), "blocked_by_type": dict(traffic.blocked_by_type)}
+                for provider, traffic in self._totals.items()
+            },
+        }
+
+    def _should_block(
+        self,
+        url: str,
+        resource_type: str,
+        allowed_url_patterns: tuple[str, ...],
+        blocked_url_patterns: tuple[str, ...],
+    ) -> bool:
+        if any(pattern in url for pattern in allowed_url_patterns):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return any(pattern in url for pattern in blocked_url_patterns)
+
+    @staticmethod
+    def _content_length(response: Any) -> int:
+        try:
+            return int((response.headers or {}).get("content-length", 0))
+        except (TypeError, ValueError):
+            return 0
@@ -0,0 +1,147 @@
+import asyncio
+from collections import deque
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from polychat.model.client.retry_policy import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class NonRetryableError(Exception):
+    """Errore che non ha senso ritentare (es. credenziali non valide)."""
+
+
+class _ProviderBudget:
+    def __init__(self) -> None:
+        self.requests: deque[float] = deque()
+        self.retries: deque[float] = deque()
+        self.retried = 0
+        self.exhausted = 0
+        self.not_retryable = 0
+
+
+class RetryManager:
+    """
+    Esegue le operazioni dei client con retry, backoff esponenziale e un budget per provider.
+
+    Si ritentano solo gli errori transitori (timeout, errori di rete, 429/5xx); errori di
+    autenticazione e di validazione falliscono subito, cosi' come i tentativi per cui il
+    chiamante vieta il retry (es. prompt gia' inviato). La classificazione usa solo tipo
+    dell'eccezione e status HTTP: i client segnalano la sessione non valida con
+    PermissionError o NonRetryableError, le credenziali mancanti con ValueError.
+    Il budget limita i retry di un provider a `budget_ratio` delle richieste viste negli
+    ultimi `budget_window_seconds` (con un minimo di `min_retries_per_window`), cosi' durante
+    un incidente i retry non moltiplicano il carico sul browser.
+    """
+
+    RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        budget_ratio: float = 0.2,
+        min_retries_per_window: int = 3,
+        budget_window_seconds: float = 60.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.budget_ratio = budget_ratio
+        self.min_retries_per_window = min_retries_per_window
+        self.budget_window_seconds = budget_window_seconds
+        self.rng = rng or random.Random()
+        self._budgets: dict[str, _ProviderBudget] = {}
+
+    async def run(
+        self,
+        provider: str,
+        operation_name: str,
+        operation: Callable[[], Awaitable[T]],
+        policy: RetryPolicy,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """Esegue `operation`; `can_retry` puo' vietare il retry dell'ultimo tentativo fallito."""
+        budget = self._get_budget(provider)
+        self._record(budget.requests)
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                return await operation()
+            except Exception as exc:
+                if attempt == policy.max_attempts:
+                    raise
+                if not self.is_retryable(exc) or (can_retry is not None and not can_retry()):
+                    budget.not_retryable += 1
+                    raise
+                if not self._try_spend(budget):
+                    budget.exhausted += 1
+                    logger.info("Retry budget exhausted for %s; not retrying %s", provider, operation_name)
+                    raise
+
+                delay = policy.compute_delay(attempt, self.rng)
+                logger.info(
+                    "%s %s attempt %s/%s failed (%s); retrying in %.2fs",
+                    provider,
+                    operation_name,
+                    attempt,
+                    policy.max_attempts,
+                    exc,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+        raise RuntimeError("Nessun tentativo eseguito")
+
+    @classmethod
+    def is_retryable(cls, exc: BaseException) -> bool:
+        """Errore transitorio del provider; usato anche dal circuit breaker per ignorare gli errori del chiamante."""
+        if isinstance(exc, NonRetryableError):
+            return False
+        if isinstance(exc, httpx.HTTPStatusError):
+            return exc.response.status_code in cls.RETRYABLE_STATUS_CODES
+        if isinstance(exc, (TimeoutError, asyncio.TimeoutError, httpx.TransportError, ConnectionError)):
+            return True
+        if isinstance(exc, (ValueError, KeyError, PermissionError, NotImplementedError, FileNotFoundError)):
+            return False
+        # Errori Playwright (timeout di navigazione/selector, target chiuso) e altri errori transitori
+        return True
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        result = {}
+        for provider, budget in self._budgets.items():
+            self._trim(budget.requests, now)
+            self._trim(budget.retries, now)
+            result[provider] = {
+                "requests_in_window": len(budget.requests),
+                "retries_in_window": len(budget.retries),
+                "retried": budget.retried,
+                "budget_exhausted": budget.exhausted,
+                "not_retryable": budget.not_retryable,
+            }
+        return result
+
+    def _get_budget(self, provider: str) -> _ProviderBudget:
+        if provider not in self._budgets:
+            self._budgets[provider] = _ProviderBudget()
+        return self._budgets[provider]
+
+    def _try_spend(self, budget: _ProviderBudget) -> bool:
+        now = time.monotonic()
+        self._trim(budget.requests, now)
+        self._trim(budget.retries, now)
+        allowed = max(self.min_retries_per_window, int(len(budget.requests) * self.budget_ratio))
+        if len(budget.retries) >= allowed:
+            return False
+        budget.retries.append(now)
+        budget.retried += 1
+        return True
+
+    def _record(self, timestamps: deque[float]) -> None:
+        timestamps.append(time.monotonic())
+
+    def _trim(self, timestamps: deque[float], now: float) -> None:
+        while timestamps and now - timestamps[0] > self.budget_window_seconds:
+            timestamps.popleft()
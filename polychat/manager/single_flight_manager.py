@@ -0,0 +1,44 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlightManager:
+    """
+    Accorpa le chiamate concorrenti con la stessa chiave in un'unica esecuzione.
+
+    Il primo chiamante avvia `factory()` in un task; chi arriva con la stessa chiave mentre
+    il task e' in corso ne attende il risultato (o l'eccezione) invece di ripetere il lavoro.
+    La cancellazione di un chiamante non interrompe il task condiviso con gli altri.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            task.add_done_callback(lambda done, flight_key=key: self._forget(flight_key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Evita il warning "exception was never retrieved" se tutti i chiamanti sono stati cancellati
+        if not task.cancelled():
+            task.exception()
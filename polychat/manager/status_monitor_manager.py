@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+StatusCheck = Callable[[], Awaitable[dict]]
+
+
+class StatusMonitorManager:
+    """
+    Tiene in memoria l'ultimo stato di ogni provider, aggiornato in background.
+
+    Ogni `refresh_interval_seconds` il monitor esegue in sequenza il controllo registrato da
+    ciascun provider (lo `status()` del client, che apre il browser) e ne salva il risultato
+    con il campo `checked_at`. Le letture con `get` non aprono mai il browser; `refresh`
+    forza un controllo immediato, accorpando le richieste concorrenti per lo stesso provider.
+    Con intervallo 0 il refresh in background e' disattivato e ogni lettura e' live.
+    """
+
+    def __init__(self, refresh_interval_seconds: float = 300.0, check_timeout_seconds: float = 60.0):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self._checks: dict[str, StatusCheck] = {}
+        self._statuses: dict[str, dict] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.refresh_interval_seconds > 0
+
+    def register(self, provider: str, check: StatusCheck) -> None:
+        self._checks[provider] = check
+
+    async def start(self) -> None:
+        if self._task is not None or not self.enabled or not self._checks:
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.info("Status monitor started (interval=%ss)", self.refresh_interval_seconds)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get(self, provider: str) -> Optional[dict]:
+        """Ultimo stato noto del provider, None se non ancora controllato."""
+        if not self.enabled:
+            return None
+        status = self._statuses.get(provider)
+        return dict(status) if status is not None else None
+
+    def invalidate(self, provider: str) -> None:
+        """Da chiamare dopo login/logout: lo stato salvato non e' piu' attendibile."""
+        self._statuses.pop(provider, None)
+
+    async def refresh(self, provider: str) -> dict:
+        """Controlla subito lo stato del provider e aggiorna quello in memoria."""
+        if provider not in self._checks:
+            raise ValueError(f"Nessun controllo di stato registrato per {provider}")
+
+        task = self._refreshing.get(provider)
+        if task is None:
+            task = asyncio.ensure_future(self._check(provider))
+            self._refreshing[provider] = task
+            task.add_done_callback(lambda done, key=provider: self._refreshing.pop(key, None))
+        return dict(await asyncio.shield(task))
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "refresh_interval_seconds": self.refresh_interval_seconds,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "providers": {
+                provider: {
+                    "is_available": status.get("is_available"),
+                    "is_logged_in": status.get("is_logged_in"),
+                    "checked_at": status["checked_at"],
+                    "age_seconds": round(now - status["checked_at"], 3),
+                }
+                for provider, status in self._statuses.items()
+            },
+        }
+
+    async def _run(self) -> None:
+        while True:
+            for provider in list(self._checks):
+                try:
+                    await self.refresh(provider)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.warning("Status refresh for %s failed: %s", provider, exc)
+            await asyncio.sleep(self.refresh_interval_seconds)
+
+    async def _check(self, provider: str) -> dict:
+        self.refreshes += 1
+        try:
+            status = dict(await asyncio.wait_for(self._checks[provider](), timeout=self.check_timeout_seconds))
+        except Exception as exc:
+            self.failures += 1
+            logger.info("Status check for %s failed: %s", provider, exc)
+            status = {
+                "provider": provider,
+                "is_available": False,
+                "is_logged_in": None,
+                "detail": f"Status check failed: {exc or type(exc).__name__}",
+            }
+        status["checked_at"] = time.time()
+        self._statuses[provider] = status
+        return status
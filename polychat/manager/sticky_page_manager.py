@@ -0,0 +1,129 @@
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Optional
+
+from polychat.manager.warm_page_pool_manager import WarmPage
+
+logger = logging.getLogger(__name__)
+
+
+class _StickyEntry:
+    def __init__(self, page: WarmPage, generation: int) -> None:
+        self.page = page
+        self.generation = generation
+        self.parked_at = time.monotonic()
+
+
+class StickyPageManager:
+    """
+    Tiene aperta la pagina di una conversazione tra un turno e il successivo.
+
+    Dopo `ask`/`ask_and_wait` il client parcheggia la pagina, gia' sulla URL della chat,
+    sotto (provider, chat_id); il turno successivo della stessa conversazione la riprende
+    (`checkout`) e scrive subito il prompt, senza aprire un browser ne' ricaricare la chat.
+    Le pagine inattive da piu' di `idle_ttl_seconds` vengono chiuse, e oltre `max_pages`
+    si chiude la meno recente. Con TTL o `max_pages` a 0 la modalita' e' disattivata.
+    """
+
+    def __init__(self, idle_ttl_seconds: float = 0.0, max_pages: int = 4, reap_interval_seconds: float = 15.0):
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_pages = max(0, max_pages)
+        self.reap_interval_seconds = reap_interval_seconds
+        self._entries: OrderedDict[tuple[str, str], _StickyEntry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.idle_ttl_seconds > 0 and self.max_pages > 0
+
+    async def start(self) -> None:
+        if self._task is not None or not self.enabled:
+            return
+        self._task = asyncio.create_task(self._run_reaper())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            await entry.page.close()
+
+    async def checkout(self, provider: str, chat_id: str, key: str) -> Optional[WarmPage]:
+        """Riprende la pagina parcheggiata della conversazione, se ancora valida per le credenziali `key`."""
+        entry = self._entries.pop((provider, chat_id), None)
+        if entry is not None and self._is_usable(provider, entry) and entry.page.key == key:
+            self.hits += 1
+            return entry.page
+
+        self.misses += 1
+        if entry is not None:
+            await entry.page.close()
+        return None
+
+    async def park(self, provider: str, chat_id: str, page: WarmPage) -> None:
+        """Conserva la pagina per il prossimo turno di `chat_id`; chiude quella che sostituisce."""
+        if not self.enabled:
+            await page.close()
+            return
+
+        key = (provider, chat_id)
+        previous = self._entries.pop(key, None)
+        self._entries[key] = _StickyEntry(page, self._generations.get(provider, 0))
+        if previous is not None and previous.page is not page:
+            await previous.page.close()
+
+        while len(self._entries) > self.max_pages:
+            _, evicted = self._entries.popitem(last=False)
+            self.evictions += 1
+            await evicted.page.close()
+
+    def invalidate(self, provider: str) -> None:
+        """Le pagine del provider non vanno piu' riusate (es. dopo login/logout)."""
+        self._generations[provider] = self._generations.get(provider, 0) + 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pages": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _is_usable(self, provider: str, entry: _StickyEntry) -> bool:
+        if entry.generation != self._generations.get(provider, 0):
+            return False
+        return time.monotonic() - entry.parked_at < self.idle_ttl_seconds
+
+    async def _run_reaper(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval_seconds)
+            await self._close_expired()
+
+    async def _close_expired(self) -> None:
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if not self._is_usable(key[0], entry)
+        ]
+        for key in expired:
+            # Durante le chiusure precedenti la voce puo' essere stata ripresa o sostituita
+            entry = self._entries.get(key)
+            if entry is None or self._is_usable(key[0], entry):
+                continue
+            del self._entries[key]
+            logger.info("Closing idle page of %s conversation %s", key[0], key[1])
+            await entry.page.close()
@@ -0,0 +1,185 @@
+import asyncio
+from contextlib import AsyncExitStack
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WarmPage:
+    """Pagina gia' autenticata e parcheggiata sulla landing URL di un provider."""
+
+    def __init__(self, key: str, context, page, exit_stack: AsyncExitStack) -> None:  # noqa: ANN001
+        self.key = key
+        self.context = context
+        self.page = page
+        self.exit_stack = exit_stack
+        self.created_at = time.monotonic()
+        self.generation = 0
+
+    async def close(self) -> None:
+        try:
+            await self.exit_stack.aclose()
+        except Exception as exc:
+            logger.warning("Error while closing warm page: %s", exc)
+
+
+WarmPageFactory = Callable[[], Awaitable[Optional[WarmPage]]]
+
+
+class _ProviderPool:
+    def __init__(self, factory: WarmPageFactory) -> None:
+        self.factory = factory
+        self.ready: list[WarmPage] = []
+        self.generation = 0
+        self.refill_event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.last_error: Optional[str] = None
+
+
+class WarmPagePoolManager:
+    """
+    Pool per provider di pagine pre-autenticate, pronte per essere usate da una richiesta.
+
+    Ogni provider registra una factory che apre un BrowserContext con storage state,
+    cookie e token gia' applicati e parcheggia la pagina sulla landing URL. Una pagina
+    viene consegnata una sola volta (`checkout`) e poi chiusa dal chiamante; il pool si
+    riempie di nuovo in background. Le pagine piu' vecchie di `max_idle_seconds`, o
+    create con credenziali diverse da quelle richieste, vengono scartate.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        max_idle_seconds: float = 300.0,
+        refill_retry_seconds: float = 30.0,
+    ):
+        self.size = max(0, size)
+        self.max_idle_seconds = max_idle_seconds
+        self.refill_retry_seconds = refill_retry_seconds
+        self._providers: dict[str, _ProviderPool] = {}
+        self._started = False
+
+    @property
+    def is_started(self) -> bool:
+        return self._started
+
+    def register(self, provider: str, factory: WarmPageFactory) -> None:
+        self._providers[provider] = _ProviderPool(factory)
+
+    async def start(self) -> None:
+        if self._started or self.size == 0:
+            return
+
+        self._started = True
+        for provider, pool in self._providers.items():
+            pool.refill_event.set()
+            pool.task = asyncio.create_task(self._run_refill(provider, pool))
+        logger.info("Warm page pool started (size=%s, providers=%s)", self.size, list(self._providers))
+
+    async def stop(self) -> None:
+        self._started = False
+        for pool in self._providers.values():
+            if pool.task is not None:
+                pool.task.cancel()
+                try:
+                    await pool.task
+                except asyncio.CancelledError:
+                    pass
+                pool.task = None
+
+            entries = list(pool.ready)
+            pool.ready.clear()
+            for entry in entries:
+                await entry.close()
+
+    async def checkout(self, provider: str, key: str) -> Optional[WarmPage]:
+        """Restituisce una pagina pronta compatibile con `key`, oppure None se non disponibile."""
+        pool = self._providers.get(provider)
+        if not self._started or pool is None:
+            return None
+
+        selected: Optional[WarmPage] = None
+        discarded: list[WarmPage] = []
+        while pool.ready:
+            entry = pool.ready.pop(0)
+            if self._is_usable(pool, entry) and entry.key == key:
+                selected = entry
+                break
+            discarded.append(entry)
+
+        pool.refill_event.set()
+        for entry in discarded:
+            await entry.close()
+
+        if selected is None:
+            pool.misses += 1
+            return None
+
+        pool.hits += 1
+        return selected
+
+    def invalidate(self, provider: str) -> None:
+        """Scarta le pagine pronte di un provider (es. dopo login/logout)."""
+        pool = self._providers.get(provider)
+        if pool is None:
+            return
+        pool.generation += 1
+        pool.refill_event.set()
+
+    def stats(self) -> dict:
+        return {
+            "started": self._started,
+            "size": self.size,
+            "providers": {
+                provider: {
+                    "ready": len(pool.ready),
+                    "hits": pool.hits,
+                    "misses": pool.misses,
+                    "last_error": pool.last_error,
+                }
+                for provider, pool in self._providers.items()
+            },
+        }
+
+    def _is_usable(self, pool: _ProviderPool, entry: WarmPage) -> bool:
+        if entry.generation != pool.generation:
+            return False
+        return time.monotonic() - entry.created_at < self.max_idle_seconds
+
+    async def _run_refill(self, provider: str, pool: _ProviderPool) -> None:
+        # Il controllo su _started copre il caso in cui wait_for assorba la cancellazione
+        while self._started:
+            try:
+                await asyncio.wait_for(pool.refill_event.wait(), timeout=self.max_idle_seconds)
+            except asyncio.TimeoutError:
+                pass
+            pool.refill_event.clear()
+
+            await self._drop_unusable(pool)
+            while self._started and len(pool.ready) < self.size:
+                generation = pool.generation
+                try:
+                    entry = await pool.factory()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    pool.last_error = str(exc)
+                    logger.info("Unable to warm %s page: %s", provider, exc)
+                    await asyncio.sleep(self.refill_retry_seconds)
+                    continue
+
+                if entry is None:
+                    break
+                entry.generation = generation
+                pool.last_error = None
+                pool.ready.append(entry)
+
+    async def _drop_unusable(self, pool: _ProviderPool) -> None:
+        stale = [entry for entry in pool.ready if not self._is_usable(pool, entry)]
+        for entry in stale:
+            pool.ready.remove(entry)
+            await entry.close()
@@ -1,4 +1,19 @@
-from polychat.model.api.chat_response import ChatCompleteResponse, ChatMessageResponse, ChatStartResponse
+import hashlib
+from typing import AsyncIterable, AsyncIterator, Optional
+
+from fastapi import HTTPException, Response, status
+
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.circuit_breaker_manager import CircuitOpenError
+from polychat.model.api.chat_response import (
+    ChatBatchItemResponse,
+    ChatCompleteResponse,
+    ChatMessageResponse,
+    ChatStartResponse,
+    ChatStreamEventResponse,
+)
+from polychat.model.client.chat_stream_event import ChatStreamEvent
+from polychat.model.service.batch_item import BatchItem
 from polychat.model.service.chat import Chat
 
 
@@ -16,9 +31,87 @@ class ChatToApiMapper:
             image_url=chat.image_url,
         )
 
+    def create_conditional_message_from(
+        self,
+        chat: Chat,
+        response: Optional[Response] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ChatMessageResponse | Response:
+        """
+        Messaggio con ETag calcolato sul contenuto: se coincide con `If-None-Match` restituisce
+        un 304 senza body, altrimenti imposta l'header ETag su `response`.
+        """
+        message = self.create_message_from(chat)
+        etag = '"' + hashlib.sha256(message.model_dump_json().encode("utf-8")).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if if_none_match and self._etag_matches(etag, if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if response is not None:
+            response.headers.update(headers)
+        return message
+
     def create_complete_from(self, chat: Chat) -> ChatCompleteResponse:
         return ChatCompleteResponse(
             chat_id=chat.id,
             message=chat.message,
             image_url=chat.image_url,
         )
+
+    def create_batch_item_from(self, item: BatchItem) -> ChatBatchItemResponse:
+        return ChatBatchItemResponse(
+            index=item.index,
+            sequence=item.sequence,
+            total=item.total,
+            status="succeeded" if item.succeeded else "failed",
+            latency_seconds=item.latency_seconds,
+            result=self.create_complete_from(item.chat) if item.chat is not None else None,
+            error=item.error,
+        )
+
+    def create_too_many_requests_from(self, exc: AdmissionRejectedError) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        )
+
+    def create_service_unavailable_from(self, exc: CircuitOpenError) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after_seconds)},
+        )
+
+    def create_stream_event_from(self, event: ChatStreamEvent) -> ChatStreamEventResponse:
+        return ChatStreamEventResponse(
+            type=event.type,
+            chat_id=event.chat_id,
+            text=event.text,
+        )
+
+    @staticmethod
+    def _etag_matches(etag: str, if_none_match: str) -> bool:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        # Confronto debole: W/"x" equivale a "x"
+        return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+    async def create_sse_stream_from(
+        self,
+        events: AsyncIterable[ChatStreamEvent],
+        first_event: Optional[ChatStreamEvent] = None,
+    ) -> AsyncIterator[str]:
+        """Serializza gli eventi nel formato text/event-stream; `first_event` e' quello gia' letto dal controller."""
+        if first_event is not None:
+            yield self._sse_event_from(first_event)
+        async for event in events:
+            yield self._sse_event_from(event)
+
+    def _sse_event_from(self, event: ChatStreamEvent) -> str:
+        payload = self.create_stream_event_from(event).model_dump_json()
+        return f"event: {event.type}\ndata: {payload}\n\n"
+
+    async def create_ndjson_stream_from(self, items: AsyncIterable[BatchItem]) -> AsyncIterator[str]:
+        """Serializza gli esiti del batch come NDJSON, una riga per elemento."""
+        async for item in items:
+            yield self.create_batch_item_from(item).model_dump_json() + "\n"
@@ -0,0 +1,32 @@
+from fastapi import HTTPException, status
+
+from polychat.manager.job_manager import JobCapacityError
+from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.model.api.job_response import JobResponse
+from polychat.model.service.job import Job
+
+
+class JobToApiMapper:
+    """Mapper job di dominio -> API."""
+
+    def __init__(self, chat_to_api_mapper: ChatToApiMapper):
+        self.chat_to_api_mapper = chat_to_api_mapper
+
+    def create_from(self, job: Job) -> JobResponse:
+        return JobResponse(
+            job_id=job.id,
+            provider=job.provider,
+            status=job.status,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            result=self.chat_to_api_mapper.create_complete_from(job.chat) if job.chat is not None else None,
+            error=job.error,
+            webhook_delivered=job.webhook_delivered,
+        )
+
+    def create_capacity_error_from(self, exc: JobCapacityError) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+        )
@@ -0,0 +1,31 @@
+from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.model.api.multi_complete_response import MultiCompleteResponse, ProviderCompleteResponse
+from polychat.model.service.multi_completion import MultiCompletion, ProviderCompletion
+
+
+class MultiToApiMapper:
+    """Mapper risposte multi-provider di dominio -> API."""
+
+    def __init__(self, chat_to_api_mapper: ChatToApiMapper):
+        self.chat_to_api_mapper = chat_to_api_mapper
+
+    def create_from(self, completion: MultiCompletion) -> MultiCompleteResponse:
+        return MultiCompleteResponse(
+            mode=completion.mode,
+            complete=completion.is_complete,
+            required=completion.required,
+            succeeded=completion.succeeded,
+            winner=completion.winner,
+            hedge_after_seconds=completion.hedge_after_seconds,
+            elapsed_seconds=completion.elapsed_seconds,
+            results=[self.create_provider_from(result) for result in completion.results],
+        )
+
+    def create_provider_from(self, result: ProviderCompletion) -> ProviderCompleteResponse:
+        return ProviderCompleteResponse(
+            provider=result.provider,
+            status=result.status,
+            latency_seconds=result.latency_seconds,
+            result=self.chat_to_api_mapper.create_complete_from(result.chat) if result.chat is not None else None,
+            error=result.error,
+        )
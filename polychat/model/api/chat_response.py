@@ -30,6 +30,30 @@ class ChatCompleteResponse(BaseModel):
     image_url: Optional[str] = None
 
 
+class ChatBatchItemResponse(BaseModel):
+    """Riga NDJSON dell'endpoint batch: `index` e' la posizione nella richiesta, `sequence` l'ordine di arrivo."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    index: int
+    sequence: int
+    total: int
+    status: str
+    latency_seconds: float
+    result: Optional[ChatCompleteResponse] = None
+    error: Optional[str] = None
+
+
+class ChatStreamEventResponse(BaseModel):
+    """Evento SSE dell'endpoint di streaming (`chat`, `delta`, `done`, `error`)."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    type: str
+    chat_id: Optional[str] = None
+    text: str = ""
+
+
 class ChannelStatusResponse(BaseModel):
     """Stato operativo/autenticazione di un canale."""
 
@@ -39,3 +63,4 @@ class ChannelStatusResponse(BaseModel):
     is_available: bool
     is_logged_in: Optional[bool] = None
     detail: Optional[str] = None
+    checked_at: Optional[float] = None  # timestamp Unix dell'ultimo controllo
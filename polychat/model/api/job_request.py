@@ -0,0 +1,40 @@
+import ipaddress
+from typing import Literal, Optional
+from urllib.parse import urlsplit
+
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class JobRequest(BaseModel):
+    """Richiesta di creazione di un job asincrono."""
+
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+    provider: Literal["chatgpt", "deepseek", "gemini", "kimi", "perplexity", "qwen"]
+    message: str
+    chat_id: Optional[str] = None
+    # True = digitazione simulata (lenta); di default il prompt viene inserito in un colpo solo
+    type: bool = False
+    webhook_url: Optional[str] = None
+
+    @field_validator("webhook_url")
+    @classmethod
+    def _validate_webhook_url(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        parsed = urlsplit(value)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError("webhook_url deve essere un URL http(s) assoluto")
+        # Il server non deve diventare un relay verso la rete locale (SSRF)
+        host = parsed.hostname.rstrip(".")
+        if host == "localhost" or host.endswith(".localhost") or not cls._is_public_host(host):
+            raise ValueError("webhook_url non puo' puntare a indirizzi locali o privati")
+        return value
+
+    @staticmethod
+    def _is_public_host(host: str) -> bool:
+        try:
+            return ipaddress.ip_address(host).is_global
+        except ValueError:
+            # Nome a dominio: gli indirizzi risolti vengono controllati alla consegna
+            return True
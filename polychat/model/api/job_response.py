@@ -0,0 +1,21 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.api.chat_response import ChatCompleteResponse
+
+
+class JobResponse(BaseModel):
+    """Stato di un job asincrono; `result` e' valorizzato quando `status` e' `succeeded`."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    job_id: str
+    provider: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[ChatCompleteResponse] = None
+    error: Optional[str] = None
+    webhook_delivered: Optional[bool] = None
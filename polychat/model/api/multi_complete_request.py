@@ -0,0 +1,22 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+Provider = Literal["chatgpt", "deepseek", "gemini", "kimi", "perplexity", "qwen"]
+
+
+class MultiCompleteRequest(BaseModel):
+    """Richiesta inviata in parallelo a piu' provider."""
+
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+    providers: list[Provider] = Field(min_length=1)
+    message: str
+    mode: Literal["first", "all", "quorum", "hedged"] = "all"
+    # Risposte necessarie in modalita' `quorum`; di default la maggioranza dei provider
+    quorum: Optional[int] = Field(default=None, ge=1)
+    timeout_seconds: Optional[float] = Field(default=None, gt=0, le=600)
+    # Modalita' `hedged`: attesa prima del provider successivo; di default il p95 osservato del primo
+    hedge_after_seconds: Optional[float] = Field(default=None, ge=0, le=600)
+    # True = digitazione simulata (lenta); di default il prompt viene inserito in un colpo solo
+    type: bool = False
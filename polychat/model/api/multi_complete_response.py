@@ -0,0 +1,32 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.api.chat_response import ChatCompleteResponse
+
+
+class ProviderCompleteResponse(BaseModel):
+    """Esito di un singolo provider, con la latenza misurata dall'invio."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    provider: str
+    status: str
+    latency_seconds: float
+    result: Optional[ChatCompleteResponse] = None
+    error: Optional[str] = None
+
+
+class MultiCompleteResponse(BaseModel):
+    """Risposte dei provider interrogati; `complete` indica se la modalita' e' stata soddisfatta."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    mode: str
+    complete: bool
+    required: int
+    succeeded: int
+    winner: Optional[str] = None
+    hedge_after_seconds: Optional[float] = None
+    elapsed_seconds: float
+    results: list[ProviderCompleteResponse]
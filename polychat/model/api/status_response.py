@@ -0,0 +1,14 @@
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.api.chat_response import ChannelStatusResponse
+
+
+class StatusResponse(BaseModel):
+    """Stato di tutti i provider; `timed_out` elenca quelli che non hanno risposto entro la scadenza."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    status: str
+    providers: dict[str, ChannelStatusResponse]
+    timed_out: list[str]
+    elapsed_seconds: float
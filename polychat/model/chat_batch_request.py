@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+
+from polychat.model.chat_request import ChatRequest
+
+
+class ChatBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+    requests: list[ChatRequest] = Field(min_length=1, max_length=10000)
+    # Richieste eseguite contemporaneamente; di default BATCH_DEFAULT_PARALLELISM
+    parallelism: Optional[int] = Field(default=None, ge=1)
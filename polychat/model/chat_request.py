@@ -7,4 +7,5 @@ class ChatRequest(BaseModel):
 
     message: str
     chat_id: Optional[str] = None
-    type: bool = True
+    # True = digitazione simulata (lenta); di default il prompt viene inserito in un colpo solo
+    type: bool = False
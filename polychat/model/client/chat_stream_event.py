@@ -0,0 +1,13 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChatStreamEvent(BaseModel):
+    """Evento incrementale prodotto durante lo streaming di una risposta."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    type: Literal["chat", "delta", "done", "error"]
+    chat_id: Optional[str] = None
+    text: str = ""
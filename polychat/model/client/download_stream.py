@@ -0,0 +1,25 @@
+from typing import AsyncIterator
+
+import httpx
+from pydantic import BaseModel, ConfigDict
+
+
+class DownloadStream(BaseModel):
+    """Download in pass-through: header upstream da inoltrare e body letto a chunk senza bufferizzarlo."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    status_code: int
+    media_type: str
+    headers: dict[str, str]
+    response: httpx.Response
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self.response.aiter_raw():
+                yield chunk
+        finally:
+            await self.response.aclose()
+
+    async def aclose(self) -> None:
+        await self.response.aclose()
@@ -0,0 +1,25 @@
+import random
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class RetryPolicy(BaseModel):
+    """Politica di retry di un'operazione del client: tentativi e backoff esponenziale con jitter."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 15.0
+    multiplier: float = 2.0
+    # Frazione del ritardo resa casuale (1.0 = "full jitter", 0 = backoff deterministico)
+    jitter: float = 1.0
+
+    def compute_delay(self, retry_number: int, rng: Optional[random.Random] = None) -> float:
+        """Ritardo prima del retry numero `retry_number` (1 = primo retry)."""
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * self.multiplier ** (retry_number - 1))
+        if self.jitter <= 0:
+            return delay
+        jittered = delay * (1 - self.jitter)
+        return jittered + (rng or random).uniform(0, delay - jittered)
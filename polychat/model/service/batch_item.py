@@ -0,0 +1,22 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.service.chat import Chat
+
+
+class BatchItem(BaseModel):
+    """Esito di un elemento di un batch; `index` e' la posizione nella richiesta, `sequence` l'ordine di fine."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    index: int
+    sequence: int
+    total: int
+    latency_seconds: float
+    chat: Optional[Chat] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
@@ -0,0 +1,31 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.service.chat import Chat
+
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class Job(BaseModel):
+    """Richiesta `ask_and_wait` eseguita in background."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    id: str
+    provider: str
+    message: str
+    chat_id: Optional[str] = None
+    type_input: bool = True
+    webhook_url: Optional[str] = None
+    status: JobStatus = "queued"
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chat: Optional[Chat] = None
+    error: Optional[str] = None
+    webhook_delivered: Optional[bool] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
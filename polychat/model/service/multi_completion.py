@@ -0,0 +1,38 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from polychat.model.service.chat import Chat
+
+MultiMode = Literal["first", "all", "quorum", "hedged"]
+ProviderCompletionStatus = Literal["succeeded", "failed", "cancelled", "timed_out", "skipped"]
+
+
+class ProviderCompletion(BaseModel):
+    """Esito di un provider in una richiesta inviata a piu' provider."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    provider: str
+    status: ProviderCompletionStatus
+    latency_seconds: float
+    chat: Optional[Chat] = None
+    error: Optional[str] = None
+
+
+class MultiCompletion(BaseModel):
+    """Risultato di `ask_and_wait` inviato in parallelo a piu' provider."""
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    mode: MultiMode
+    required: int
+    succeeded: int
+    winner: Optional[str] = None
+    hedge_after_seconds: Optional[float] = None
+    elapsed_seconds: float
+    results: list[ProviderCompletion]
+
+    @property
+    def is_complete(self) -> bool:
+        return self.succeeded >= self.required
@@ -0,0 +1,37 @@
+from typing import Optional
+
+
+class SseParser:
+    """Parser incrementale per stream text/event-stream: accumula i chunk e restituisce gli eventi completi."""
+
+    def __init__(self) -> None:
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        self._buffer += chunk.replace("\r\n", "\n")
+        events = []
+        while "\n\n" in self._buffer:
+            block, self._buffer = self._buffer.split("\n\n", 1)
+            event = self.parse_block(block)
+            if event is not None:
+                events.append(event)
+        return events
+
+    @staticmethod
+    def parse_block(block: str) -> Optional[tuple[str, str]]:
+        event_name = "message"
+        data_lines = []
+        for line in block.split("\n"):
+            if not line or line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "event":
+                event_name = value
+            elif field == "data":
+                data_lines.append(value)
+
+        if not data_lines:
+            return None
+        return event_name, "\n".join(data_lines)
@@ -1,56 +1,198 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
+from urllib.parse import parse_qs, urlsplit
 
 from injector import inject
 
 from polychat.client.chat_gpt_client import ChatGptClient
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.admission_manager import AdmissionManager, AdmissionRejectedError
+from polychat.manager.batch_manager import BatchManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager, CircuitOpenError
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.manager.single_flight_manager import SingleFlightManager
+from polychat.manager.status_monitor_manager import StatusMonitorManager
 from polychat.mapper.client.chatgpt_chat_mapper import ChatGptChatMapper
+from polychat.model.chat_request import ChatRequest
+from polychat.model.client.chat_stream_event import ChatStreamEvent
+from polychat.model.client.chatgpt_conversation_detail import ConversationDetail
+from polychat.model.service.batch_item import BatchItem
+from polychat.model.client.download_stream import DownloadStream
 from polychat.model.service.chat import Chat
 
 
 class ChatGptService:
+    PROVIDER_NAME = "chatgpt"
 
     @inject
-    def __init__(self, chatgpt_client: ChatGptClient, chatgpt_chat_mapper: ChatGptChatMapper):
+    def __init__(
+        self,
+        chatgpt_client: ChatGptClient,
+        chatgpt_chat_mapper: ChatGptChatMapper,
+        admission_manager: Optional[AdmissionManager] = None,
+        account_pool_manager: Optional[AccountPoolManager] = None,
+        account_clients: Optional[dict[str, ChatGptClient]] = None,
+        conversation_cache_manager: Optional[ConversationCacheManager] = None,
+        single_flight_manager: Optional[SingleFlightManager] = None,
+        circuit_breaker_manager: Optional[CircuitBreakerManager] = None,
+        status_monitor_manager: Optional[StatusMonitorManager] = None,
+        batch_manager: Optional[BatchManager] = None,
+    ):
         self.chatgpt_client = chatgpt_client
         self.chatgpt_chat_mapper = chatgpt_chat_mapper
+        self.admission_manager = admission_manager or AdmissionManager()
+        self.account_pool_manager = account_pool_manager or AccountPoolManager()
+        self.conversation_cache_manager = conversation_cache_manager or ConversationCacheManager()
+        self.single_flight_manager = single_flight_manager or SingleFlightManager()
+        self.circuit_breaker_manager = circuit_breaker_manager or CircuitBreakerManager()
+        self.status_monitor_manager = status_monitor_manager or StatusMonitorManager()
+        self.batch_manager = batch_manager or BatchManager()
+        # Un client per account; quello di default gestisce login, logout e status
+        self.chatgpt_clients = {AccountPoolManager.DEFAULT_ACCOUNT: chatgpt_client, **(account_clients or {})}
+        self.account_pool_manager.register(self.PROVIDER_NAME, list(self.chatgpt_clients))
+        self.circuit_breaker_manager.register_probe(self.PROVIDER_NAME, self._probe_status)
+        self.status_monitor_manager.register(self.PROVIDER_NAME, lambda: self.chatgpt_client.status())
 
     def logout(self) -> None:
         """Rimuove la sessione ChatGPT salvata."""
         self.chatgpt_client.logout()
+        self.status_monitor_manager.invalidate(self.PROVIDER_NAME)
 
     async def login(self, content: str) -> None:
         await self.chatgpt_client.login(content)
+        self.status_monitor_manager.invalidate(self.PROVIDER_NAME)
 
-    async def status(self) -> dict:
-        return await self.chatgpt_client.status()
+    async def status(self, refresh: bool = False) -> dict:
+        """Ultimo stato controllato in background; con `refresh` esegue un controllo live."""
+        cached = None if refresh else self.status_monitor_manager.get(self.PROVIDER_NAME)
+        return cached or await self.status_monitor_manager.refresh(self.PROVIDER_NAME)
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> Chat:
         """Invia una domanda a ChatGPT e restituisce l'output come Chat."""
         try:
-            result = await self.chatgpt_client.ask(message, chat_id, type_input=type_input)
-            return self.chatgpt_chat_mapper.create_from(result)
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        result = await self.chatgpt_clients[account].ask(message, chat_id, type_input=type_input)
+            return self._remember_account(self.chatgpt_chat_mapper.create_from(result), account)
+        except (AdmissionRejectedError, CircuitOpenError):
+            raise
         except Exception as exc:
             raise Exception(f"Error asking ChatGPT: {exc}")
 
     async def get_conversation(self, chat_id: str) -> Chat:
         """Recupera i dettagli di una conversazione ChatGPT."""
         try:
-            detail = await self.chatgpt_client.get_conversation(chat_id)
-            return self.chatgpt_chat_mapper.create_from(detail)
+            cached = self.conversation_cache_manager.get(self.PROVIDER_NAME, chat_id)
+            if cached is not None:
+                return cached
+
+            # Letture concorrenti della stessa conversazione condividono un'unica richiesta;
+            # se nel frattempo arriva un nuovo messaggio il risultato non finisce in cache
+            generation = self.conversation_cache_manager.generation()
+            return await self.single_flight_manager.run(
+                (self.PROVIDER_NAME, chat_id),
+                lambda: self._fetch_conversation(chat_id, generation),
+            )
+        except CircuitOpenError:
+            raise
         except Exception as exc:
             raise Exception(f"Error fetching ChatGPT conversation: {exc}")
 
+    async def _fetch_conversation(self, chat_id: str, generation: int) -> Chat:
+        async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+            account = self.account_pool_manager.account_for(self.PROVIDER_NAME, chat_id)
+            detail = await self.chatgpt_clients[account].get_conversation(chat_id)
+            chat = self.chatgpt_chat_mapper.create_from(detail)
+            self.conversation_cache_manager.put(
+                self.PROVIDER_NAME,
+                chat_id,
+                chat,
+                completed=self._is_turn_completed(detail),
+                generation=generation,
+            )
+        return chat
+
     async def ask_and_wait(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> Chat:
         """Invia una domanda e attende che la conversazione esponga la risposta finale."""
         try:
-            detail = await self.chatgpt_client.ask_and_wait(message, chat_id, type_input=type_input)
-            return self.chatgpt_chat_mapper.create_from(detail)
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        detail = await self.chatgpt_clients[account].ask_and_wait(message, chat_id, type_input=type_input)
+            return self._remember_account(self.chatgpt_chat_mapper.create_from(detail), account)
+        except (AdmissionRejectedError, CircuitOpenError):
+            raise
         except Exception as exc:
             raise Exception(f"Error asking ChatGPT and waiting for completion: {exc}")
 
-    def proxy_download(self, download_url: str) -> tuple[bytes, int, str, str]:
-        """Proxy download file ChatGPT usando cookie di sessione."""
+    def ask_batch(self, requests: list[ChatRequest], parallelism: Optional[int] = None) -> AsyncIterator[BatchItem]:
+        """Esegue `ask_and_wait` per ogni richiesta con parallelismo limitato, restituendo gli esiti man mano."""
+        return self.batch_manager.run(
+            len(requests),
+            lambda index: self.ask_and_wait(requests[index].message, requests[index].chat_id, requests[index].type),
+            parallelism,
+        )
+
+    async def ask_stream(
+        self,
+        message: str,
+        chat_id: Optional[str] = None,
+        type_input: bool = True,
+    ) -> AsyncIterator[ChatStreamEvent]:
+        """Invia una domanda e produce la risposta man mano che ChatGPT la genera."""
+        try:
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        async for event in self.chatgpt_clients[account].ask_stream(message, chat_id, type_input=type_input):
+                            self._track_conversation(event.chat_id, account)
+                            yield event
+        except (AdmissionRejectedError, CircuitOpenError):
+            # Sollevate prima del primo evento: il controller risponde 429/503 invece di aprire lo stream
+            raise
+        except Exception as exc:
+            yield ChatStreamEvent(type="error", text=f"Error streaming ChatGPT answer: {exc}")
+
+    async def proxy_download(
+        self,
+        download_url: str,
+        request_headers: Optional[dict[str, str]] = None,
+        chat_id: Optional[str] = None,
+    ) -> DownloadStream:
+        """
+        Proxy download file ChatGPT usando cookie di sessione, in streaming.
+        Il file appartiene all'account della conversazione (`chat_id`, o `conversation_id`
+        nella query della download_url): i cookie usati sono quelli di quell'account.
+        """
+        if not chat_id:
+            chat_id = next(iter(parse_qs(urlsplit(download_url).query).get("conversation_id", [])), None)
+        account = self.account_pool_manager.account_for(self.PROVIDER_NAME, chat_id)
         try:
-            return self.chatgpt_client.proxy_download(download_url)
+            return await self.chatgpt_clients[account].proxy_download(download_url, request_headers)
         except Exception as exc:
             raise Exception(f"Error proxying ChatGPT download: {exc}")
+
+    def _remember_account(self, chat: Chat, account: str) -> Chat:
+        """Associa la conversazione all'account che l'ha creata, per le richieste successive."""
+        self._track_conversation(chat.id, account)
+        return chat
+
+    @staticmethod
+    def _is_turn_completed(detail: ConversationDetail) -> bool:
+        """L'ultimo messaggio e' una risposta dell'assistente chiusa (`end_turn`)."""
+        node = detail.mapping.get(detail.current_node or "")
+        message = node.message if node else None
+        return bool(message and message.author.role == "assistant" and message.end_turn)
+
+    def _track_conversation(self, chat_id: Optional[str], account: str) -> None:
+        # La conversazione e' cambiata: le letture in cache non sono piu' valide
+        self.account_pool_manager.remember_conversation(self.PROVIDER_NAME, chat_id, account)
+        self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+
+    async def _probe_status(self) -> bool:
+        """Sonda del circuit breaker: il provider risponde di nuovo."""
+        status = await self.status_monitor_manager.refresh(self.PROVIDER_NAME)
+        return bool(status.get("is_available"))
@@ -0,0 +1,160 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+import uuid
+
+import httpx
+from injector import inject
+
+from polychat.manager.admission_manager import AdmissionManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.job_manager import JobManager
+from polychat.mapper.service.job_to_api_mapper import JobToApiMapper
+from polychat.model.service.chat import Chat
+from polychat.model.service.job import Job
+from polychat.service.chat_gpt_service import ChatGptService
+from polychat.service.deepseek_service import DeepseekService
+from polychat.service.gemini_service import GeminiService
+from polychat.service.kimi_service import KimiService
+from polychat.service.perplexity_service import PerplexityService
+from polychat.service.qwen_service import QwenService
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Esegue `ask_and_wait` dei provider in background e ne consegna il risultato.
+
+    Le richieste passano dall'admission control come quelle interattive, ma un rifiuto per
+    sovraccarico non fa fallire il job: viene ripetuto dopo il Retry-After.
+
+    I webhook usano un client dedicato (timeout breve, niente redirect ne' cookie) e vengono
+    consegnati solo a host che risolvono su indirizzi pubblici.
+    """
+
+    WEBHOOK_ATTEMPTS = 3
+    WEBHOOK_RETRY_DELAY_SECONDS = 1.0
+    WEBHOOK_TIMEOUT_SECONDS = 10.0
+
+    @inject
+    def __init__(
+        self,
+        job_manager: JobManager,
+        http_client_manager: HttpClientManager,
+        job_to_api_mapper: JobToApiMapper,
+        chatgpt_service: ChatGptService,
+        deepseek_service: DeepseekService,
+        gemini_service: GeminiService,
+        kimi_service: KimiService,
+        perplexity_service: PerplexityService,
+        qwen_service: QwenService,
+    ):
+        self.job_manager = job_manager
+        self.http_client_manager = http_client_manager
+        self.job_to_api_mapper = job_to_api_mapper
+        self._webhook_client: Optional[httpx.AsyncClient] = None
+        self.services = {
+            service.PROVIDER_NAME: service
+            for service in (
+                chatgpt_service,
+                deepseek_service,
+                gemini_service,
+                kimi_service,
+                perplexity_service,
+                qwen_service,
+            )
+        }
+
+    def submit(
+        self,
+        provider: str,
+        message: str,
+        chat_id: Optional[str] = None,
+        type_input: bool = True,
+        webhook_url: Optional[str] = None,
+    ) -> Job:
+        """Crea il job e lo accoda; ritorna subito con lo stato `queued`."""
+        if provider not in self.services:
+            raise ValueError(f"Provider non supportato: {provider}")
+
+        job = Job(
+            id=uuid.uuid4().hex,
+            provider=provider,
+            message=message,
+            chat_id=chat_id,
+            type_input=type_input,
+            webhook_url=webhook_url,
+            created_at=time.time(),
+        )
+        on_finished = self._deliver_webhook if webhook_url else None
+        return self.job_manager.submit(job, self._run, on_finished)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.job_manager.get(job_id)
+
+    async def wait(self, job_id: str, timeout_seconds: float) -> Optional[Job]:
+        """Long-poll: attende al massimo `timeout_seconds` che il job termini."""
+        return await self.job_manager.wait(job_id, timeout_seconds)
+
+    def stats(self) -> dict:
+        return self.job_manager.stats()
+
+    async def stop(self) -> None:
+        client, self._webhook_client = self._webhook_client, None
+        if client is not None:
+            await client.aclose()
+
+    async def _run(self, job: Job) -> Chat:
+        service = self.services[job.provider]
+        # Un job accodato dietro risposte lunghe attende il suo turno invece di fallire per sovraccarico
+        return await AdmissionManager.retry_until_admitted(
+            lambda: service.ask_and_wait(job.message, job.chat_id, type_input=job.type_input)
+        )
+
+    async def _deliver_webhook(self, job: Job) -> None:
+        if not await self._is_public_target(job.webhook_url):
+            logger.warning("Webhook for job %s refused: %s resolves to a non-public address", job.id, job.webhook_url)
+            job.webhook_delivered = False
+            return
+
+        payload = self.job_to_api_mapper.create_from(job).model_dump(mode="json")
+        client = self._get_webhook_client()
+        for attempt in range(1, self.WEBHOOK_ATTEMPTS + 1):
+            try:
+                response = await client.post(job.webhook_url, json=payload)
+                if response.status_code < 400:
+                    job.webhook_delivered = True
+                    return
+                logger.info("Webhook for job %s answered %s (attempt %s)", job.id, response.status_code, attempt)
+            except Exception as exc:
+                logger.info("Webhook for job %s failed (attempt %s): %s", job.id, attempt, exc)
+
+            if attempt < self.WEBHOOK_ATTEMPTS:
+                await asyncio.sleep(self.WEBHOOK_RETRY_DELAY_SECONDS * attempt)
+
+        job.webhook_delivered = False
+
+    def _get_webhook_client(self) -> httpx.AsyncClient:
+        if self._webhook_client is None or self._webhook_client.is_closed:
+            self._webhook_client = self.http_client_manager.create_client(self.WEBHOOK_TIMEOUT_SECONDS)
+        return self._webhook_client
+
+    async def _is_public_target(self, url: str) -> bool:
+        parsed = urlsplit(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        try:
+            addresses = await self._resolve_addresses(parsed.hostname or "", port)
+            return bool(addresses) and all(ipaddress.ip_address(address).is_global for address in addresses)
+        except (OSError, ValueError) as exc:
+            logger.info("Cannot resolve webhook host %s: %s", parsed.hostname, exc)
+            return False
+
+    @staticmethod
+    async def _resolve_addresses(host: str, port: int) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        return [info[4][0] for info in infos]
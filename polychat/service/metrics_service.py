@@ -0,0 +1,257 @@
+from typing import Optional
+
+from injector import inject
+
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.admission_manager import AdmissionManager
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.batch_manager import BatchManager
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.manager.http_client_manager import HttpClientManager
+from polychat.manager.job_manager import JobManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager, Sample
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.single_flight_manager import SingleFlightManager
+from polychat.manager.status_monitor_manager import StatusMonitorManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPagePoolManager
+
+
+def _gauge(name: str, help_text: str, value: Optional[float], **labels: str) -> list[Sample]:
+    return [] if value is None else [(name, "gauge", help_text, labels, float(value))]
+
+
+def _counter(name: str, help_text: str, value: Optional[float], **labels: str) -> list[Sample]:
+    return [] if value is None else [(name, "counter", help_text, labels, float(value))]
+
+
+class MetricsService:
+    """
+    Metriche Prometheus del server (GET /metrics).
+
+    Durate, esiti ed errori delle operazioni dei client sono registrati direttamente nel
+    MetricsManager; lo stato di pool, code, cache e circuiti viene letto dagli `stats()`
+    dei manager al momento della richiesta.
+    """
+
+    CIRCUIT_STATES = ("closed", "open", "half_open")
+
+    @inject
+    def __init__(
+        self,
+        metrics_manager: MetricsManager,
+        browser_pool_manager: BrowserPoolManager,
+        warm_page_pool_manager: WarmPagePoolManager,
+        sticky_page_manager: StickyPageManager,
+        admission_manager: AdmissionManager,
+        account_pool_manager: AccountPoolManager,
+        conversation_cache_manager: ConversationCacheManager,
+        single_flight_manager: SingleFlightManager,
+        retry_manager: RetryManager,
+        circuit_breaker_manager: CircuitBreakerManager,
+        job_manager: JobManager,
+        batch_manager: BatchManager,
+        http_client_manager: HttpClientManager,
+        status_monitor_manager: StatusMonitorManager,
+        latency_manager: LatencyManager,
+        resource_blocking_manager: ResourceBlockingManager,
+        asset_cache_manager: AssetCacheManager,
+    ):
+        self.metrics_manager = metrics_manager
+        self.browser_pool_manager = browser_pool_manager
+        self.warm_page_pool_manager = warm_page_pool_manager
+        self.sticky_page_manager = sticky_page_manager
+        self.admission_manager = admission_manager
+        self.account_pool_manager = account_pool_manager
+        self.conversation_cache_manager = conversation_cache_manager
+        self.single_flight_manager = single_flight_manager
+        self.retry_manager = retry_manager
+        self.circuit_breaker_manager = circuit_breaker_manager
+        self.job_manager = job_manager
+        self.batch_manager = batch_manager
+        self.http_client_manager = http_client_manager
+        self.status_monitor_manager = status_monitor_manager
+        self.latency_manager = latency_manager
+        self.resource_blocking_manager = resource_blocking_manager
+        self.asset_cache_manager = asset_cache_manager
+        self.metrics_manager.register_collector(self._collect)
+
+    def render(self) -> str:
+        return self.metrics_manager.render()
+
+    def _collect(self) -> list[Sample]:
+        return [
+            *self._browser_samples(),
+            *self._admission_samples(),
+            *self._account_samples(),
+            *self._cache_samples(),
+            *self._retry_samples(),
+            *self._circuit_samples(),
+            *self._background_samples(),
+            *self._http_samples(),
+            *self._status_samples(),
+            *self._latency_samples(),
+        ]
+
+    def _browser_samples(self) -> list[Sample]:
+        pool = self.browser_pool_manager.stats()
+        samples = [
+            *_gauge("polychat_browser_processes", "Processi browser Camoufox aperti", pool["open_browsers"]),
+            *_counter("polychat_browser_launches_total", "Browser avviati", pool["launches"]),
+            *_counter(
+                "polychat_browser_launch_seconds_total",
+                "Tempo complessivo speso ad avviare browser",
+                pool["launch_seconds_total"],
+            ),
+            *_gauge(
+                "polychat_browser_active_leases",
+                "BrowserContext in uso sui browser del pool",
+                sum(browser["active_leases"] for browser in pool["browsers"]),
+            ),
+        ]
+
+        for provider, warm in self.warm_page_pool_manager.stats()["providers"].items():
+            samples += _gauge("polychat_warm_pages_ready", "Pagine calde pronte", warm["ready"], provider=provider)
+            samples += _counter("polychat_warm_page_hits_total", "Richieste servite da una pagina calda", warm["hits"], provider=provider)
+            samples += _counter("polychat_warm_page_misses_total", "Richieste senza pagina calda", warm["misses"], provider=provider)
+
+        sticky = self.sticky_page_manager.stats()
+        samples += _gauge("polychat_sticky_pages", "Pagine di conversazione tenute aperte", sticky["pages"])
+        samples += _counter("polychat_sticky_page_hits_total", "Turni che hanno ripreso la pagina della conversazione", sticky["hits"])
+        samples += _counter("polychat_sticky_page_evictions_total", "Pagine sticky chiuse per limite", sticky["evictions"])
+
+        for provider, traffic in self.resource_blocking_manager.stats()["providers"].items():
+            samples += _counter("polychat_blocked_requests_total", "Richieste bloccate dalle route", traffic["blocked"], provider=provider)
+            samples += _counter(
+                "polychat_page_downloaded_bytes_total",
+                "Byte scaricati dalle pagine (Content-Length)",
+                traffic["downloaded_bytes"],
+                provider=provider,
+            )
+        return samples
+
+    def _admission_samples(self) -> list[Sample]:
+        samples = []
+        for provider, gate in self.admission_manager.stats().items():
+            samples += _gauge("polychat_admission_in_flight", "Richieste browser ammesse in corso", gate["in_flight"], provider=provider)
+            samples += _gauge("polychat_admission_queued", "Richieste in attesa di ammissione", gate["queued"], provider=provider)
+            samples += _counter("polychat_admission_admitted_total", "Richieste ammesse", gate["admitted"], provider=provider)
+            samples += _counter("polychat_admission_rejected_total", "Richieste rifiutate (coda piena)", gate["rejected"], provider=provider)
+            samples += _counter("polychat_admission_timed_out_total", "Richieste scadute in coda", gate["timed_out"], provider=provider)
+        return samples
+
+    def _account_samples(self) -> list[Sample]:
+        samples = []
+        for provider, accounts in self.account_pool_manager.stats()["providers"].items():
+            for account, load in accounts.items():
+                samples += _gauge(
+                    "polychat_account_in_flight",
+                    "Richieste in corso per account",
+                    load["in_flight"],
+                    provider=provider,
+                    account=account,
+                )
+                samples += _counter(
+                    "polychat_account_leases_total",
+                    "Richieste assegnate all'account",
+                    load["leases"],
+                    provider=provider,
+                    account=account,
+                )
+        return samples
+
+    def _cache_samples(self) -> list[Sample]:
+        conversations = self.conversation_cache_manager.stats()
+        single_flight = self.single_flight_manager.stats()
+        assets = self.asset_cache_manager.stats()
+        return [
+            *_gauge("polychat_conversation_cache_entries", "Conversazioni in cache", conversations["entries"]),
+            *_counter("polychat_conversation_cache_hits_total", "Letture servite dalla cache", conversations["hits"]),
+            *_counter("polychat_conversation_cache_misses_total", "Letture non in cache", conversations["misses"]),
+            *_gauge("polychat_single_flight_in_flight", "Letture condivise in corso", single_flight["in_flight"]),
+            *_counter("polychat_single_flight_coalesced_total", "Chiamate accorpate a una gia' in corso", single_flight["coalesced"]),
+            *_gauge("polychat_asset_cache_bytes", "Byte occupati dalla cache degli asset", assets["bytes"]),
+            *_counter("polychat_asset_cache_hits_total", "Asset serviti dal disco", assets["hits"]),
+            *_counter("polychat_asset_cache_misses_total", "Asset scaricati dalla rete", assets["misses"]),
+        ]
+
+    def _retry_samples(self) -> list[Sample]:
+        samples = []
+        for provider, budget in self.retry_manager.stats().items():
+            samples += _counter("polychat_retries_total", "Tentativi ripetuti", budget["retried"], provider=provider)
+            samples += _counter(
+                "polychat_retry_budget_exhausted_total",
+                "Retry negati per budget esaurito",
+                budget["budget_exhausted"],
+                provider=provider,
+            )
+        return samples
+
+    def _circuit_samples(self) -> list[Sample]:
+        samples = []
+        for provider, circuit in self.circuit_breaker_manager.stats().items():
+            for state in self.CIRCUIT_STATES:
+                samples += _gauge(
+                    "polychat_circuit_state",
+                    "Stato del circuit breaker (1 = stato corrente)",
+                    1 if circuit["state"] == state else 0,
+                    provider=provider,
+                    state=state,
+                )
+            samples += _counter("polychat_circuit_trips_total", "Aperture del circuito", circuit["trips"], provider=provider)
+            samples += _counter("polychat_circuit_rejected_total", "Richieste rifiutate a circuito aperto", circuit["rejected"], provider=provider)
+        return samples
+
+    def _background_samples(self) -> list[Sample]:
+        jobs = self.job_manager.stats()
+        batches = self.batch_manager.stats()
+        samples = []
+        for status in ("queued", "running"):
+            samples += _gauge("polychat_jobs", "Job asincroni per stato", jobs[status], status=status)
+        for outcome in ("succeeded", "failed"):
+            samples += _counter("polychat_jobs_completed_total", "Job conclusi per esito", jobs[outcome], outcome=outcome)
+            samples += _counter("polychat_batch_items_total", "Messaggi dei batch conclusi per esito", batches[outcome], outcome=outcome)
+        samples += _gauge("polychat_batches_running", "Batch NDJSON in corso", batches["running_batches"])
+        return samples
+
+    def _http_samples(self) -> list[Sample]:
+        samples = []
+        for host, client in self.http_client_manager.stats()["hosts"].items():
+            samples += _counter("polychat_http_client_requests_total", "Richieste dirette per host", client["requests"], host=host)
+        return samples
+
+    def _status_samples(self) -> list[Sample]:
+        samples = []
+        for provider, status in self.status_monitor_manager.stats()["providers"].items():
+            samples += _gauge(
+                "polychat_provider_available",
+                "Esito dell'ultimo controllo di stato (1 = disponibile)",
+                None if status["is_available"] is None else int(bool(status["is_available"])),
+                provider=provider,
+            )
+            samples += _gauge(
+                "polychat_provider_status_age_seconds",
+                "Eta' dell'ultimo controllo di stato",
+                status["age_seconds"],
+                provider=provider,
+            )
+        return samples
+
+    def _latency_samples(self) -> list[Sample]:
+        samples = []
+        for provider, operations in self.latency_manager.stats().items():
+            for operation, latency in operations.items():
+                for quantile in ("p50", "p95", "p99"):
+                    samples += _gauge(
+                        "polychat_operation_latency_seconds",
+                        "Percentili delle durate recenti riuscite (finestra del LatencyManager)",
+                        latency[f"{quantile}_seconds"],
+                        provider=provider,
+                        operation=operation,
+                        quantile=quantile,
+                    )
+        return samples
@@ -0,0 +1,189 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from injector import inject
+
+from polychat.manager.latency_manager import LatencyManager
+from polychat.model.service.chat import Chat
+from polychat.model.service.multi_completion import MultiCompletion, MultiMode, ProviderCompletion
+from polychat.service.chat_gpt_service import ChatGptService
+from polychat.service.deepseek_service import DeepseekService
+from polychat.service.gemini_service import GeminiService
+from polychat.service.kimi_service import KimiService
+from polychat.service.perplexity_service import PerplexityService
+from polychat.service.qwen_service import QwenService
+
+logger = logging.getLogger(__name__)
+
+
+class MultiService:
+    """Invia lo stesso messaggio a piu' provider in parallelo tramite i rispettivi service."""
+
+    @inject
+    def __init__(
+        self,
+        chatgpt_service: ChatGptService,
+        deepseek_service: DeepseekService,
+        gemini_service: GeminiService,
+        kimi_service: KimiService,
+        perplexity_service: PerplexityService,
+        qwen_service: QwenService,
+        timeout_seconds: float = 180.0,
+        latency_manager: Optional[LatencyManager] = None,
+        hedge_percentile: float = 0.95,
+        hedge_default_delay_seconds: float = 30.0,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.latency_manager = latency_manager or LatencyManager()
+        self.hedge_percentile = hedge_percentile
+        self.hedge_default_delay_seconds = hedge_default_delay_seconds
+        self.services = {
+            service.PROVIDER_NAME: service
+            for service in (
+                chatgpt_service,
+                deepseek_service,
+                gemini_service,
+                kimi_service,
+                perplexity_service,
+                qwen_service,
+            )
+        }
+
+    async def complete(
+        self,
+        providers: list[str],
+        message: str,
+        mode: MultiMode = "all",
+        quorum: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        type_input: bool = True,
+        hedge_after_seconds: Optional[float] = None,
+    ) -> MultiCompletion:
+        """
+        Esegue `ask_and_wait` su ogni provider e si ferma appena la modalita' e' soddisfatta:
+        `first` alla prima risposta valida, `quorum` dopo `quorum` risposte (di default la
+        maggioranza), `all` quando hanno risposto tutti. Le richieste ancora in corso vengono
+        cancellate; allo scadere di `timeout_seconds` si restituisce quello che e' arrivato.
+
+        In modalita' `hedged` parte solo il primo provider: se non risponde entro
+        `hedge_after_seconds` (di default il suo p95 osservato) o fallisce, parte il successivo
+        con lo stesso messaggio, e vince la prima risposta valida.
+        """
+        providers = list(dict.fromkeys(providers))
+        unknown = [provider for provider in providers if provider not in self.services]
+        if not providers or unknown:
+            raise ValueError(f"Provider non supportati: {', '.join(unknown) or 'nessun provider indicato'}")
+        required = self._required_successes(mode, len(providers), quorum)
+        timeout_seconds = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        hedge_delay = self._hedge_delay(providers[0], hedge_after_seconds) if mode == "hedged" else None
+
+        started_at = time.monotonic()
+        deadline = started_at + timeout_seconds
+        waiting = list(providers)
+        tasks: dict[asyncio.Task, str] = {}
+        pending: set[asyncio.Task] = set()
+        results: dict[str, ProviderCompletion] = {}
+        winner = None
+        next_launch_at = started_at
+
+        def launch() -> None:
+            provider = waiting.pop(0)
+            task = asyncio.create_task(self.services[provider].ask_and_wait(message, None, type_input))
+            tasks[task] = provider
+            pending.add(task)
+
+        try:
+            while self._succeeded(results) < required:
+                now = time.monotonic()
+                # Senza hedging partono tutti subito; con hedging uno alla volta, o subito se
+                # nessuno e' piu' in corso (il precedente ha fallito)
+                while waiting and (hedge_delay is None or not pending or now >= next_launch_at):
+                    launch()
+                    if hedge_delay is not None:
+                        next_launch_at = now + hedge_delay
+                        break
+                if not pending:
+                    break
+
+                wake_at = deadline if hedge_delay is None or not waiting else min(deadline, next_launch_at)
+                remaining = wake_at - now
+                if remaining <= 0 and wake_at == deadline:
+                    break
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, remaining), return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                for task in done:
+                    provider = tasks[task]
+                    results[provider] = self._completion_from(provider, task, time.monotonic() - started_at)
+                    if winner is None and results[provider].status == "succeeded":
+                        winner = provider
+        finally:
+            # Chi non ha ancora risposto non serve piu' (modalita' soddisfatta o scadenza raggiunta)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        status = "cancelled" if self._succeeded(results) >= required else "timed_out"
+        for task in pending:
+            provider = tasks[task]
+            results[provider] = ProviderCompletion(
+                provider=provider,
+                status=status,
+                latency_seconds=round(time.monotonic() - started_at, 3),
+            )
+        for provider in waiting:
+            results[provider] = ProviderCompletion(provider=provider, status="skipped", latency_seconds=0.0)
+
+        return MultiCompletion(
+            mode=mode,
+            required=required,
+            succeeded=self._succeeded(results),
+            winner=winner,
+            hedge_after_seconds=round(hedge_delay, 3) if hedge_delay is not None else None,
+            elapsed_seconds=round(time.monotonic() - started_at, 3),
+            results=[results[provider] for provider in providers],
+        )
+
+    def _hedge_delay(self, provider: str, hedge_after_seconds: Optional[float]) -> float:
+        """Attesa prima del provider di riserva: esplicita, p95 osservato o valore di default."""
+        if hedge_after_seconds is not None:
+            return hedge_after_seconds
+        observed = self.latency_manager.percentile(provider, "ask_and_wait", self.hedge_percentile)
+        return observed if observed is not None else self.hedge_default_delay_seconds
+
+    @staticmethod
+    def _required_successes(mode: MultiMode, provider_count: int, quorum: Optional[int]) -> int:
+        if mode in ("first", "hedged"):
+            return 1
+        if mode == "all":
+            return provider_count
+        if quorum is None:
+            return provider_count // 2 + 1
+        if quorum < 1 or quorum > provider_count:
+            raise ValueError(f"Il quorum deve essere compreso tra 1 e {provider_count}")
+        return quorum
+
+    @staticmethod
+    def _succeeded(results: dict[str, ProviderCompletion]) -> int:
+        return sum(1 for result in results.values() if result.status == "succeeded")
+
+    @staticmethod
+    def _completion_from(provider: str, task: asyncio.Task, latency_seconds: float) -> ProviderCompletion:
+        latency_seconds = round(latency_seconds, 3)
+        if task.cancelled():
+            return ProviderCompletion(provider=provider, status="cancelled", latency_seconds=latency_seconds)
+
+        exc = task.exception()
+        if exc is not None:
+            logger.info("Multi-provider request to %s failed: %s", provider, exc)
+            return ProviderCompletion(
+                provider=provider,
+                status="failed",
+                latency_seconds=latency_seconds,
+                error=str(exc) or type(exc).__name__,
+            )
+
+        chat: Chat = task.result()
+        return ProviderCompletion(provider=provider, status="succeeded", latency_seconds=latency_seconds, chat=chat)
@@ -1,16 +1,51 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
 from injector import inject
 from polychat.client.perplexity_client import PerplexityClient
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.admission_manager import AdmissionManager, AdmissionRejectedError
+from polychat.manager.batch_manager import BatchManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager, CircuitOpenError
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.manager.single_flight_manager import SingleFlightManager
+from polychat.manager.status_monitor_manager import StatusMonitorManager
 from polychat.mapper.client.perplexity_chat_mapper import PerplexityChatMapper
+from polychat.model.chat_request import ChatRequest
+from polychat.model.client.chat_stream_event import ChatStreamEvent
+from polychat.model.service.batch_item import BatchItem
 from polychat.model.service.chat import Chat
 
 
 class PerplexityService:
+    PROVIDER_NAME = "perplexity"
 
     @inject
-    def __init__(self, perplexity_client: PerplexityClient, perplexity_chat_mapper: PerplexityChatMapper):
+    def __init__(
+        self,
+        perplexity_client: PerplexityClient,
+        perplexity_chat_mapper: PerplexityChatMapper,
+        admission_manager: Optional[AdmissionManager] = None,
+        account_pool_manager: Optional[AccountPoolManager] = None,
+        account_clients: Optional[dict[str, PerplexityClient]] = None,
+        conversation_cache_manager: Optional[ConversationCacheManager] = None,
+        single_flight_manager: Optional[SingleFlightManager] = None,
+        circuit_breaker_manager: Optional[CircuitBreakerManager] = None,
+        status_monitor_manager: Optional[StatusMonitorManager] = None,
+        batch_manager: Optional[BatchManager] = None,
+    ):
         self.perplexity_client = perplexity_client
         self.perplexity_chat_mapper = perplexity_chat_mapper
+        self.admission_manager = admission_manager or AdmissionManager()
+        self.account_pool_manager = account_pool_manager or AccountPoolManager()
+        self.conversation_cache_manager = conversation_cache_manager or ConversationCacheManager()
+        self.single_flight_manager = single_flight_manager or SingleFlightManager()
+        self.circuit_breaker_manager = circuit_breaker_manager or CircuitBreakerManager()
+        self.status_monitor_manager = status_monitor_manager or StatusMonitorManager()
+        self.batch_manager = batch_manager or BatchManager()
+        # Un client per account; quello di default gestisce login, logout e status
+        self.perplexity_clients = {AccountPoolManager.DEFAULT_ACCOUNT: perplexity_client, **(account_clients or {})}
+        self.account_pool_manager.register(self.PROVIDER_NAME, list(self.perplexity_clients))
+        self.circuit_breaker_manager.register_probe(self.PROVIDER_NAME, self._probe_status)
+        self.status_monitor_manager.register(self.PROVIDER_NAME, lambda: self.perplexity_client.status())
 
     async def login(self, session_cookie: str) -> None:
         """Salva il cookie di sessione Perplexity."""
@@ -18,33 +53,112 @@ class PerplexityService:
             await self.perplexity_client.login(session_cookie)
         except Exception as e:
             raise Exception(f"Error during Perplexity login: {str(e)}")
+        self.status_monitor_manager.invalidate(self.PROVIDER_NAME)
 
     def logout(self) -> None:
         self.perplexity_client.logout()
+        self.status_monitor_manager.invalidate(self.PROVIDER_NAME)
 
-    async def status(self) -> dict:
-        return await self.perplexity_client.status()
+    async def status(self, refresh: bool = False) -> dict:
+        """Ultimo stato controllato in background; con `refresh` esegue un controllo live."""
+        cached = None if refresh else self.status_monitor_manager.get(self.PROVIDER_NAME)
+        return cached or await self.status_monitor_manager.refresh(self.PROVIDER_NAME)
 
     async def ask(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> Chat:
         """Ask a question to Perplexity AI and return a Chat."""
         try:
-            response = await self.perplexity_client.ask(message, chat_id, type_input=type_input)
-            return self.perplexity_chat_mapper.create_from(response)
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        response = await self.perplexity_clients[account].ask(message, chat_id, type_input=type_input)
+            return self._remember_account(self.perplexity_chat_mapper.create_from(response), account)
+        except (AdmissionRejectedError, CircuitOpenError):
+            raise
         except Exception as e:
             raise Exception(f"Error asking Perplexity: {str(e)}")
 
     async def get_conversation(self, chat_id: str) -> Chat:
         """Recupera la conversazione Perplexity a partire dallo slug."""
         try:
-            response = await self.perplexity_client.get_conversation(chat_id)
-            return self.perplexity_chat_mapper.create_from(response)
+            cached = self.conversation_cache_manager.get(self.PROVIDER_NAME, chat_id)
+            if cached is not None:
+                return cached
+
+            # Letture concorrenti della stessa conversazione condividono un'unica richiesta;
+            # se nel frattempo arriva un nuovo messaggio il risultato non finisce in cache
+            generation = self.conversation_cache_manager.generation()
+            return await self.single_flight_manager.run(
+                (self.PROVIDER_NAME, chat_id),
+                lambda: self._fetch_conversation(chat_id, generation),
+            )
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise Exception(f"Error fetching Perplexity conversation: {str(e)}")
 
+    async def _fetch_conversation(self, chat_id: str, generation: int) -> Chat:
+        async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+            account = self.account_pool_manager.account_for(self.PROVIDER_NAME, chat_id)
+            response = await self.perplexity_clients[account].get_conversation(chat_id)
+            chat = self.perplexity_chat_mapper.create_from(response)
+            self.conversation_cache_manager.put(self.PROVIDER_NAME, chat_id, chat, generation=generation)
+        return chat
+
     async def ask_and_wait(self, message: str, chat_id: Optional[str] = None, type_input: bool = True) -> Chat:
         """Send a message and wait until the provider exposes the completed response."""
         try:
-            response = await self.perplexity_client.ask_and_wait(message, chat_id, type_input=type_input)
-            return self.perplexity_chat_mapper.create_from(response)
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        response = await self.perplexity_clients[account].ask_and_wait(message, chat_id, type_input=type_input)
+            return self._remember_account(self.perplexity_chat_mapper.create_from(response), account)
+        except (AdmissionRejectedError, CircuitOpenError):
+            raise
         except Exception as e:
             raise Exception(f"Error asking Perplexity and waiting for completion: {str(e)}")
+
+    def ask_batch(self, requests: list[ChatRequest], parallelism: Optional[int] = None) -> AsyncIterator[BatchItem]:
+        """Esegue `ask_and_wait` per ogni richiesta con parallelismo limitato, restituendo gli esiti man mano."""
+        return self.batch_manager.run(
+            len(requests),
+            lambda index: self.ask_and_wait(requests[index].message, requests[index].chat_id, requests[index].type),
+            parallelism,
+        )
+
+    async def ask_stream(
+        self,
+        message: str,
+        chat_id: Optional[str] = None,
+        type_input: bool = True,
+    ) -> AsyncIterator[ChatStreamEvent]:
+        """Invia una domanda e produce la risposta man mano che Perplexity la genera."""
+        try:
+            self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+            async with self.circuit_breaker_manager.guard(self.PROVIDER_NAME):
+                async with self.admission_manager.admit(self.PROVIDER_NAME):
+                    async with self.account_pool_manager.lease(self.PROVIDER_NAME, chat_id) as account:
+                        async for event in self.perplexity_clients[account].ask_stream(message, chat_id, type_input=type_input):
+                            self._track_conversation(event.chat_id, account)
+                            yield event
+        except (AdmissionRejectedError, CircuitOpenError):
+            # Sollevate prima del primo evento: il controller risponde 429/503 invece di aprire lo stream
+            raise
+        except Exception as e:
+            yield ChatStreamEvent(type="error", text=f"Error streaming Perplexity answer: {str(e)}")
+
+    def _remember_account(self, chat: Chat, account: str) -> Chat:
+        """Associa la conversazione all'account che l'ha creata, per le richieste successive."""
+        self._track_conversation(chat.id, account)
+        return chat
+
+    def _track_conversation(self, chat_id: Optional[str], account: str) -> None:
+        # La conversazione e' cambiata: le letture in cache non sono piu' valide
+        self.account_pool_manager.remember_conversation(self.PROVIDER_NAME, chat_id, account)
+        self.conversation_cache_manager.invalidate(self.PROVIDER_NAME, chat_id)
+
+    async def _probe_status(self) -> bool:
+        """Sonda del circuit breaker: il provider risponde di nuovo."""
+        status = await self.status_monitor_manager.refresh(self.PROVIDER_NAME)
+        return bool(status.get("is_available"))
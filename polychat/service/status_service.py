@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from injector import inject
+
+from polychat.service.chat_gpt_service import ChatGptService
+from polychat.service.deepseek_service import DeepseekService
+from polychat.service.gemini_service import GeminiService
+from polychat.service.kimi_service import KimiService
+from polychat.service.perplexity_service import PerplexityService
+from polychat.service.qwen_service import QwenService
+
+logger = logging.getLogger(__name__)
+
+
+class StatusService:
+    """Stato aggregato dei provider, controllati in parallelo entro una scadenza comune."""
+
+    @inject
+    def __init__(
+        self,
+        chatgpt_service: ChatGptService,
+        deepseek_service: DeepseekService,
+        gemini_service: GeminiService,
+        kimi_service: KimiService,
+        perplexity_service: PerplexityService,
+        qwen_service: QwenService,
+        timeout_seconds: float = 30.0,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.services = {
+            service.PROVIDER_NAME: service
+            for service in (
+                chatgpt_service,
+                deepseek_service,
+                gemini_service,
+                kimi_service,
+                perplexity_service,
+                qwen_service,
+            )
+        }
+
+    async def status(self, refresh: bool = False, timeout_seconds: Optional[float] = None) -> dict:
+        """
+        Interroga tutti i provider contemporaneamente e restituisce i risultati arrivati entro
+        `timeout_seconds`: la latenza e' quella del provider piu' lento, non la somma.
+        I provider oltre la scadenza risultano non disponibili e vengono elencati in `timed_out`.
+        """
+        timeout_seconds = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        started_at = time.monotonic()
+        tasks = {
+            provider: asyncio.create_task(service.status(refresh=refresh))
+            for provider, service in self.services.items()
+        }
+        await asyncio.wait(tasks.values(), timeout=timeout_seconds)
+
+        providers = {}
+        timed_out = []
+        for provider, task in tasks.items():
+            if not task.done():
+                # Il controllo del monitor prosegue in background e aggiornera' lo stato in memoria
+                task.cancel()
+                timed_out.append(provider)
+                providers[provider] = self._unavailable(
+                    provider, f"Status check did not finish within {timeout_seconds}s"
+                )
+            elif task.exception() is not None:
+                logger.info("Status of %s failed: %s", provider, task.exception())
+                providers[provider] = self._unavailable(provider, f"Status check failed: {task.exception()}")
+            else:
+                providers[provider] = task.result()
+
+        available = all(provider_status.get("is_available") for provider_status in providers.values())
+        return {
+            "status": "ok" if available else "degraded",
+            "providers": providers,
+            "timed_out": timed_out,
+            "elapsed_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    @staticmethod
+    def _unavailable(provider: str, detail: str) -> dict:
+        return {"provider": provider, "is_available": False, "is_logged_in": None, "detail": detail}
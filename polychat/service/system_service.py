@@ -0,0 +1,68 @@
+from injector import inject
+
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.admission_manager import AdmissionManager
+from polychat.manager.asset_cache_manager import AssetCacheManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.status_monitor_manager import StatusMonitorManager
+
+
+class SystemService:
+    """Stato interno del server (salute dei provider, code di ammissione, account e cache)."""
+
+    @inject
+    def __init__(
+        self,
+        admission_manager: AdmissionManager,
+        account_pool_manager: AccountPoolManager,
+        conversation_cache_manager: ConversationCacheManager,
+        circuit_breaker_manager: CircuitBreakerManager,
+        status_monitor_manager: StatusMonitorManager,
+        latency_manager: LatencyManager,
+        resource_blocking_manager: ResourceBlockingManager,
+        asset_cache_manager: AssetCacheManager,
+    ):
+        self.admission_manager = admission_manager
+        self.account_pool_manager = account_pool_manager
+        self.conversation_cache_manager = conversation_cache_manager
+        self.circuit_breaker_manager = circuit_breaker_manager
+        self.status_monitor_manager = status_monitor_manager
+        self.latency_manager = latency_manager
+        self.resource_blocking_manager = resource_blocking_manager
+        self.asset_cache_manager = asset_cache_manager
+
+    def health(self) -> dict:
+        """Stato del server: `degraded` se il circuito di almeno un provider non e' chiuso."""
+        circuits = self.circuit_breaker_manager.stats()
+        degraded = any(circuit["state"] != "closed" for circuit in circuits.values())
+        return {"status": "degraded" if degraded else "ok", "circuits": circuits}
+
+    def admission_stats(self) -> dict:
+        """Richieste in corso, in coda e tempi di attesa per provider."""
+        return self.admission_manager.stats()
+
+    def account_stats(self) -> dict:
+        """Richieste in corso e totali per ogni account dei provider."""
+        return self.account_pool_manager.stats()
+
+    def conversation_cache_stats(self) -> dict:
+        return self.conversation_cache_manager.stats()
+
+    def status_monitor_stats(self) -> dict:
+        """Eta' dell'ultimo controllo di stato di ogni provider."""
+        return self.status_monitor_manager.stats()
+
+    def latency_stats(self) -> dict:
+        """Percentili delle durate recenti per provider e operazione del client."""
+        return self.latency_manager.stats()
+
+    def resource_blocking_stats(self) -> dict:
+        """Richieste bloccate e byte scaricati dalle pagine di ogni provider."""
+        return self.resource_blocking_manager.stats()
+
+    def asset_cache_stats(self) -> dict:
+        """Occupazione e hit rate della cache degli asset statici."""
+        return self.asset_cache_manager.stats()
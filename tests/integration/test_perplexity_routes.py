@@ -67,6 +67,20 @@ def test_get_perplexity_chat_returns_message_payload():
     assert response.json() == {"message": "from fake", "image_url": None}
 
 
+def test_get_perplexity_chat_honors_if_none_match():
+    app = create_test_app()
+    client = TestClient(app)
+
+    first = client.get("/perplexity/chats/chat-abc")
+    etag = first.headers["ETag"]
+    second = client.get("/perplexity/chats/chat-abc", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+    assert client.get("/perplexity/chats/chat-abc", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
 def test_post_perplexity_chat_complete_returns_full_payload():
     app = create_test_app()
     client = TestClient(app)
@@ -1,8 +1,18 @@
 import asyncio
+from contextlib import AsyncExitStack
+import json
 
-import requests
+import httpx
+import pytest
 
 from polychat.client.abstract_client import AbstractClient
+from polychat.manager.latency_manager import LatencyManager
+from polychat.manager.metrics_manager import MetricsManager
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+from polychat.manager.retry_manager import RetryManager
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPage
+from polychat.model.client.retry_policy import RetryPolicy
 
 
 class _FakePage:
@@ -46,28 +56,583 @@ def test_goto_logs_get_url(caplog):
     assert "GET https://example.com/home" in caplog.text
 
 
-def test_requests_request_logs_method_and_url(caplog, monkeypatch):
+def test_goto_with_reuse_current_skips_navigation_when_already_on_url():
     client = AbstractClient()
-    caplog.set_level("INFO", logger="polychat.http")
+    page = _FakePage()
+    page.url = "https://example.com/home/"
 
-    captured = {}
+    asyncio.run(client._goto(page, "https://example.com/home", reuse_current=True))
+
+    assert page.last_goto is None
+
+
+def test_open_page_uses_warm_page_with_matching_session():
+    class _WarmClient(AbstractClient):
+        PROVIDER_NAME = "example"
+        WARM_PAGE_URL = "https://example.com/"
+
+    warm_page = WarmPage(
+        AbstractClient._warm_page_key("state.json", None, None),
+        "warm-context",
+        "warm-page",
+        AsyncExitStack(),
+    )
+
+    class _FakeWarmPagePool:
+        def __init__(self):
+            self.registered = {}
+            self.checkouts = []
+
+        def register(self, provider, factory):
+            self.registered[provider] = factory
+
+        async def checkout(self, provider, key):
+            self.checkouts.append((provider, key))
+            return warm_page
+
+    warm_page_pool = _FakeWarmPagePool()
+    client = _WarmClient(warm_page_pool=warm_page_pool)
+
+    async def _use_page():
+        async with client._open_page("state.json") as (context, page):
+            return context, page
+
+    assert asyncio.run(_use_page()) == ("warm-context", "warm-page")
+    assert list(warm_page_pool.registered) == ["example"]
+    assert warm_page_pool.checkouts == [("example", warm_page.key)]
+
+
+def test_open_page_keeps_conversation_page_between_turns_in_sticky_mode():
+    class _StickyClient(AbstractClient):
+        PROVIDER_NAME = "example"
+
+    class _CountingBrowserPool:
+        def __init__(self):
+            self.contexts = []
+
+        def lease_context(self, **_kwargs):
+            pool = self
+
+            class _Lease:
+                async def __aenter__(self):
+                    context = _StreamContext(_StreamPage())
+                    pool.contexts.append(context)
+                    return context
+
+                async def __aexit__(self, exc_type, exc, tb):
+                    return False
+
+            return _Lease()
+
+    browser_pool = _CountingBrowserPool()
+    sticky_page_manager = StickyPageManager(idle_ttl_seconds=60)
+    client = _StickyClient(browser_pool=browser_pool, sticky_page_manager=sticky_page_manager)
+
+    async def _turn(chat_id, resolved_chat_id, fail=False):
+        async with client._open_page("state.json", chat_id=chat_id) as (_context, page):
+            if fail:
+                raise RuntimeError("boom")
+            await client._release_page(page, resolved_chat_id)
+            return page
 
-    def _fake_request(self, method, url, **kwargs):
-        captured["method"] = method
-        captured["url"] = url
-        captured["kwargs"] = kwargs
+    async def _run():
+        first = await _turn(None, "chat-1")
+        second = await _turn("chat-1", "chat-1")
+        assert second is first
+        assert not first.closed
 
-        class _Response:
-            status_code = 200
+        with pytest.raises(RuntimeError):
+            await _turn("chat-1", "chat-1", fail=True)
+        third = await _turn("chat-1", "chat-1")
+        assert third is not first
 
-        return _Response()
+        client._invalidate_warm_pages()
+        fourth = await _turn("chat-1", "chat-1")
+        assert fourth is not third
 
-    monkeypatch.setattr(requests.Session, "request", _fake_request)
+    asyncio.run(_run())
 
-    with requests.Session() as session:
-        client._requests_request(session, "post", "https://example.com/api", timeout=3)
+    assert len(browser_pool.contexts) == 3
+    assert sticky_page_manager.stats()["hits"] == 2
 
-    assert captured["method"] == "POST"
-    assert captured["url"] == "https://example.com/api"
-    assert captured["kwargs"] == {"timeout": 3}
+
+def test_release_page_closes_page_when_sticky_mode_is_disabled():
+    page = _StreamPage()
+
+    asyncio.run(AbstractClient()._release_page(page, "chat-1"))
+
+    assert page.closed
+
+
+def _mock_http_client(monkeypatch, client, handler):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(client.http_client_manager, "get_client", lambda _url: http_client)
+    return http_client
+
+
+@pytest.mark.asyncio
+async def test_http_request_logs_method_and_url(caplog, monkeypatch):
+    client = AbstractClient()
+    caplog.set_level("INFO", logger="polychat.http")
+    captured = {}
+
+    def _handler(request):
+        captured["method"] = request.method
+        captured["url"] = str(request.url)
+        return httpx.Response(200)
+
+    _mock_http_client(monkeypatch, client, _handler)
+
+    response = await client._http_request("post", "https://example.com/api", timeout=3)
+
+    assert response.status_code == 200
+    assert captured == {"method": "POST", "url": "https://example.com/api"}
     assert "POST https://example.com/api" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "response",
+    [
+        httpx.Response(401),
+        httpx.Response(403),
+        httpx.Response(200, headers={"cf-mitigated": "challenge", "Content-Type": "text/html"}),
+        httpx.Response(200, html="<html><title>Just a moment...</title></html>"),
+    ],
+)
+async def test_fetch_json_direct_returns_none_when_browser_is_needed(monkeypatch, response):
+    client = AbstractClient()
+    _mock_http_client(monkeypatch, client, lambda _request: response)
+
+    assert await client._fetch_json_direct("GET", "https://example.com/api") is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_json_direct_returns_payload_and_raises_other_errors(monkeypatch):
+    client = AbstractClient()
+    responses = [httpx.Response(200, json={"ok": True}), httpx.Response(404)]
+    captured = []
+
+    def _handler(request):
+        captured.append(request.headers)
+        return responses.pop(0)
+
+    _mock_http_client(monkeypatch, client, _handler)
+
+    assert await client._fetch_json_direct("GET", "https://example.com/api", {"Cookie": "a=b"}) == {"ok": True}
+    assert captured[0]["Cookie"] == "a=b"
+    assert captured[0]["User-Agent"] == AbstractClient.DIRECT_READ_USER_AGENT
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._fetch_json_direct("GET", "https://example.com/api")
+
+
+def test_read_storage_state_cookies_filters_by_domain(tmp_path):
+    storage_state_path = tmp_path / "state.json"
+    storage_state_path.write_text(
+        json.dumps(
+            {
+                "cookies": [
+                    {"name": "cf_clearance", "value": "cf", "domain": ".example.com"},
+                    {"name": "other", "value": "x", "domain": "other.org"},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cookies = AbstractClient._read_storage_state_cookies(str(storage_state_path), "example.com")
+
+    assert cookies == {"cf_clearance": "cf"}
+    assert AbstractClient._read_storage_state_cookies(str(tmp_path / "missing.json"), "example.com") == {}
+
+
+def test_watch_page_event_resolves_on_matching_event_and_detaches():
+    class _ListenerPage(_FakePage):
+        def remove_listener(self, event_name, handler):
+            if self.handlers.get(event_name) is handler:
+                del self.handlers[event_name]
+
+    async def _run():
+        client = AbstractClient()
+        page = _ListenerPage()
+        signal = client._watch_page_event(page, "response", lambda response: response.url.endswith("/done"))
+
+        page.handlers["response"](_FakeRequest("GET", "https://example.com/other"))
+        assert signal.done() is False
+        page.handlers["response"](_FakeRequest("GET", "https://example.com/done"))
+
+        result = await client._wait_for_signal(signal, timeout_ms=1_000)
+        return page, result
+
+    page, result = asyncio.run(_run())
+
+    assert result.url == "https://example.com/done"
+    assert "response" not in page.handlers
+
+
+def test_wait_for_network_to_settle_detaches_its_handlers_from_the_page():
+    class _ListenerPage(_FakePage):
+        def remove_listener(self, event_name, handler):
+            if self.handlers.get(event_name) is handler:
+                del self.handlers[event_name]
+
+    page = _ListenerPage()
+
+    asyncio.run(AbstractClient()._wait_for_network_to_settle(page, timeout_seconds=1, check_interval_seconds=0.01))
+
+    assert page.handlers == {}
+
+
+def test_wait_for_signal_returns_none_after_timeout():
+    async def _run():
+        return await AbstractClient._wait_for_signal(asyncio.Event().wait(), timeout_ms=10)
+
+    assert asyncio.run(_run()) is None
+
+
+def test_timed_operation_logs_step_breakdown(caplog):
+    class _TimedClient(AbstractClient):
+        PROVIDER_NAME = "example"
+
+    async def _run(client):
+        async with client._timed_operation("ask") as timings:
+            async with client._timed_step("navigate"):
+                pass
+            async with client._timed_step("submit"):
+                pass
+        return timings
+
+    caplog.set_level("INFO", logger="polychat.timing")
+
+    timings = asyncio.run(_run(_TimedClient()))
+
+    assert [step for step, _elapsed in timings] == ["navigate", "submit"]
+    assert "example ask total=" in caplog.text
+    assert "navigate=" in caplog.text
+
+
+def test_timed_operation_logs_blocked_requests_of_pages_opened_during_operation(caplog):
+    class _BlockingClient(AbstractClient):
+        PROVIDER_NAME = "example"
+        ALLOWED_URL_PATTERNS = ("/api/",)
+
+    class _RoutingContext(_StreamContext):
+        async def route(self, pattern, handler):
+            self.route_handler = handler
+
+        def on(self, event_name, handler):
+            self.response_handler = handler
+
+    class _Route:
+        def __init__(self, url, resource_type):
+            self.request = type("Request", (), {"url": url, "resource_type": resource_type})()
+
+        async def abort(self, error_code="failed"):
+            return None
+
+        async def fallback(self):
+            return None
+
+    context = _RoutingContext(_StreamPage())
+    client = _BlockingClient(
+        browser_pool=_StreamBrowserPool(context),
+        resource_blocking_manager=ResourceBlockingManager(),
+    )
+
+    async def _run():
+        async with client._timed_operation("ask"):
+            async with client._open_page() as (opened_context, _page):
+                await opened_context.route_handler(_Route("https://example.com/hero.webp", "image"))
+                await opened_context.route_handler(_Route("https://example.com/api/image", "image"))
+
+    caplog.set_level("INFO", logger="polychat.timing")
+
+    asyncio.run(_run())
+
+    assert "blocked=1 allowed=1" in caplog.text
+    assert client.resource_blocking_manager.traffic(context) is None
+
+
+def test_timed_operation_records_latency_of_successful_operations_only():
+    class _TimedClient(AbstractClient):
+        PROVIDER_NAME = "example"
+
+    latency_manager = LatencyManager(min_samples=1)
+    client = _TimedClient(latency_manager=latency_manager)
+
+    async def _run():
+        async with client._timed_operation("ask_and_wait"):
+            pass
+        with pytest.raises(RuntimeError):
+            async with client._timed_operation("ask_and_wait"):
+                raise RuntimeError("boom")
+
+    asyncio.run(_run())
+
+    stats = latency_manager.stats()["example"]["ask_and_wait"]
+    assert stats["count"] == 2
+    assert stats["failures"] == 1
+    assert latency_manager.percentile("example", "ask_and_wait", 0.95) is not None
+
+
+def test_timed_operation_records_phase_and_error_metrics():
+    class _TimedClient(AbstractClient):
+        PROVIDER_NAME = "example"
+
+    metrics_manager = MetricsManager()
+    client = _TimedClient(metrics_manager=metrics_manager)
+
+    async def _run():
+        with pytest.raises(TimeoutError):
+            async with client._timed_operation("ask"):
+                async with client._timed_step("navigate"):
+                    pass
+                raise TimeoutError("generation")
+
+    asyncio.run(_run())
+
+    text = metrics_manager.render()
+    assert 'polychat_phase_duration_seconds_count{operation="ask",phase="navigate",provider="example"} 1' in text
+    assert 'polychat_operation_errors_total{exception="TimeoutError",operation="ask",provider="example"} 1' in text
+    assert 'polychat_operations_in_flight{operation="ask",provider="example"} 0' in text
+
+
+class _StreamPage:
+    def __init__(self):
+        self.bindings = {}
+        self.init_scripts = []
+        self.closed = False
+
+    async def expose_function(self, name, callback):
+        self.bindings[name] = callback
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    async def evaluate(self, _script):
+        return None
+
+    async def close(self):
+        self.closed = True
+
+    def emit_chunk(self, chunk):
+        next(callback for name, callback in self.bindings.items() if "Chunk" in name)("https://example.com/stream", chunk)
+
+    def emit_end(self):
+        next(callback for name, callback in self.bindings.items() if "End" in name)("https://example.com/stream")
+
+
+class _StreamContext:
+    def __init__(self, page):
+        self.page = page
+
+    async def new_page(self):
+        return self.page
+
+    async def close(self):
+        return None
+
+
+class _StreamBrowserPool:
+    def __init__(self, context):
+        self.context = context
+
+    def lease_context(self, **_kwargs):
+        context = self.context
+
+        class _Lease:
+            async def __aenter__(self):
+                return context
+
+            async def __aexit__(self, exc_type, exc, tb):
+                return False
+
+        return _Lease()
+
+
+def test_ask_stream_forwards_deltas_from_page_stream():
+    class _StreamingClient(AbstractClient):
+        PROVIDER_NAME = "example"
+        STREAM_URL_MARKERS = ("/stream",)
+
+        async def _submit_prompt(self, page, message, chat_id, type_input):
+            page.emit_chunk("data: Ciao\n\n")
+            await asyncio.sleep(0)
+            page.emit_chunk("data:  mondo\n\n")
+            page.emit_end()
+            return "chat-1"
+
+        def _extract_stream_deltas(self, state, event_name, data):
+            return [data]
+
+    async def _run():
+        page = _StreamPage()
+        client = _StreamingClient(browser_pool=_StreamBrowserPool(_StreamContext(page)))
+        events = [event async for event in client.ask_stream("hello")]
+        return page, events
+
+    page, events = asyncio.run(_run())
+
+    assert [(event.type, event.text) for event in events] == [
+        ("delta", "Ciao"),
+        ("delta", " mondo"),
+        ("chat", ""),
+        ("done", "Ciao mondo"),
+    ]
+    assert events[-1].chat_id == "chat-1"
+    assert '"/stream"' in page.init_scripts[0]
+    assert page.closed is True
+
+
+def test_ask_stream_without_markers_falls_back_to_complete_answer():
+    class _Response:
+        chat_id = "chat-2"
+        message = "Risposta completa"
+
+    class _BlockingClient(AbstractClient):
+        async def ask_and_wait(self, message, chat_id=None, type_input=True):
+            return _Response()
+
+    async def _run():
+        return [event async for event in _BlockingClient().ask_stream("hello")]
+
+    events = asyncio.run(_run())
+
+    assert [(event.type, event.chat_id, event.text) for event in events] == [
+        ("chat", "chat-2", ""),
+        ("delta", "chat-2", "Risposta completa"),
+        ("done", "chat-2", "Risposta completa"),
+    ]
+
+
+def test_diff_stream_text_returns_only_new_suffix():
+    state = {}
+
+    assert AbstractClient._diff_stream_text(state, "Ciao") == ["Ciao"]
+    assert AbstractClient._diff_stream_text(state, "Ciao mondo") == [" mondo"]
+    assert AbstractClient._diff_stream_text(state, "Ciao mondo") == []
+
+
+def _no_delay_retry_manager() -> RetryManager:
+    return RetryManager(min_retries_per_window=10)
+
+
+def test_retry_async_retries_transient_errors_before_submit(monkeypatch):
+    monkeypatch.setattr(AbstractClient, "RETRY_POLICIES", {"ask": RetryPolicy(max_attempts=3, base_delay_seconds=0)})
+    client = AbstractClient(retry_manager=_no_delay_retry_manager())
+    calls = []
+
+    async def operation():
+        calls.append("attempt")
+        if len(calls) < 3:
+            raise TimeoutError("navigation timeout")
+        return "ok"
+
+    assert asyncio.run(client._retry_async(operation, "ask")) == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_async_never_replays_an_attempt_after_prompt_submit(monkeypatch):
+    monkeypatch.setattr(AbstractClient, "RETRY_POLICIES", {"ask": RetryPolicy(max_attempts=3, base_delay_seconds=0)})
+    client = AbstractClient(retry_manager=_no_delay_retry_manager())
+    calls = []
+
+    async def operation():
+        calls.append("attempt")
+        client._mark_prompt_submitted()
+        raise TimeoutError("conversation url timeout")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(client._retry_async(operation, "ask"))
+    assert len(calls) == 1
+
+
+class _InputPage:
+    def __init__(self, kind: str, accepts_scripts: bool = True):
+        self.kind = kind
+        self.accepts_scripts = accepts_scripts
+        self.value = ""
+        self.inserted = []
+        self.keyboard = self
+
+    async def wait_for_selector(self, _selector):
+        return None
+
+    async def click(self, _selector):
+        return None
+
+    async def insert_text(self, text):
+        self.inserted.append(text)
+        self.value += text
+
+    async def eval_on_selector(self, _selector, script, arg=None):
+        if arg is None:
+            return {"kind": self.kind, "length": len(self.value)}
+        if self.accepts_scripts:
+            self.value += arg
+        return None
+
+
+def test_insert_message_sets_textarea_value_through_dom():
+    page = _InputPage("value")
+
+    strategy = asyncio.run(AbstractClient()._insert_message(page, "textarea", "hello"))
+
+    assert strategy == "dom"
+    assert page.value == "hello"
+    assert page.inserted == []
+
+
+def test_insert_message_pastes_long_messages_into_editors_and_falls_back_to_insert_text():
+    client = AbstractClient()
+    long_message = "x" * AbstractClient.INPUT_PASTE_MIN_CHARS
+
+    assert asyncio.run(client._insert_message(_InputPage("editable"), "#editor", "short")) == "insert_text"
+    assert asyncio.run(client._insert_message(_InputPage("editable"), "#editor", long_message)) == "paste"
+
+    ignoring_page = _InputPage("editable", accepts_scripts=False)
+    assert asyncio.run(client._insert_message(ignoring_page, "#editor", long_message)) == "insert_text"
+    assert ignoring_page.value == long_message
+
+
+def test_insert_message_keeps_newlines_and_pastes_multiline_text_into_editors():
+    client = AbstractClient()
+    textarea = _InputPage("value")
+    editor = _InputPage("editable")
+
+    assert asyncio.run(client._insert_message(textarea, "textarea", "def f():\r\n    return 1")) == "dom"
+    assert asyncio.run(client._insert_message(editor, "#editor", "line 1\nline 2")) == "paste"
+
+    assert textarea.value == "def f():\n    return 1"
+    assert editor.value == "line 1\nline 2"
+
+
+def test_type_message_turns_newlines_into_shift_enter():
+    class _TypingPage:
+        def __init__(self):
+            self.events = []
+            self.keyboard = self
+
+        async def wait_for_selector(self, _selector):
+            return None
+
+        async def click(self, _selector):
+            return None
+
+        async def type(self, _selector, text):
+            self.events.append(("type", text))
+
+        async def press(self, key):
+            self.events.append(("press", key))
+
+    page = _TypingPage()
+
+    asyncio.run(AbstractClient()._type_message(page, "textarea", "abc\n\nde", chunk_size=2))
+
+    assert page.events == [
+        ("type", "ab"),
+        ("type", "c"),
+        ("press", "Shift+Enter"),
+        ("press", "Shift+Enter"),
+        ("type", "de"),
+    ]
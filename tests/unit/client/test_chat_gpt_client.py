@@ -1,6 +1,8 @@
+import asyncio
 import json
 from pathlib import Path
 
+import httpx
 import pytest
 
 from polychat.client.chat_gpt_client import ChatGptClient
@@ -239,58 +241,35 @@ class _ConversationFetchPage:
 
 
 class _ConversationFetchPageWithLateImage(_ConversationFetchPage):
+    """Emette la response del download immagine poco dopo l'apertura della conversazione."""
+
     def __init__(self, response: _FakeResponse, image_response: _FakeResponse):
         super().__init__(response)
         self._image_response = image_response
-        self._emitted_image = False
 
-    async def wait_for_timeout(self, _timeout: int) -> None:
-        self.waited_timeouts.append(_timeout)
-        if (
-            _timeout == ChatGptClient.IMAGE_DOWNLOAD_GRACE_PERIOD_MS
-            and not self._emitted_image
-            and "response" in self.handlers
-        ):
-            self._emitted_image = True
-            await self.handlers["response"](self._image_response)
-        return None
+    async def goto(self, _url: str, **_kwargs) -> None:
+        await super().goto(_url, **_kwargs)
+        self._emit_later(self._image_response)
 
+    def _emit_later(self, response: _FakeResponse) -> None:
+        async def _emit() -> None:
+            await asyncio.sleep(0.01)
+            await self.handlers["response"](response)
 
-class _ConversationFetchPageWithReloadedImage(_ConversationFetchPage):
-    def __init__(self, response: _FakeResponse, initial_image_response: _FakeResponse, refreshed_image_response: _FakeResponse):
-        super().__init__(response)
-        self._initial_image_response = initial_image_response
-        self._refreshed_image_response = refreshed_image_response
-        self._grace_wait_count = 0
+        asyncio.get_running_loop().create_task(_emit())
 
-    async def wait_for_timeout(self, _timeout: int) -> None:
-        self.waited_timeouts.append(_timeout)
-        if _timeout == ChatGptClient.IMAGE_DOWNLOAD_GRACE_PERIOD_MS and "response" in self.handlers:
-            self._grace_wait_count += 1
-            if self._grace_wait_count == 1:
-                await self.handlers["response"](self._initial_image_response)
-            elif self._grace_wait_count == 3:
-                await self.handlers["response"](self._refreshed_image_response)
-        return None
 
+class _ConversationFetchPageWithReloadedImage(_ConversationFetchPageWithLateImage):
+    def __init__(self, response: _FakeResponse, initial_image_response: _FakeResponse, refreshed_image_response: _FakeResponse):
+        super().__init__(response, initial_image_response)
+        self._refreshed_image_response = refreshed_image_response
 
-class _ConversationFetchPageWithFailingReload(_ConversationFetchPage):
-    def __init__(self, response: _FakeResponse, initial_image_response: _FakeResponse):
-        super().__init__(response)
-        self._initial_image_response = initial_image_response
-        self._grace_wait_count = 0
+    async def reload(self, **_kwargs) -> None:
+        await super().reload(**_kwargs)
+        self._emit_later(self._refreshed_image_response)
 
-    async def wait_for_timeout(self, _timeout: int) -> None:
-        self.waited_timeouts.append(_timeout)
-        if (
-            _timeout == ChatGptClient.IMAGE_DOWNLOAD_GRACE_PERIOD_MS
-            and self._grace_wait_count == 0
-            and "response" in self.handlers
-        ):
-            self._grace_wait_count += 1
-            await self.handlers["response"](self._initial_image_response)
-        return None
 
+class _ConversationFetchPageWithFailingReload(_ConversationFetchPageWithLateImage):
     async def reload(self, **_kwargs) -> None:
         self.reload_calls += 1
         raise TimeoutError("reload timeout")
@@ -338,11 +317,12 @@ async def test_ask_raises_when_session_cookie_is_missing(tmp_path):
         await client.ask("hello")
 
 
-def test_get_conversations_raises_when_session_cookie_is_missing(tmp_path):
+@pytest.mark.asyncio
+async def test_get_conversations_raises_when_session_cookie_is_missing(tmp_path):
     client = ChatGptClient(str(tmp_path), session_cookie="")
 
     with pytest.raises(ValueError, match="CHATGPT_SESSION_COOKIE mancante o vuoto"):
-        client.get_conversations()
+        await client.get_conversations()
 
 
 def test_load_session_cookie_reads_persisted_file(tmp_path):
@@ -451,7 +431,7 @@ async def test_login_adds_chunked_browser_cookies(tmp_path, monkeypatch):
             return False
 
     client = ChatGptClient(str(tmp_path), session_cookie="")
-    monkeypatch.setattr("polychat.client.chat_gpt_client.AsyncCamoufox", _TrackingAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _TrackingAsyncCamoufox)
 
     await client.login(
         '[{"name":"__Secure-next-auth.session-token.0","value":"chunk-0","domain":"chatgpt.com"},'
@@ -501,7 +481,7 @@ def test_auth_headers_include_cookie_header_when_provided():
 @pytest.mark.asyncio
 async def test_ask_does_not_select_workspace_when_workspace_name_is_empty(tmp_path, monkeypatch):
     client = ChatGptClient(str(tmp_path), session_cookie="cookie", workspace_name="")
-    monkeypatch.setattr("polychat.client.chat_gpt_client.AsyncCamoufox", _FakeAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _FakeAsyncCamoufox)
 
     called = False
 
@@ -517,10 +497,45 @@ async def test_ask_does_not_select_workspace_when_workspace_name_is_empty(tmp_pa
     assert called is False
 
 
+class _StreamingKeyboard(_FakeKeyboard):
+    def __init__(self, page):
+        self._page = page
+
+    async def press(self, key: str) -> None:
+        if key == "Enter":
+            self._page.events.append("submit")
+            for handler in list(self._page.handlers.get("response", [])):
+                handler(_FakeStreamResponse())
+
+
+class _FakeStreamResponse:
+    url = "https://chatgpt.com/backend-api/f/conversation"
+
+    class request:
+        method = "POST"
+
+
+class _StreamingPage(_FakePage):
+    def __init__(self):
+        super().__init__()
+        self.keyboard = _StreamingKeyboard(self)
+        self.handlers = {}
+        self.events = []
+
+    def on(self, event: str, handler) -> None:
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event: str, handler) -> None:
+        self.handlers[event].remove(handler)
+
+    async def close(self) -> None:
+        self.events.append("close")
+
+
 @pytest.mark.asyncio
-async def test_ask_waits_five_seconds_after_submit_before_close(tmp_path, monkeypatch):
+async def test_ask_waits_for_conversation_stream_before_close(tmp_path, monkeypatch):
     client = ChatGptClient(str(tmp_path), session_cookie="cookie", workspace_name="")
-    page = _FakePage()
+    page = _StreamingPage()
 
     class _TrackingAsyncCamoufox:
         def __init__(self, **_kwargs):
@@ -532,11 +547,15 @@ async def test_ask_waits_five_seconds_after_submit_before_close(tmp_path, monkey
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    monkeypatch.setattr("polychat.client.chat_gpt_client.AsyncCamoufox", _TrackingAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _TrackingAsyncCamoufox)
 
+    started_at = asyncio.get_running_loop().time()
     await client.ask("hello")
 
-    assert ChatGptClient.POST_SUBMIT_WAIT_MS in page.waited_timeouts
+    assert page.events[:2] == ["submit", "close"]
+    assert page.waited_timeouts == []
+    assert asyncio.get_running_loop().time() - started_at < ChatGptClient.POST_SUBMIT_WAIT_MS / 1000
+    assert page.handlers["response"] == []
 
 
 @pytest.mark.asyncio
@@ -563,7 +582,7 @@ async def test_ask_retries_chatgpt_navigation_three_times(tmp_path, monkeypatch)
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    monkeypatch.setattr("polychat.client.chat_gpt_client.AsyncCamoufox", _TrackingAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _TrackingAsyncCamoufox)
     monkeypatch.setattr(client, "_goto", _failing_goto)
 
     result = await client.ask("hello")
@@ -622,7 +641,7 @@ async def test_ask_creates_screenshot_when_input_interaction_fails(tmp_path, mon
     session_dir = tmp_path / "var" / "session"
     session_dir.mkdir(parents=True, exist_ok=True)
     client = ChatGptClient(str(session_dir), session_cookie="cookie")
-    monkeypatch.setattr("polychat.client.chat_gpt_client.AsyncCamoufox", _FakeAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _FakeAsyncCamoufox)
 
     async def _broken_type_message(_page, _message):
         raise Exception("element detached from DOM")
@@ -679,7 +698,7 @@ async def test_fetch_conversation_via_page_awaits_conversation_response(tmp_path
     assert result == payload
     assert page.goto_calls == 1
     assert page.goto_urls == ["https://chatgpt.com/c/chat-123"]
-    assert ChatGptClient.IMAGE_DOWNLOAD_GRACE_PERIOD_MS in page.waited_timeouts
+    assert page.waited_timeouts == []
 
 
 @pytest.mark.asyncio
@@ -753,10 +772,42 @@ async def test_fetch_conversation_via_page_raises_after_async_status_timeout(tmp
     assert page.waited_timeouts.count(ChatGptClient.ASYNC_STATUS_POLL_INTERVAL_MS) == 6
 
 
+def _fast_image_client(tmp_path) -> ChatGptClient:
+    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
+    client.IMAGE_DOWNLOAD_GRACE_PERIOD_MS = 500
+    client.IMAGE_DOWNLOAD_SETTLE_MS = 50
+    return client
+
+
+def _image_conversation_payload() -> dict:
+    return {
+        "conversation_id": "chat-123",
+        "current_node": "node-1",
+        "mapping": {
+            "node-1": {
+                "id": "node-1",
+                "message": {
+                    "id": "node-1",
+                    "author": {"role": "tool"},
+                    "content": {
+                        "content_type": "multimodal_text",
+                        "parts": [{"content_type": "image_asset_pointer", "asset_pointer": "sediment://file-1"}],
+                    },
+                },
+            }
+        },
+    }
+
+
+def test_conversation_has_image_parts_detects_image_asset_pointer():
+    assert ChatGptClient._conversation_has_image_parts(_image_conversation_payload()) is True
+    assert ChatGptClient._conversation_has_image_parts({"mapping": {}}) is False
+
+
 @pytest.mark.asyncio
 async def test_fetch_conversation_via_page_collects_late_image_download_url(tmp_path):
-    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
-    payload = {"conversation_id": "chat-123", "mapping": {}, "current_node": None}
+    client = _fast_image_client(tmp_path)
+    payload = _image_conversation_payload()
     response = _FakeResponse("https://chatgpt.com/backend-api/conversation/chat-123", payload)
     image_response = _FakeResponse(
         "https://chatgpt.com/backend-api/files/download/file-1?conversation_id=chat-123",
@@ -771,8 +822,8 @@ async def test_fetch_conversation_via_page_collects_late_image_download_url(tmp_
 
 @pytest.mark.asyncio
 async def test_fetch_conversation_via_page_refreshes_image_download_url_when_present(tmp_path):
-    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
-    payload = {"conversation_id": "chat-123", "mapping": {}, "current_node": None}
+    client = _fast_image_client(tmp_path)
+    payload = _image_conversation_payload()
     response = _FakeResponse("https://chatgpt.com/backend-api/conversation/chat-123", payload)
     initial_image_response = _FakeResponse(
         "https://chatgpt.com/backend-api/files/download/file-1?conversation_id=chat-123",
@@ -787,14 +838,14 @@ async def test_fetch_conversation_via_page_refreshes_image_download_url_when_pre
     result = await client._fetch_conversation_via_page(page, "chat-123")
 
     assert page.reload_calls == 1
-    assert page.waited_timeouts.count(ChatGptClient.IMAGE_DOWNLOAD_GRACE_PERIOD_MS) == 3
+    assert page.waited_timeouts == []
     assert result["image_download_url"] == "https://files.chatgpt.com/file-2.png"
 
 
 @pytest.mark.asyncio
 async def test_fetch_conversation_via_page_keeps_initial_image_when_reload_times_out(tmp_path):
-    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
-    payload = {"conversation_id": "chat-123", "mapping": {}, "current_node": None}
+    client = _fast_image_client(tmp_path)
+    payload = _image_conversation_payload()
     response = _FakeResponse("https://chatgpt.com/backend-api/conversation/chat-123", payload)
     initial_image_response = _FakeResponse(
         "https://chatgpt.com/backend-api/files/download/file-1?conversation_id=chat-123",
@@ -806,3 +857,91 @@ async def test_fetch_conversation_via_page_keeps_initial_image_when_reload_times
 
     assert page.reload_calls == 1
     assert result["image_download_url"] == "https://files.chatgpt.com/file-1.png"
+
+
+def test_extract_stream_deltas_follows_delta_encoding_for_assistant_text(tmp_path):
+    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
+    state = {}
+    events = [
+        {"p": "", "o": "add", "v": {"message": {"author": {"role": "user"}, "content": {"content_type": "text", "parts": [""]}}}},
+        {"p": "/message/content/parts/0", "o": "append", "v": "ignorato"},
+        {"p": "", "o": "add", "v": {"message": {"author": {"role": "assistant"}, "content": {"content_type": "text", "parts": [""]}}}},
+        {"p": "/message/content/parts/0", "o": "append", "v": "Ciao"},
+        {"v": " mondo"},
+        {"p": "", "o": "patch", "v": [
+            {"p": "/message/content/parts/0", "o": "append", "v": "!"},
+            {"p": "/message/status", "o": "replace", "v": "finished_successfully"},
+        ]},
+    ]
+
+    deltas = [delta for event in events for delta in client._extract_stream_deltas(state, "delta", json.dumps(event))]
+
+    assert deltas == ["Ciao", " mondo", "!"]
+    assert client._extract_stream_deltas(state, "message", "[DONE]") == []
+
+
+def test_extract_stream_deltas_diffs_legacy_full_message_events(tmp_path):
+    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
+    state = {}
+
+    def _event(text):
+        return json.dumps({"message": {"author": {"role": "assistant"}, "content": {"content_type": "text", "parts": [text]}}})
+
+    assert client._extract_stream_deltas(state, "message", _event("Ciao")) == ["Ciao"]
+    assert client._extract_stream_deltas(state, "message", _event("Ciao mondo")) == [" mondo"]
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_proxy_download_streams_body_and_forwards_range_headers(tmp_path, monkeypatch):
+    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
+    captured = {}
+
+    def _handler(request):
+        captured["headers"] = request.headers
+        return httpx.Response(
+            206,
+            headers={
+                "Content-Type": "image/png",
+                "Content-Length": "4",
+                "Content-Range": "bytes 0-3/10",
+                "ETag": '"abc"',
+                "Set-Cookie": "upstream=1",
+            },
+            stream=_ChunkedStream([b"\x89P", b"NG"]),
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    monkeypatch.setattr(client.http_client_manager, "get_client", lambda _url: http_client)
+
+    download = await client.proxy_download(
+        "https://chatgpt.com/backend-api/estuary/content?id=file-1",
+        {"Range": "bytes=0-3", "X-Ignored": "1"},
+    )
+    body = b"".join([chunk async for chunk in download.iter_bytes()])
+
+    assert captured["headers"]["Range"] == "bytes=0-3"
+    assert "X-Ignored" not in captured["headers"]
+    assert download.status_code == 206
+    assert download.media_type == "image/png"
+    assert download.headers == {"content-length": "4", "content-range": "bytes 0-3/10", "etag": '"abc"'}
+    assert body == b"\x89PNG"
+    assert download.response.is_closed is True
+
+
+@pytest.mark.asyncio
+async def test_proxy_download_raises_on_upstream_error(tmp_path, monkeypatch):
+    client = ChatGptClient(str(tmp_path), session_cookie="cookie")
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _request: httpx.Response(403)))
+    monkeypatch.setattr(client.http_client_manager, "get_client", lambda _url: http_client)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.proxy_download("https://chatgpt.com/backend-api/estuary/content?id=file-1")
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from polychat.client.deepseek_client import DeepseekClient
@@ -52,3 +53,19 @@ def test_resolve_user_token_json_from_json_payload(tmp_path):
     token_json = client._resolve_user_token_json_from_login_content('{"token":"abc"}')
 
     assert token_json == '{"token": "abc"}'
+
+
+def test_extract_stream_deltas_skips_think_fragments(tmp_path):
+    client = DeepseekClient(str(tmp_path), user_token_json="")
+    state = {}
+    events = [
+        {"v": {"response": {"fragments": [{"type": "THINK", "content": "Penso"}]}}},
+        {"p": "response/fragments/0/content", "o": "APPEND", "v": "..."},
+        {"p": "response/fragments", "o": "APPEND", "v": [{"type": "RESPONSE", "content": "Ciao"}]},
+        {"p": "response/fragments/1/content", "o": "APPEND", "v": " mondo"},
+        {"v": "!"},
+    ]
+
+    deltas = [delta for event in events for delta in client._extract_stream_deltas(state, "", json.dumps(event))]
+
+    assert deltas == ["Ciao", " mondo", "!"]
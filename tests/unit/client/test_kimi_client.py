@@ -56,24 +56,12 @@ def test_validate_auth_tokens_requires_both_fields():
         KimiClient._validate_auth_tokens({"access_token": "abc"})
 
 
-@pytest.mark.asyncio
-async def test_set_auth_tokens_script_uses_expected_local_storage_keys(tmp_path):
-    class _FakePage:
-        def __init__(self):
-            self.calls = []
-
-        async def evaluate(self, script, payload):
-            self.calls.append((script, payload))
+def test_auth_tokens_init_script_uses_expected_local_storage_keys():
+    script = KimiClient._build_auth_tokens_init_script("a", 'b"quoted')
 
-    page = _FakePage()
-    client = KimiClient(str(tmp_path), access_token="", refresh_token="")
-
-    await client._set_auth_tokens(page, "a", "b")
-
-    script, payload = page.calls[0]
-    assert "localStorage.setItem('access_token'" in script
-    assert "localStorage.setItem('refresh_token'" in script
-    assert payload == ["a", "b"]
+    assert "window.location.origin === \"https://www.kimi.com\"" in script
+    assert "localStorage.setItem('access_token', \"a\")" in script
+    assert "localStorage.setItem('refresh_token', \"b\\\"quoted\")" in script
 
 
 def test_is_logged_in_from_user_name_text_returns_false_for_log_in():
@@ -166,7 +154,7 @@ async def test_fetch_conversation_via_page_returns_message_content(tmp_path):
 
     assert result == "Ciao!"
     assert page.reload_calls == 0
-    assert page.waited_timeouts == [KimiClient.GET_CHAT_WAIT_TIMEOUT_MS]
+    assert page.waited_timeouts == []
     assert page.expect_timeouts == [KimiClient.GET_CHAT_WAIT_TIMEOUT_MS]
 
 
@@ -185,10 +173,7 @@ async def test_fetch_conversation_via_page_retries_after_timeout_and_refreshes(t
 
     assert result == "Risposta completa"
     assert page.reload_calls == 1
-    assert page.waited_timeouts == [
-        KimiClient.GET_CHAT_WAIT_TIMEOUT_MS,
-        KimiClient.GET_CHAT_WAIT_TIMEOUT_MS,
-    ]
+    assert page.waited_timeouts == []
     assert page.expect_timeouts == [
         KimiClient.GET_CHAT_WAIT_TIMEOUT_MS,
         KimiClient.GET_CHAT_WAIT_TIMEOUT_MS,
@@ -224,7 +209,7 @@ async def test_fetch_conversation_via_page_raises_after_ninety_seconds(tmp_path)
         await client._fetch_conversation_via_page(page, "chat-123")
 
     assert page.reload_calls == 8
-    assert page.waited_timeouts == [KimiClient.GET_CHAT_WAIT_TIMEOUT_MS] * 9
+    assert page.expect_timeouts == [KimiClient.GET_CHAT_WAIT_TIMEOUT_MS] * 9
 
 
 def test_is_matching_get_chat_response_ignores_query_params():
@@ -253,6 +238,12 @@ async def test_get_conversation_uses_backend_fetch_helper(tmp_path, monkeypatch)
             return None
 
     class _FakeContext:
+        def __init__(self):
+            self.init_scripts = []
+
+        async def add_init_script(self, script):
+            self.init_scripts.append(script)
+
         async def new_page(self):
             return _FakePage()
 
@@ -273,28 +264,53 @@ async def test_get_conversation_uses_backend_fetch_helper(tmp_path, monkeypatch)
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    bootstrap_calls = []
+    goto_calls = []
     fetch_calls = []
 
-    async def _fake_bootstrap(page, url, access_token, refresh_token, **_kwargs):
-        bootstrap_calls.append((page, url, access_token, refresh_token))
+    async def _fake_goto(page, url, **_kwargs):
+        goto_calls.append((page, url))
 
     async def _fake_fetch(page, chat_id):
         fetch_calls.append((page, chat_id))
         return "Risposta backend"
 
-    monkeypatch.setattr("polychat.client.kimi_client.AsyncCamoufox", _FakeAsyncCamoufox)
-    monkeypatch.setattr(client, "_bootstrap_authenticated_page", _fake_bootstrap)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _FakeAsyncCamoufox)
+    monkeypatch.setattr(client, "_goto", _fake_goto)
     monkeypatch.setattr(client, "_fetch_conversation_via_page", _fake_fetch)
+    async def _rejected_direct_read(*_args, **_kwargs):
+        return None
+
+    monkeypatch.setattr(client, "_fetch_json_direct", _rejected_direct_read)
 
     result = await client.get_conversation("chat-123")
 
     assert result.chat_id == "chat-123"
     assert result.message == "Risposta backend"
-    assert bootstrap_calls[0][1] == "https://www.kimi.com/chat/chat-123"
+    assert goto_calls == [(goto_calls[0][0], "https://www.kimi.com/chat/chat-123")]
     assert fetch_calls[0][1:] == ("chat-123",)
 
 
+@pytest.mark.asyncio
+async def test_get_conversation_reads_get_chat_over_http_without_browser(tmp_path, monkeypatch):
+    client = KimiClient(str(tmp_path), access_token="access", refresh_token="refresh")
+    direct_calls = []
+
+    async def _fake_fetch_json_direct(method, url, headers=None, json_body=None):
+        direct_calls.append((method, url, headers["Authorization"], json_body))
+        return {"chat": {"id": "chat-123", "messageContent": "Risposta HTTP"}}
+
+    async def _unexpected_open_page(*_args, **_kwargs):
+        raise AssertionError("browser should not be opened")
+
+    monkeypatch.setattr(client, "_fetch_json_direct", _fake_fetch_json_direct)
+    monkeypatch.setattr(client, "_open_page", _unexpected_open_page)
+
+    result = await client.get_conversation("chat-123")
+
+    assert result.message == "Risposta HTTP"
+    assert direct_calls == [("POST", KimiClient.GET_CHAT_URL, "Bearer access", {"chat_id": "chat-123"})]
+
+
 @pytest.mark.asyncio
 async def test_ask_and_wait_uses_backend_fetch_helper(tmp_path, monkeypatch):
     client = KimiClient(str(tmp_path), access_token="access", refresh_token="refresh")
@@ -308,6 +324,12 @@ async def test_ask_and_wait_uses_backend_fetch_helper(tmp_path, monkeypatch):
             return None
 
     class _FakeContext:
+        def __init__(self):
+            self.init_scripts = []
+
+        async def add_init_script(self, script):
+            self.init_scripts.append(script)
+
         async def new_page(self):
             return _FakePage()
 
@@ -332,8 +354,8 @@ async def test_ask_and_wait_uses_backend_fetch_helper(tmp_path, monkeypatch):
     open_chat_calls = []
     fetch_calls = []
 
-    async def _fake_submit(page, message, chat_id, type_input, access_token, refresh_token):
-        submit_calls.append((page, message, chat_id, type_input, access_token, refresh_token))
+    async def _fake_submit(page, message, chat_id, type_input):
+        submit_calls.append((page, message, chat_id, type_input))
         return "chat-123"
 
     async def _fake_open_chat(page, chat_id):
@@ -343,17 +365,24 @@ async def test_ask_and_wait_uses_backend_fetch_helper(tmp_path, monkeypatch):
         fetch_calls.append((page, chat_id))
         return "Risposta finale"
 
-    monkeypatch.setattr("polychat.client.kimi_client.AsyncCamoufox", _FakeAsyncCamoufox)
+    settle_calls = []
+
+    async def _fake_settle(page, timeout_seconds, check_interval_seconds):
+        settle_calls.append((timeout_seconds, check_interval_seconds))
+
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _FakeAsyncCamoufox)
     monkeypatch.setattr(client, "_submit_prompt", _fake_submit)
     monkeypatch.setattr(client, "_open_chat_page", _fake_open_chat)
     monkeypatch.setattr(client, "_fetch_conversation_via_page", _fake_fetch)
+    monkeypatch.setattr(client, "_wait_for_network_to_settle", _fake_settle)
 
     result = await client.ask_and_wait("ciao", chat_id="chat-0")
 
     assert result.chat_id == "chat-123"
     assert result.message == "Risposta finale"
-    assert submit_calls[0][1:] == ("ciao", "chat-0", True, "access", "refresh")
-    assert page_waits == [KimiClient.POST_SUBMIT_WAIT_MS]
+    assert submit_calls[0][1:] == ("ciao", "chat-0", True)
+    assert page_waits == []
+    assert settle_calls == [(KimiClient.COMPLETE_WAIT_TIMEOUT_SECONDS, KimiClient.COMPLETE_WAIT_CHECK_INTERVAL_SECONDS)]
     assert open_chat_calls[0][1:] == ("chat-123",)
     assert fetch_calls[0][1:] == ("chat-123",)
 
@@ -380,8 +409,8 @@ async def test_dismiss_later_dialog_clicks_matching_button(tmp_path):
             assert selector == ".common-dialog-button"
             return self.buttons
 
-        async def wait_for_timeout(self, timeout):
-            self.waits.append(timeout)
+        async def wait_for_selector(self, selector, state, timeout):
+            self.waits.append((selector, state, timeout))
 
     matching_button = _FakeButton("Maybe Later")
     other_button = _FakeButton("No thanks")
@@ -392,7 +421,7 @@ async def test_dismiss_later_dialog_clicks_matching_button(tmp_path):
 
     assert other_button.clicked is False
     assert matching_button.clicked is True
-    assert page.waits == [500]
+    assert page.waits == [(".common-dialog-button", "hidden", KimiClient.DIALOG_CLOSE_WAIT_MS)]
 
 
 @pytest.mark.asyncio
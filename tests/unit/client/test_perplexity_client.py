@@ -1,4 +1,5 @@
 import asyncio
+import json
 
 import pytest
 
@@ -120,7 +121,7 @@ async def test_status_returns_unavailable_when_browser_bootstrap_fails(tmp_path,
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    monkeypatch.setattr("polychat.client.perplexity_client.AsyncCamoufox", _FailingAsyncCamoufox)
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _FailingAsyncCamoufox)
 
     status = await client.status()
 
@@ -138,3 +139,20 @@ def test_resolve_session_cookie_from_cookie_export(tmp_path):
     )
 
     assert cookie == "perplexity-123"
+
+
+def test_extract_stream_deltas_rebuilds_markdown_chunks(tmp_path):
+    client = PerplexityClient(str(tmp_path), session_cookie="cookie")
+    state = {}
+
+    def _event(chunks, offset):
+        return json.dumps({
+            "blocks": [
+                {"intended_usage": "web_results", "markdown_block": {"answer": "ignorato"}},
+                {"intended_usage": "ask_text", "markdown_block": {"chunks": chunks, "chunk_starting_offset": offset}},
+            ]
+        })
+
+    assert client._extract_stream_deltas(state, "message", _event(["Ciao"], 0)) == ["Ciao"]
+    assert client._extract_stream_deltas(state, "message", _event([" mondo", "!"], 1)) == [" mondo!"]
+    assert client._extract_stream_deltas(state, "message", _event([" mondo", "!"], 1)) == []
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from polychat.client.qwen_client import QwenClient
@@ -61,3 +62,15 @@ def test_resolve_session_cookie_from_cookie_export(tmp_path):
     )
 
     assert cookie == "qwen-123"
+
+
+def test_extract_stream_deltas_keeps_only_answer_phase(tmp_path):
+    client = QwenClient(str(tmp_path), session_cookie="")
+    state = {}
+
+    def _chunk(content, phase):
+        return json.dumps({"choices": [{"delta": {"content": content, "phase": phase}}]})
+
+    assert client._extract_stream_deltas(state, "", _chunk("ragionamento", "think")) == []
+    assert client._extract_stream_deltas(state, "", _chunk("Ciao", "answer")) == ["Ciao"]
+    assert client._extract_stream_deltas(state, "", "[DONE]") == []
@@ -0,0 +1,16 @@
+from polychat.parser.sse_parser import SseParser
+
+
+def test_feed_returns_events_only_when_complete():
+    parser = SseParser()
+
+    assert parser.feed("event: delta\ndata: {\"v\": ") == []
+    assert parser.feed("\"ciao\"}\n\ndata: [DONE]\n\n") == [
+        ("delta", "{\"v\": \"ciao\"}"),
+        ("message", "[DONE]"),
+    ]
+
+
+def test_parse_block_joins_multiline_data_and_skips_comments():
+    assert SseParser.parse_block(": ping\ndata: riga 1\ndata: riga 2") == ("message", "riga 1\nriga 2")
+    assert SseParser.parse_block(": ping") is None
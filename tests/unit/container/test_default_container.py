@@ -70,3 +70,33 @@ def test_default_container_passes_chatgpt_env_to_client(monkeypatch):
     app_log_path = os.path.join("var", "log", "app.log")
     if os.path.exists(app_log_path):
         os.remove(app_log_path)
+
+
+def test_init_environment_variables_reads_admission_overrides_per_provider(monkeypatch):
+    monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT", "3")
+    monkeypatch.setenv("ADMISSION_MAX_IN_FLIGHT_CHATGPT", "1")
+
+    container = DefaultContainer.__new__(DefaultContainer)
+    container._init_environment_variables()
+
+    assert container.admission_max_in_flight == 3
+    assert container.admission_max_in_flight_by_provider == {"chatgpt": 1}
+
+
+def test_init_environment_variables_reads_account_credentials(monkeypatch):
+    monkeypatch.setenv("KIMI_ACCESS_TOKEN__acct2", "access-2")
+    monkeypatch.setenv("KIMI_REFRESH_TOKEN__acct2", "refresh-2")
+    monkeypatch.setenv("CHATGPT_SESSION_COOKIE__work", "cookie-work")
+
+    container = DefaultContainer.__new__(DefaultContainer)
+    container._init_environment_variables()
+    container.accounts_session_dir = os.path.join("var", "missing-accounts")
+
+    assert container.kimi_access_token_by_account == {"acct2": "access-2"}
+    assert container.chatgpt_session_cookie_by_account == {"work": "cookie-work"}
+    assert container.chatgpt_session_cookie_chunks == []
+    assert container._provider_accounts(
+        "kimi",
+        container.kimi_access_token_by_account,
+        container.kimi_refresh_token_by_account,
+    ) == ["acct2"]
@@ -1,8 +1,16 @@
+import json
+
+from fastapi import HTTPException
 import pytest
 
 from polychat.controller.perplexity_controller import PerplexityController
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.batch_manager import BatchManager
+from polychat.manager.circuit_breaker_manager import CircuitOpenError
 from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.model.chat_batch_request import ChatBatchRequest
 from polychat.model.chat_request import ChatRequest
+from polychat.model.client.chat_stream_event import ChatStreamEvent
 from polychat.model.service.chat import Chat
 from polychat.model.service.chat_metadata import ChatMetadata
 
@@ -17,13 +25,27 @@ class _FakePerplexityService:
     async def ask_and_wait(self, message: str, chat_id: str | None = None, type_input: bool = True) -> Chat:
         return Chat(id="chat-123", message="answer", image_url="https://img.test/x.png", metadata=ChatMetadata(provider="perplexity"))
 
+    async def ask_stream(self, message: str, chat_id: str | None = None, type_input: bool = True):
+        yield ChatStreamEvent(type="delta", text="ans")
+        yield ChatStreamEvent(type="chat", chat_id="chat-123")
+        yield ChatStreamEvent(type="delta", chat_id="chat-123", text="wer")
+        yield ChatStreamEvent(type="done", chat_id="chat-123", text="answer")
+
     async def get_conversation(self, chat_id: str) -> Chat:
         return Chat(id=chat_id, message="answer", metadata=ChatMetadata(provider="perplexity"))
 
+    def ask_batch(self, requests: list[ChatRequest], parallelism: int | None = None):
+        async def run(index: int) -> Chat:
+            if requests[index].message == "fail":
+                raise RuntimeError("boom")
+            return Chat(id=f"chat-{index}", message=requests[index].message, metadata=ChatMetadata(provider="perplexity"))
+
+        return BatchManager().run(len(requests), run, parallelism)
+
     def logout(self) -> None:
         return None
 
-    async def status(self) -> dict:
+    async def status(self, refresh: bool = False) -> dict:
         return {
             "provider": "perplexity",
             "is_available": True,
@@ -65,6 +87,97 @@ async def test_create_chat_and_wait_returns_complete_payload():
     assert response.image_url == "https://img.test/x.png"
 
 
+@pytest.mark.asyncio
+async def test_create_chat_stream_emits_server_sent_events():
+    controller = PerplexityController(_FakePerplexityService(), ChatToApiMapper())
+
+    response = await controller.create_chat_stream(ChatRequest(message="hello"))
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    assert response.media_type == "text/event-stream"
+    assert chunks[0] == 'event: delta\ndata: {"type":"delta","chat_id":null,"text":"ans"}\n\n'
+    assert chunks[-1] == 'event: done\ndata: {"type":"done","chat_id":"chat-123","text":"answer"}\n\n'
+    assert len(chunks) == 4
+
+
+@pytest.mark.asyncio
+async def test_create_chat_batch_streams_one_ndjson_line_per_request():
+    controller = PerplexityController(_FakePerplexityService(), ChatToApiMapper())
+
+    response = await controller.create_chat_batch(
+        ChatBatchRequest(requests=[ChatRequest(message="one"), ChatRequest(message="fail"), ChatRequest(message="three")])
+    )
+    lines = [json.loads(chunk) async for chunk in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    assert sorted(line["sequence"] for line in lines) == [1, 2, 3]
+    by_index = {line["index"]: line for line in lines}
+    assert by_index[0]["status"] == "succeeded"
+    assert by_index[0]["result"]["message"] == "one"
+    assert by_index[1] == {
+        "index": 1,
+        "sequence": by_index[1]["sequence"],
+        "total": 3,
+        "status": "failed",
+        "latency_seconds": by_index[1]["latency_seconds"],
+        "result": None,
+        "error": "boom",
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_chat_and_wait_returns_429_with_retry_after_when_overloaded():
+    service = _FakePerplexityService()
+
+    async def _rejected(*_args, **_kwargs):
+        raise AdmissionRejectedError("perplexity", "coda piena", 7)
+
+    service.ask_and_wait = _rejected
+    controller = PerplexityController(service, ChatToApiMapper())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller.create_chat_and_wait(ChatRequest(message="hello"))
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "7"}
+
+
+@pytest.mark.asyncio
+async def test_get_chat_response_returns_503_when_circuit_is_open():
+    service = _FakePerplexityService()
+
+    async def _open(*_args, **_kwargs):
+        raise CircuitOpenError("perplexity", 12)
+
+    service.get_conversation = _open
+    controller = PerplexityController(service, ChatToApiMapper())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller.get_chat_response("chat-123")
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "12"}
+
+
+@pytest.mark.asyncio
+async def test_create_chat_stream_returns_429_before_streaming_when_overloaded():
+    service = _FakePerplexityService()
+
+    async def _rejected(*_args, **_kwargs):
+        raise AdmissionRejectedError("perplexity", "coda piena", 5)
+        yield
+
+    service.ask_stream = _rejected
+    controller = PerplexityController(service, ChatToApiMapper())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await controller.create_chat_stream(ChatRequest(message="hello"))
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers == {"Retry-After": "5"}
+
+
 @pytest.mark.asyncio
 async def test_login_delegates_to_service():
     service = _FakePerplexityService()
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.account_pool_manager import AccountPoolManager
+
+
+@pytest.mark.asyncio
+async def test_lease_prefers_least_loaded_account():
+    manager = AccountPoolManager()
+    manager.register("kimi", ["default", "acct2", "acct3"])
+    release = asyncio.Event()
+    leased = []
+
+    async def hold():
+        async with manager.lease("kimi") as account:
+            leased.append(account)
+            await release.wait()
+
+    tasks = [asyncio.create_task(hold()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    assert sorted(leased) == ["acct2", "acct3", "default"]
+    release.set()
+    await asyncio.gather(*tasks)
+    assert all(entry["in_flight"] == 0 for entry in manager.stats()["providers"]["kimi"].values())
+
+
+@pytest.mark.asyncio
+async def test_round_robin_rotates_accounts():
+    manager = AccountPoolManager(strategy="round_robin")
+    manager.register("qwen", ["default", "acct2"])
+
+    leased = []
+    for _ in range(4):
+        async with manager.lease("qwen") as account:
+            leased.append(account)
+
+    assert leased == ["default", "acct2", "default", "acct2"]
+
+
+@pytest.mark.asyncio
+async def test_known_conversation_stays_on_its_account():
+    manager = AccountPoolManager(max_conversations=1)
+    manager.register("chatgpt", ["default", "acct2"])
+    manager.remember_conversation("chatgpt", "chat-1", "acct2")
+
+    for _ in range(3):
+        async with manager.lease("chatgpt", "chat-1") as account:
+            assert account == "acct2"
+    assert manager.account_for("chatgpt", "chat-1") == "acct2"
+
+    manager.remember_conversation("chatgpt", "chat-2", "default")
+    assert manager.account_for("chatgpt", "chat-1") == "default"
+
+
+@pytest.mark.asyncio
+async def test_unknown_existing_conversation_goes_to_default_account_like_reads():
+    manager = AccountPoolManager(strategy="round_robin")
+    manager.register("chatgpt", ["default", "acct2"])
+
+    for _ in range(2):
+        async with manager.lease("chatgpt", "forgotten-chat") as account:
+            assert account == manager.account_for("chatgpt", "forgotten-chat") == "default"
+    async with manager.lease("chatgpt") as first, manager.lease("chatgpt") as second:
+        assert {first, second} == {"default", "acct2"}
+
+
+@pytest.mark.asyncio
+async def test_unregistered_provider_uses_default_account():
+    manager = AccountPoolManager()
+
+    async with manager.lease("gemini") as account:
+        assert account == AccountPoolManager.DEFAULT_ACCOUNT
+
+
+def test_invalid_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        AccountPoolManager(strategy="random")
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.admission_manager import AdmissionManager, AdmissionRejectedError
+
+
+async def _hold(manager: AdmissionManager, provider: str, release: asyncio.Event, order: list, name: str, priority: int = 0):
+    async with manager.admit(provider, priority=priority):
+        order.append(name)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_admit_limits_in_flight_and_serves_waiters_by_priority_then_fifo():
+    manager = AdmissionManager(max_in_flight=1, max_queue_size=5, queue_timeout_seconds=1)
+    release = asyncio.Event()
+    order = []
+
+    first = asyncio.create_task(_hold(manager, "chatgpt", release, order, "first"))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(_hold(manager, "chatgpt", release, order, "fifo-a")),
+        asyncio.create_task(_hold(manager, "chatgpt", release, order, "fifo-b")),
+        asyncio.create_task(_hold(manager, "chatgpt", release, order, "urgent", priority=-1)),
+    ]
+    await asyncio.sleep(0)
+
+    assert manager.stats()["chatgpt"]["in_flight"] == 1
+    assert manager.stats()["chatgpt"]["queued"] == 3
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+
+    assert order == ["first", "urgent", "fifo-a", "fifo-b"]
+    stats = manager.stats()["chatgpt"]
+    assert stats["in_flight"] == 0
+    assert stats["admitted"] == 4
+    assert stats["max_wait_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_immediately_when_queue_is_full():
+    manager = AdmissionManager(max_in_flight=1, max_queue_size=0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(manager, "kimi", release, [], "holder"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        async with manager.admit("kimi"):
+            pass
+
+    assert exc_info.value.retry_after_seconds >= 1
+    assert manager.stats()["kimi"]["rejected"] == 1
+    release.set()
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_after_queue_timeout_and_frees_the_queue():
+    manager = AdmissionManager(max_in_flight=1, max_queue_size=1, queue_timeout_seconds=0.01)
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(manager, "qwen", release, [], "holder"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError):
+        async with manager.admit("qwen"):
+            pass
+
+    stats = manager.stats()["qwen"]
+    assert stats["timed_out"] == 1
+    assert stats["queued"] == 0
+    release.set()
+    await holder
+    assert manager.stats()["qwen"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_configure_overrides_limits_per_provider():
+    manager = AdmissionManager(max_in_flight=1)
+    manager.configure("deepseek", max_in_flight=2)
+
+    async with manager.admit("deepseek"), manager.admit("deepseek"):
+        assert manager.stats()["deepseek"]["in_flight"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_until_admitted_waits_retry_after_instead_of_failing(monkeypatch):
+    delays = []
+    original_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+        await original_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    attempts = []
+
+    async def operation() -> str:
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise AdmissionRejectedError("kimi", "attesa in coda scaduta", retry_after_seconds=7)
+        return "done"
+
+    assert await AdmissionManager.retry_until_admitted(operation) == "done"
+    assert len(attempts) == 3
+    assert delays == [7, 7]
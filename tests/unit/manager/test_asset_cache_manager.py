@@ -0,0 +1,148 @@
+import os
+import threading
+
+import pytest
+
+from polychat.manager.asset_cache_manager import AssetCacheManager
+
+BUNDLE_URL = "https://www.perplexity.ai/_next/static/chunks/main-3f9a8c21.js"
+
+
+class _FakeRequest:
+    def __init__(self, url: str, resource_type: str = "script"):
+        self.url = url
+        self.method = "GET"
+        self.resource_type = resource_type
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes):
+        self.status = 200
+        self.headers = {"content-type": "application/javascript", "set-cookie": "secret"}
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class _FakeRoute:
+    def __init__(self, url: str, body: bytes = b"console.log(1)", resource_type: str = "script"):
+        self.request = _FakeRequest(url, resource_type)
+        self.body = body
+        self.fetched = False
+        self.fulfilled = None
+        self.fell_back = False
+
+    async def fetch(self):
+        self.fetched = True
+        return _FakeResponse(self.body)
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def fallback(self):
+        self.fell_back = True
+
+
+def test_is_cacheable_matches_hashed_assets_only():
+    manager = AssetCacheManager("unused")
+
+    assert manager.is_cacheable(BUNDLE_URL)
+    assert manager.is_cacheable("https://cdn.oaistatic.com/assets/i5bamk05qmvsi6c3.js")
+    assert manager.is_cacheable("https://chat.qwen.ai/static/css/main.1a2b3c4d.css")
+    assert not manager.is_cacheable("https://chat.qwen.ai/static/js/application.js")
+    assert not manager.is_cacheable("https://chatgpt.com/backend-api/conversation")
+
+
+@pytest.mark.asyncio
+async def test_second_request_is_served_from_disk_across_restarts(tmp_path):
+    manager = AssetCacheManager(str(tmp_path))
+    await manager.start()
+
+    first = _FakeRoute(BUNDLE_URL)
+    await manager._handle_route(first)
+    second = _FakeRoute(BUNDLE_URL)
+    await manager._handle_route(second)
+
+    assert first.fetched and not second.fetched
+    assert second.fulfilled["body"] == b"console.log(1)"
+    assert second.fulfilled["headers"] == {"content-type": "application/javascript"}
+    assert manager.stats()["hits"] == 1
+
+    await manager.stop()
+    restarted = AssetCacheManager(str(tmp_path))
+    await restarted.start()
+    third = _FakeRoute(BUNDLE_URL)
+    await restarted._handle_route(third)
+
+    assert not third.fetched
+    assert third.fulfilled["body"] == b"console.log(1)"
+
+
+@pytest.mark.asyncio
+async def test_store_evicts_least_recently_used_assets_beyond_size_limit(tmp_path):
+    manager = AssetCacheManager(str(tmp_path), max_bytes=20)
+    await manager.start()
+    urls = [f"https://example.com/_next/static/chunk-{index}.js" for index in range(3)]
+
+    await manager._handle_route(_FakeRoute(urls[0], b"a" * 8))
+    await manager._handle_route(_FakeRoute(urls[1], b"b" * 8))
+    await manager._handle_route(_FakeRoute(urls[0], b"a" * 8))
+    await manager._handle_route(_FakeRoute(urls[2], b"c" * 8))
+
+    stats = manager.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 16
+    assert stats["evictions"] == 1
+    refetched = _FakeRoute(urls[1], b"b" * 8)
+    await manager._handle_route(refetched)
+    assert refetched.fetched
+
+
+@pytest.mark.asyncio
+async def test_non_asset_resource_types_fall_back_to_other_routes(tmp_path):
+    manager = AssetCacheManager(str(tmp_path))
+    route = _FakeRoute(BUNDLE_URL, resource_type="fetch")
+
+    await manager._handle_route(route)
+
+    assert route.fell_back and not route.fetched
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_falls_back_instead_of_leaving_the_request_pending(tmp_path):
+    class _FailingRoute(_FakeRoute):
+        async def fetch(self):
+            raise RuntimeError("net::ERR_CONNECTION_RESET")
+
+    manager = AssetCacheManager(str(tmp_path))
+    await manager.start()
+    route = _FailingRoute(BUNDLE_URL)
+
+    await manager._handle_route(route)
+
+    assert route.fell_back and route.fulfilled is None
+    assert manager.stats()["entries"] == 0
+
+
+def test_concurrent_index_writes_use_distinct_temporary_files(tmp_path):
+    manager = AssetCacheManager(str(tmp_path))
+    payload = [{"url": BUNDLE_URL, "digest": "ab" * 32, "size": 1, "headers": {}}]
+
+    errors = []
+
+    def _write_many():
+        try:
+            for _ in range(50):
+                manager._write_index(payload)
+        except OSError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_write_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
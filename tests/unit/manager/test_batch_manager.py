@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.batch_manager import BatchManager
+from polychat.model.service.chat import Chat
+from polychat.model.service.chat_metadata import ChatMetadata
+
+
+def _chat(index: int) -> Chat:
+    return Chat(id=f"chat-{index}", message="answer", metadata=ChatMetadata(provider="kimi"))
+
+
+@pytest.mark.asyncio
+async def test_run_limits_parallelism_and_yields_in_completion_order():
+    manager = BatchManager(default_parallelism=2)
+    running = 0
+    peak = 0
+    delays = [0.03, 0.01, 0.0, 0.0]
+
+    async def runner(index: int) -> Chat:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(delays[index])
+        running -= 1
+        return _chat(index)
+
+    items = [item async for item in manager.run(len(delays), runner)]
+
+    assert peak == 2
+    assert [item.index for item in items] == [1, 2, 3, 0]
+    assert [item.sequence for item in items] == [1, 2, 3, 4]
+    assert all(item.total == 4 and item.succeeded for item in items)
+
+
+@pytest.mark.asyncio
+async def test_failures_do_not_abort_the_batch_and_parallelism_is_capped():
+    manager = BatchManager(default_parallelism=1, max_parallelism=2)
+    started = []
+
+    async def runner(index: int) -> Chat:
+        started.append(index)
+        if index == 0:
+            raise RuntimeError("boom")
+        return _chat(index)
+
+    items = [item async for item in manager.run(3, runner, parallelism=50)]
+
+    assert sorted(item.index for item in items) == [0, 1, 2]
+    failed = next(item for item in items if item.index == 0)
+    assert failed.error == "boom" and failed.chat is None
+    assert manager.stats() == {"running_batches": 0, "succeeded": 2, "failed": 1}
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_items_still_running():
+    manager = BatchManager(default_parallelism=2)
+    cancelled = []
+
+    async def runner(index: int) -> Chat:
+        if index == 0:
+            return _chat(index)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return _chat(index)
+
+    stream = manager.run(3, runner)
+    first = await stream.__anext__()
+    await stream.aclose()
+
+    assert first.index == 0
+    assert cancelled == [1, 2]
+    assert manager.stats()["running_batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_items_rejected_by_admission_are_retried_instead_of_failing(monkeypatch):
+    original_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: original_sleep(0))
+    rejected = set()
+
+    async def runner(index: int) -> Chat:
+        if index not in rejected:
+            rejected.add(index)
+            raise AdmissionRejectedError("kimi", "attesa in coda scaduta", 1)
+        return _chat(index)
+
+    items = [item async for item in BatchManager(max_parallelism=6).run(4, runner, parallelism=6)]
+
+    assert all(item.succeeded for item in items)
+    assert sorted(item.index for item in items) == [0, 1, 2, 3]
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.browser_pool_manager import BrowserPoolManager
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.connected = True
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, **kwargs) -> _FakeContext:
+        context = _FakeContext()
+        context.options = kwargs
+        self.contexts.append(context)
+        return context
+
+
+class _TrackingAsyncCamoufox:
+    launched = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.browser = _FakeBrowser()
+        self.closed = False
+        _TrackingAsyncCamoufox.launched.append(self)
+
+    async def __aenter__(self) -> _FakeBrowser:
+        return self.browser
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+        return False
+
+
+@pytest.fixture
+def tracking_camoufox(monkeypatch):
+    _TrackingAsyncCamoufox.launched = []
+    monkeypatch.setattr("polychat.manager.browser_pool_manager.AsyncCamoufox", _TrackingAsyncCamoufox)
+    return _TrackingAsyncCamoufox
+
+
+@pytest.mark.asyncio
+async def test_lease_context_without_start_launches_ephemeral_browser(tracking_camoufox):
+    pool = BrowserPoolManager(headless=True)
+
+    async with pool.lease_context(storage_state="state.json") as context:
+        assert context.options == {"storage_state": "state.json"}
+
+    assert len(tracking_camoufox.launched) == 1
+    assert tracking_camoufox.launched[0].closed is True
+    assert context.closed is True
+
+
+@pytest.mark.asyncio
+async def test_started_pool_reuses_browser_across_leases(tracking_camoufox):
+    pool = BrowserPoolManager(headless=True, size=1, health_check_interval_seconds=0)
+    await pool.start()
+
+    async with pool.lease_context() as first_context:
+        pass
+    async with pool.lease_context() as second_context:
+        pass
+
+    assert len(tracking_camoufox.launched) == 1
+    assert first_context.closed is True
+    assert second_context.closed is True
+    assert pool.stats()["browsers"][0]["uses"] == 2
+
+    await pool.stop()
+
+    assert tracking_camoufox.launched[0].closed is True
+    assert pool.is_started is False
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_browser_after_max_uses(tracking_camoufox):
+    pool = BrowserPoolManager(headless=True, size=1, max_uses=1, health_check_interval_seconds=0)
+    await pool.start()
+
+    async with pool.lease_context():
+        pass
+    async with pool.lease_context():
+        pass
+    await asyncio.gather(*pool._replacements)
+
+    assert len(tracking_camoufox.launched) == 2
+    assert tracking_camoufox.launched[0].closed is True
+    assert tracking_camoufox.launched[1].closed is False
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_disconnected_browser(tracking_camoufox):
+    pool = BrowserPoolManager(headless=True, size=1, health_check_interval_seconds=0)
+    await pool.start()
+    tracking_camoufox.launched[0].browser.connected = False
+
+    async with pool.lease_context() as context:
+        assert context in tracking_camoufox.launched[1].browser.contexts
+
+    assert tracking_camoufox.launched[0].closed is True
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_current_browser_when_replacement_launch_fails(tracking_camoufox, monkeypatch):
+    pool = BrowserPoolManager(headless=True, size=1, max_uses=1, health_check_interval_seconds=0)
+    await pool.start()
+    async with pool.lease_context():
+        pass
+
+    async def _failing_aenter(self):
+        raise RuntimeError("launch failed")
+
+    monkeypatch.setattr(tracking_camoufox, "__aenter__", _failing_aenter)
+    async with pool.lease_context() as context:
+        assert context in tracking_camoufox.launched[0].browser.contexts
+    await asyncio.gather(*pool._replacements)
+
+    assert len(pool.stats()["browsers"]) == 1
+    assert tracking_camoufox.launched[0].closed is False
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_leases_are_not_blocked_while_a_replacement_browser_launches(tracking_camoufox, monkeypatch):
+    pool = BrowserPoolManager(headless=True, size=1, max_uses=1, health_check_interval_seconds=0)
+    await pool.start()
+    async with pool.lease_context():
+        pass
+
+    launch_started = asyncio.Event()
+    finish_launch = asyncio.Event()
+
+    async def _slow_aenter(self):
+        launch_started.set()
+        await finish_launch.wait()
+        return self.browser
+
+    monkeypatch.setattr(tracking_camoufox, "__aenter__", _slow_aenter)
+    async with pool.lease_context() as first:
+        await launch_started.wait()
+        assert pool._lock.locked() is False
+        # Il vecchio browser continua a servire mentre il nuovo si avvia
+        async with pool.lease_context() as second:
+            assert second in tracking_camoufox.launched[0].browser.contexts
+    assert first in tracking_camoufox.launched[0].browser.contexts
+    assert len(pool._replacements) == 1
+
+    finish_launch.set()
+    await asyncio.gather(*pool._replacements)
+
+    assert tracking_camoufox.launched[0].closed is True
+    async with pool.lease_context() as third:
+        assert third in tracking_camoufox.launched[1].browser.contexts
+
+    await pool.stop()
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager, CircuitOpenError
+from polychat.manager.retry_manager import NonRetryableError
+
+
+async def _fail(manager: CircuitBreakerManager, provider: str, exc: Exception) -> None:
+    with pytest.raises(type(exc)):
+        async with manager.guard(provider):
+            raise exc
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_consecutive_failures_and_fails_fast():
+    manager = CircuitBreakerManager(failure_threshold=2, open_seconds=30)
+
+    await _fail(manager, "kimi", TimeoutError("timeout"))
+    assert manager.stats()["kimi"]["state"] == "closed"
+    await _fail(manager, "kimi", TimeoutError("timeout"))
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        async with manager.guard("kimi"):
+            raise AssertionError("la richiesta non deve partire")
+
+    assert exc_info.value.retry_after_seconds >= 1
+    assert manager.stats()["kimi"]["state"] == "open"
+    assert manager.stats()["kimi"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_success_resets_failures_and_admission_rejections_are_ignored():
+    manager = CircuitBreakerManager(failure_threshold=2)
+
+    await _fail(manager, "qwen", TimeoutError("timeout"))
+    async with manager.guard("qwen"):
+        pass
+    await _fail(manager, "qwen", AdmissionRejectedError("qwen", "coda piena", 1))
+    await _fail(manager, "qwen", TimeoutError("timeout"))
+
+    assert manager.stats()["qwen"]["state"] == "closed"
+    assert manager.stats()["qwen"]["consecutive_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens_circuit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    manager = CircuitBreakerManager(failure_threshold=1, open_seconds=30)
+    probe_results = [False, True]
+    probes = []
+
+    async def probe() -> bool:
+        probes.append("probe")
+        return probe_results[len(probes) - 1]
+
+    manager.register_probe("gemini", probe)
+    await _fail(manager, "gemini", RuntimeError("session expired"))
+
+    now[0] += 31
+    with pytest.raises(CircuitOpenError):
+        async with manager.guard("gemini"):
+            pass
+    assert manager.stats()["gemini"]["state"] == "open"
+
+    now[0] += 31
+    async with manager.guard("gemini"):
+        pass
+
+    assert probes == ["probe", "probe"]
+    assert manager.stats()["gemini"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_or_trial_reopens_circuit_instead_of_staying_half_open(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    manager = CircuitBreakerManager(failure_threshold=1, open_seconds=30)
+    probe_started = asyncio.Event()
+
+    async def probe() -> bool:
+        probe_started.set()
+        await asyncio.Event().wait()
+        return True
+
+    async def _guarded():
+        async with manager.guard("kimi"):
+            await asyncio.Event().wait()
+
+    manager.register_probe("kimi", probe)
+    await _fail(manager, "kimi", RuntimeError("down"))
+
+    now[0] += 31
+    task = asyncio.create_task(_guarded())
+    await probe_started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert manager.stats()["kimi"]["state"] == "open"
+
+    # Senza sonda la richiesta stessa e' il tentativo di prova: anche la sua cancellazione riapre
+    manager.register_probe("kimi", None)
+    now[0] += 31
+    task = asyncio.create_task(_guarded())
+    await asyncio.sleep(0)
+    assert manager.stats()["kimi"]["state"] == "half_open"
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert manager.stats()["kimi"]["state"] == "open"
+
+    now[0] += 31
+    async with manager.guard("kimi"):
+        pass
+    assert manager.stats()["kimi"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_repeated_validation_errors_leave_the_circuit_closed():
+    manager = CircuitBreakerManager(failure_threshold=2)
+
+    for _ in range(5):
+        await _fail(manager, "kimi", ValueError("chat_id mancante"))
+        await _fail(manager, "kimi", NonRetryableError("credenziali non valide"))
+
+    assert manager.stats()["kimi"]["state"] == "closed"
+    assert manager.stats()["kimi"]["consecutive_failures"] == 0
+    async with manager.guard("kimi"):
+        pass
@@ -0,0 +1,92 @@
+import time
+
+from polychat.manager.conversation_cache_manager import ConversationCacheManager
+from polychat.model.service.chat import Chat
+from polychat.model.service.chat_metadata import ChatMetadata
+
+
+def _chat(message: str) -> Chat:
+    return Chat(id="chat-1", message=message, metadata=ChatMetadata(provider="kimi"))
+
+
+def test_in_progress_entry_expires_and_stable_answer_only_extends_its_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ConversationCacheManager(in_progress_ttl_seconds=5)
+
+    cache.put("kimi", "chat-1", _chat("partial"))
+    assert cache.get("kimi", "chat-1").message == "partial"
+
+    now[0] += 6
+    assert cache.get("kimi", "chat-1") is None
+
+    # Una risposta in pausa non e' conclusa: la validita' cresce ma resta limitata
+    for _ in range(10):
+        cache.put("kimi", "chat-1", _chat("partial"))
+    now[0] += ConversationCacheManager.MAX_INFERRED_TTL_SECONDS - 1
+    assert cache.get("kimi", "chat-1").message == "partial"
+    now[0] += 2
+    assert cache.get("kimi", "chat-1") is None
+    assert cache.stats()["completed"] == 0
+
+
+def test_explicitly_completed_answer_uses_completed_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ConversationCacheManager(in_progress_ttl_seconds=5, completed_ttl_seconds=0)
+
+    cache.put("kimi", "chat-1", _chat("final"), completed=True)
+    now[0] += 3600
+
+    assert cache.get("kimi", "chat-1").message == "final"
+    assert cache.stats()["completed"] == 1
+
+
+def test_put_from_read_started_before_invalidate_is_dropped():
+    cache = ConversationCacheManager(in_progress_ttl_seconds=60)
+    cache.put("kimi", "chat-1", _chat("old"))
+
+    generation = cache.generation()
+    cache.invalidate("kimi", "chat-1")
+    cache.put("kimi", "chat-1", _chat("old"), generation=generation)
+
+    assert cache.get("kimi", "chat-1") is None
+    assert cache.stats()["stale_puts"] == 1
+
+    cache.put("kimi", "chat-1", _chat("new"), generation=cache.generation())
+    assert cache.get("kimi", "chat-1").message == "new"
+
+
+def test_forgotten_invalidations_still_drop_older_reads():
+    cache = ConversationCacheManager(max_entries=1, in_progress_ttl_seconds=60)
+
+    generation = cache.generation()
+    cache.invalidate("kimi", "a")
+    cache.invalidate("kimi", "b")
+    cache.put("kimi", "a", _chat("old"), generation=generation)
+
+    assert cache.get("kimi", "a") is None
+
+
+def test_changed_answer_stays_in_progress_and_invalidate_drops_entry():
+    cache = ConversationCacheManager(in_progress_ttl_seconds=60)
+
+    cache.put("kimi", "chat-1", _chat("first"))
+    cache.put("kimi", "chat-1", _chat("second"))
+    assert cache.stats()["completed"] == 0
+
+    cache.invalidate("kimi", "chat-1")
+    assert cache.get("kimi", "chat-1") is None
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = ConversationCacheManager(max_entries=2, in_progress_ttl_seconds=60)
+
+    cache.put("kimi", "a", _chat("a"))
+    cache.put("kimi", "b", _chat("b"))
+    cache.get("kimi", "a")
+    cache.put("kimi", "c", _chat("c"))
+
+    assert cache.get("kimi", "b") is None
+    assert cache.get("kimi", "a") is not None
+    assert cache.get("kimi", "c") is not None
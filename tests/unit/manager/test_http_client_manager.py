@@ -0,0 +1,85 @@
+import httpx
+import pytest
+
+from polychat.manager.http_client_manager import HttpClientManager
+
+
+@pytest.mark.asyncio
+async def test_get_client_reuses_one_client_per_host():
+    manager = HttpClientManager(http2=False)
+
+    first = manager.get_client("https://chatgpt.com/api/auth/session")
+    second = manager.get_client("https://chatgpt.com/backend-api/conversation/abc")
+    other = manager.get_client("https://www.kimi.com/apiv2/GetChat")
+
+    assert first is second
+    assert other is not first
+    assert manager.stats()["hosts"]["https://chatgpt.com"]["requests"] == 2
+
+    await manager.stop()
+
+    assert first.is_closed is True
+    assert other.is_closed is True
+    assert manager.stats()["hosts"] == {}
+
+
+@pytest.mark.asyncio
+async def test_get_client_recreates_closed_client_and_rejects_relative_urls():
+    manager = HttpClientManager(http2=False)
+    first = manager.get_client("https://chat.qwen.ai/api/v2/chats/1")
+    await first.aclose()
+
+    assert manager.get_client("https://chat.qwen.ai/api/v2/chats/1") is not first
+    with pytest.raises(ValueError):
+        manager.get_client("/api/v2/chats/1")
+
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients_follow_redirects_like_requests():
+    manager = HttpClientManager(http2=False)
+
+    assert manager.get_client("https://chatgpt.com/backend-api/files/download/1").follow_redirects is True
+
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_clients_never_carry_cookies_between_callers():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/download":
+            return httpx.Response(
+                302,
+                headers={"location": "/file", "set-cookie": "__Secure-next-auth.session-token=ACCOUNT1; Path=/"},
+            )
+        return httpx.Response(200, json={"cookie": request.headers.get("cookie")})
+
+    manager = HttpClientManager(http2=False)
+    client = manager.get_client("https://www.perplexity.ai/download")
+    client._transport = httpx.MockTransport(handler)
+
+    first = await client.get(
+        "https://www.perplexity.ai/download",
+        headers={"Cookie": "__Secure-next-auth.session-token=ACCOUNT1"},
+    )
+    second = await client.get("https://www.perplexity.ai/download", headers={"Cookie": "acct=2"})
+
+    assert first.json() == {"cookie": None}
+    assert second.json() == {"cookie": None}
+    assert len(client.cookies.jar) == 0
+
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_create_client_is_dedicated_and_does_not_follow_redirects():
+    manager = HttpClientManager(http2=False)
+
+    client = manager.create_client(timeout_seconds=5)
+
+    assert client.follow_redirects is False
+    assert client.timeout.read == 5
+    assert manager.stats()["hosts"] == {}
+
+    await client.aclose()
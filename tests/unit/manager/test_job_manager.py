@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+
+from polychat.manager.job_manager import JobCapacityError, JobManager
+from polychat.model.service.chat import Chat
+from polychat.model.service.chat_metadata import ChatMetadata
+from polychat.model.service.job import Job
+
+
+def _job(job_id: str) -> Job:
+    return Job(id=job_id, provider="kimi", message="hi", created_at=time.time())
+
+
+async def _answer(job: Job) -> Chat:
+    return Chat(id="chat-1", message=f"answer to {job.message}", metadata=ChatMetadata(provider=job.provider))
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_job_in_background_and_wait_returns_result():
+    manager = JobManager(max_workers=1)
+    await manager.start()
+    finished = []
+
+    async def on_finished(job: Job) -> None:
+        finished.append(job.id)
+
+    try:
+        job = manager.submit(_job("job-1"), _answer, on_finished)
+        assert job.status == "queued"
+
+        result = await manager.wait("job-1", timeout_seconds=1)
+    finally:
+        await manager.stop()
+
+    assert result.status == "succeeded"
+    assert result.chat.message == "answer to hi"
+    assert result.started_at is not None and result.finished_at is not None
+    assert finished == ["job-1"]
+    assert manager.stats()["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_runner_marks_job_failed_with_error():
+    async def failing(job: Job) -> Chat:
+        raise RuntimeError("provider down")
+
+    manager = JobManager(max_workers=1)
+    await manager.start()
+    try:
+        manager.submit(_job("job-1"), failing)
+        result = await manager.wait("job-1", timeout_seconds=1)
+    finally:
+        await manager.stop()
+
+    assert result.status == "failed"
+    assert result.error == "provider down"
+
+
+@pytest.mark.asyncio
+async def test_job_interrupted_at_shutdown_counts_as_failed_and_notifies():
+    started = asyncio.Event()
+    finished = []
+
+    async def hanging(job: Job) -> Chat:
+        started.set()
+        await asyncio.Event().wait()
+
+    async def on_finished(job: Job) -> None:
+        finished.append((job.id, job.status, job.error))
+
+    manager = JobManager(max_workers=1)
+    await manager.start()
+    manager.submit(_job("job-1"), hanging, on_finished)
+    await started.wait()
+    await manager.stop()
+
+    assert finished == [("job-1", "failed", "Job interrotto")]
+    assert manager.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_running_job_when_timeout_expires():
+    release = asyncio.Event()
+
+    async def slow(job: Job) -> Chat:
+        await release.wait()
+        return await _answer(job)
+
+    manager = JobManager(max_workers=1)
+    await manager.start()
+    try:
+        manager.submit(_job("job-1"), slow)
+        result = await manager.wait("job-1", timeout_seconds=0.01)
+        assert result.status == "running"
+        release.set()
+        assert (await manager.wait("job-1", timeout_seconds=1)).status == "succeeded"
+    finally:
+        await manager.stop()
+
+    assert await manager.wait("missing", timeout_seconds=0) is None
+
+
+@pytest.mark.asyncio
+async def test_submit_evicts_oldest_finished_jobs_and_rejects_when_all_active():
+    manager = JobManager(max_workers=1, max_jobs=2)
+    await manager.start()
+    try:
+        manager.submit(_job("job-1"), _answer)
+        await manager.wait("job-1", timeout_seconds=1)
+
+        release = asyncio.Event()
+
+        async def slow(job: Job) -> Chat:
+            await release.wait()
+            return await _answer(job)
+
+        manager.submit(_job("job-2"), slow)
+        manager.submit(_job("job-3"), slow)
+        assert manager.get("job-1") is None
+
+        with pytest.raises(JobCapacityError):
+            manager.submit(_job("job-4"), slow)
+        release.set()
+    finally:
+        await manager.stop()
@@ -0,0 +1,32 @@
+from polychat.manager.latency_manager import LatencyManager
+
+
+def test_percentile_requires_minimum_samples():
+    manager = LatencyManager(min_samples=3)
+
+    manager.record("gemini", "ask_and_wait", 1.0)
+    manager.record("gemini", "ask_and_wait", 2.0)
+    assert manager.percentile("gemini", "ask_and_wait", 0.95) is None
+
+    manager.record("gemini", "ask_and_wait", 3.0)
+    assert manager.percentile("gemini", "ask_and_wait", 0.95) == 3.0
+    assert manager.percentile("gemini", "ask_and_wait", 0.5) == 2.0
+    assert manager.percentile("kimi", "ask_and_wait", 0.95) is None
+
+
+def test_window_keeps_only_recent_successful_samples():
+    manager = LatencyManager(window_size=2, min_samples=1)
+
+    manager.record("qwen", "ask", 10.0)
+    manager.record("qwen", "ask", 1.0)
+    manager.record("qwen", "ask", 2.0)
+    manager.record("qwen", "ask", 50.0, succeeded=False)
+
+    assert manager.percentile("qwen", "ask", 1.0) == 2.0
+    assert manager.stats()["qwen"]["ask"] == {
+        "count": 4,
+        "failures": 1,
+        "p50_seconds": 1.0,
+        "p95_seconds": 2.0,
+        "p99_seconds": 2.0,
+    }
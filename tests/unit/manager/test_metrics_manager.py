@@ -0,0 +1,43 @@
+from polychat.manager.metrics_manager import MetricsManager
+
+
+def test_operation_metrics_track_in_flight_duration_and_errors():
+    manager = MetricsManager(buckets=(1.0, 5.0))
+
+    manager.operation_started("kimi", "ask")
+    assert 'polychat_operations_in_flight{operation="ask",provider="kimi"} 1' in manager.render()
+
+    manager.operation_finished("kimi", "ask", 0.5)
+    manager.operation_started("kimi", "ask")
+    manager.operation_finished("kimi", "ask", 3.0, TimeoutError("slow"))
+    text = manager.render()
+
+    assert 'polychat_operations_in_flight{operation="ask",provider="kimi"} 0' in text
+    assert 'polychat_operation_duration_seconds_bucket{operation="ask",provider="kimi",le="1"} 1' in text
+    assert 'polychat_operation_duration_seconds_bucket{operation="ask",provider="kimi",le="5"} 2' in text
+    assert 'polychat_operation_duration_seconds_bucket{operation="ask",provider="kimi",le="+Inf"} 2' in text
+    assert 'polychat_operation_duration_seconds_sum{operation="ask",provider="kimi"} 3.5' in text
+    assert 'polychat_operation_duration_seconds_count{operation="ask",provider="kimi"} 2' in text
+    assert 'polychat_operations_total{operation="ask",outcome="failed",provider="kimi"} 1' in text
+    assert 'polychat_operations_total{operation="ask",outcome="succeeded",provider="kimi"} 1' in text
+    assert 'polychat_operation_errors_total{exception="TimeoutError",operation="ask",provider="kimi"} 1' in text
+    assert "# TYPE polychat_operation_duration_seconds histogram" in text
+    assert "# TYPE polychat_operations_total counter" in text
+
+
+def test_render_includes_collector_samples_and_escapes_label_values():
+    manager = MetricsManager()
+    manager.register_collector(
+        lambda: [
+            ("polychat_browser_processes", "gauge", "Processi browser", {}, 2.0),
+            ("polychat_account_in_flight", "gauge", "Richieste per account", {"account": 'a"b'}, 1.0),
+        ]
+    )
+
+    text = manager.render()
+
+    assert "# HELP polychat_browser_processes Processi browser" in text
+    assert "# TYPE polychat_browser_processes gauge" in text
+    assert "polychat_browser_processes 2\n" in text
+    assert 'polychat_account_in_flight{account="a\\"b"} 1' in text
+    assert text.endswith("\n")
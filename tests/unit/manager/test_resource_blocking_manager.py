@@ -0,0 +1,74 @@
+import pytest
+
+from polychat.manager.resource_blocking_manager import ResourceBlockingManager
+
+
+class _FakeRequest:
+    def __init__(self, url: str, resource_type: str):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, url: str, resource_type: str):
+        self.request = _FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self, error_code: str = "failed"):
+        self.outcome = "aborted"
+
+    async def fallback(self):
+        self.outcome = "continued"
+
+
+class _FakeResponse:
+    def __init__(self, content_length: str):
+        self.headers = {"content-length": content_length}
+
+
+class _FakeContext:
+    def __init__(self):
+        self.route_handler = None
+        self.handlers = {}
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    def on(self, event_name, handler):
+        self.handlers[event_name] = handler
+
+
+async def _request(context: _FakeContext, url: str, resource_type: str) -> str:
+    route = _FakeRoute(url, resource_type)
+    await context.route_handler(route)
+    return route.outcome
+
+
+@pytest.mark.asyncio
+async def test_install_blocks_resource_types_and_trackers_but_not_allowed_urls():
+    manager = ResourceBlockingManager()
+    context = _FakeContext()
+
+    traffic = await manager.install(context, "kimi", allowed_url_patterns=("/apiv2/",))
+
+    assert await _request(context, "https://www.kimi.com/logo.png", "image") == "aborted"
+    assert await _request(context, "https://www.google-analytics.com/g/collect", "fetch") == "aborted"
+    assert await _request(context, "https://www.kimi.com/apiv2/avatar", "image") == "continued"
+    assert await _request(context, "https://www.kimi.com/app.js", "script") == "continued"
+    context.handlers["response"](_FakeResponse("2048"))
+
+    assert manager.traffic(context) is traffic
+    assert traffic.snapshot() == {"blocked": 2, "allowed": 2, "downloaded_bytes": 2048}
+    assert manager.stats()["providers"]["kimi"]["blocked_by_type"] == {"image": 1, "fetch": 1}
+
+    manager.forget(context)
+    assert manager.traffic(context) is None
+
+
+@pytest.mark.asyncio
+async def test_install_is_noop_when_disabled():
+    manager = ResourceBlockingManager(enabled=False)
+    context = _FakeContext()
+
+    assert await manager.install(context, "kimi") is None
+    assert context.route_handler is None
@@ -0,0 +1,90 @@
+import random
+
+import httpx
+import pytest
+
+from polychat.manager.retry_manager import NonRetryableError, RetryManager
+from polychat.model.client.retry_policy import RetryPolicy
+
+NO_DELAY = RetryPolicy(max_attempts=3, base_delay_seconds=0)
+
+
+def _failing(errors: list[Exception], calls: list):
+    async def operation():
+        calls.append("attempt")
+        raise errors[min(len(calls), len(errors)) - 1]
+
+    return operation
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_fail_on_first_attempt():
+    manager = RetryManager()
+    request = httpx.Request("GET", "https://example.test")
+    unauthorized = httpx.HTTPStatusError("denied", request=request, response=httpx.Response(401, request=request))
+    for error in (
+        NonRetryableError("bad"),
+        ValueError("chat_id mancante"),
+        PermissionError("Deepseek login required: redirected to /sign_in"),
+        unauthorized,
+    ):
+        calls = []
+        with pytest.raises(type(error)):
+            await manager.run("kimi", "ask", _failing([error], calls), NO_DELAY)
+        assert len(calls) == 1
+
+
+def test_transient_errors_are_retryable_even_if_their_message_mentions_auth():
+    manager = RetryManager()
+
+    assert manager.is_retryable(TimeoutError("Timeout 30000ms exceeded waiting for /login-button-403"))
+    assert manager.is_retryable(Exception("Target closed while loading https://chat.test/c/401ab"))
+
+
+@pytest.mark.asyncio
+async def test_retryable_status_codes_are_retried_up_to_max_attempts():
+    manager = RetryManager(min_retries_per_window=10)
+    request = httpx.Request("GET", "https://example.test")
+    error = httpx.HTTPStatusError("busy", request=request, response=httpx.Response(503, request=request))
+    calls = []
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await manager.run("kimi", "get_conversation", _failing([error], calls), NO_DELAY)
+
+    assert len(calls) == 3
+    assert manager.stats()["kimi"]["retried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_stops_retries_during_incident():
+    manager = RetryManager(budget_ratio=0.0, min_retries_per_window=1)
+    first_calls, second_calls = [], []
+
+    with pytest.raises(TimeoutError):
+        await manager.run("qwen", "ask", _failing([TimeoutError("t")], first_calls), NO_DELAY)
+    with pytest.raises(TimeoutError):
+        await manager.run("qwen", "ask", _failing([TimeoutError("t")], second_calls), NO_DELAY)
+
+    assert len(first_calls) == 2
+    assert len(second_calls) == 1
+    assert manager.stats()["qwen"]["budget_exhausted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_can_retry_false_prevents_replay():
+    manager = RetryManager()
+    calls = []
+
+    with pytest.raises(TimeoutError):
+        await manager.run("kimi", "ask", _failing([TimeoutError("t")], calls), NO_DELAY, can_retry=lambda: False)
+
+    assert len(calls) == 1
+
+
+def test_compute_delay_grows_exponentially_and_respects_jitter_bounds():
+    policy = RetryPolicy(base_delay_seconds=1, max_delay_seconds=5, multiplier=2, jitter=0)
+    assert [policy.compute_delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+
+    jittered = RetryPolicy(base_delay_seconds=4, jitter=0.5)
+    rng = random.Random(1)
+    assert all(2 <= jittered.compute_delay(1, rng) <= 4 for _ in range(20))
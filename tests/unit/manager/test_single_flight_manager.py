@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.single_flight_manager import SingleFlightManager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_with_same_key_share_one_execution():
+    manager = SingleFlightManager()
+    release = asyncio.Event()
+    calls = []
+
+    async def fetch():
+        calls.append("fetch")
+        await release.wait()
+        return "result"
+
+    callers = [asyncio.create_task(manager.run("chat-1", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["result", "result", "result"]
+    assert calls == ["fetch"]
+    assert manager.stats() == {"in_flight": 0, "started": 1, "coalesced": 2}
+
+    assert await manager.run("chat-1", fetch) == "result"
+    assert calls == ["fetch", "fetch"]
+
+
+@pytest.mark.asyncio
+async def test_error_is_propagated_to_every_waiter():
+    manager = SingleFlightManager()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    callers = [asyncio.create_task(manager.run("chat-1", fail)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch():
+    manager = SingleFlightManager()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(manager.run("chat-1", fetch))
+    second = asyncio.create_task(manager.run("chat-1", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
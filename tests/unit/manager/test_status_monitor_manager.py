@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.status_monitor_manager import StatusMonitorManager
+
+
+def _status_check(calls: list, is_available: bool = True):
+    async def check() -> dict:
+        calls.append("check")
+        return {"provider": "kimi", "is_available": is_available, "is_logged_in": True, "detail": None}
+
+    return check
+
+
+@pytest.mark.asyncio
+async def test_refresh_stores_status_with_checked_at_and_get_serves_it_from_memory():
+    manager = StatusMonitorManager(refresh_interval_seconds=300)
+    calls = []
+    manager.register("kimi", _status_check(calls))
+
+    assert manager.get("kimi") is None
+
+    status = await manager.refresh("kimi")
+    assert status["is_available"] is True
+    assert status["checked_at"] > 0
+
+    assert manager.get("kimi") == status
+    assert calls == ["check"]
+
+    manager.invalidate("kimi")
+    assert manager.get("kimi") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_check():
+    manager = StatusMonitorManager()
+    release = asyncio.Event()
+    calls = []
+
+    async def slow_check() -> dict:
+        calls.append("check")
+        await release.wait()
+        return {"provider": "kimi", "is_available": True}
+
+    manager.register("kimi", slow_check)
+    refreshes = [asyncio.create_task(manager.refresh("kimi")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*refreshes)
+    assert calls == ["check"]
+    assert all(result["is_available"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_failed_or_slow_check_is_reported_as_unavailable():
+    manager = StatusMonitorManager(check_timeout_seconds=0.01)
+
+    async def failing_check() -> dict:
+        raise RuntimeError("browser crashed")
+
+    async def hanging_check() -> dict:
+        await asyncio.sleep(1)
+        return {"provider": "qwen", "is_available": True}
+
+    manager.register("kimi", failing_check)
+    manager.register("qwen", hanging_check)
+
+    kimi = await manager.refresh("kimi")
+    qwen = await manager.refresh("qwen")
+
+    assert kimi["is_available"] is False
+    assert "browser crashed" in kimi["detail"]
+    assert qwen["is_available"] is False
+    assert manager.stats()["failures"] == 2
+
+
+@pytest.mark.asyncio
+async def test_background_loop_refreshes_every_registered_provider():
+    manager = StatusMonitorManager(refresh_interval_seconds=0.01)
+    calls = []
+    manager.register("kimi", _status_check(calls))
+
+    await manager.start()
+    try:
+        for _ in range(50):
+            if len(calls) >= 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await manager.stop()
+
+    assert len(calls) >= 2
+    assert manager.get("kimi")["is_available"] is True
+
+
+@pytest.mark.asyncio
+async def test_disabled_monitor_never_serves_cached_status():
+    manager = StatusMonitorManager(refresh_interval_seconds=0)
+    manager.register("kimi", _status_check([]))
+
+    await manager.start()
+    await manager.refresh("kimi")
+
+    assert manager.get("kimi") is None
+    await manager.stop()
@@ -0,0 +1,72 @@
+from contextlib import AsyncExitStack
+import time
+
+import pytest
+
+from polychat.manager.sticky_page_manager import StickyPageManager
+from polychat.manager.warm_page_pool_manager import WarmPage
+
+
+class _ClosingPage(WarmPage):
+    def __init__(self, key: str = "key") -> None:
+        super().__init__(key, "context", "page", AsyncExitStack())
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_checkout_returns_parked_page_once_for_matching_credentials():
+    manager = StickyPageManager(idle_ttl_seconds=60)
+    page = _ClosingPage()
+
+    await manager.park("kimi", "chat-1", page)
+
+    assert await manager.checkout("kimi", "chat-1", "key") is page
+    assert await manager.checkout("kimi", "chat-1", "key") is None
+
+    await manager.park("kimi", "chat-1", page)
+    assert await manager.checkout("kimi", "chat-1", "other-key") is None
+    assert page.closed
+
+
+@pytest.mark.asyncio
+async def test_park_evicts_least_recent_page_beyond_limit():
+    manager = StickyPageManager(idle_ttl_seconds=60, max_pages=2)
+    pages = [_ClosingPage() for _ in range(3)]
+
+    for index, page in enumerate(pages):
+        await manager.park("kimi", f"chat-{index}", page)
+
+    assert pages[0].closed
+    assert not pages[1].closed and not pages[2].closed
+    assert manager.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_and_invalidated_pages_are_closed():
+    manager = StickyPageManager(idle_ttl_seconds=60)
+    expired = _ClosingPage()
+    fresh = _ClosingPage()
+    await manager.park("kimi", "chat-1", expired)
+    await manager.park("qwen", "chat-2", fresh)
+    manager._entries[("kimi", "chat-1")].parked_at = time.monotonic() - 120
+
+    await manager._close_expired()
+    assert expired.closed and not fresh.closed
+
+    manager.invalidate("qwen")
+    assert await manager.checkout("qwen", "chat-2", "key") is None
+    assert fresh.closed
+
+
+@pytest.mark.asyncio
+async def test_disabled_manager_closes_pages_instead_of_parking():
+    manager = StickyPageManager(idle_ttl_seconds=0)
+    page = _ClosingPage()
+
+    await manager.park("kimi", "chat-1", page)
+
+    assert page.closed
+    assert manager.stats()["pages"] == 0
@@ -0,0 +1,91 @@
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+from polychat.manager.warm_page_pool_manager import WarmPage, WarmPagePoolManager
+
+
+class _WarmPageFactory:
+    def __init__(self, key: str = "session"):
+        self.key = key
+        self.created = []
+        self.closed = []
+
+    async def __call__(self) -> WarmPage:
+        index = len(self.created)
+        exit_stack = AsyncExitStack()
+        exit_stack.push_async_callback(self._close, index)
+        entry = WarmPage(self.key, f"context-{index}", f"page-{index}", exit_stack)
+        self.created.append(entry)
+        return entry
+
+    async def _close(self, index: int) -> None:
+        self.closed.append(index)
+
+
+async def _wait_until(predicate, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_checkout_returns_none_when_pool_not_started():
+    pool = WarmPagePoolManager(size=1)
+    pool.register("kimi", _WarmPageFactory())
+
+    assert await pool.checkout("kimi", "session") is None
+
+
+@pytest.mark.asyncio
+async def test_checkout_returns_warm_page_and_refills_in_background():
+    factory = _WarmPageFactory()
+    pool = WarmPagePoolManager(size=1)
+    pool.register("kimi", factory)
+    await pool.start()
+    await _wait_until(lambda: len(factory.created) == 1)
+
+    entry = await pool.checkout("kimi", "session")
+
+    assert entry is factory.created[0]
+    assert entry.page == "page-0"
+    await _wait_until(lambda: len(factory.created) == 2)
+    assert pool.stats()["providers"]["kimi"]["hits"] == 1
+
+    await pool.stop()
+    assert factory.closed == [1]
+
+
+@pytest.mark.asyncio
+async def test_checkout_discards_page_created_with_different_credentials():
+    factory = _WarmPageFactory(key="old-session")
+    pool = WarmPagePoolManager(size=1)
+    pool.register("kimi", factory)
+    await pool.start()
+    await _wait_until(lambda: len(factory.created) == 1)
+
+    assert await pool.checkout("kimi", "new-session") is None
+    assert factory.closed == [0]
+    assert pool.stats()["providers"]["kimi"]["misses"] == 1
+
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_ready_pages():
+    factory = _WarmPageFactory()
+    pool = WarmPagePoolManager(size=1)
+    pool.register("kimi", factory)
+    await pool.start()
+    await _wait_until(lambda: len(factory.created) == 1)
+
+    pool.invalidate("kimi")
+    await _wait_until(lambda: len(factory.created) == 2)
+
+    assert factory.closed == [0]
+    assert await pool.checkout("kimi", "session") is factory.created[1]
+
+    await pool.stop()
@@ -0,0 +1,31 @@
+import pytest
+from pydantic import ValidationError
+
+from polychat.model.api.job_request import JobRequest
+
+
+def test_job_request_accepts_http_webhook_url():
+    request = JobRequest(provider="kimi", message="hello", webhook_url="https://hooks.example.com/polychat")
+
+    assert request.webhook_url == "https://hooks.example.com/polychat"
+
+
+@pytest.mark.parametrize(
+    "webhook_url",
+    [
+        "file:///etc/passwd",
+        "ftp://example.com/hook",
+        "https:///no-host",
+        "/relative",
+        "http://localhost:8459/kimi/chats",
+        "http://127.0.0.1/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://10.0.0.5/hook",
+        "http://192.168.1.10/hook",
+        "http://[::1]/hook",
+        "http://[fd00::1]/hook",
+    ],
+)
+def test_job_request_rejects_non_http_webhook_urls(webhook_url):
+    with pytest.raises(ValidationError):
+        JobRequest(provider="kimi", message="hello", webhook_url=webhook_url)
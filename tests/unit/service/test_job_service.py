@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from polychat.manager.admission_manager import AdmissionRejectedError
+from polychat.manager.job_manager import JobManager
+from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.mapper.service.job_to_api_mapper import JobToApiMapper
+from polychat.model.service.chat import Chat
+from polychat.model.service.chat_metadata import ChatMetadata
+from polychat.service.job_service import JobService
+
+
+class _FakeProviderService:
+    def __init__(self, provider: str):
+        self.PROVIDER_NAME = provider
+        self.calls = []
+
+    async def ask_and_wait(self, message: str, chat_id: str | None = None, type_input: bool = True) -> Chat:
+        self.calls.append((message, chat_id, type_input))
+        return Chat(id="chat-9", message="answer", metadata=ChatMetadata(provider=self.PROVIDER_NAME))
+
+
+class _FakeHttpClientManager:
+    def __init__(self, handler):
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def create_client(self, timeout_seconds: float, follow_redirects: bool = False) -> httpx.AsyncClient:
+        return self.client
+
+
+async def _public_addresses(host: str, port: int) -> list[str]:
+    return ["93.184.216.34"]
+
+
+def _service(job_manager: JobManager, http_client_manager) -> tuple[JobService, dict]:
+    services = {
+        name: _FakeProviderService(name)
+        for name in ("chatgpt", "deepseek", "gemini", "kimi", "perplexity", "qwen")
+    }
+    service = JobService(
+        job_manager,
+        http_client_manager,
+        JobToApiMapper(ChatToApiMapper()),
+        services["chatgpt"],
+        services["deepseek"],
+        services["gemini"],
+        services["kimi"],
+        services["perplexity"],
+        services["qwen"],
+    )
+    return service, services
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_provider_and_posts_result_to_webhook():
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    job_manager = JobManager(max_workers=1)
+    service, providers = _service(job_manager, _FakeHttpClientManager(handler))
+    service._resolve_addresses = _public_addresses
+    await job_manager.start()
+    try:
+        job = service.submit("kimi", "hello", "chat-1", type_input=False, webhook_url="https://hooks.test/done")
+        await job_manager.wait(job.id, timeout_seconds=1)
+        # La callback del webhook gira dopo che il job e' segnato come terminato
+        await job_manager._queue.join()
+    finally:
+        await job_manager.stop()
+
+    assert providers["kimi"].calls == [("hello", "chat-1", False)]
+    assert job.webhook_delivered is True
+    assert received[0]["job_id"] == job.id
+    assert received[0]["status"] == "succeeded"
+    assert received[0]["result"]["message"] == "answer"
+
+
+@pytest.mark.asyncio
+async def test_webhook_is_not_posted_to_hosts_resolving_to_private_addresses():
+    received = []
+    job_manager = JobManager(max_workers=1)
+    service, _ = _service(job_manager, _FakeHttpClientManager(lambda request: received.append(request) or httpx.Response(204)))
+
+    async def loopback(host: str, port: int) -> list[str]:
+        return ["127.0.0.1"]
+
+    service._resolve_addresses = loopback
+    await job_manager.start()
+    try:
+        job = service.submit("kimi", "hello", webhook_url="https://rebind.test/done")
+        await job_manager.wait(job.id, timeout_seconds=1)
+        await job_manager._queue.join()
+    finally:
+        await job_manager.stop()
+        await service.stop()
+
+    assert received == []
+    assert job.webhook_delivered is False
+
+
+def test_submit_rejects_unknown_provider():
+    service, _ = _service(JobManager(), _FakeHttpClientManager(lambda request: httpx.Response(200)))
+
+    with pytest.raises(ValueError):
+        service.submit("unknown", "hello")
+
+
+@pytest.mark.asyncio
+async def test_job_rejected_by_admission_is_retried_instead_of_failing(monkeypatch):
+    original_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: original_sleep(0))
+    job_manager = JobManager(max_workers=1)
+    service, providers = _service(job_manager, _FakeHttpClientManager(lambda request: httpx.Response(204)))
+    answer = providers["kimi"].ask_and_wait
+    rejections = [AdmissionRejectedError("kimi", "attesa in coda scaduta", 1)]
+
+    async def busy_then_answer(message: str, chat_id: str | None = None, type_input: bool = True) -> Chat:
+        if rejections:
+            raise rejections.pop()
+        return await answer(message, chat_id, type_input)
+
+    providers["kimi"].ask_and_wait = busy_then_answer
+    await job_manager.start()
+    try:
+        job = service.submit("kimi", "hello")
+        finished = await job_manager.wait(job.id, timeout_seconds=1)
+    finally:
+        await job_manager.stop()
+
+    assert finished.status == "succeeded"
+    assert providers["kimi"].calls == [("hello", None, True)]
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from polychat.manager.latency_manager import LatencyManager
+from polychat.mapper.service.chat_to_api_mapper import ChatToApiMapper
+from polychat.mapper.service.multi_to_api_mapper import MultiToApiMapper
+from polychat.model.service.chat import Chat
+from polychat.model.service.chat_metadata import ChatMetadata
+from polychat.service.multi_service import MultiService
+
+PROVIDERS = ("chatgpt", "deepseek", "gemini", "kimi", "perplexity", "qwen")
+
+
+class _FakeProviderService:
+    def __init__(self, provider: str, delay: float = 0.0, error: Exception | None = None):
+        self.PROVIDER_NAME = provider
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.cancelled = False
+
+    async def ask_and_wait(self, message: str, chat_id: str | None = None, type_input: bool = True) -> Chat:
+        self.calls.append((message, chat_id, type_input))
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return Chat(id=f"{self.PROVIDER_NAME}-chat", message="answer", metadata=ChatMetadata(provider=self.PROVIDER_NAME))
+
+
+def _service(**overrides) -> tuple[MultiService, dict]:
+    services = {name: overrides.get(name) or _FakeProviderService(name) for name in PROVIDERS}
+    return MultiService(*(services[name] for name in PROVIDERS), 1.0), services
+
+
+@pytest.mark.asyncio
+async def test_first_mode_returns_fastest_success_and_cancels_the_rest():
+    service, services = _service(
+        kimi=_FakeProviderService("kimi", error=RuntimeError("boom")),
+        qwen=_FakeProviderService("qwen", delay=0.01),
+        gemini=_FakeProviderService("gemini", delay=5),
+    )
+
+    completion = await service.complete(["kimi", "qwen", "gemini"], "hello", mode="first")
+
+    assert completion.is_complete
+    assert completion.winner == "qwen"
+    assert [result.status for result in completion.results] == ["failed", "succeeded", "cancelled"]
+    assert completion.results[0].error == "boom"
+    assert services["gemini"].cancelled
+    assert services["qwen"].calls == [("hello", None, True)]
+
+
+@pytest.mark.asyncio
+async def test_all_mode_returns_partial_results_at_deadline():
+    service, _ = _service(gemini=_FakeProviderService("gemini", delay=5))
+
+    completion = await service.complete(["kimi", "gemini"], "hello", mode="all", timeout_seconds=0.05)
+
+    assert not completion.is_complete
+    assert completion.succeeded == 1
+    assert {result.provider: result.status for result in completion.results} == {
+        "kimi": "succeeded",
+        "gemini": "timed_out",
+    }
+
+    response = MultiToApiMapper(ChatToApiMapper()).create_from(completion)
+    assert response.complete is False
+    assert response.results[0].result.message == "answer"
+    assert response.results[1].result is None
+
+
+@pytest.mark.asyncio
+async def test_quorum_mode_defaults_to_majority_and_validates_bounds():
+    service, services = _service(perplexity=_FakeProviderService("perplexity", delay=5))
+
+    completion = await service.complete(["kimi", "qwen", "perplexity"], "hello", mode="quorum")
+
+    assert completion.required == 2
+    assert completion.succeeded == 2
+    assert services["perplexity"].cancelled
+
+    with pytest.raises(ValueError):
+        await service.complete(["kimi", "qwen"], "hello", mode="quorum", quorum=3)
+    with pytest.raises(ValueError):
+        await service.complete(["unknown"], "hello")
+
+
+@pytest.mark.asyncio
+async def test_hedged_mode_starts_backup_after_threshold_and_cancels_loser():
+    service, services = _service(
+        gemini=_FakeProviderService("gemini", delay=5),
+        kimi=_FakeProviderService("kimi", delay=0.01),
+    )
+
+    completion = await service.complete(["gemini", "kimi", "qwen"], "hello", mode="hedged", hedge_after_seconds=0.02)
+
+    assert completion.winner == "kimi"
+    assert completion.hedge_after_seconds == 0.02
+    assert [result.status for result in completion.results] == ["cancelled", "succeeded", "skipped"]
+    assert services["gemini"].cancelled
+    assert services["qwen"].calls == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_mode_does_not_start_backup_when_primary_is_fast():
+    service, services = _service()
+
+    completion = await service.complete(["kimi", "qwen"], "hello", mode="hedged", hedge_after_seconds=1)
+
+    assert completion.winner == "kimi"
+    assert services["qwen"].calls == []
+
+
+@pytest.mark.asyncio
+async def test_hedged_mode_uses_observed_percentile_and_fails_over_immediately_on_error():
+    service, services = _service(kimi=_FakeProviderService("kimi", error=RuntimeError("boom")))
+    service.latency_manager = LatencyManager(min_samples=1)
+    service.latency_manager.record("kimi", "ask_and_wait", 42.0)
+
+    completion = await service.complete(["kimi", "qwen"], "hello", mode="hedged")
+
+    assert completion.hedge_after_seconds == 42.0
+    assert completion.winner == "qwen"
+    assert completion.elapsed_seconds < 1
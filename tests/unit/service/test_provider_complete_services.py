@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 
+from polychat.manager.account_pool_manager import AccountPoolManager
+from polychat.manager.circuit_breaker_manager import CircuitBreakerManager, CircuitOpenError
 from polychat.mapper.client.chatgpt_chat_mapper import ChatGptChatMapper
 from polychat.mapper.client.deepseek_chat_mapper import DeepseekChatMapper
 from polychat.mapper.client.gemini_chat_mapper import GeminiChatMapper
@@ -102,6 +106,7 @@ class _FakeChatGptClient:
     def __init__(self):
         self.calls = []
         self.conversation_calls = []
+        self.download_calls = []
 
     async def ask_and_wait(self, message: str, chat_id: str | None = None, type_input: bool = True) -> ConversationDetail:
         self.calls.append((message, chat_id, type_input))
@@ -129,6 +134,10 @@ class _FakeChatGptClient:
         self.conversation_calls.append(chat_id)
         return await self.ask_and_wait("ignored", chat_id)
 
+    async def proxy_download(self, download_url: str, request_headers: dict[str, str] | None = None):
+        self.download_calls.append(download_url)
+        return download_url
+
 
 @pytest.mark.asyncio
 async def test_deepseek_service_ask_and_wait_uses_single_client_flow():
@@ -193,3 +202,140 @@ async def test_chatgpt_service_ask_and_wait_uses_single_client_flow():
     assert client.conversation_calls == []
     assert response.id == "chatgpt-chat"
     assert response.message == "done"
+
+
+@pytest.mark.asyncio
+async def test_kimi_service_spreads_new_chats_across_accounts_and_keeps_follow_ups_on_owner():
+    default_client = _FakeKimiClient()
+    second_client = _FakeKimiClient()
+    service = KimiService(
+        default_client,
+        KimiChatMapper(),
+        account_pool_manager=AccountPoolManager(strategy="round_robin"),
+        account_clients={"acct2": second_client},
+    )
+
+    first = await service.ask_and_wait("first")
+    await service.ask_and_wait("follow-up", chat_id=first.id)
+    await service.get_conversation(first.id)
+    await service.ask_and_wait("second")
+
+    assert default_client.calls == [("first", None, True), ("follow-up", "kimi-chat", True)]
+    assert default_client.conversation_calls == ["kimi-chat"]
+    assert second_client.calls == [("second", None, True)]
+
+
+@pytest.mark.asyncio
+async def test_chatgpt_service_downloads_files_with_the_session_of_the_conversation_account():
+    default_client = _FakeChatGptClient()
+    second_client = _FakeChatGptClient()
+    account_pool_manager = AccountPoolManager()
+    service = ChatGptService(
+        default_client,
+        ChatGptChatMapper(),
+        account_pool_manager=account_pool_manager,
+        account_clients={"acct2": second_client},
+    )
+    account_pool_manager.remember_conversation("chatgpt", "chat-2", "acct2")
+
+    await service.proxy_download("https://chatgpt.com/backend-api/estuary/content?id=file-1", chat_id="chat-2")
+    await service.proxy_download("https://chatgpt.com/backend-api/files/download/f?conversation_id=chat-2")
+    await service.proxy_download("https://chatgpt.com/backend-api/estuary/content?id=file-3")
+
+    assert second_client.download_calls == [
+        "https://chatgpt.com/backend-api/estuary/content?id=file-1",
+        "https://chatgpt.com/backend-api/files/download/f?conversation_id=chat-2",
+    ]
+    assert default_client.download_calls == ["https://chatgpt.com/backend-api/estuary/content?id=file-3"]
+
+
+@pytest.mark.asyncio
+async def test_kimi_service_stream_raises_circuit_open_instead_of_an_error_event():
+    circuit_breaker_manager = CircuitBreakerManager(failure_threshold=1, open_seconds=60)
+    service = KimiService(_FakeKimiClient(), KimiChatMapper(), circuit_breaker_manager=circuit_breaker_manager)
+    with pytest.raises(RuntimeError):
+        async with circuit_breaker_manager.guard("kimi"):
+            raise RuntimeError("down")
+
+    with pytest.raises(CircuitOpenError):
+        await anext(service.ask_stream("hello"))
+
+
+@pytest.mark.asyncio
+async def test_kimi_service_serves_repeated_reads_from_cache_until_follow_up():
+    client = _FakeKimiClient()
+    service = KimiService(client, KimiChatMapper())
+
+    await service.get_conversation("chat-1")
+    await service.get_conversation("chat-1")
+    assert client.conversation_calls == ["chat-1"]
+
+    await service.ask_and_wait("follow-up", chat_id="chat-1")
+    await service.get_conversation("chat-1")
+    assert client.conversation_calls == ["chat-1", "chat-1"]
+
+
+@pytest.mark.asyncio
+async def test_kimi_service_does_not_cache_a_read_that_overlaps_a_follow_up():
+    client = _FakeKimiClient()
+    release = asyncio.Event()
+    original_get_conversation = client.get_conversation
+
+    async def slow_get_conversation(chat_id: str) -> KimiResponse:
+        await release.wait()
+        return await original_get_conversation(chat_id)
+
+    client.get_conversation = slow_get_conversation
+    service = KimiService(client, KimiChatMapper())
+
+    reader = asyncio.create_task(service.get_conversation("chat-1"))
+    await asyncio.sleep(0)
+    await service.ask_and_wait("follow-up", chat_id="chat-1")
+    release.set()
+    await reader
+
+    await service.get_conversation("chat-1")
+    assert client.conversation_calls == ["chat-1", "chat-1"]
+
+
+@pytest.mark.asyncio
+async def test_deepseek_service_coalesces_concurrent_reads_of_same_chat():
+    client = _FakeDeepseekClient()
+    release = asyncio.Event()
+    original_get_conversation = client.get_conversation
+
+    async def slow_get_conversation(chat_id: str) -> DeepseekResponse:
+        await release.wait()
+        return await original_get_conversation(chat_id)
+
+    client.get_conversation = slow_get_conversation
+    service = DeepseekService(client, DeepseekChatMapper())
+
+    readers = [asyncio.create_task(service.get_conversation("chat-1")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    chats = await asyncio.gather(*readers)
+
+    assert client.conversation_calls == ["chat-1"]
+    assert {chat.id for chat in chats} == {"chat-1"}
+
+
+@pytest.mark.asyncio
+async def test_kimi_service_status_is_served_from_monitor_unless_refresh_is_requested():
+    client = _FakeKimiClient()
+    status_calls = []
+
+    async def status() -> dict:
+        status_calls.append("status")
+        return {"provider": "kimi", "is_available": True, "is_logged_in": True, "detail": None}
+
+    client.status = status
+    service = KimiService(client, KimiChatMapper())
+
+    first = await service.status()
+    second = await service.status()
+    assert status_calls == ["status"]
+    assert second["checked_at"] == first["checked_at"]
+
+    await service.status(refresh=True)
+    assert status_calls == ["status", "status"]
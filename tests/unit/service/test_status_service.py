@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from polychat.model.api.status_response import StatusResponse
+from polychat.service.status_service import StatusService
+
+PROVIDERS = ("chatgpt", "deepseek", "gemini", "kimi", "perplexity", "qwen")
+
+
+class _FakeProviderService:
+    def __init__(self, provider: str, delay: float = 0.0, error: Exception | None = None):
+        self.PROVIDER_NAME = provider
+        self.delay = delay
+        self.error = error
+        self.refresh_calls = []
+
+    async def status(self, refresh: bool = False) -> dict:
+        self.refresh_calls.append(refresh)
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {"provider": self.PROVIDER_NAME, "is_available": True, "is_logged_in": True, "detail": None}
+
+
+def _service(services: dict, timeout_seconds: float = 1.0) -> StatusService:
+    return StatusService(*(services[name] for name in PROVIDERS), timeout_seconds)
+
+
+@pytest.mark.asyncio
+async def test_status_checks_providers_concurrently():
+    services = {name: _FakeProviderService(name, delay=0.05) for name in PROVIDERS}
+
+    result = await _service(services).status(refresh=True)
+
+    assert result["status"] == "ok"
+    assert set(result["providers"]) == set(PROVIDERS)
+    assert result["timed_out"] == []
+    # In sequenza servirebbero 0.3s
+    assert result["elapsed_seconds"] < 0.2
+    assert all(service.refresh_calls == [True] for service in services.values())
+    StatusResponse.model_validate(result)
+
+
+@pytest.mark.asyncio
+async def test_status_returns_partial_results_after_deadline():
+    services = {name: _FakeProviderService(name) for name in PROVIDERS}
+    services["gemini"] = _FakeProviderService("gemini", delay=5)
+    services["qwen"] = _FakeProviderService("qwen", error=RuntimeError("browser crashed"))
+
+    result = await _service(services).status(timeout_seconds=0.05)
+
+    assert result["status"] == "degraded"
+    assert result["timed_out"] == ["gemini"]
+    assert result["providers"]["gemini"]["is_available"] is False
+    assert "browser crashed" in result["providers"]["qwen"]["detail"]
+    assert result["providers"]["kimi"]["is_available"] is True
+    assert result["elapsed_seconds"] < 1